@@ -10,6 +10,7 @@ Project Feedback Loops → Aggregator → Strategy Engine → Dashboard/Actions
 """
 
 import json
+import sqlite3
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -36,8 +37,9 @@ class FeedbackAggregator:
         self.feedback_sources = {
             'Assessment': {
                 'path': Path('/home/mavrick/Projects/Assessment/data'),
-                'loops': ['score_tracking.json', 'remediation_tracking.json',
-                         'learned_patterns.json', 'benchmarks.json']
+                'loops': ['remediation_tracking.json', 'learned_patterns.json'],
+                # Score history lives in the project's FeedbackStore
+                'store': 'feedback.db'
             },
             'Azure_Projects': {
                 'path': Path('/home/mavrick/Projects/Azure_Projects/feedback'),
@@ -46,8 +48,9 @@ class FeedbackAggregator:
             },
             'NetworkScannerSuite': {
                 'path': Path('/home/mavrick/Projects/NetworkScannerSuite/service/analytics_data'),
-                'loops': ['scan_metrics.json', 'scan_errors.json',
-                         'network_intelligence.json', 'resource_metrics.json']
+                'loops': ['scan_errors.json', 'network_intelligence.json', 'resource_metrics.json'],
+                # Scan history lives in the project's FeedbackStore
+                'store': 'feedback.db'
             },
             'Template_Docs': {
                 'path': Path('/home/mavrick/Projects/Template Docs/survey_system/data'),
@@ -129,24 +132,57 @@ class FeedbackAggregator:
                     loop_metrics = self._extract_loop_metrics(
                         project_name, loop_file, data
                     )
-
-                    # Merge metrics
-                    metrics['data_points'] += loop_metrics.get('data_points', 0)
-                    if loop_metrics.get('leverage_multiplier'):
-                        metrics['leverage_multiplier'] = max(
-                            metrics['leverage_multiplier'],
-                            loop_metrics['leverage_multiplier']
-                        )
-                    if loop_metrics.get('automation_rate'):
-                        metrics['automation_rate'] = loop_metrics['automation_rate']
-                    metrics['exceptions_count'] += loop_metrics.get('exceptions', 0)
-
-                    if loop_metrics.get('insights'):
-                        metrics['insights'].extend(loop_metrics['insights'])
+                    self._merge_metrics(metrics, loop_metrics)
 
                 except Exception as e:
                     pass  # Skip unreadable files
 
+        store_path = feedback_path / config['store'] if config.get('store') else None
+        if store_path and store_path.exists():
+            self._merge_metrics(metrics, self._extract_store_metrics(project_name, store_path))
+
+        return metrics
+
+    def _merge_metrics(self, metrics: Dict[str, Any], loop_metrics: Dict[str, Any]) -> None:
+        """Merge one loop's metrics into the project totals"""
+        metrics['data_points'] += loop_metrics.get('data_points', 0)
+        if loop_metrics.get('leverage_multiplier'):
+            metrics['leverage_multiplier'] = max(
+                metrics['leverage_multiplier'],
+                loop_metrics['leverage_multiplier']
+            )
+        if loop_metrics.get('automation_rate'):
+            metrics['automation_rate'] = loop_metrics['automation_rate']
+        metrics['exceptions_count'] += loop_metrics.get('exceptions', 0)
+
+        if loop_metrics.get('insights'):
+            metrics['insights'].extend(loop_metrics['insights'])
+
+    def _extract_store_metrics(self, project: str, db_path: Path) -> Dict[str, Any]:
+        """Extract metrics from a project's FeedbackStore database (opened read-only)"""
+
+        metrics = {'data_points': 0, 'insights': []}
+
+        conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            if project == 'Assessment':
+                # Score series are keyed customer_id/assessment_type
+                groups = conn.execute("SELECT grp FROM aggregates WHERE stream = 'scores'").fetchall()
+                metrics['data_points'] = len({grp.split('/', 1)[0] for grp, in groups})
+
+            elif project == 'NetworkScannerSuite':
+                scans = conn.execute("SELECT COUNT(*) FROM events WHERE stream = 'scans'").fetchone()[0]
+                metrics['data_points'] = scans
+
+                if scans:
+                    # Only successful scans are observed into scan_duration
+                    successful = conn.execute(
+                        "SELECT COALESCE(SUM(count), 0) FROM aggregates WHERE stream = 'scan_duration'"
+                    ).fetchone()[0]
+                    metrics['automation_rate'] = successful / scans
+        finally:
+            conn.close()
+
         return metrics
 
     def _extract_loop_metrics(
@@ -169,10 +205,6 @@ class FeedbackAggregator:
                 tech_count = len(data.get('technology_patterns', {}))
                 metrics['insights'].append(f"Patterns from {industry_count} industries, {tech_count} technologies")
 
-            elif loop_file == 'score_tracking.json':
-                customers = data.get('customers', {})
-                metrics['data_points'] = len(customers)
-
             elif loop_file == 'remediation_tracking.json':
                 # Automation metrics from remediation
                 completed = len(data.get('completed', []))
@@ -208,16 +240,6 @@ class FeedbackAggregator:
                 vendors = len(data.get('vendor_profiles', {}))
                 metrics['insights'].append(f"Network intel: {services} services, {vendors} vendors")
 
-            elif loop_file == 'scan_metrics.json':
-                scans = data.get('scans', [])
-                metrics['data_points'] = len(scans)
-
-                if scans:
-                    # Calculate leverage from scan efficiency
-                    successful = sum(1 for s in scans if s.get('outcome') == 'success')
-                    if len(scans) > 0:
-                        metrics['automation_rate'] = successful / len(scans)
-
             elif loop_file == 'scan_errors.json':
                 errors = data.get('errors', [])
                 recovery_success = data.get('recovery_success', {})
@@ -380,7 +402,7 @@ class FeedbackAggregator:
             }
 
             if path.exists():
-                for loop_file in config['loops']:
+                for loop_file in config['loops'] + ([config['store']] if config.get('store') else []):
                     if (path / loop_file).exists():
                         status['source_status'][project_name]['files_found'].append(loop_file)
 
@@ -43,6 +43,7 @@ def main():
     processed = 0
     failed = 0
     skipped = 0
+    pending_notes = []
 
     for i, file_path in enumerate(all_files, 1):
         try:
@@ -98,19 +99,19 @@ def main():
                 subfolder=subfolder
             )
 
-            # Add to vector store
+            # Queue for vector store (written in batches after the loop)
             if note_result and 'file_path' in note_result:
                 note_content = Path(note_result['file_path']).read_text(encoding='utf-8')
-                vector_store.add_note(
-                    note_id=note_result['note_id'],
-                    content=note_content,
-                    metadata={
+                pending_notes.append({
+                    'note_id': note_result['note_id'],
+                    'content': note_content,
+                    'metadata': {
                         'title': structured.get('title', file_path.stem),
                         'file_path': note_result['file_path'],
                         'tags': structured.get('tags', []),
                         'source_site': structured.get('source_site', 'unknown')
                     }
-                )
+                })
 
             print(f"   ✅ Created: {note_result['note_id']}")
             processed += 1
@@ -120,6 +121,13 @@ def main():
             failed += 1
             continue
 
+    # Chunk and embed all new notes in batches - search reads the chunk index
+    if pending_notes:
+        print(f"🔍 Adding {len(pending_notes)} notes to vector store...")
+        index_result = vector_store.upsert_note_chunks(pending_notes)
+        for note_id, error in index_result['failed'].items():
+            print(f"  ⚠️  Vector store add failed for {note_id}: {error}")
+
     print()
     print("=" * 70)
     print("📊 Processing Complete")
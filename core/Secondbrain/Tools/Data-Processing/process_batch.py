@@ -60,6 +60,7 @@ def process_documents(file_pattern: str = "*.html", limit: int = None):
         "failed": [],
         "skipped": []
     }
+    pending_notes = []
 
     for i, file_path in enumerate(files, 1):
         print(f"[{i}/{len(files)}] Processing: {file_path.name}")
@@ -105,14 +106,13 @@ def process_documents(file_pattern: str = "*.html", limit: int = None):
             print(f"  📝 Creating note in Obsidian vault...")
             note_result = vault.create_note(structured, note_type="processed")
 
-            # Add to vector store
+            # Queue for vector store (written in batches after the loop)
             if vector_store.enabled:
-                print(f"  🔍 Adding to vector store...")
-                vector_store.add_note(
-                    note_id=note_result["note_id"],
-                    content=structured.get("content", ""),
-                    metadata={"title": structured.get("title", "")}
-                )
+                pending_notes.append({
+                    "note_id": note_result["note_id"],
+                    "content": structured.get("content", ""),
+                    "metadata": {"title": structured.get("title", "")}
+                })
 
             print(f"  ✅ Success: {note_result['title']}")
             print(f"     Tags: {', '.join(structured['tags'])}")
@@ -124,6 +124,13 @@ def process_documents(file_pattern: str = "*.html", limit: int = None):
 
         print()
 
+    # Chunk and embed all new notes in batches - search reads the chunk index
+    if pending_notes:
+        print(f"🔍 Adding {len(pending_notes)} notes to vector store...")
+        index_result = vector_store.upsert_note_chunks(pending_notes)
+        for note_id, error in index_result['failed'].items():
+            print(f"  ⚠️  Vector store add failed for {note_id}: {error}")
+
     # Summary
     print("=" * 60)
     print("📊 Processing Summary")
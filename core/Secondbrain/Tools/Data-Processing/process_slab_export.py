@@ -114,10 +114,10 @@ def main():
 
             # Add to vector store
             if note_result and 'file_path' in note_result:
-                vector_store.add_note(
-                    note_id=note_result['note_id'],
-                    content=content[:1000],
-                    metadata={
+                vector_store.upsert_note_chunks([{
+                    'note_id': note_result['note_id'],
+                    'content': content[:1000],
+                    'metadata': {
                         'title': structured.get('title', file_path.stem),
                         'file_path': note_result['file_path'],
                         'tags': structured.get('tags', []),
@@ -126,7 +126,7 @@ def main():
                         'customer': structured.get('customer', 'internal'),
                         'technology': structured.get('technology', '')
                     }
-                )
+                }])
 
             print(f"   Created: {note_result['note_id']}")
             processed += 1
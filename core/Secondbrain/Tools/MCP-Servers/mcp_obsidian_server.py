@@ -13,6 +13,8 @@ from datetime import datetime
 
 from core.obsidian_vault import ObsidianVault
 from core.vector_store import VectorStore
+from core.structured_store import StructuredStore
+from core.config import CHROMA_DB_DIR
 
 
 class ObsidianMCPServer:
@@ -29,7 +31,11 @@ class ObsidianMCPServer:
     """
     
     def __init__(self, vault_path: Optional[Path] = None):
-        self.vault = ObsidianVault(vault_path)
+        # Full-text index (built by rebuild_index.py) avoids a vault scan per search
+        self.vault = ObsidianVault(
+            vault_path,
+            text_index=StructuredStore(CHROMA_DB_DIR.parent / "structured.db")
+        )
         self.vector_store = VectorStore()
         
     def get_tools(self) -> List[Dict]:
@@ -129,19 +135,20 @@ class ObsidianMCPServer:
         
         try:
             if tool_name == "create_note":
-                note_path = self.vault.create_note(
+                note_result = self.vault.create_note(
                     structured_data=arguments["structured_data"],
                     note_type=arguments.get("note_type", "processed")
                 )
                 
                 # Add to vector store
-                note_id = note_path.stem
+                note_path = Path(note_result["file_path"])
+                note_id = note_result["note_id"]
                 content = note_path.read_text(encoding='utf-8')
-                self.vector_store.add_note(
-                    note_id=note_id,
-                    content=content,
-                    metadata=arguments["structured_data"]
-                )
+                self.vector_store.upsert_note_chunks([{
+                    'note_id': note_id,
+                    'content': content,
+                    'metadata': arguments["structured_data"]
+                }])
                 
                 return {
                     "success": True,
@@ -9,7 +9,9 @@ Enables multi-step reasoning and data retrieval for sophisticated queries
 """
 import os
 import json
-from typing import List, Dict, Any, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Iterator
 from anthropic import Anthropic
 from core.structured_store import StructuredStore
 from core.vector_store import VectorStore
@@ -20,11 +22,18 @@ from core.config import CHROMA_DB_DIR, OBSIDIAN_VAULT_PATH
 class AgenticRAG:
     """Agent-based RAG system with tool use for complex queries"""
 
-    def __init__(self, structured_store: StructuredStore, vector_store: VectorStore):
+    def __init__(self, structured_store: StructuredStore, vector_store: VectorStore,
+                 max_tool_workers: int = 4):
         self.structured_store = structured_store
         self.vector_store = vector_store
         self.client = Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
 
+        # Tool calls from one model turn are independent reads, so run them side by side
+        self.tool_executor = ThreadPoolExecutor(
+            max_workers=max_tool_workers,
+            thread_name_prefix="agent-tool"
+        )
+
         # Define tools available to the agent
         self.tools = [
             {
@@ -237,19 +246,41 @@ class AgenticRAG:
         except Exception as e:
             return f"Tool error: {str(e)}"
 
-    def query(self, user_query: str, max_iterations: int = 8) -> Dict[str, Any]:
+    def _timed_tool(self, tool_name: str, tool_input: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one tool and record how long it took"""
+        started = time.perf_counter()
+        result = self.execute_tool(tool_name, tool_input)
+        return {"result": result, "duration_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+    def iter_tools(self, tool_blocks: List[Any]) -> Iterator[tuple]:
+        """Execute all tool_use blocks of one turn concurrently
+
+        Yields (block index, {'result', 'duration_ms'}) as each tool finishes,
+        so a slow tool doesn't hold back the others' results.
         """
-        Process a complex query using the agent with tool use
+        if len(tool_blocks) == 1:
+            yield 0, self._timed_tool(tool_blocks[0].name, tool_blocks[0].input)
+            return
 
-        Returns dict with:
-        - answer: The final answer
-        - tool_calls: List of tools used
-        - reasoning: The agent's reasoning process
+        futures = {
+            self.tool_executor.submit(self._timed_tool, block.name, block.input): index
+            for index, block in enumerate(tool_blocks)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    def execute_tools(self, tool_blocks: List[Any]) -> List[Dict[str, Any]]:
+        """Execute all tool_use blocks of one turn concurrently
+
+        Returns one {'result', 'duration_ms'} per block, in block order.
         """
-        messages = [
-            {
-                "role": "user",
-                "content": f"""You are a helpful assistant for Obera Connect, an IT managed services company.
+        outcomes = [None] * len(tool_blocks)
+        for index, outcome in self.iter_tools(tool_blocks):
+            outcomes[index] = outcome
+        return outcomes
+
+    def _build_prompt(self, user_query: str) -> str:
+        return f"""You are a helpful assistant for Obera Connect, an IT managed services company.
 Answer the following question using the available tools. Be precise and factual.
 
 IMPORTANT GUIDELINES:
@@ -259,13 +290,24 @@ IMPORTANT GUIDELINES:
 - Use search_customers ONLY if looking for a specific customer by name
 - Use semantic_search for documentation/procedure questions
 - Use run_sql_query only for complex queries not covered by other tools
+- Request independent tools in the same turn - they are executed in parallel
 - After gathering data, provide a clear final answer - don't keep searching endlessly
 
 Question: {user_query}
 
 Use the tools to gather the information you need, then provide a clear, concise answer."""
-            }
-        ]
+
+    def query_stream(self, user_query: str, max_iterations: int = 8) -> Iterator[Dict[str, Any]]:
+        """
+        Process a query, yielding progress events as they happen
+
+        Event types:
+        - text: {'type': 'text', 'text': str} - partial answer text
+        - tool_start: {'type': 'tool_start', 'tools': [{'tool', 'input'}]} - a turn's tools were dispatched
+        - tool_result: {'type': 'tool_result', 'tool', 'input', 'result', 'duration_ms'} - one per tool, as it finishes
+        - done: {'type': 'done', 'answer', 'tool_calls', 'iterations'} - always last
+        """
+        messages = [{"role": "user", "content": self._build_prompt(user_query)}]
 
         tool_calls = []
         iterations = 0
@@ -273,46 +315,34 @@ Use the tools to gather the information you need, then provide a clear, concise
         while iterations < max_iterations:
             iterations += 1
 
-            response = self.client.messages.create(
+            with self.client.messages.stream(
                 model="claude-sonnet-4-20250514",
                 max_tokens=4096,
                 tools=self.tools,
                 messages=messages
-            )
-
-            # Check if we're done (no more tool use)
-            if response.stop_reason == "end_turn":
-                # Extract final text response
-                final_answer = ""
-                for block in response.content:
-                    if hasattr(block, 'text'):
-                        final_answer = block.text
-                        break
-
-                return {
-                    "answer": final_answer,
-                    "tool_calls": tool_calls,
-                    "iterations": iterations
-                }
+            ) as stream:
+                for event in stream:
+                    if event.type == "text":
+                        yield {"type": "text", "text": event.text}
+                response = stream.get_final_message()
 
-            # Process tool use blocks
-            tool_use_blocks = []
-            for block in response.content:
-                if block.type == "tool_use":
-                    tool_use_blocks.append(block)
+            tool_use_blocks = [block for block in response.content if block.type == "tool_use"]
 
-            if not tool_use_blocks:
-                # No tool use, get text response
+            # Done when the model stops asking for tools
+            if response.stop_reason == "end_turn" or not tool_use_blocks:
                 final_answer = ""
                 for block in response.content:
                     if hasattr(block, 'text'):
                         final_answer = block.text
                         break
-                return {
+
+                yield {
+                    "type": "done",
                     "answer": final_answer,
                     "tool_calls": tool_calls,
                     "iterations": iterations
                 }
+                return
 
             # Add assistant response to messages
             messages.append({
@@ -320,25 +350,35 @@ Use the tools to gather the information you need, then provide a clear, concise
                 "content": response.content
             })
 
-            # Execute tools and collect results
-            tool_results = []
-            for tool_block in tool_use_blocks:
-                tool_name = tool_block.name
-                tool_input = tool_block.input
-
-                # Execute the tool
-                result = self.execute_tool(tool_name, tool_input)
-                tool_calls.append({
-                    "tool": tool_name,
-                    "input": tool_input,
-                    "result": result[:500]  # Truncate for logging
-                })
-
-                tool_results.append({
+            yield {
+                "type": "tool_start",
+                "tools": [{"tool": block.name, "input": block.input} for block in tool_use_blocks]
+            }
+
+            # Execute tools concurrently, reporting each as it finishes
+            calls = [None] * len(tool_use_blocks)
+            outcomes = [None] * len(tool_use_blocks)
+            for index, outcome in self.iter_tools(tool_use_blocks):
+                tool_block = tool_use_blocks[index]
+                calls[index] = {
+                    "tool": tool_block.name,
+                    "input": tool_block.input,
+                    "result": outcome["result"][:500],  # Truncate for logging
+                    "duration_ms": outcome["duration_ms"]
+                }
+                outcomes[index] = outcome
+                yield {"type": "tool_result", **calls[index]}
+
+            # The tool_result message lists results in request order
+            tool_calls.extend(calls)
+            tool_results = [
+                {
                     "type": "tool_result",
                     "tool_use_id": tool_block.id,
-                    "content": result
-                })
+                    "content": outcome["result"]
+                }
+                for tool_block, outcome in zip(tool_use_blocks, outcomes)
+            ]
 
             # Add tool results to messages
             messages.append({
@@ -346,12 +386,26 @@ Use the tools to gather the information you need, then provide a clear, concise
                 "content": tool_results
             })
 
-        return {
+        yield {
+            "type": "done",
             "answer": "Max iterations reached. Please try a simpler query.",
             "tool_calls": tool_calls,
             "iterations": iterations
         }
 
+    def query(self, user_query: str, max_iterations: int = 8) -> Dict[str, Any]:
+        """
+        Process a complex query using the agent with tool use
+
+        Returns dict with:
+        - answer: The final answer
+        - tool_calls: List of tools used
+        - iterations: Model turns taken
+        """
+        for event in self.query_stream(user_query, max_iterations):
+            if event["type"] == "done":
+                return {key: value for key, value in event.items() if key != "type"}
+
 
 def main():
     """Test the agentic RAG system"""
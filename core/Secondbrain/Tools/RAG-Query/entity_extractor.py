@@ -54,7 +54,7 @@ class EntityExtractor:
 
     def extract_projects(self, csv_path: Path) -> int:
         """Extract projects from a SharePoint Project List CSV"""
-        count = 0
+        projects = []
         try:
             with open(csv_path, 'r', encoding='utf-8', errors='ignore') as f:
                 reader = csv.DictReader(f)
@@ -79,17 +79,17 @@ class EntityExtractor:
                         'source_url': row.get('EncodedAbsUrl', ''),
                     }
 
-                    if self.store.add_project(project_data):
-                        count += 1
+                    projects.append(project_data)
 
         except Exception as e:
             print(f"  Error reading {csv_path.name}: {e}")
 
-        return count
+        # One transaction per file instead of a commit per row
+        return self.store.add_projects(projects)
 
     def extract_tickets(self, csv_path: Path) -> int:
         """Extract tickets from a SharePoint Ticket List CSV"""
-        count = 0
+        tickets = []
         try:
             with open(csv_path, 'r', encoding='utf-8', errors='ignore') as f:
                 reader = csv.DictReader(f)
@@ -100,31 +100,22 @@ class EntityExtractor:
 
                     ticket_id = row.get('UniqueId') or row.get('GUID') or row.get('TicketNumber') or f"tkt_{row.get('ID', '')}"
 
-                    self.store.execute("""
-                        INSERT INTO tickets (id, title, customer, status, priority, assigned_to, due_date, description, source, updated_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        ON CONFLICT(id) DO UPDATE SET
-                            title = excluded.title,
-                            status = excluded.status,
-                            updated_at = excluded.updated_at
-                    """, (
-                        ticket_id,
-                        row.get('TicketTitle') or row.get('Title') or 'Untitled Ticket',
-                        row.get('Customer', ''),
-                        row.get('Status', 'Open'),
-                        row.get('Priority', 'Medium'),
-                        row.get('AssignedTo', ''),
-                        self._parse_date(row.get('DueDate')),
-                        row.get('Description', ''),
-                        row.get('Source', 'SharePoint'),
-                        datetime.now().isoformat()
-                    ))
-                    count += 1
+                    tickets.append({
+                        'id': ticket_id,
+                        'title': row.get('TicketTitle') or row.get('Title') or 'Untitled Ticket',
+                        'customer': row.get('Customer', ''),
+                        'status': row.get('Status', 'Open'),
+                        'priority': row.get('Priority', 'Medium'),
+                        'assigned_to': row.get('AssignedTo', ''),
+                        'due_date': self._parse_date(row.get('DueDate')),
+                        'description': row.get('Description', ''),
+                        'source': row.get('Source', 'SharePoint'),
+                    })
 
         except Exception as e:
             print(f"  Error reading {csv_path.name}: {e}")
 
-        return count
+        return self.store.add_tickets(tickets)
 
     def extract_employees_from_assignments(self):
         """Extract unique employees from project/ticket assignments"""
@@ -145,11 +136,7 @@ class EntityExtractor:
                 employees.add(name)
 
         # Add employees to store
-        for name in employees:
-            self.store.execute("""
-                INSERT INTO employees (name, source) VALUES (?, 'assignment')
-                ON CONFLICT(name) DO NOTHING
-            """, (name,))
+        self.store.add_employees(sorted(employees))
 
         return len(employees)
 
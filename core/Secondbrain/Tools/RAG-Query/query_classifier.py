@@ -176,9 +176,12 @@ class QueryRouter:
     """Routes queries to appropriate handlers based on classification"""
 
     def __init__(self, structured_store, vector_store):
+        from core.hybrid_search import HybridSearcher
+
         self.classifier = QueryClassifier()
         self.structured_store = structured_store
         self.vector_store = vector_store
+        self.hybrid_searcher = HybridSearcher(vector_store, structured_store)
 
     def route(self, query: str) -> Dict[str, Any]:
         """
@@ -258,8 +261,8 @@ class QueryRouter:
         return result
 
     def _handle_exploratory(self, query: str) -> List[Dict]:
-        """Handle exploratory queries using vector store"""
-        return self.vector_store.semantic_search(query, n_results=10)
+        """Handle exploratory queries using keyword + vector search"""
+        return self.hybrid_searcher.search(query, n_results=10)
 
 
 def main():
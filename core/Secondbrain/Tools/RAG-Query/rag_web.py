@@ -9,15 +9,19 @@ Access from browser at http://localhost:5000
 
 Supports:
 - Analytical queries (counts, lists) -> SQLite structured store
-- Exploratory queries (semantic search) -> ChromaDB vector store
+- Exploratory queries (semantic search) -> ChromaDB vector store fused with
+  SQLite FTS5 keyword search (reciprocal rank fusion)
 """
 import os
+import json
 from anthropic import Anthropic
-from flask import Flask, render_template_string, request, jsonify
+from flask import Flask, Response, render_template_string, request, jsonify, stream_with_context
 from pathlib import Path
 from core.vector_store import VectorStore
 from core.obsidian_vault import ObsidianVault
 from core.structured_store import StructuredStore
+from core.hybrid_search import HybridSearcher
+from core.query_cache import QueryCache, normalize_query, index_version
 from query_classifier import QueryClassifier, QueryType
 from core.config import CHROMA_DB_DIR, OBSIDIAN_VAULT_PATH
 from agentic_rag import AgenticRAG
@@ -38,9 +42,40 @@ else:
 
 # Initialize stores
 vector_store = VectorStore(CHROMA_DB_DIR)
-vault = ObsidianVault(OBSIDIAN_VAULT_PATH)
 structured_store = StructuredStore(CHROMA_DB_DIR.parent / "structured.db")
+vault = ObsidianVault(OBSIDIAN_VAULT_PATH, text_index=structured_store)
 query_classifier = QueryClassifier()
+hybrid_searcher = HybridSearcher(vector_store, structured_store)
+
+# Cache for /search responses and LLM summaries - entries are tied to the
+# index version, so any write to the vector index or structured.db invalidates them
+query_cache = QueryCache(
+    CHROMA_DB_DIR.parent / "query_cache.db",
+    max_entries=int(os.getenv("RAG_CACHE_MAX_ENTRIES", "500")),
+    ttl_seconds=int(os.getenv("RAG_CACHE_TTL_SECONDS", "3600"))
+)
+# Chroma's own sqlite (and its WAL) changes on every collection write, including
+# ingestion scripts that bypass rebuild_index and the manifest
+INDEX_FILES = (
+    CHROMA_DB_DIR / "index_manifest.json",
+    CHROMA_DB_DIR / "chroma.sqlite3",
+    CHROMA_DB_DIR / "chroma.sqlite3-wal"
+)
+_last_index_version = None
+
+
+def current_index_version() -> str:
+    """Current index version; purges cached entries the first time it changes"""
+    global _last_index_version
+    # structured.db is versioned by its write counter - in WAL mode commits
+    # don't touch the main file's mtime until a checkpoint
+    version = f"{structured_store.data_version()}:{index_version(*INDEX_FILES)}"
+    if version != _last_index_version:
+        if _last_index_version is not None:
+            dropped = query_cache.invalidate(version)
+            print(f"Index changed - invalidated {dropped} cached queries")
+        _last_index_version = version
+    return version
 agentic_rag = AgenticRAG(structured_store, vector_store) if ANTHROPIC_API_KEY else None
 
 HTML_TEMPLATE = """
@@ -362,6 +397,11 @@ HTML_TEMPLATE = """
             const agentMode = document.getElementById('agentMode').checked;
             const endpoint = agentMode ? '/agent' : '/search';
 
+            if (agentMode) {
+                streamAgent(query);
+                return;
+            }
+
             document.getElementById('loading').style.display = 'block';
             document.getElementById('loading').innerHTML = agentMode ? '<h3>🤖 Agent thinking...</h3>' : '<h3>🔍 Searching...</h3>';
             document.getElementById('results').innerHTML = '';
@@ -442,6 +482,75 @@ HTML_TEMPLATE = """
             container.innerHTML = html || '<div class="no-results">No results found.</div>';
         }
 
+        function streamAgent(query) {
+            const loading = document.getElementById('loading');
+            loading.style.display = 'block';
+            loading.innerHTML = '<h3>🤖 Agent thinking...</h3>';
+            document.getElementById('results').innerHTML = '';
+
+            let answer = '';
+            const toolsUsed = [];
+
+            function render(done) {
+                displayAgentResults({ agent_answer: answer, tools_used: toolsUsed });
+                if (done) loading.style.display = 'none';
+            }
+
+            function handle(event) {
+                if (event.type === 'text') {
+                    answer += event.text;
+                    render(false);
+                } else if (event.type === 'tool_start') {
+                    answer = '';
+                    loading.innerHTML = '<h3>🔧 Running: ' + event.tools.map(t => t.tool).join(', ') + '</h3>';
+                } else if (event.type === 'tool_result') {
+                    toolsUsed.push(event);
+                    render(false);
+                } else if (event.type === 'done') {
+                    answer = event.answer || answer;
+                    render(true);
+                }
+            }
+
+            fetch('/agent', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ query: query, stream: true })
+            })
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error('HTTP ' + response.status + ': ' + response.statusText);
+                }
+                if (!(response.headers.get('Content-Type') || '').includes('text/event-stream')) {
+                    // Agent unavailable - plain JSON reply
+                    return response.json().then(data => { loading.style.display = 'none'; displayAgentResults(data); });
+                }
+
+                const reader = response.body.getReader();
+                const decoder = new TextDecoder();
+                let buffer = '';
+
+                function pump() {
+                    return reader.read().then(({ done, value }) => {
+                        if (done) { loading.style.display = 'none'; return; }
+                        buffer += decoder.decode(value, { stream: true });
+                        const frames = buffer.split('\\n\\n');
+                        buffer = frames.pop();
+                        frames.forEach(frame => {
+                            if (frame.startsWith('data: ')) handle(JSON.parse(frame.slice(6)));
+                        });
+                        return pump();
+                    });
+                }
+                return pump();
+            })
+            .catch(err => {
+                loading.style.display = 'none';
+                document.getElementById('results').innerHTML = '<div class="no-results">Error: ' + err.message + '</div>';
+                console.error('Agent stream error:', err);
+            });
+        }
+
         function displayAgentResults(data) {
             const container = document.getElementById('results');
             let html = '<span class="query-type-badge query-type-hybrid">Agent Response</span>';
@@ -480,6 +589,12 @@ def search():
     if not query:
         return jsonify({'results': [], 'llm_summary': None, 'query_type': None})
 
+    version = current_index_version()
+    cache_parts = [normalize_query(query)]
+    cached = query_cache.get('search', cache_parts, version)
+    if cached is not None:
+        return jsonify({**cached, 'cached': True})
+
     # Classify the query
     query_type, metadata = query_classifier.classify(query)
     print(f"Query: '{query}' -> Type: {query_type.value}, Intent: {metadata['intent']}, Entities: {metadata['entities']}")
@@ -493,26 +608,36 @@ def search():
         structured_answer = handle_analytical_query(query, metadata)
         llm_summary = structured_answer  # Direct answer for analytical queries
 
-    # Handle exploratory queries with vector store
+    # Handle exploratory queries with keyword + vector search
     elif query_type == QueryType.EXPLORATORY:
-        results = vector_store.semantic_search(query, n_results=10)
+        results = hybrid_searcher.search(query, n_results=10)
         if anthropic_client and results:
             llm_summary = generate_llm_summary(query, results)
 
     # Handle hybrid queries - both stores
     else:
         structured_answer = handle_analytical_query(query, metadata)
-        results = vector_store.semantic_search(query, n_results=5)
+        results = hybrid_searcher.search(query, n_results=5)
         if anthropic_client:
             # Combine structured answer with document context
             llm_summary = generate_hybrid_summary(query, structured_answer, results)
 
-    return jsonify({
+    response = {
         'results': results,
         'llm_summary': llm_summary,
         'query_type': query_type.value,
         'structured_data': structured_answer if query_type == QueryType.ANALYTICAL else None
-    })
+    }
+    if not (llm_summary or '').startswith('Could not generate'):
+        query_cache.set('search', cache_parts, version, response)
+
+    return jsonify({**response, 'cached': False})
+
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    """Hit/miss counters for the query and summary cache"""
+    return jsonify({**query_cache.get_stats(), 'index_version': current_index_version()})
 
 
 def handle_analytical_query(query: str, metadata: dict) -> str:
@@ -576,6 +701,12 @@ def generate_llm_summary(query: str, results: list) -> str:
     if not anthropic_client or not results:
         return None
 
+    cache_parts = [normalize_query(query), [r['note_id'] for r in results]]
+    version = current_index_version()
+    cached = query_cache.get('summary', cache_parts, version)
+    if cached is not None:
+        return cached
+
     context_str = "\\n---\\n".join([
         f"Document {i+1} (Source: {r['metadata'].get('file_path', 'unknown')})\\n{r['content']}"
         for i, r in enumerate(results)
@@ -599,7 +730,9 @@ Keep the summary concise and directly address the query.
             max_tokens=1000,
             messages=[{"role": "user", "content": llm_prompt}]
         )
-        return response.content[0].text
+        summary = response.content[0].text
+        query_cache.set('summary', cache_parts, version, summary)
+        return summary
     except Exception as e:
         print(f"Error calling Anthropic API for summary: {e}")
         return "Could not generate LLM summary due to an error."
@@ -610,6 +743,12 @@ def generate_hybrid_summary(query: str, structured_answer: str, results: list) -
     if not anthropic_client:
         return structured_answer
 
+    cache_parts = [normalize_query(query), structured_answer, [r['note_id'] for r in results]]
+    version = current_index_version()
+    cached = query_cache.get('hybrid_summary', cache_parts, version)
+    if cached is not None:
+        return cached
+
     doc_context = ""
     if results:
         doc_context = "\\n---\\n".join([
@@ -636,14 +775,20 @@ def generate_hybrid_summary(query: str, structured_answer: str, results: list) -
             max_tokens=1000,
             messages=[{"role": "user", "content": llm_prompt}]
         )
-        return response.content[0].text
+        summary = response.content[0].text
+        query_cache.set('hybrid_summary', cache_parts, version, summary)
+        return summary
     except Exception as e:
         print(f"Error calling Anthropic API for hybrid summary: {e}")
         return structured_answer
 
 @app.route('/agent', methods=['POST'])
 def agent_query():
-    """Handle agent mode queries with tool use"""
+    """Handle agent mode queries with tool use
+
+    With {"stream": true} in the body the response is a text/event-stream of
+    agent events (text, tool_start, tool_result, done) as they happen.
+    """
     query = request.json.get('query', '')
     if not query:
         return jsonify({'agent_answer': None, 'tools_used': [], 'error': 'No query provided'})
@@ -651,6 +796,13 @@ def agent_query():
     if not agentic_rag:
         return jsonify({'agent_answer': 'Agent mode requires ANTHROPIC_API_KEY to be set.', 'tools_used': []})
 
+    if request.json.get('stream'):
+        return Response(
+            stream_with_context(stream_agent_events(query)),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
     try:
         result = agentic_rag.query(query)
         return jsonify({
@@ -663,6 +815,17 @@ def agent_query():
         return jsonify({'agent_answer': f'Agent error: {str(e)}', 'tools_used': []})
 
 
+def stream_agent_events(query: str):
+    """Format agent events as server-sent events"""
+    try:
+        for event in agentic_rag.query_stream(query):
+            yield f"data: {json.dumps(event, default=str)}\n\n"
+    except Exception as e:
+        print(f"Agent error: {e}")
+        error_event = {'type': 'done', 'answer': f'Agent error: {str(e)}', 'tool_calls': [], 'iterations': 0}
+        yield f"data: {json.dumps(error_event)}\n\n"
+
+
 if __name__ == '__main__':
     print("=" * 80)
     print("🌐 Second Brain RAG Web Interface")
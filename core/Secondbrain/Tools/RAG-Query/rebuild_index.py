@@ -5,80 +5,227 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 #!/usr/bin/env python3
 """
 Rebuild vector store index from current vault notes
+
+By default the index is updated incrementally: only notes whose content
+changed since the last run are re-embedded, and notes removed from the vault
+are deleted from the index. Pass --full to wipe and rebuild from scratch.
+
+Notes are stored as heading-aware chunks (see core/chunker.py) linked back to
+their parent note, so semantic search returns focused passages. The same notes
+are kept in the SQLite full-text index (structured.db) used for hybrid search.
 """
-from pathlib import Path
+import argparse
+import shutil
 from core.vector_store import VectorStore
-from core.obsidian_vault import ObsidianVault
-from core.config import CHROMA_DB_DIR, OBSIDIAN_VAULT_PATH
+from core.structured_store import StructuredStore
+from core.index_manifest import IndexManifest, note_id_for_path, content_hash
+from core.config import (
+    CHROMA_DB_DIR, OBSIDIAN_VAULT_PATH, EMBEDDING_BATCH_SIZE, CHUNK_SIZE, CHUNK_OVERLAP
+)
 
-def rebuild_index():
-    """Rebuild the vector store from scratch"""
-    print("🔄 Rebuilding vector store index...")
-    print()
 
-    # Delete and recreate vector store
-    import shutil
-    if CHROMA_DB_DIR.exists():
-        print(f"🗑️  Clearing old index: {CHROMA_DB_DIR}")
-        shutil.rmtree(CHROMA_DB_DIR)
+def parse_note_metadata(note_path: Path, content: str) -> dict:
+    """Extract title, tags and path metadata from a note's frontmatter"""
+    metadata = {
+        'title': note_path.stem,
+        'file_path': str(note_path),
+        'tags': []
+    }
+
+    in_frontmatter = False
+    for line in content.split('\n'):
+        if line.strip() == '---':
+            if not in_frontmatter:
+                in_frontmatter = True
+            else:
+                break
+            continue
+
+        if in_frontmatter:
+            if line.startswith('title:'):
+                metadata['title'] = line.split(':', 1)[1].strip()
+            elif line.startswith('tags:'):
+                tag_part = line.split(':', 1)[1].strip()
+                if tag_part:
+                    metadata['tags'] = [t.strip() for t in tag_part.split(',')]
+
+    return metadata
+
+
+def rebuild_index(full: bool = False, batch_size: int = EMBEDDING_BATCH_SIZE,
+                  chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP):
+    """Bring the vector store in line with the vault notes
+
+    Args:
+        full: Delete the existing index and re-embed every note
+        batch_size: Changed notes chunked and embedded per vector store write
+        chunk_size: Chunk length in characters
+        chunk_overlap: Characters shared between windows of a long section
+    """
+    manifest = IndexManifest()
+
+    if not full and not manifest.exists and CHROMA_DB_DIR.exists():
+        # Index predates the manifest (positional note_N ids) - can't diff against it
+        print("ℹ️  No index manifest found - falling back to full rebuild")
+        full = True
+    elif not full and manifest.outdated:
+        # Index predates chunking - unchanged notes would never get chunks
+        print("ℹ️  Index manifest is from an older index layout - falling back to full rebuild")
+        full = True
+
+    if full:
+        print("🔄 Rebuilding vector store index (full)...")
+        if CHROMA_DB_DIR.exists():
+            print(f"🗑️  Clearing old index: {CHROMA_DB_DIR}")
+            shutil.rmtree(CHROMA_DB_DIR)
+        manifest.clear()
+    else:
+        print("🔄 Updating vector store index (incremental)...")
+    print()
 
     vector_store = VectorStore(CHROMA_DB_DIR)
-    vault = ObsidianVault(OBSIDIAN_VAULT_PATH)
+    if not vector_store.enabled:
+        print("❌ Vector store unavailable - nothing indexed")
+        return None
+
+    structured_store = StructuredStore(CHROMA_DB_DIR.parent / "structured.db")
+    if full:
+        structured_store.clear_note_text()
+    # Manifest written before the keyword index existed - fill it without re-embedding
+    backfill_text = bool(manifest.entries) and structured_store.count_note_text() == 0
 
     notes_dir = OBSIDIAN_VAULT_PATH / "notes"
     notes = list(notes_dir.rglob("*.md"))  # Use rglob to include subdirectories
 
-    print(f"📚 Found {len(notes)} notes to index")
+    print(f"📚 Found {len(notes)} notes in vault")
     print()
 
-    indexed = 0
-    for i, note_path in enumerate(notes, 1):
+    stats = {'added': 0, 'updated': 0, 'unchanged': 0, 'deleted': 0, 'failed': 0}
+    seen = set()
+    pending = {}  # note_id -> note awaiting a batch write
+
+    def flush():
+        """Chunk, embed and write pending notes, then record them in the manifest
+
+        Keyword index rows for the batch commit together with the manifest, so
+        the structured.db write lock is only held while writing, not embedding.
+        """
+        if not pending:
+            return
+        result = vector_store.upsert_note_chunks(
+            ({'note_id': note_id, 'content': note['content'], 'metadata': note['metadata']}
+             for note_id, note in pending.items()),
+            batch_size=batch_size,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap
+        )
+        with structured_store.transaction():
+            for note_id in result['written']:
+                note = pending[note_id]
+                structured_store.index_note_text(
+                    note_id, note['metadata']['title'], note['metadata']['file_path'],
+                    note['content'], note['metadata']['tags']
+                )
+                manifest.record(note['rel_path'], note_id, note['hash'], note['mtime'], note['size'])
+                stats['updated' if note['is_update'] else 'added'] += 1
+        manifest.save()
+        for note_id, error in result['failed'].items():
+            stats['failed'] += 1
+            print(f"❌ Error indexing {pending[note_id]['rel_path']}: {error}")
+        pending.clear()
+        print(f"✓ Indexed {stats['added'] + stats['updated']} changed notes...")
+
+    for note_path in notes:
+        rel_path = note_path.relative_to(notes_dir).as_posix()
+        seen.add(rel_path)
+
         try:
-            # Read note content
+            stat = note_path.stat()
+            if manifest.is_unchanged(rel_path, stat.st_mtime, stat.st_size):
+                if backfill_text:
+                    content = note_path.read_text(encoding='utf-8')
+                    metadata = parse_note_metadata(note_path, content)
+                    structured_store.index_note_text(
+                        manifest.get(rel_path)['note_id'], metadata['title'],
+                        metadata['file_path'], content, metadata['tags']
+                    )
+                stats['unchanged'] += 1
+                continue
+
             content = note_path.read_text(encoding='utf-8')
+            digest = content_hash(content)
+            previous = manifest.get(rel_path)
+            note_id = note_id_for_path(rel_path)
 
-            # Extract title and metadata
-            title = note_path.stem
-            metadata = {
-                'title': title,
-                'file_path': str(note_path),
-                'tags': []
-            }
+            if previous and previous.get('hash') == digest:
+                # Touched but not edited - just refresh the stat info
+                manifest.record(rel_path, note_id, digest, stat.st_mtime, stat.st_size)
+                if backfill_text:
+                    metadata = parse_note_metadata(note_path, content)
+                    structured_store.index_note_text(
+                        note_id, metadata['title'], metadata['file_path'],
+                        content, metadata['tags']
+                    )
+                stats['unchanged'] += 1
+                continue
 
-            # Parse frontmatter for tags
-            in_frontmatter = False
-            for line in content.split('\n'):
-                if line.strip() == '---':
-                    if not in_frontmatter:
-                        in_frontmatter = True
-                    else:
-                        break
-                    continue
-
-                if in_frontmatter:
-                    if line.startswith('title:'):
-                        metadata['title'] = line.split(':', 1)[1].strip()
-                    elif line.startswith('tags:'):
-                        tag_part = line.split(':', 1)[1].strip()
-                        if tag_part:
-                            metadata['tags'] = [t.strip() for t in tag_part.split(',')]
-
-            # Add to vector store
-            note_id = f"note_{i}"
-            vector_store.add_note(note_id, content, metadata)
-            indexed += 1
-
-            if indexed % 10 == 0:
-                print(f"✓ Indexed {indexed}/{len(notes)} notes...")
+            pending[note_id] = {
+                'rel_path': rel_path,
+                'content': content,
+                'metadata': parse_note_metadata(note_path, content),
+                'hash': digest,
+                'mtime': stat.st_mtime,
+                'size': stat.st_size,
+                'is_update': previous is not None
+            }
+            if len(pending) >= batch_size:
+                flush()
 
         except Exception as e:
+            stats['failed'] += 1
             print(f"❌ Error indexing {note_path.name}: {e}")
 
+    flush()
+
+    # Drop notes that no longer exist in the vault
+    with structured_store.transaction():
+        for rel_path in [p for p in manifest.entries if p not in seen]:
+            entry = manifest.remove(rel_path)
+            vector_store.delete_note(entry['note_id'])
+            structured_store.remove_note_text(entry['note_id'])
+            stats['deleted'] += 1
+
+        # Drop entries the manifest doesn't know: notes outside notes/ and
+        # ids written by older ingestion scripts (filename or stem keyed)
+        known = {entry['note_id'] for entry in manifest.entries.values()}
+        for note_id in vector_store.list_note_ids() - known:
+            vector_store.delete_note(note_id)
+            structured_store.remove_note_text(note_id)
+            stats['deleted'] += 1
+
+    manifest.save()
+
     print()
     print("=" * 80)
-    print("✅ Index rebuilt successfully!")
-    print(f"📊 Total notes indexed: {indexed}/{len(notes)}")
+    print("✅ Index up to date!")
+    print(f"📊 Added: {stats['added']}  Updated: {stats['updated']}  "
+          f"Unchanged: {stats['unchanged']}  Deleted: {stats['deleted']}  Failed: {stats['failed']}")
     print()
 
+    return stats
+
+
 if __name__ == "__main__":
-    rebuild_index()
+    parser = argparse.ArgumentParser(description="Rebuild vector store index from vault notes")
+    parser.add_argument('--full', action='store_true',
+                        help='Delete the existing index and re-embed every note')
+    parser.add_argument('--batch-size', type=int, default=EMBEDDING_BATCH_SIZE,
+                        help=f'Notes embedded per batch (default: {EMBEDDING_BATCH_SIZE})')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help=f'Chunk length in characters (default: {CHUNK_SIZE}; use with --full)')
+    parser.add_argument('--chunk-overlap', type=int, default=CHUNK_OVERLAP,
+                        help=f'Overlap between chunk windows (default: {CHUNK_OVERLAP}; use with --full)')
+    args = parser.parse_args()
+
+    rebuild_index(full=args.full, batch_size=args.batch_size,
+                  chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap)
@@ -72,17 +72,17 @@ def main():
             result = claude_processor.structure_content(raw_content=content)
 
             # Create Obsidian note
-            note_path = vault.create_note(
-                title=result.get('title', file_path.stem),
-                content=content[:500],  # Preserve first 500 chars of source, not AI-generated
-                tags=result.get('tags', [])
-            )
+            note_result = vault.create_note({
+                'title': result.get('title', file_path.stem),
+                'content': content[:500],  # Preserve first 500 chars of source, not AI-generated
+                'tags': result.get('tags', [])
+            })
 
             # Add to vector store
-            vector_store.add_note(
-                note_id=note_path.stem,
-                content=content[:1000],  # Index source content, not AI-generated
-                metadata={
+            vector_store.upsert_note_chunks([{
+                'note_id': note_result['note_id'],
+                'content': content[:1000],  # Index source content, not AI-generated
+                'metadata': {
                     'title': result.get('title', file_path.stem),
                     'tags': result.get('tags', []),
                     'source': str(file_path),
@@ -91,9 +91,9 @@ def main():
                     'customer': result.get('customer', 'unknown'),
                     'technology': result.get('technology', '')
                 }
-            )
+            }])
 
-            print(f"✅ Created note: {note_path.name}")
+            print(f"✅ Created note: {Path(note_result['file_path']).name}")
             processed += 1
 
         except Exception as e:
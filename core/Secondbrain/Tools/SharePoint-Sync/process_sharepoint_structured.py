@@ -65,6 +65,7 @@ def main():
     processed = 0
     failed = 0
     skipped = 0
+    pending_notes = []
 
     # Track which files have already been processed (check if note exists)
     already_processed = set()
@@ -113,18 +114,18 @@ def main():
                 subfolder=subfolder
             )
 
-            # Add to vector store
-            vector_store.add_note(
-                note_id=note_result['note_id'],
-                content=structured_data.get('content', ''),
-                metadata={
+            # Queue for vector store (written in batches after the loop)
+            pending_notes.append({
+                'note_id': note_result['note_id'],
+                'content': structured_data.get('content', ''),
+                'metadata': {
                     'title': structured_data['title'],
                     'tags': structured_data.get('tags', []),
                     'source': str(file_path),
                     'source_type': 'sharepoint',
                     'subfolder': subfolder
                 }
-            )
+            })
 
             print(f"✅ Created: {note_result['path']}")
             processed += 1
@@ -135,6 +136,13 @@ def main():
             traceback.print_exc()
             failed += 1
 
+    # Chunk and embed all new notes in batches - search reads the chunk index
+    if pending_notes:
+        print(f"🔍 Adding {len(pending_notes)} notes to vector store...")
+        index_result = vector_store.upsert_note_chunks(pending_notes)
+        for note_id, error in index_result['failed'].items():
+            print(f"  ⚠️  Vector store add failed for {note_id}: {error}")
+
     print("\n" + "=" * 60)
     print("📊 Processing Summary")
     print("=" * 60)
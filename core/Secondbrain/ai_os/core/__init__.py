@@ -11,6 +11,7 @@ from .base import (
     MessageBus,
     StateStore
 )
+from .message_bus import AsyncMessageBus, OverflowPolicy, Subscription
 from .config import AIConfig, load_config
 from .logging import AILogger, get_logger
 from .exceptions import (
@@ -29,6 +30,9 @@ __all__ = [
     'LayerInterface',
     'MessageBus',
     'StateStore',
+    'AsyncMessageBus',
+    'OverflowPolicy',
+    'Subscription',
     'AIConfig',
     'load_config',
     'AILogger',
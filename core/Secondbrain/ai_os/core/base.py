@@ -4,6 +4,7 @@ AI Operating System - Base Classes and Interfaces
 
 import uuid
 import json
+import sqlite3
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
@@ -254,30 +255,129 @@ class StateStore:
     """
     Persistent state storage for the AI OS
     Provides checkpoint/rollback capabilities
+
+    Backed by SQLite (WAL journal) in store_path/state.db:
+    - set()/delete() write only the changed key
+    - checkpoints store only keys changed since the previous checkpoint,
+      with a full copy every FULL_CHECKPOINT_INTERVAL levels so restoring
+      replays a bounded chain
+    - a checkpoint index table makes listing a single query
+
+    An existing state.json and checkpoint_*.json files are imported on
+    first use.
     """
 
+    FULL_CHECKPOINT_INTERVAL = 10
+    COMPACT_EVERY = 1000
+
     def __init__(self, store_path: Union[str, Path] = "./ai_os_state"):
         self.store_path = Path(store_path)
         self.store_path.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.store_path / "state.db"
         self._state: Dict[str, Any] = {}
-        self._checkpoints: Dict[str, Dict] = {}
+        self._unsaved: set = set()
         self._lock = Lock()
+        self._writes_since_compact = 0
+
+        new_store = not self.db_path.exists()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+        if new_store:
+            self._import_legacy_files()
 
         # Load existing state
         self._load_state()
 
-    def _load_state(self):
-        """Load state from disk"""
+    def _create_tables(self):
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS dirty_keys (
+                    key TEXT PRIMARY KEY
+                );
+                CREATE TABLE IF NOT EXISTS meta (
+                    name TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                CREATE TABLE IF NOT EXISTS checkpoints (
+                    id TEXT PRIMARY KEY,
+                    timestamp TEXT NOT NULL,
+                    base_id TEXT,
+                    depth INTEGER NOT NULL,
+                    full INTEGER NOT NULL,
+                    changed_keys INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_checkpoints_timestamp
+                    ON checkpoints(timestamp);
+                CREATE TABLE IF NOT EXISTS checkpoint_entries (
+                    checkpoint_id TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT,
+                    deleted INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (checkpoint_id, key)
+                );
+            """)
+
+    def _import_legacy_files(self):
+        """One-time import of the JSON files written by earlier versions"""
         state_file = self.store_path / "state.json"
         if state_file.exists():
             with open(state_file, 'r') as f:
-                self._state = json.load(f)
+                legacy_state = json.load(f)
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)",
+                    [(k, json.dumps(v, default=str)) for k, v in legacy_state.items()]
+                )
+
+        for checkpoint_file in sorted(self.store_path.glob("checkpoint_*.json")):
+            checkpoint_id = checkpoint_file.stem.replace("checkpoint_", "")
+            with open(checkpoint_file, 'r') as f:
+                data = json.load(f)
+            self._write_checkpoint(
+                checkpoint_id, data.get("timestamp") or datetime.now().isoformat(),
+                base_id=None, depth=0,
+                entries={k: (json.dumps(v, default=str), False) for k, v in data.get("state", {}).items()}
+            )
+
+        # state.json may be newer than any checkpoint: start a fresh chain
+        with self._conn:
+            self._conn.execute("DELETE FROM meta WHERE name = 'head'")
 
-    def _save_state(self):
-        """Persist state to disk"""
-        state_file = self.store_path / "state.json"
-        with open(state_file, 'w') as f:
-            json.dump(self._state, f, indent=2, default=str)
+    def _load_state(self):
+        """Load state from disk"""
+        rows = self._conn.execute("SELECT key, value FROM state").fetchall()
+        self._state = {key: json.loads(value) for key, value in rows}
+
+    def _save_keys(self, keys):
+        """Persist the given keys (upsert or delete) and mark them dirty"""
+        upserts = [(k, json.dumps(self._state[k], default=str)) for k in keys if k in self._state]
+        deletes = [(k,) for k in keys if k not in self._state]
+        with self._conn:
+            if upserts:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", upserts
+                )
+            if deletes:
+                self._conn.executemany("DELETE FROM state WHERE key = ?", deletes)
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO dirty_keys (key) VALUES (?)", [(k,) for k in keys]
+            )
+
+        self._writes_since_compact += 1
+        if self._writes_since_compact >= self.COMPACT_EVERY:
+            self._compact()
+
+    def _flush_unsaved(self):
+        if self._unsaved:
+            self._save_keys(list(self._unsaved))
+            self._unsaved.clear()
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get value from state"""
@@ -287,59 +387,177 @@ class StateStore:
         """Set value in state"""
         with self._lock:
             self._state[key] = value
+            self._unsaved.add(key)
             if persist:
-                self._save_state()
+                self._flush_unsaved()
 
     def delete(self, key: str):
         """Delete key from state"""
         with self._lock:
             if key in self._state:
                 del self._state[key]
-                self._save_state()
+                self._unsaved.add(key)
+                self._flush_unsaved()
 
     def checkpoint(self, checkpoint_id: str = None) -> str:
-        """Create a checkpoint of current state"""
+        """
+        Create a checkpoint of current state
+
+        Stores only keys changed since the previous checkpoint, or the full
+        state when starting a new chain. Reusing an existing id overwrites
+        that checkpoint with a full copy.
+        """
         checkpoint_id = checkpoint_id or str(uuid.uuid4())[:8]
         with self._lock:
-            self._checkpoints[checkpoint_id] = {
-                "timestamp": datetime.now().isoformat(),
-                "state": self._state.copy()
-            }
+            self._flush_unsaved()
+
+            reused = self._checkpoint_row(checkpoint_id) is not None
+            if reused:
+                self._detach_dependents(checkpoint_id)
+
+            head = self._get_meta("head")
+            base = self._checkpoint_row(head) if head else None
+            depth = base["depth"] + 1 if base else 0
+
+            if reused or base is None or depth >= self.FULL_CHECKPOINT_INTERVAL:
+                base_id, depth = None, 0
+                keys = list(self._state)
+            else:
+                base_id = head
+                keys = [row[0] for row in self._conn.execute("SELECT key FROM dirty_keys")]
 
-            # Persist checkpoint
-            checkpoint_file = self.store_path / f"checkpoint_{checkpoint_id}.json"
-            with open(checkpoint_file, 'w') as f:
-                json.dump(self._checkpoints[checkpoint_id], f, indent=2, default=str)
+            entries = {
+                k: (json.dumps(self._state[k], default=str), False) if k in self._state else (None, True)
+                for k in keys
+            }
+            self._write_checkpoint(checkpoint_id, datetime.now().isoformat(), base_id, depth, entries)
 
         return checkpoint_id
 
+    def _write_checkpoint(
+        self,
+        checkpoint_id: str,
+        timestamp: str,
+        base_id: Optional[str],
+        depth: int,
+        entries: Dict[str, tuple],
+        set_head: bool = True
+    ):
+        with self._conn:
+            self._conn.execute("DELETE FROM checkpoint_entries WHERE checkpoint_id = ?", (checkpoint_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (id, timestamp, base_id, depth, full, changed_keys) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (checkpoint_id, timestamp, base_id, depth, int(base_id is None), len(entries))
+            )
+            self._conn.executemany(
+                "INSERT INTO checkpoint_entries (checkpoint_id, key, value, deleted) VALUES (?, ?, ?, ?)",
+                [(checkpoint_id, k, value, int(deleted)) for k, (value, deleted) in entries.items()]
+            )
+            if set_head:
+                self._conn.execute("DELETE FROM dirty_keys")
+                self._set_meta("head", checkpoint_id)
+
+    def _detach_dependents(self, checkpoint_id: str):
+        """Rewrite checkpoints based on checkpoint_id as full copies before it is overwritten"""
+        dependents = self._conn.execute(
+            "SELECT id, timestamp FROM checkpoints WHERE base_id = ? AND id != ?",
+            (checkpoint_id, checkpoint_id)
+        ).fetchall()
+        for dependent_id, timestamp in dependents:
+            state = self._reconstruct(dependent_id) or {}
+            self._write_checkpoint(
+                dependent_id, timestamp, base_id=None, depth=0,
+                entries={k: (json.dumps(v, default=str), False) for k, v in state.items()},
+                set_head=False
+            )
+
+    def _checkpoint_row(self, checkpoint_id: str) -> Optional[Dict]:
+        row = self._conn.execute(
+            "SELECT id, timestamp, base_id, depth, full, changed_keys FROM checkpoints WHERE id = ?",
+            (checkpoint_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("id", "timestamp", "base_id", "depth", "full", "changed_keys"), row))
+
+    def _reconstruct(self, checkpoint_id: str) -> Optional[Dict[str, Any]]:
+        """Replay a checkpoint chain from its full root"""
+        current = self._checkpoint_row(checkpoint_id)
+        if current is None:
+            return None
+
+        chain = [current["id"]]
+        while current["base_id"] is not None:
+            if current["base_id"] in chain:
+                # Corrupt chain (e.g. written by a version that reused ids as deltas)
+                return None
+            current = self._checkpoint_row(current["base_id"])
+            if current is None:
+                return None
+            chain.append(current["id"])
+
+        state: Dict[str, Any] = {}
+        for cp_id in reversed(chain):
+            for key, value, deleted in self._conn.execute(
+                "SELECT key, value, deleted FROM checkpoint_entries WHERE checkpoint_id = ?", (cp_id,)
+            ):
+                if deleted:
+                    state.pop(key, None)
+                else:
+                    state[key] = json.loads(value)
+        return state
+
     def rollback(self, checkpoint_id: str) -> bool:
         """Rollback to a checkpoint"""
-        if checkpoint_id not in self._checkpoints:
-            # Try loading from disk
-            checkpoint_file = self.store_path / f"checkpoint_{checkpoint_id}.json"
-            if checkpoint_file.exists():
-                with open(checkpoint_file, 'r') as f:
-                    self._checkpoints[checkpoint_id] = json.load(f)
-            else:
+        with self._lock:
+            restored = self._reconstruct(checkpoint_id)
+            if restored is None:
                 return False
 
-        with self._lock:
-            self._state = self._checkpoints[checkpoint_id]["state"].copy()
-            self._save_state()
+            changed = [k for k in set(self._state) | set(restored)
+                       if k not in restored or k not in self._state or self._state[k] != restored[k]]
+            self._state = restored
+            self._unsaved.clear()
+            self._save_keys(changed)
+
+            # Later checkpoints diff against the restored one
+            with self._conn:
+                self._conn.execute("DELETE FROM dirty_keys")
+                self._set_meta("head", checkpoint_id)
 
         return True
 
     def list_checkpoints(self) -> List[Dict]:
         """List all available checkpoints"""
-        checkpoints = []
-        for f in self.store_path.glob("checkpoint_*.json"):
-            checkpoint_id = f.stem.replace("checkpoint_", "")
-            with open(f, 'r') as file:
-                data = json.load(file)
-                checkpoints.append({
-                    "id": checkpoint_id,
-                    "timestamp": data.get("timestamp"),
-                    "file": str(f)
-                })
-        return sorted(checkpoints, key=lambda x: x["timestamp"], reverse=True)
+        rows = self._conn.execute(
+            "SELECT id, timestamp, full, changed_keys FROM checkpoints ORDER BY timestamp DESC"
+        ).fetchall()
+        return [
+            {
+                "id": checkpoint_id,
+                "timestamp": timestamp,
+                "full": bool(full),
+                "changed_keys": changed_keys,
+                "file": str(self.db_path)
+            }
+            for checkpoint_id, timestamp, full, changed_keys in rows
+        ]
+
+    def _get_meta(self, name: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, name: str, value: str):
+        self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+    def _compact(self):
+        """Fold the SQLite WAL back into the database file"""
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._writes_since_compact = 0
+
+    def close(self):
+        """Compact and close the database"""
+        with self._lock:
+            self._compact()
+            self._conn.close()
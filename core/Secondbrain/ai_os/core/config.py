@@ -52,6 +52,13 @@ class AIConfig:
         "intent_parser": {
             "enabled": True
         },
+        "ml_classifier": {
+            "model": "all-MiniLM-L6-v2",
+            "backend": "torch",  # or "onnx" with sentence-transformers >= 3.2
+            "cache_size": 2048,
+            "batch_size": 32,
+            "warm_up": True
+        },
         "context_manager": {
             "max_context_length": 32000,
             "history_depth": 10
@@ -0,0 +1,356 @@
+"""
+AI Operating System - Async Message Bus
+Topic-routed publish/subscribe with per-subscriber bounded queues
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .logging import get_logger
+
+
+class OverflowPolicy(Enum):
+    """What a full subscriber queue does with a new message"""
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    BLOCK = "block"
+    SPILL = "spill"  # Overflow to a JSONL file, replayed when the queue drains
+
+
+@dataclass
+class SubscriptionStats:
+    """Queue depth and latency counters for one subscription"""
+    delivered: int = 0
+    dropped: int = 0
+    spilled: int = 0
+    errors: int = 0
+    max_depth: int = 0
+    total_queue_ms: float = 0.0
+    max_queue_ms: float = 0.0
+    total_handler_ms: float = 0.0
+    max_handler_ms: float = 0.0
+
+    def record(self, queue_ms: float, handler_ms: float):
+        self.delivered += 1
+        self.total_queue_ms += queue_ms
+        self.max_queue_ms = max(self.max_queue_ms, queue_ms)
+        self.total_handler_ms += handler_ms
+        self.max_handler_ms = max(self.max_handler_ms, handler_ms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        n = self.delivered or 1
+        return {
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "errors": self.errors,
+            "max_depth": self.max_depth,
+            "avg_queue_ms": round(self.total_queue_ms / n, 3),
+            "max_queue_ms": round(self.max_queue_ms, 3),
+            "avg_handler_ms": round(self.total_handler_ms / n, 3),
+            "max_handler_ms": round(self.max_handler_ms, 3)
+        }
+
+
+@dataclass(eq=False)
+class Subscription:
+    """
+    A subscriber's pattern, callback and private queue
+
+    Each subscription is drained by its own worker task, so a slow
+    callback only backs up its own queue.
+    """
+    id: str
+    pattern: str
+    callback: Callable
+    maxsize: int = 1000
+    policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+    block_timeout: Optional[float] = None
+    spill_path: Optional[Path] = None
+    stats: SubscriptionStats = field(default_factory=SubscriptionStats)
+
+    queue: Optional[asyncio.Queue] = None
+    worker: Optional[asyncio.Task] = None
+    pending_spill: int = 0
+    spill_offset: int = 0
+
+    @property
+    def depth(self) -> int:
+        return (self.queue.qsize() if self.queue else 0) + self.pending_spill
+
+
+class TopicTrie:
+    """
+    Subscription patterns indexed by dot-separated segment
+
+    `*` matches exactly one segment, `#` matches zero or more trailing
+    segments (e.g. "layer2.#", "*.request.failed"). Matching walks only
+    the branches that can match, instead of testing every pattern.
+    """
+
+    def __init__(self):
+        self._children: Dict[str, 'TopicTrie'] = {}
+        self._subscriptions: Set[Subscription] = set()
+
+    def insert(self, pattern: str, subscription: Subscription):
+        node = self
+        for segment in pattern.split('.'):
+            node = node._children.setdefault(segment, TopicTrie())
+        node._subscriptions.add(subscription)
+
+    def remove(self, pattern: str, subscription: Subscription):
+        path = [self]
+        for segment in pattern.split('.'):
+            node = path[-1]._children.get(segment)
+            if node is None:
+                return
+            path.append(node)
+        path[-1]._subscriptions.discard(subscription)
+
+        # Prune empty branches
+        segments = pattern.split('.')
+        for depth in range(len(segments), 0, -1):
+            node = path[depth]
+            if node._subscriptions or node._children:
+                break
+            del path[depth - 1]._children[segments[depth - 1]]
+
+    def match(self, topic: str) -> Set[Subscription]:
+        matches: Set[Subscription] = set()
+        self._match(topic.split('.'), 0, matches)
+        return matches
+
+    def _match(self, segments: List[str], index: int, matches: Set[Subscription]):
+        multi = self._children.get('#')
+        if multi is not None:
+            matches.update(multi._subscriptions)
+
+        if index == len(segments):
+            matches.update(self._subscriptions)
+            return
+
+        for key in (segments[index], '*'):
+            child = self._children.get(key)
+            if child is not None:
+                child._match(segments, index + 1, matches)
+
+
+class AsyncMessageBus:
+    """
+    Asyncio-native inter-layer message bus
+
+    publish() routes a message through the topic trie and offers it to
+    each matching subscription's bounded queue; it never runs callbacks
+    itself. Full queues apply the subscription's OverflowPolicy, so only
+    BLOCK subscriptions can slow a publisher down.
+
+    Sync callbacks run in the default executor so they cannot stall the
+    event loop; async callbacks are awaited by the subscription's worker.
+    """
+
+    def __init__(self, spill_dir: Optional[Path] = None):
+        self.logger = get_logger("ai_os.message_bus")
+        self._trie = TopicTrie()
+        self._subscriptions: Dict[str, Subscription] = {}
+        self._spill_dir = Path(spill_dir) if spill_dir else Path("./ai_os_state/bus_spill")
+        self._published = 0
+        self._unrouted = 0
+        self._closed = False
+
+    def subscribe(
+        self,
+        pattern: str,
+        callback: Callable,
+        maxsize: int = 1000,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        block_timeout: Optional[float] = None
+    ) -> Subscription:
+        """
+        Subscribe a callback to a topic pattern
+
+        Args:
+            pattern: Topic pattern, with `*` / `#` wildcards
+            callback: Sync or async function taking the message envelope
+            maxsize: Queue bound for this subscriber
+            policy: What to do when the queue is full
+            block_timeout: For BLOCK, seconds to wait before dropping (None = forever)
+        """
+        subscription = Subscription(
+            id=str(uuid.uuid4())[:8],
+            pattern=pattern,
+            callback=callback,
+            maxsize=maxsize,
+            policy=policy,
+            block_timeout=block_timeout
+        )
+        if policy == OverflowPolicy.SPILL:
+            self._spill_dir.mkdir(parents=True, exist_ok=True)
+            subscription.spill_path = self._spill_dir / f"{subscription.id}.jsonl"
+
+        self._subscriptions[subscription.id] = subscription
+        self._trie.insert(pattern, subscription)
+        return subscription
+
+    async def unsubscribe(self, subscription: Subscription):
+        """Remove a subscription and stop its worker"""
+        self._trie.remove(subscription.pattern, subscription)
+        self._subscriptions.pop(subscription.id, None)
+        await self._stop_worker(subscription)
+
+    async def publish(self, topic: str, payload: Dict, source: str = None) -> str:
+        """Publish a message; returns its ID"""
+        if self._closed:
+            raise RuntimeError("Message bus is closed")
+
+        envelope = {
+            "id": str(uuid.uuid4()),
+            "topic": topic,
+            "from": source,
+            "timestamp": datetime.now().isoformat(),
+            "payload": payload
+        }
+        self._published += 1
+
+        subscriptions = self._trie.match(topic)
+        if not subscriptions:
+            self._unrouted += 1
+        for subscription in subscriptions:
+            await self._offer(subscription, envelope)
+        return envelope["id"]
+
+    async def _offer(self, subscription: Subscription, envelope: Dict):
+        self._ensure_worker(subscription)
+        queue = subscription.queue
+        item = (time.monotonic(), envelope)
+
+        if subscription.pending_spill:
+            # Keep ordering: once spilling, new messages go behind the spill
+            self._spill(subscription, item)
+        elif not queue.full():
+            queue.put_nowait(item)
+        elif subscription.policy == OverflowPolicy.DROP_OLDEST:
+            queue.get_nowait()
+            queue.task_done()
+            queue.put_nowait(item)
+            subscription.stats.dropped += 1
+        elif subscription.policy == OverflowPolicy.DROP_NEWEST:
+            subscription.stats.dropped += 1
+        elif subscription.policy == OverflowPolicy.SPILL:
+            self._spill(subscription, item)
+        else:
+            try:
+                await asyncio.wait_for(queue.put(item), timeout=subscription.block_timeout)
+            except asyncio.TimeoutError:
+                subscription.stats.dropped += 1
+
+        subscription.stats.max_depth = max(subscription.stats.max_depth, subscription.depth)
+
+    def _spill(self, subscription: Subscription, item: tuple):
+        enqueued_at, envelope = item
+        with open(subscription.spill_path, 'a') as f:
+            f.write(json.dumps({"enqueued_at": enqueued_at, "envelope": envelope}, default=str) + "\n")
+        subscription.pending_spill += 1
+        subscription.stats.spilled += 1
+
+    def _refill_from_spill(self, subscription: Subscription):
+        """Move spilled messages back into the (empty) queue, oldest first"""
+        queue = subscription.queue
+        with open(subscription.spill_path, 'r') as f:
+            f.seek(subscription.spill_offset)
+            while subscription.pending_spill and not queue.full():
+                record = json.loads(f.readline())
+                queue.put_nowait((record["enqueued_at"], record["envelope"]))
+                subscription.pending_spill -= 1
+            subscription.spill_offset = f.tell()
+
+        if not subscription.pending_spill:
+            subscription.spill_path.unlink()
+            subscription.spill_offset = 0
+
+    def _ensure_worker(self, subscription: Subscription):
+        if subscription.worker is None or subscription.worker.done():
+            if subscription.queue is None:
+                subscription.queue = asyncio.Queue(maxsize=subscription.maxsize)
+            subscription.worker = asyncio.ensure_future(self._run_worker(subscription))
+
+    async def _run_worker(self, subscription: Subscription):
+        loop = asyncio.get_running_loop()
+        queue = subscription.queue
+        while True:
+            if queue.empty() and subscription.pending_spill:
+                self._refill_from_spill(subscription)
+
+            enqueued_at, envelope = await queue.get()
+            started = time.monotonic()
+            try:
+                if asyncio.iscoroutinefunction(subscription.callback):
+                    await subscription.callback(envelope)
+                else:
+                    await loop.run_in_executor(None, subscription.callback, envelope)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                subscription.stats.errors += 1
+                self.logger.warning(f"Subscriber {subscription.pattern} failed on {envelope['topic']}: {e}")
+            finally:
+                finished = time.monotonic()
+                subscription.stats.record(
+                    (started - enqueued_at) * 1000, (finished - started) * 1000
+                )
+                queue.task_done()
+
+    async def drain(self, timeout: Optional[float] = None):
+        """Wait until every subscriber has processed its queued and spilled messages"""
+        async def _drain_all():
+            while True:
+                pending = [s for s in self._subscriptions.values() if s.depth]
+                if not pending:
+                    return
+                await asyncio.gather(*(s.queue.join() for s in pending if s.queue))
+                await asyncio.sleep(0)
+
+        await asyncio.wait_for(_drain_all(), timeout=timeout)
+
+    async def _stop_worker(self, subscription: Subscription):
+        if subscription.worker and not subscription.worker.done():
+            subscription.worker.cancel()
+            try:
+                await subscription.worker
+            except asyncio.CancelledError:
+                pass
+        subscription.worker = None
+
+    async def close(self, drain: bool = True, timeout: Optional[float] = 5.0):
+        """Stop accepting messages, optionally drain, and stop workers"""
+        self._closed = True
+        if drain:
+            try:
+                await self.drain(timeout=timeout)
+            except asyncio.TimeoutError:
+                self.logger.warning("Message bus closed with undelivered messages")
+        for subscription in list(self._subscriptions.values()):
+            await self._stop_worker(subscription)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth and latency metrics per subscription"""
+        return {
+            "published": self._published,
+            "unrouted": self._unrouted,
+            "subscriptions": {
+                subscription.id: {
+                    "pattern": subscription.pattern,
+                    "policy": subscription.policy.value,
+                    "depth": subscription.depth,
+                    "maxsize": subscription.maxsize,
+                    **subscription.stats.to_dict()
+                }
+                for subscription in self._subscriptions.values()
+            }
+        }
@@ -103,8 +103,16 @@ class TaskClassifier:
 
         try:
             from .ml_classifier import MLIntentClassifier
-            self._ml_classifier = MLIntentClassifier()
-            self._ml_initialized = await self._ml_classifier.initialize()
+            ml_config = self.config.intelligence.get("ml_classifier", {})
+            self._ml_classifier = MLIntentClassifier(
+                model_name=ml_config.get("model", "all-MiniLM-L6-v2"),
+                cache_size=ml_config.get("cache_size", 2048),
+                backend=ml_config.get("backend", "torch"),
+                batch_size=ml_config.get("batch_size", 32)
+            )
+            self._ml_initialized = await self._ml_classifier.initialize(
+                warm_up=ml_config.get("warm_up", True)
+            )
 
             if self._ml_initialized:
                 self.logger.info("ML classifier initialized - using semantic classification")
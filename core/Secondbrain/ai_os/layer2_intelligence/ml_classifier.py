@@ -3,7 +3,9 @@ Layer 2: ML-based Intent Classifier
 Uses sentence embeddings for semantic intent classification
 """
 
+import asyncio
 import json
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
@@ -182,46 +184,58 @@ class MLIntentClassifier:
         ]
     }
 
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2", cache_dir: Path = None):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        cache_dir: Path = None,
+        cache_size: int = 2048,
+        backend: str = "torch",
+        batch_size: int = 32
+    ):
         self.logger = get_logger("ai_os.ml_classifier")
         self.model_name = model_name
         self.cache_dir = cache_dir or Path("./ai_os_cache/ml_models")
+        self.backend = backend  # "torch", or "onnx" / "openvino" on sentence-transformers >= 3.2
+        self.batch_size = batch_size
 
         self._model: Optional[SentenceTransformer] = None
         self._category_embeddings: Dict[str, np.ndarray] = {}
         self._action_embeddings: Dict[str, np.ndarray] = {}
         self._initialized = False
 
+        # Stacked, L2-normalized centroids: one matmul scores every category
+        self._category_names: List[str] = []
+        self._category_matrix: Optional[np.ndarray] = None
+        self._action_names: List[str] = []
+        self._action_matrix: Optional[np.ndarray] = None
+        self._example_labels: List[Tuple[str, str]] = []
+        self._example_matrix: Optional[np.ndarray] = None
+
+        # LRU of normalized text -> unit embedding
+        self._embedding_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_hits = 0
+        self._cache_misses = 0
+
     @property
     def is_available(self) -> bool:
         """Check if ML classification is available"""
         return ML_AVAILABLE
 
-    async def initialize(self) -> bool:
-        """Initialize the ML classifier"""
+    async def initialize(self, warm_up: bool = True) -> bool:
+        """
+        Initialize the ML classifier
+
+        Model loading runs in a worker thread. With warm_up, a first
+        inference is run here so the first real request doesn't pay for it.
+        """
         if not ML_AVAILABLE:
             self.logger.warning("sentence-transformers not installed - ML classification disabled")
             return False
 
         try:
-            self.logger.info(f"Loading ML model: {self.model_name}")
-
-            # Load model (will download if not cached)
-            self.cache_dir.mkdir(parents=True, exist_ok=True)
-            self._model = SentenceTransformer(self.model_name, cache_folder=str(self.cache_dir))
-
-            # Pre-compute category embeddings
-            self.logger.info("Computing category embeddings...")
-            for category, examples in self.INTENT_EXAMPLES.items():
-                embeddings = self._model.encode(examples)
-                # Use mean of example embeddings as category representation
-                self._category_embeddings[category] = np.mean(embeddings, axis=0)
-
-            # Pre-compute action embeddings
-            for action, examples in self.ACTION_EXAMPLES.items():
-                embeddings = self._model.encode(examples)
-                self._action_embeddings[action] = np.mean(embeddings, axis=0)
-
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self._load, warm_up)
             self._initialized = True
             self.logger.info("ML classifier initialized successfully")
             return True
@@ -230,6 +244,93 @@ class MLIntentClassifier:
             self.logger.error(f"Failed to initialize ML classifier: {e}")
             return False
 
+    def _load(self, warm_up: bool):
+        self.logger.info(f"Loading ML model: {self.model_name} ({self.backend})")
+
+        # Load model (will download if not cached)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        kwargs = {"cache_folder": str(self.cache_dir)}
+        if self.backend != "torch":
+            kwargs["backend"] = self.backend
+        self._model = SentenceTransformer(self.model_name, **kwargs)
+
+        # Pre-compute category and action embeddings (mean of examples)
+        self.logger.info("Computing category embeddings...")
+        for category, examples in self.INTENT_EXAMPLES.items():
+            self._category_embeddings[category] = np.mean(self._encode(examples), axis=0)
+        for action, examples in self.ACTION_EXAMPLES.items():
+            self._action_embeddings[action] = np.mean(self._encode(examples), axis=0)
+        self._rebuild_matrices()
+
+        if warm_up:
+            self._model.encode(["warm up"], batch_size=1, show_progress_bar=False)
+
+    @staticmethod
+    def _normalize_text(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    @staticmethod
+    def _stack_normalized(vectors: List[np.ndarray]) -> np.ndarray:
+        matrix = np.vstack(vectors).astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _rebuild_matrices(self):
+        """Restack centroids and examples after embeddings change"""
+        self._category_names = list(self._category_embeddings)
+        self._category_matrix = self._stack_normalized(
+            [self._category_embeddings[c] for c in self._category_names]
+        )
+        self._action_names = list(self._action_embeddings)
+        self._action_matrix = self._stack_normalized(
+            [self._action_embeddings[a] for a in self._action_names]
+        )
+        self._example_labels = [
+            (category, example)
+            for category, examples in self.INTENT_EXAMPLES.items()
+            for example in examples
+        ]
+        self._example_matrix = self._encode([example for _, example in self._example_labels])
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts to unit vectors, one row per input
+
+        Cached texts are served from the LRU; the rest are encoded in a
+        single batched model call.
+        """
+        keys = [self._normalize_text(t) for t in texts]
+        missing = [k for k in dict.fromkeys(keys) if k not in self._embedding_cache]
+        self._cache_hits += len(keys) - len(missing)
+        self._cache_misses += len(missing)
+
+        fresh: Dict[str, np.ndarray] = {}
+        if missing:
+            encoded = self._model.encode(
+                missing,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+            fresh = dict(zip(missing, np.asarray(encoded, dtype=np.float32)))
+
+        rows = []
+        for key in keys:
+            vector = fresh.get(key)
+            if vector is None:
+                vector = self._embedding_cache[key]
+                self._embedding_cache.move_to_end(key)
+            rows.append(vector)
+
+        for key, vector in fresh.items():
+            self._embedding_cache[key] = vector
+        while len(self._embedding_cache) > self._cache_size:
+            self._embedding_cache.popitem(last=False)
+
+        return np.vstack(rows)
+
     def classify(self, content: str) -> Dict[str, Any]:
         """
         Classify content using semantic embeddings
@@ -240,66 +341,76 @@ class MLIntentClassifier:
         Returns:
             Classification with category, action, and confidence scores
         """
+        return self.classify_batch([content])[0]
+
+    def classify_batch(self, contents: List[str]) -> List[Dict[str, Any]]:
+        """
+        Classify many texts with one encode call and one matmul per head
+
+        Returns one classification per input, in order.
+        """
+        if not contents:
+            return []
         if not self._initialized or not self._model:
-            return self._fallback_classify(content)
+            return [self._fallback_classify(content) for content in contents]
 
         try:
-            # Encode the query
-            query_embedding = self._model.encode(content)
-
-            # Calculate similarity to each category
-            category_scores = {}
-            for category, cat_embedding in self._category_embeddings.items():
-                similarity = self._cosine_similarity(query_embedding, cat_embedding)
-                category_scores[category] = float(similarity)
-
-            # Get top category
-            sorted_categories = sorted(category_scores.items(), key=lambda x: x[1], reverse=True)
-            primary_category = sorted_categories[0][0]
-            primary_confidence = sorted_categories[0][1]
-
-            # Calculate action similarity
-            action_scores = {}
-            for action, act_embedding in self._action_embeddings.items():
-                similarity = self._cosine_similarity(query_embedding, act_embedding)
-                action_scores[action] = float(similarity)
-
-            # Get top action
-            sorted_actions = sorted(action_scores.items(), key=lambda x: x[1], reverse=True)
-            primary_action = sorted_actions[0][0]
-
-            # Normalize confidence (similarity range is typically 0-1 for normalized embeddings)
-            # but can be negative, so we map to 0.5-1.0 range
-            confidence = (primary_confidence + 1) / 2  # Map from [-1,1] to [0,1]
-            confidence = max(0.5, min(1.0, confidence))  # Clamp to reasonable range
-
-            return {
-                "primary_category": primary_category,
-                "sub_category": primary_action,
-                "confidence": confidence,
-                "category_scores": category_scores,
-                "action_scores": action_scores,
-                "ml_classified": True,
-                "top_categories": [
-                    {"category": cat, "score": score}
-                    for cat, score in sorted_categories[:3]
-                ]
-            }
+            queries = self._encode(contents)
+
+            # Cosine similarity == dot product of unit vectors
+            category_sims = queries @ self._category_matrix.T
+            action_sims = queries @ self._action_matrix.T
+
+            return [
+                self._build_result(category_row, action_row)
+                for category_row, action_row in zip(category_sims, action_sims)
+            ]
 
         except Exception as e:
             self.logger.error(f"ML classification error: {e}")
-            return self._fallback_classify(content)
+            return [self._fallback_classify(content) for content in contents]
+
+    def _build_result(self, category_row: np.ndarray, action_row: np.ndarray) -> Dict[str, Any]:
+        category_scores = {
+            category: float(score) for category, score in zip(self._category_names, category_row)
+        }
+        action_scores = {
+            action: float(score) for action, score in zip(self._action_names, action_row)
+        }
 
-    def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
-        """Calculate cosine similarity between two vectors"""
-        dot_product = np.dot(a, b)
-        norm_a = np.linalg.norm(a)
-        norm_b = np.linalg.norm(b)
+        # Get top category and action
+        sorted_categories = sorted(category_scores.items(), key=lambda x: x[1], reverse=True)
+        primary_category, primary_confidence = sorted_categories[0]
+        primary_action = self._action_names[int(np.argmax(action_row))]
 
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
+        # Normalize confidence (similarity range is typically 0-1 for normalized embeddings)
+        # but can be negative, so we map to 0.5-1.0 range
+        confidence = (primary_confidence + 1) / 2  # Map from [-1,1] to [0,1]
+        confidence = max(0.5, min(1.0, confidence))  # Clamp to reasonable range
 
-        return dot_product / (norm_a * norm_b)
+        return {
+            "primary_category": primary_category,
+            "sub_category": primary_action,
+            "confidence": confidence,
+            "category_scores": category_scores,
+            "action_scores": action_scores,
+            "ml_classified": True,
+            "top_categories": [
+                {"category": cat, "score": score}
+                for cat, score in sorted_categories[:3]
+            ]
+        }
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Embedding cache hit/miss counters"""
+        total = self._cache_hits + self._cache_misses
+        return {
+            "size": len(self._embedding_cache),
+            "max_size": self._cache_size,
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "hit_rate": round(self._cache_hits / total, 4) if total else 0.0
+        }
 
     def _fallback_classify(self, content: str) -> Dict[str, Any]:
         """Fallback to simple keyword matching when ML unavailable"""
@@ -347,8 +458,9 @@ class MLIntentClassifier:
 
         # Recompute embedding if model is loaded
         if self._model and category in self._category_embeddings:
-            embeddings = self._model.encode(self.INTENT_EXAMPLES[category])
+            embeddings = self._encode(self.INTENT_EXAMPLES[category])
             self._category_embeddings[category] = np.mean(embeddings, axis=0)
+            self._rebuild_matrices()
 
     def get_similar_queries(self, content: str, top_k: int = 5) -> List[Tuple[str, str, float]]:
         """
@@ -359,18 +471,13 @@ class MLIntentClassifier:
         if not self._initialized or not self._model:
             return []
 
-        query_embedding = self._model.encode(content)
+        scores = self._example_matrix @ self._encode([content])[0]
+        top = np.argsort(-scores)[:top_k]
 
-        similarities = []
-        for category, examples in self.INTENT_EXAMPLES.items():
-            for example in examples:
-                example_embedding = self._model.encode(example)
-                sim = self._cosine_similarity(query_embedding, example_embedding)
-                similarities.append((category, example, float(sim)))
-
-        # Sort by similarity
-        similarities.sort(key=lambda x: x[2], reverse=True)
-        return similarities[:top_k]
+        return [
+            (self._example_labels[i][0], self._example_labels[i][1], float(scores[i]))
+            for i in top
+        ]
 
 
 # Singleton instance for reuse
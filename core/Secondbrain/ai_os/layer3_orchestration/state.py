@@ -4,6 +4,8 @@ DAG-based workflow state management with checkpointing and parallel execution
 """
 
 import asyncio
+import heapq
+import itertools
 import json
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -41,9 +43,14 @@ class DAGNode:
     status: NodeStatus = NodeStatus.PENDING
     result: Any = None
     error: Optional[str] = None
+    queued_at: Optional[datetime] = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
+    # Scheduling: higher priority runs first; estimated_ms weights critical path
+    priority: int = 0
+    estimated_ms: float = 1.0
+
     # Execution configuration
     executor: Optional[Callable] = None
     agent: Optional[str] = None
@@ -66,6 +73,13 @@ class DAGNode:
             return (self.completed_at - self.started_at).total_seconds() * 1000
         return None
 
+    @property
+    def wait_ms(self) -> Optional[float]:
+        """Time spent ready but waiting for a free slot"""
+        if self.queued_at and self.started_at:
+            return (self.started_at - self.queued_at).total_seconds() * 1000
+        return None
+
     @property
     def can_retry(self) -> bool:
         """Check if node can be retried"""
@@ -78,13 +92,16 @@ class StateMachine:
 
     Manages:
     - Node dependencies and execution order
-    - Parallel execution of independent nodes
+    - Parallel execution of independent nodes (completion-driven ready queue)
+    - Priority and critical-path ordering of ready nodes
     - Checkpointing and recovery
     - State transitions and validation
     - Retry logic with exponential backoff
     - Conditional branching
     """
 
+    _TERMINAL = (NodeStatus.COMPLETED, NodeStatus.FAILED, NodeStatus.SKIPPED)
+
     def __init__(self, workflow_id: str, checkpoint_path: Optional[Path] = None):
         self.workflow_id = workflow_id
         self.logger = get_logger("ai_os.state_machine")
@@ -103,7 +120,6 @@ class StateMachine:
 
         # Execution control
         self._max_parallel = 5
-        self._semaphore: Optional[asyncio.Semaphore] = None
 
         # Results collection
         self._results: Dict[str, Any] = {}
@@ -119,9 +135,16 @@ class StateMachine:
         max_retries: int = 3,
         timeout: int = 300,
         branch_condition: BranchCondition = BranchCondition.ALWAYS,
-        condition_func: Callable = None
+        condition_func: Callable = None,
+        priority: int = 0,
+        estimated_ms: float = 1.0
     ):
-        """Add a node to the DAG"""
+        """
+        Add a node to the DAG
+
+        Among ready nodes, higher `priority` runs first; ties go to the node
+        with the longest remaining path (sum of `estimated_ms`) to a sink.
+        """
         self._nodes[node_id] = DAGNode(
             id=node_id,
             name=name,
@@ -132,62 +155,105 @@ class StateMachine:
             max_retries=max_retries,
             timeout=timeout,
             branch_condition=branch_condition,
-            condition_func=condition_func
+            condition_func=condition_func,
+            priority=priority,
+            estimated_ms=estimated_ms
         )
 
     def get_ready_nodes(self) -> List[str]:
-        """Get nodes that are ready to execute (all dependencies met)"""
+        """
+        Get nodes that are ready to execute (all dependencies resolved)
+
+        Full scan of the DAG; execute() tracks readiness incrementally.
+        Nodes whose branch condition fails are skipped as a side effect.
+        """
         ready = []
 
         for node_id, node in self._nodes.items():
             if node.status != NodeStatus.PENDING:
                 continue
 
-            # Check all dependencies are completed
-            deps_met = all(
-                self._nodes.get(dep, DAGNode("", "")).status == NodeStatus.COMPLETED
-                for dep in node.dependencies
-            )
-
-            if not deps_met:
+            if not all(self._is_terminal(dep) for dep in node.dependencies):
                 continue
 
-            # Check branching conditions
-            if node.branch_condition == BranchCondition.ON_SUCCESS:
-                # All dependencies must have succeeded
-                deps_success = all(
-                    self._nodes.get(dep, DAGNode("", "")).status == NodeStatus.COMPLETED
-                    for dep in node.dependencies
-                )
-                if not deps_success:
-                    self._skip_node(node_id, "Dependencies did not succeed")
-                    continue
-
-            elif node.branch_condition == BranchCondition.ON_FAILURE:
-                # At least one dependency must have failed
-                any_failed = any(
-                    self._nodes.get(dep, DAGNode("", "")).status == NodeStatus.FAILED
-                    for dep in node.dependencies
-                )
-                if not any_failed:
-                    self._skip_node(node_id, "No dependency failures")
-                    continue
-
-            elif node.branch_condition == BranchCondition.ON_CONDITION:
-                # Evaluate custom condition
-                if node.condition_func:
-                    try:
-                        if not node.condition_func(self._results):
-                            self._skip_node(node_id, "Condition not met")
-                            continue
-                    except Exception as e:
-                        self._skip_node(node_id, f"Condition error: {e}")
-                        continue
+            skip_reason = self._branch_skip_reason(node)
+            if skip_reason:
+                self._skip_node(node_id, skip_reason)
+                continue
 
             ready.append(node_id)
 
         return ready
 
+    def _is_terminal(self, node_id: str) -> bool:
+        node = self._nodes.get(node_id)
+        return node is not None and node.status in self._TERMINAL
+
+    def _branch_skip_reason(self, node: DAGNode) -> Optional[str]:
+        """
+        Evaluate a node's branch condition once its dependencies are resolved
+
+        Returns the reason to skip it, or None if it should run.
+        """
+        dep_statuses = [self._nodes[dep].status for dep in node.dependencies]
+
+        if node.branch_condition == BranchCondition.ON_FAILURE:
+            # At least one dependency must have failed
+            if NodeStatus.FAILED not in dep_statuses:
+                return "No dependency failures"
+            return None
+
+        # All other conditions need every dependency to have succeeded
+        if any(status != NodeStatus.COMPLETED for status in dep_statuses):
+            return "Dependencies did not succeed"
+
+        if node.branch_condition == BranchCondition.ON_CONDITION and node.condition_func:
+            # Evaluate custom condition
+            try:
+                if not node.condition_func(self._results):
+                    return "Condition not met"
+            except Exception as e:
+                return f"Condition error: {e}"
+
+        return None
+
+    def _critical_path_ranks(self) -> Dict[str, float]:
+        """
+        Longest remaining path (sum of estimated_ms) from each node to a sink
+
+        Nodes on cycles keep their own estimate; they never become ready anyway.
+        """
+        dependents = self._dependents()
+        remaining = {node_id: len(dependents[node_id]) for node_id in self._nodes}
+        ranks: Dict[str, float] = {}
+
+        # Reverse topological order: sinks first
+        stack = [node_id for node_id, count in remaining.items() if count == 0]
+        while stack:
+            node_id = stack.pop()
+            node = self._nodes[node_id]
+            ranks[node_id] = node.estimated_ms + max(
+                (ranks[child] for child in dependents[node_id]), default=0.0
+            )
+            for dep in node.dependencies:
+                if dep in remaining:
+                    remaining[dep] -= 1
+                    if remaining[dep] == 0:
+                        stack.append(dep)
+
+        for node_id, node in self._nodes.items():
+            ranks.setdefault(node_id, node.estimated_ms)
+        return ranks
+
+    def _dependents(self) -> Dict[str, List[str]]:
+        """Reverse edges: node -> nodes that depend on it"""
+        dependents: Dict[str, List[str]] = {node_id: [] for node_id in self._nodes}
+        for node_id, node in self._nodes.items():
+            for dep in node.dependencies:
+                if dep in dependents:
+                    dependents[dep].append(node_id)
+        return dependents
+
     def _skip_node(self, node_id: str, reason: str):
         """Skip a node due to branching"""
         if node_id in self._nodes:
@@ -203,6 +269,11 @@ class StateMachine:
         """
         Execute the DAG with parallel processing
 
+        Completion-driven: each node keeps a count of unresolved
+        dependencies, and a finishing node immediately releases its
+        dependents into a ready queue ordered by priority, then critical
+        path. A slow node only delays the nodes that depend on it.
+
         Args:
             executor: Async function to execute each node
             max_parallel: Maximum concurrent executions
@@ -211,33 +282,76 @@ class StateMachine:
             Dict with execution results and status
         """
         self._started = True
-        self._semaphore = asyncio.Semaphore(max_parallel)
+        self._max_parallel = max_parallel
         start_time = datetime.now()
 
         self.logger.info(f"Starting DAG execution: {self.workflow_id}")
 
         try:
-            while not self.is_complete() and not self._cancelled:
-                ready_nodes = self.get_ready_nodes()
+            ranks = self._critical_path_ranks()
+            dependents = self._dependents()
+            sequence = itertools.count()
+            ready: List[tuple] = []
+            running: Dict[asyncio.Task, str] = {}
+
+            def enqueue(node_id: str):
+                node = self._nodes[node_id]
+                node.status = NodeStatus.READY
+                node.queued_at = datetime.now()
+                heapq.heappush(ready, (-node.priority, -ranks[node_id], next(sequence), node_id))
+
+            def resolve(node_id: str):
+                """All dependencies of node_id are terminal: queue or skip it."""
+                node = self._nodes[node_id]
+                skip_reason = self._branch_skip_reason(node)
+                if skip_reason:
+                    self._skip_node(node_id, skip_reason)
+                    release(node_id)
+                else:
+                    enqueue(node_id)
+
+            def release(node_id: str):
+                """node_id reached a terminal state: update its dependents."""
+                for child in dependents[node_id]:
+                    unresolved[child] -= 1
+                    if unresolved[child] == 0 and self._nodes[child].status == NodeStatus.PENDING:
+                        resolve(child)
+
+            # Nodes interrupted mid-run (e.g. restored from a checkpoint) run again
+            for node in self._nodes.values():
+                if node.status in (NodeStatus.READY, NodeStatus.RUNNING):
+                    node.status = NodeStatus.PENDING
+
+            # Missing dependencies never resolve, matching a node that never completes
+            unresolved = {
+                node_id: sum(1 for dep in node.dependencies if not self._is_terminal(dep))
+                for node_id, node in self._nodes.items()
+            }
+            for node_id, node in self._nodes.items():
+                if node.status == NodeStatus.PENDING and unresolved[node_id] == 0:
+                    resolve(node_id)
+
+            while not self._cancelled or running:
+                while ready and len(running) < max_parallel and not self._cancelled:
+                    node_id = heapq.heappop(ready)[3]
+                    if self._nodes[node_id].status != NodeStatus.READY:
+                        continue
+                    task = asyncio.ensure_future(self._execute_node(node_id, executor))
+                    running[task] = node_id
 
-                if not ready_nodes:
-                    # No nodes ready but not complete - check for deadlock
-                    running = [n for n in self._nodes.values() if n.status == NodeStatus.RUNNING]
-                    if not running:
+                if not running:
+                    if not self.is_complete() and not self._cancelled:
                         self.logger.warning("Possible deadlock detected - no ready or running nodes")
-                        break
-
-                    # Wait for running nodes
-                    await asyncio.sleep(0.1)
-                    continue
-
-                # Execute ready nodes in parallel
-                tasks = [
-                    self._execute_node(node_id, executor)
-                    for node_id in ready_nodes
-                ]
+                    break
 
-                await asyncio.gather(*tasks, return_exceptions=True)
+                done, _ = await asyncio.wait(set(running), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    node_id = running.pop(task)
+                    if task.exception() is not None:
+                        self.mark_failed(node_id, str(task.exception()))
+                    elif not self._is_terminal(node_id):
+                        self.mark_failed(node_id, "No attempts left")
+                    release(node_id)
 
             # Create final checkpoint
             self.checkpoint()
@@ -255,7 +369,10 @@ class StateMachine:
                 "node_states": {
                     node_id: {
                         "status": node.status.value,
-                        "duration_ms": node.duration_ms
+                        "duration_ms": node.duration_ms,
+                        "wait_ms": node.wait_ms,
+                        "retries": node.retry_count,
+                        "priority": node.priority
                     }
                     for node_id, node in self._nodes.items()
                 }
@@ -280,49 +397,50 @@ class StateMachine:
         if not node:
             return
 
-        async with self._semaphore:
-            while node.can_retry:
-                try:
-                    self.mark_running(node_id)
+        while node.can_retry:
+            try:
+                self.mark_running(node_id)
+
+                # Determine executor
+                node_executor = node.executor or executor
+                if not node_executor:
+                    raise ValueError(f"No executor for node {node_id}")
 
-                    # Determine executor
-                    node_executor = node.executor or executor
-                    if not node_executor:
-                        raise ValueError(f"No executor for node {node_id}")
+                # Execute with timeout
+                result = await asyncio.wait_for(
+                    node_executor(node, self._results),
+                    timeout=node.timeout
+                )
 
-                    # Execute with timeout
-                    result = await asyncio.wait_for(
-                        node_executor(node, self._results),
-                        timeout=node.timeout
+                self.mark_completed(node_id, result)
+                self._results[node_id] = result
+                self.logger.debug(
+                    f"Node {node_id} completed in {node.duration_ms:.1f}ms "
+                    f"(waited {node.wait_ms or 0:.1f}ms)"
+                )
+                return
+
+            except asyncio.TimeoutError:
+                node.retry_count += 1
+                if node.can_retry:
+                    delay = node.retry_delay * (2 ** node.retry_count)
+                    self.logger.warning(
+                        f"Node {node_id} timed out, retry {node.retry_count}/{node.max_retries} in {delay}s"
                     )
+                    await asyncio.sleep(delay)
+                else:
+                    self.mark_failed(node_id, f"Timeout after {node.max_retries} retries")
 
-                    self.mark_completed(node_id, result)
-                    self._results[node_id] = result
-                    return
-
-                except asyncio.TimeoutError:
-                    node.retry_count += 1
-                    if node.can_retry:
-                        delay = node.retry_delay * (2 ** node.retry_count)
-                        self.logger.warning(
-                            f"Node {node_id} timed out, retry {node.retry_count}/{node.max_retries} in {delay}s"
-                        )
-                        node.status = NodeStatus.PENDING
-                        await asyncio.sleep(delay)
-                    else:
-                        self.mark_failed(node_id, f"Timeout after {node.max_retries} retries")
-
-                except Exception as e:
-                    node.retry_count += 1
-                    if node.can_retry:
-                        delay = node.retry_delay * (2 ** node.retry_count)
-                        self.logger.warning(
-                            f"Node {node_id} failed: {e}, retry {node.retry_count}/{node.max_retries}"
-                        )
-                        node.status = NodeStatus.PENDING
-                        await asyncio.sleep(delay)
-                    else:
-                        self.mark_failed(node_id, str(e))
+            except Exception as e:
+                node.retry_count += 1
+                if node.can_retry:
+                    delay = node.retry_delay * (2 ** node.retry_count)
+                    self.logger.warning(
+                        f"Node {node_id} failed: {e}, retry {node.retry_count}/{node.max_retries}"
+                    )
+                    await asyncio.sleep(delay)
+                else:
+                    self.mark_failed(node_id, str(e))
 
     def cancel(self):
         """Cancel the workflow execution"""
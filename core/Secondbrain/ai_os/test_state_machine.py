@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+StateMachine Tests
+Completion-driven scheduling, branch skipping, parallelism bound and ordering
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_os.layer3_orchestration.state import BranchCondition, NodeStatus, StateMachine
+
+
+@pytest.fixture
+def machine(tmp_path):
+    return StateMachine("test", checkpoint_path=tmp_path)
+
+
+def recorder(log, delays=None, failing=()):
+    """Executor that logs start/end events, sleeping per node and failing on request"""
+    delays = delays or {}
+
+    async def run(node, results):
+        log.append(("start", node.id))
+        await asyncio.sleep(delays.get(node.id, 0))
+        log.append(("end", node.id))
+        if node.id in failing:
+            raise RuntimeError(f"{node.id} failed")
+        return node.id
+
+    return run
+
+
+def test_slow_sibling_does_not_delay_dependent(machine):
+    """A node starts as soon as its own dependency finishes"""
+    log = []
+    machine.add_node("fast", "fast")
+    machine.add_node("slow", "slow")
+    machine.add_node("after_fast", "after_fast", dependencies=["fast"])
+
+    result = asyncio.run(machine.execute(recorder(log, delays={"slow": 0.2})))
+
+    assert result["success"]
+    assert log.index(("start", "after_fast")) < log.index(("end", "slow"))
+
+
+def test_on_failure_branch_runs_and_on_success_skips(machine):
+    """A failed dependency runs ON_FAILURE handlers and skips everything needing success"""
+    log = []
+    machine.add_node("step", "step", max_retries=1)
+    machine.add_node("handler", "handler", dependencies=["step"],
+                     branch_condition=BranchCondition.ON_FAILURE)
+    machine.add_node("next", "next", dependencies=["step"],
+                     branch_condition=BranchCondition.ON_SUCCESS)
+    machine.add_node("after_next", "after_next", dependencies=["next"])
+
+    result = asyncio.run(machine.execute(recorder(log, failing={"step"})))
+    states = result["node_states"]
+
+    assert not result["success"] and result["completed"]
+    assert states["step"]["status"] == "failed"
+    assert states["handler"]["status"] == "completed"
+    assert states["next"]["status"] == "skipped"
+    assert states["after_next"]["status"] == "skipped"
+
+
+def test_on_failure_branch_skipped_on_success(machine):
+    """ON_FAILURE handlers are skipped when every dependency succeeded"""
+    machine.add_node("step", "step")
+    machine.add_node("handler", "handler", dependencies=["step"],
+                     branch_condition=BranchCondition.ON_FAILURE)
+    machine.add_node("next", "next", dependencies=["step"],
+                     branch_condition=BranchCondition.ON_SUCCESS)
+
+    result = asyncio.run(machine.execute(recorder([])))
+
+    assert result["node_states"]["handler"]["status"] == "skipped"
+    assert result["node_states"]["next"]["status"] == "completed"
+
+
+def test_max_parallel_bound(machine):
+    """No more than max_parallel nodes run at once"""
+    running = 0
+    peak = 0
+
+    async def run(node, results):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+
+    for i in range(6):
+        machine.add_node(f"n{i}", f"n{i}")
+
+    result = asyncio.run(machine.execute(run, max_parallel=2))
+
+    assert result["success"]
+    assert peak == 2
+
+
+def test_priority_then_critical_path_ordering(machine):
+    """Higher priority runs first; ties go to the longer remaining path"""
+    log = []
+    machine.add_node("low", "low", priority=0)
+    machine.add_node("high", "high", priority=5)
+    machine.add_node("short", "short", priority=1, estimated_ms=1)
+    machine.add_node("long", "long", priority=1, estimated_ms=1)
+    machine.add_node("long_tail", "long_tail", dependencies=["long"], estimated_ms=50)
+
+    asyncio.run(machine.execute(recorder(log), max_parallel=1))
+    started = [node_id for event, node_id in log if event == "start"]
+
+    assert started[:3] == ["high", "long", "short"]
+    assert started.index("long_tail") > started.index("long")
+    assert "low" in started[3:]
+
+
+def test_interrupted_nodes_rerun(machine):
+    """Nodes left READY or RUNNING (e.g. restored mid-run) run again"""
+    log = []
+    machine.add_node("a", "a")
+    machine.add_node("b", "b", dependencies=["a"])
+    machine.mark_running("a")
+    machine._nodes["b"].status = NodeStatus.READY
+
+    result = asyncio.run(machine.execute(recorder(log)))
+
+    assert result["success"]
+    assert [node_id for event, node_id in log if event == "start"] == ["a", "b"]
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+StateStore Tests
+Checkpoint/rollback, reused checkpoint ids and legacy JSON import
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ai_os.core.base import StateStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = StateStore(tmp_path)
+    yield store
+    store.close()
+
+
+def test_rollback_restores_diff_chain(store):
+    """Rolling back replays deltas, including deleted keys"""
+    store.set("a", 1)
+    store.set("b", 2)
+    first = store.checkpoint()
+    store.set("a", 10)
+    store.delete("b")
+    second = store.checkpoint()
+    store.set("c", 3)
+
+    assert store.rollback(first)
+    assert store.get("a") == 1 and store.get("b") == 2 and store.get("c") is None
+
+    assert store.rollback(second)
+    assert store.get("a") == 10 and store.get("b") is None
+
+
+def test_rollback_survives_reopen(tmp_path):
+    """Checkpoints and restored state are read back from state.db"""
+    store = StateStore(tmp_path)
+    store.set("a", 1)
+    cp = store.checkpoint()
+    store.set("a", 2)
+    store.close()
+
+    store = StateStore(tmp_path)
+    assert store.get("a") == 2
+    assert store.rollback(cp)
+    store.close()
+    assert StateStore(tmp_path).get("a") == 1
+
+
+def test_reused_id_at_head(store):
+    """Checkpointing the same id twice overwrites it instead of pointing it at itself"""
+    store.set("a", 1)
+    store.checkpoint("x")
+    store.set("a", 2)
+    store.checkpoint("x")
+    store.set("a", 3)
+
+    assert store.rollback("x")
+    assert store.get("a") == 2
+
+
+def test_reused_older_id(store):
+    """Reusing an older id keeps its dependents restorable and does not cycle"""
+    store.set("a", 1)
+    store.checkpoint("A")
+    store.set("b", 2)
+    store.checkpoint("B")
+    store.set("a", 5)
+    store.checkpoint("A")
+
+    assert store.rollback("B")
+    assert store.get("a") == 1 and store.get("b") == 2
+
+    assert store.rollback("A")
+    assert store.get("a") == 5 and store.get("b") == 2
+
+
+def test_cyclic_chain_rejected(store):
+    """A corrupt cyclic chain fails the rollback instead of hanging"""
+    store.set("a", 1)
+    store.checkpoint("A")
+    store.set("a", 2)
+    store.checkpoint("B")
+    with store._conn:
+        store._conn.execute("UPDATE checkpoints SET base_id = 'B' WHERE id = 'A'")
+
+    assert not store.rollback("B")
+    store.set("a", 3)
+    assert store.get("a") == 3
+
+
+def test_legacy_files_imported(tmp_path):
+    """state.json and checkpoint_*.json from the file-based store are imported"""
+    (tmp_path / "state.json").write_text(json.dumps({"a": 2, "b": "x"}))
+    (tmp_path / "checkpoint_old.json").write_text(json.dumps({
+        "timestamp": "2025-01-01T00:00:00",
+        "state": {"a": 1}
+    }))
+
+    store = StateStore(tmp_path)
+    try:
+        assert store.get("a") == 2 and store.get("b") == "x"
+        assert [cp["id"] for cp in store.list_checkpoints()] == ["old"]
+
+        store.set("c", 3)
+        new = store.checkpoint()
+        assert store.rollback("old")
+        assert store.get("a") == 1 and store.get("b") is None
+
+        assert store.rollback(new)
+        assert store.get("a") == 2 and store.get("c") == 3
+    finally:
+        store.close()
@@ -0,0 +1,121 @@
+"""
+Markdown Chunker - splits notes into heading-aware, overlapping chunks
+Used to embed long SOPs as several focused passages instead of one diluted vector
+"""
+import re
+from typing import List, Dict, Any, Optional
+
+from .config import CHUNK_SIZE, CHUNK_OVERLAP
+
+
+HEADING_RE = re.compile(r'^(#{1,6})\s+(.+?)\s*#*\s*$')
+
+
+def strip_frontmatter(content: str) -> str:
+    """Remove a leading YAML frontmatter block"""
+    if content.startswith('---'):
+        end = content.find('\n---', 3)
+        if end != -1:
+            return content[end + 4:].lstrip('\n')
+    return content
+
+
+def split_sections(content: str) -> List[Dict[str, str]]:
+    """Split markdown into sections at heading lines
+
+    Returns:
+        List of {'heading': str, 'text': str}; text includes the heading line
+    """
+    sections = []
+    heading = ''
+    lines: List[str] = []
+
+    for line in content.split('\n'):
+        match = HEADING_RE.match(line)
+        if match and lines:
+            sections.append({'heading': heading, 'text': '\n'.join(lines).strip()})
+            lines = []
+        if match:
+            heading = match.group(2)
+        lines.append(line)
+
+    if lines:
+        sections.append({'heading': heading, 'text': '\n'.join(lines).strip()})
+
+    return [s for s in sections if s['text']]
+
+
+def _window(text: str, size: int, overlap: int) -> List[str]:
+    """Slide a size-char window with overlap, preferring to break on whitespace"""
+    if len(text) <= size:
+        return [text]
+
+    step_back = min(overlap, size // 2)
+    pieces = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            # Back off to the last paragraph/line/word boundary in the second half of the window
+            for sep in ('\n\n', '\n', ' '):
+                cut = text.rfind(sep, start + size // 2, end)
+                if cut != -1:
+                    end = cut
+                    break
+        pieces.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        start = max(end - step_back, start + 1)
+
+    return [p for p in pieces if p]
+
+
+def chunk_markdown(content: str, chunk_size: Optional[int] = None,
+                   overlap: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Split a markdown note into chunks for embedding
+
+    Small adjacent sections are merged up to chunk_size; sections larger than
+    chunk_size are windowed with overlap and keep their heading as a prefix.
+
+    Args:
+        content: Raw note markdown (frontmatter is ignored)
+        chunk_size: Target chunk length in characters (defaults to CHUNK_SIZE)
+        overlap: Characters shared between consecutive windows (defaults to CHUNK_OVERLAP)
+
+    Returns:
+        List of {'index': int, 'heading': str, 'text': str}
+    """
+    chunk_size = chunk_size or CHUNK_SIZE
+    overlap = CHUNK_OVERLAP if overlap is None else overlap
+
+    body = strip_frontmatter(content)
+    chunks: List[Dict[str, Any]] = []
+    buffer = None
+
+    def emit(heading: str, text: str):
+        chunks.append({'index': len(chunks), 'heading': heading, 'text': text})
+
+    for section in split_sections(body):
+        text = section['text']
+
+        if len(text) > chunk_size:
+            if buffer:
+                emit(buffer['heading'], buffer['text'])
+                buffer = None
+            prefix = f"{section['heading']}\n" if section['heading'] else ''
+            for i, piece in enumerate(_window(text, chunk_size, overlap)):
+                # First window already starts with the heading line
+                emit(section['heading'], piece if i == 0 or not prefix else prefix + piece)
+            continue
+
+        if buffer and len(buffer['text']) + len(text) + 2 <= chunk_size:
+            buffer['text'] += '\n\n' + text
+        else:
+            if buffer:
+                emit(buffer['heading'], buffer['text'])
+            buffer = {'heading': section['heading'], 'text': text}
+
+    if buffer:
+        emit(buffer['heading'], buffer['text'])
+
+    return chunks
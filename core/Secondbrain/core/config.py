@@ -25,8 +25,9 @@ NOTEBOOKLM_FEEDBACK_DIR = BASE_DIR / "notebooklm_feedback"
 NOTEBOOKLM_EXPORTS_DIR = BASE_DIR / "notebooklm_exports"
 
 # Processing settings
-CHUNK_SIZE = 1000
-CHUNK_OVERLAP = 200
+CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "1000"))  # Characters per embedded chunk
+CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "200"))  # Characters shared by adjacent windows
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))  # Notes per vector store write
 
 # Consistency thresholds
 CONSISTENCY_THRESHOLD = 0.85
@@ -0,0 +1,86 @@
+"""
+Hybrid Search - fuses BM25 keyword hits with vector search results
+Keyword search (SQLite FTS5) catches exact terms such as customer names,
+device models and ticket numbers; vector search catches paraphrases.
+The two rankings are merged with reciprocal rank fusion (RRF).
+"""
+from typing import List, Dict, Any, Iterable
+
+
+# Standard RRF damping constant - higher values flatten the rank contribution
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(rankings: Iterable[List[str]], k: int = RRF_K) -> Dict[str, float]:
+    """Combine several ranked id lists into one score per id
+
+    score(id) = sum over lists of 1 / (k + rank), rank starting at 1
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return scores
+
+
+class HybridSearcher:
+    """Runs keyword and semantic search and returns one fused ranking"""
+
+    def __init__(self, vector_store, structured_store, k: int = RRF_K):
+        self.vector_store = vector_store
+        self.structured_store = structured_store
+        self.k = k
+
+    def search(self, query: str, n_results: int = 10,
+               candidates: int = None) -> List[Dict[str, Any]]:
+        """Hybrid search over vault notes
+
+        Args:
+            query: Free-text query
+            n_results: Notes to return
+            candidates: Hits pulled from each retriever before fusion (default 2 * n_results)
+
+        Returns:
+            Results in VectorStore.semantic_search format plus 'score' (RRF)
+            and 'sources' (['vector', 'keyword']). 'distance' is 1 - score
+            normalised to the best possible score, so UIs that show
+            (1 - distance) as a match percentage keep working.
+        """
+        candidates = candidates or n_results * 2
+
+        vector_hits = self.vector_store.semantic_search(query, n_results=candidates)
+        keyword_hits = self.structured_store.search_notes_text(query, limit=candidates)
+
+        scores = reciprocal_rank_fusion(
+            [[r['note_id'] for r in vector_hits], [r['note_id'] for r in keyword_hits]],
+            k=self.k
+        )
+
+        by_id: Dict[str, Dict[str, Any]] = {}
+        for hit in vector_hits:
+            by_id[hit['note_id']] = {**hit, 'sources': ['vector']}
+        for hit in keyword_hits:
+            if hit['note_id'] in by_id:
+                by_id[hit['note_id']]['sources'].append('keyword')
+            else:
+                by_id[hit['note_id']] = {
+                    'note_id': hit['note_id'],
+                    'content': hit['snippet'],
+                    'metadata': {
+                        'title': hit['title'],
+                        'file_path': hit['file_path'],
+                        'tags': hit['tags']
+                    },
+                    'sources': ['keyword']
+                }
+
+        best_possible = 2.0 / (self.k + 1)
+        ranked = sorted(by_id.values(), key=lambda r: scores[r['note_id']], reverse=True)
+
+        results = []
+        for result in ranked[:n_results]:
+            result['score'] = scores[result['note_id']]
+            result['distance'] = 1 - result['score'] / best_possible
+            results.append(result)
+
+        return results
@@ -0,0 +1,99 @@
+"""
+Index Manifest - tracks which vault notes are in the vector store
+Maps note path -> content hash / mtime so re-indexing only touches changed notes
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from .config import CHROMA_DB_DIR
+
+
+MANIFEST_FILENAME = "index_manifest.json"
+# 2: notes are indexed as chunks (obsidian_chunks) rather than whole notes
+MANIFEST_VERSION = 2
+
+
+def note_id_for_path(relative_path: str) -> str:
+    """Stable vector store id for a note, derived from its vault-relative path"""
+    normalized = Path(relative_path).as_posix()
+    return "note_" + hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+
+def content_hash(content: str) -> str:
+    """Hash of note content used for change detection"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class IndexManifest:
+    """Persistent path -> {note_id, hash, mtime, size} map for the vector index"""
+
+    def __init__(self, manifest_path: Optional[Path] = None):
+        self.manifest_path = Path(manifest_path) if manifest_path else CHROMA_DB_DIR / MANIFEST_FILENAME
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.updated_at: Optional[str] = None
+        self.version: Optional[int] = None
+        self.load()
+
+    @property
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+
+    @property
+    def outdated(self) -> bool:
+        """Manifest was written by an older index layout and can't be diffed against"""
+        return self.exists and self.version != MANIFEST_VERSION
+
+    def load(self):
+        """Load manifest from disk (missing or corrupt file -> empty manifest)"""
+        if not self.manifest_path.exists():
+            return
+
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+            self.version = data.get('version')
+            if data.get('version') == MANIFEST_VERSION:
+                self.entries = data.get('notes', {})
+                self.updated_at = data.get('updated_at')
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"⚠ Index manifest unreadable, starting fresh: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Write manifest atomically so an interrupted run never leaves a partial file"""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        self.updated_at = datetime.now().isoformat()
+        self.version = MANIFEST_VERSION
+        data = {
+            'version': MANIFEST_VERSION,
+            'updated_at': self.updated_at,
+            'notes': self.entries
+        }
+        tmp_path = self.manifest_path.with_suffix('.json.tmp')
+        tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding='utf-8')
+        os.replace(tmp_path, self.manifest_path)
+
+    def get(self, relative_path: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(relative_path)
+
+    def is_unchanged(self, relative_path: str, mtime: float, size: int) -> bool:
+        """Cheap check using stat() only - no file read needed"""
+        entry = self.entries.get(relative_path)
+        return bool(entry) and entry.get('mtime') == mtime and entry.get('size') == size
+
+    def record(self, relative_path: str, note_id: str, digest: str, mtime: float, size: int):
+        self.entries[relative_path] = {
+            'note_id': note_id,
+            'hash': digest,
+            'mtime': mtime,
+            'size': size
+        }
+
+    def remove(self, relative_path: str) -> Optional[Dict[str, Any]]:
+        return self.entries.pop(relative_path, None)
+
+    def clear(self):
+        self.entries = {}
@@ -9,13 +9,22 @@ from typing import Dict, List, Optional, Any
 
 from .config import OBSIDIAN_VAULT_PATH
 from .html_generator import generate_html_document
+from .index_manifest import note_id_for_path
 
 
 class ObsidianVault:
     """Manages Obsidian vault operations"""
 
-    def __init__(self, vault_path: Optional[Path] = None):
+    def __init__(self, vault_path: Optional[Path] = None, text_index=None):
+        """
+        Args:
+            vault_path: Vault root (defaults to OBSIDIAN_VAULT_PATH)
+            text_index: Optional StructuredStore whose full-text index serves
+                plain query searches over notes/ instead of scanning every file
+        """
         self.vault_path = Path(vault_path) if vault_path else OBSIDIAN_VAULT_PATH
+        self.notes_dir = self.vault_path / "notes"  # Folder covered by rebuild_index
+        self.text_index = text_index
 
         # Ensure vault exists
         if not self.vault_path.exists():
@@ -60,6 +69,14 @@ class ObsidianVault:
         note_path.parent.mkdir(parents=True, exist_ok=True)
         note_path.write_text(content, encoding='utf-8')
 
+        note_id = self.note_id(note_path)
+
+        # Keep the full-text index current until the next rebuild_index run
+        if self.text_index is not None and note_path.is_relative_to(self.notes_dir):
+            self.text_index.index_note_text(
+                note_id, title, str(note_path), content, structured_data.get('tags', [])
+            )
+
         # Also generate HTML with OberaConnect branding
         html_dir = self.vault_path / "html_output"
         if subfolder:
@@ -73,13 +90,20 @@ class ObsidianVault:
             print(f"Warning: HTML generation failed: {e}")
 
         return {
-            "note_id": filename,
+            "note_id": note_id,
             "file_path": str(note_path),
             "html_path": str(html_path),
             "title": title,
             "created": datetime.now().isoformat()
         }
 
+    def note_id(self, note_path: Path) -> str:
+        """Index id for a note - the same path-based id rebuild_index uses for notes/"""
+        note_path = Path(note_path)
+        if note_path.is_relative_to(self.notes_dir):
+            return note_id_for_path(note_path.relative_to(self.notes_dir).as_posix())
+        return note_id_for_path(note_path.relative_to(self.vault_path).as_posix())
+
     def update_note(self, note_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update an existing note"""
         # Find the note file
@@ -106,11 +130,18 @@ class ObsidianVault:
 
     def search_notes(self, query: str = "", tags: List[str] = None,
                     concepts: List[str] = None) -> List[Dict[str, Any]]:
-        """Search notes in vault"""
-        results = []
+        """Search notes in vault
 
-        # Search all markdown files
-        for note_path in self.vault_path.rglob("*.md"):
+        A plain query is served from the full-text index for notes/ (the
+        folder rebuild_index covers); the rest of the vault is still scanned.
+        """
+        use_index = query and not tags and not concepts and self.text_index is not None \
+            and self.text_index.count_note_text() > 0
+
+        results = self._search_text_index(query) if use_index else []
+
+        # Scan the markdown files the index doesn't cover
+        for note_path in self._unindexed_notes() if use_index else self.vault_path.rglob("*.md"):
             content = note_path.read_text(encoding='utf-8')
 
             # Simple search logic
@@ -123,6 +154,25 @@ class ObsidianVault:
 
         return results
 
+    def _unindexed_notes(self):
+        """Markdown files outside notes/, without walking notes/ itself"""
+        for entry in self.vault_path.iterdir():
+            if entry == self.notes_dir:
+                continue
+            if entry.is_dir():
+                yield from entry.rglob("*.md")
+            elif entry.suffix == ".md":
+                yield entry
+
+    def _search_text_index(self, query: str) -> List[Dict[str, Any]]:
+        """Serve a query search over notes/ from the full-text index"""
+        results = []
+        for hit in self.text_index.search_notes_text(query, limit=None):
+            note_path = Path(hit['file_path'])
+            if note_path.exists():
+                results.append(self._note_info(note_path))
+        return results
+
     def get_note_content(self, note_id: str) -> Optional[str]:
         """Get full content of a note"""
         note_path = self._find_note(note_id)
@@ -215,9 +265,9 @@ class ObsidianVault:
         return '\n'.join(lines)
 
     def _find_note(self, note_id: str) -> Optional[Path]:
-        """Find a note by ID (filename)"""
+        """Find a note by ID (index id, filename or stem)"""
         for note_path in self.vault_path.rglob("*.md"):
-            if note_path.name == note_id or note_path.stem == note_id:
+            if note_path.name == note_id or note_path.stem == note_id or self.note_id(note_path) == note_id:
                 return note_path
         return None
 
@@ -0,0 +1,158 @@
+"""
+Query Cache - LRU + TTL cache for RAG search responses and LLM summaries
+Entries are tagged with the index version they were computed against, kept in
+memory for fast lookups and mirrored to SQLite so they survive restarts.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation"""
+    query = re.sub(r'\s+', ' ', query.strip().lower())
+    return query.rstrip('?!.')
+
+
+def index_version(*paths: Path) -> str:
+    """Version string that changes whenever any of the given index files change"""
+    parts = []
+    for path in paths:
+        try:
+            parts.append(str(Path(path).stat().st_mtime_ns))
+        except OSError:
+            parts.append('0')
+    return ':'.join(parts)
+
+
+class QueryCache:
+    """Thread-safe LRU cache with TTL, version invalidation and hit/miss stats"""
+
+    def __init__(self, db_path: Optional[Path] = None, max_entries: int = 500,
+                 ttl_seconds: int = 3600):
+        """
+        Args:
+            db_path: SQLite file for persistence (None = memory only)
+            max_entries: LRU capacity across all namespaces
+            ttl_seconds: Entry lifetime
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+        self.conn = None
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS query_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            self.conn.commit()
+            self._load()
+
+    def _load(self):
+        """Warm the in-memory LRU from disk, newest entries last (most recent)"""
+        cutoff = time.time() - self.ttl_seconds
+        self.conn.execute("DELETE FROM query_cache WHERE created_at < ?", (cutoff,))
+        rows = self.conn.execute("""
+            SELECT key, value, version, created_at FROM (
+                SELECT * FROM query_cache ORDER BY created_at DESC LIMIT ?
+            ) ORDER BY created_at ASC
+        """, (self.max_entries,)).fetchall()
+        self.conn.commit()
+
+        for key, value, version, created_at in rows:
+            self._entries[key] = {
+                'value': json.loads(value),
+                'version': version,
+                'created_at': created_at
+            }
+
+    @staticmethod
+    def make_key(namespace: str, parts: Iterable[Any]) -> str:
+        raw = json.dumps([namespace, list(parts)], sort_keys=True, default=str)
+        return namespace + ':' + hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, namespace: str, parts: Iterable[Any], version: str) -> Optional[Any]:
+        """Return the cached value, or None if missing, expired or from another index version"""
+        key = self.make_key(namespace, parts)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+
+            if entry['version'] != version or time.time() - entry['created_at'] > self.ttl_seconds:
+                self._drop(key)
+                self._stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return entry['value']
+
+    def set(self, namespace: str, parts: Iterable[Any], version: str, value: Any):
+        """Store a JSON-serialisable value"""
+        key = self.make_key(namespace, parts)
+        created_at = time.time()
+        with self._lock:
+            self._entries[key] = {'value': value, 'version': version, 'created_at': created_at}
+            self._entries.move_to_end(key)
+
+            if self.conn:
+                try:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO query_cache (key, value, version, created_at) VALUES (?, ?, ?, ?)",
+                        (key, json.dumps(value, default=str), version, created_at)
+                    )
+                    self.conn.commit()
+                except Exception as e:
+                    print(f"⚠ Query cache write failed: {e}")
+
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._stats['evictions'] += 1
+
+    def invalidate(self, version: Optional[str] = None) -> int:
+        """Drop every entry not computed against `version` (all entries if None)"""
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if version is None or e['version'] != version]
+            for key in stale:
+                self._drop(key)
+            self._stats['invalidations'] += len(stale)
+            return len(stale)
+
+    def _drop(self, key: str):
+        """Remove one entry from memory and disk - caller holds the lock"""
+        self._entries.pop(key, None)
+        if self.conn:
+            try:
+                self.conn.execute("DELETE FROM query_cache WHERE key = ?", (key,))
+                self.conn.commit()
+            except Exception as e:
+                print(f"⚠ Query cache delete failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hit_rate': round(self._stats['hits'] / lookups, 3) if lookups else 0.0
+            }
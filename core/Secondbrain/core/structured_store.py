@@ -3,27 +3,127 @@
 Structured Store - SQLite database for SharePoint List data
 Optimized for aggregation queries (counts, sums, filters)
 """
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable
 from datetime import datetime
 import json
 import re
 
 
+# Metrics kept in the summary_counts table, one per base table
+SUMMARY_TABLES = ('customers', 'projects', 'tickets', 'documents', 'employees')
+
+
 class StructuredStore:
-    """SQLite store for structured SharePoint data - optimized for analytical queries"""
+    """SQLite store for structured SharePoint data - optimized for analytical queries
 
-    def __init__(self, db_path: Path):
+    Connections come from a small pool (WAL mode, so web readers don't block
+    on imports). Headline counts and project breakdowns are kept in summary
+    tables maintained by triggers, so analytical reads don't scan base tables.
+    """
+
+    def __init__(self, db_path: Path, pool_size: int = 8):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
+        self.pool_size = pool_size
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
         self._init_schema()
 
+    # ==================== Connection Pool ====================
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._pool_lock:
+            if self._created < self.pool_size:
+                self._created += 1
+                return self._connect()
+        # Pool exhausted - wait for a connection to be returned
+        return self._pool.get()
+
+    def _release(self, conn: sqlite3.Connection):
+        self._pool.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection (reuses the thread's open transaction, if any)"""
+        conn = getattr(self._local, 'txn_conn', None)
+        if conn is not None:
+            yield conn
+            return
+
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Group several writes into one commit on a single pooled connection
+
+        Nested calls join the outer transaction. Rolls back on exception.
+        """
+        if getattr(self._local, 'txn_conn', None) is not None:
+            yield self._local.txn_conn
+            return
+
+        conn = self._acquire()
+        self._local.txn_conn = conn
+        try:
+            yield conn
+            self._commit(conn)
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._local.txn_conn = None
+            self._release(conn)
+
+    @staticmethod
+    def _commit(conn: sqlite3.Connection):
+        """Commit, bumping write_version if anything was written"""
+        if conn.in_transaction:
+            conn.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'write_version'")
+        conn.commit()
+
+    def data_version(self) -> int:
+        """Counter that changes with every committed write to the store"""
+        rows = self.query("SELECT value FROM store_meta WHERE key = 'write_version'")
+        return rows[0]['value'] if rows else 0
+
+    def close(self):
+        """Close all idle pooled connections"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._pool_lock:
+            self._created = 0
+
     def _init_schema(self):
         """Create tables for structured business data"""
-        cursor = self.conn.cursor()
+        with self.transaction() as conn:
+            self._create_tables(conn.cursor())
+
+    def _create_tables(self, cursor: sqlite3.Cursor):
 
         # Customers table - extracted from folders and documents
         cursor.execute("""
@@ -117,28 +217,193 @@ class StructuredStore:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_tickets_customer ON tickets(customer)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_documents_customer ON documents(customer)")
 
-        self.conn.commit()
+        # Full-text (BM25) index over vault notes - exact terms like customer
+        # names, device models and ticket numbers that embeddings blur.
+        # note_id matches the vector store id so results can be fused.
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+                    note_id UNINDEXED,
+                    file_path UNINDEXED,
+                    title,
+                    tags,
+                    content,
+                    tokenize = 'unicode61'
+                )
+            """)
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            print(f"⚠ SQLite FTS5 unavailable - keyword search disabled: {e}")
+            self.fts_enabled = False
+
+        self._create_summary_tables(cursor)
+
+        # Write counter bumped by every commit that changed data - a cheap
+        # version for caches (file mtimes miss commits that sit in the WAL)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS store_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        cursor.execute("INSERT OR IGNORE INTO store_meta (key, value) VALUES ('write_version', 0)")
+
+    def _create_summary_tables(self, cursor: sqlite3.Cursor):
+        """Materialized aggregates, kept current by triggers on the base tables"""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS summary_counts (
+                metric TEXT PRIMARY KEY,
+                value INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS project_status_counts (
+                status TEXT PRIMARY KEY,
+                count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS project_customer_counts (
+                customer TEXT PRIMARY KEY,
+                count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        # Row counts per table
+        for table in SUMMARY_TABLES:
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_count_ins AFTER INSERT ON {table}
+                BEGIN
+                    UPDATE summary_counts SET value = value + 1 WHERE metric = '{table}';
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_count_del AFTER DELETE ON {table}
+                BEGIN
+                    UPDATE summary_counts SET value = value - 1 WHERE metric = '{table}';
+                END
+            """)
+
+        # Project breakdowns by status and customer (NULL status/customer stored as '')
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_projects_breakdown_ins AFTER INSERT ON projects
+            BEGIN
+                INSERT INTO project_status_counts (status, count) VALUES (COALESCE(NEW.status, ''), 1)
+                    ON CONFLICT(status) DO UPDATE SET count = count + 1;
+                INSERT INTO project_customer_counts (customer, count) VALUES (COALESCE(NEW.customer, ''), 1)
+                    ON CONFLICT(customer) DO UPDATE SET count = count + 1;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_projects_breakdown_del AFTER DELETE ON projects
+            BEGIN
+                UPDATE project_status_counts SET count = count - 1 WHERE status = COALESCE(OLD.status, '');
+                UPDATE project_customer_counts SET count = count - 1 WHERE customer = COALESCE(OLD.customer, '');
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_projects_breakdown_upd AFTER UPDATE OF status, customer ON projects
+            BEGIN
+                UPDATE project_status_counts SET count = count - 1 WHERE status = COALESCE(OLD.status, '');
+                INSERT INTO project_status_counts (status, count) VALUES (COALESCE(NEW.status, ''), 1)
+                    ON CONFLICT(status) DO UPDATE SET count = count + 1;
+                UPDATE project_customer_counts SET count = count - 1 WHERE customer = COALESCE(OLD.customer, '');
+                INSERT INTO project_customer_counts (customer, count) VALUES (COALESCE(NEW.customer, ''), 1)
+                    ON CONFLICT(customer) DO UPDATE SET count = count + 1;
+            END
+        """)
+
+        # First run against an existing database - seed from the base tables
+        seeded = cursor.execute("SELECT COUNT(*) FROM summary_counts").fetchone()[0]
+        if seeded < len(SUMMARY_TABLES):
+            self._refresh_summaries(cursor)
+
+    def _refresh_summaries(self, cursor: sqlite3.Cursor):
+        cursor.execute("DELETE FROM summary_counts")
+        for table in SUMMARY_TABLES:
+            cursor.execute(
+                f"INSERT INTO summary_counts (metric, value) SELECT '{table}', COUNT(*) FROM {table}"
+            )
+        cursor.execute("DELETE FROM project_status_counts")
+        cursor.execute("""
+            INSERT INTO project_status_counts (status, count)
+            SELECT COALESCE(status, ''), COUNT(*) FROM projects GROUP BY COALESCE(status, '')
+        """)
+        cursor.execute("DELETE FROM project_customer_counts")
+        cursor.execute("""
+            INSERT INTO project_customer_counts (customer, count)
+            SELECT COALESCE(customer, ''), COUNT(*) FROM projects GROUP BY COALESCE(customer, '')
+        """)
+
+    def refresh_summaries(self):
+        """Recompute all summary tables from the base tables (repair/maintenance)"""
+        with self.transaction() as conn:
+            self._refresh_summaries(conn.cursor())
 
     def query(self, sql: str, params: tuple = ()) -> List[Dict]:
         """Execute SQL query and return results as dicts"""
-        cursor = self.conn.cursor()
-        try:
-            cursor.execute(sql, params)
-            return [dict(row) for row in cursor.fetchall()]
-        except Exception as e:
-            print(f"SQL Error: {e}")
-            return []
+        with self.connection() as conn:
+            try:
+                cursor = conn.execute(sql, params)
+                return [dict(row) for row in cursor.fetchall()]
+            except Exception as e:
+                print(f"SQL Error: {e}")
+                return []
 
     def execute(self, sql: str, params: tuple = ()) -> bool:
-        """Execute SQL statement (INSERT, UPDATE, DELETE)"""
-        cursor = self.conn.cursor()
-        try:
-            cursor.execute(sql, params)
-            self.conn.commit()
-            return True
-        except Exception as e:
-            print(f"SQL Error: {e}")
-            return False
+        """Execute SQL statement (INSERT, UPDATE, DELETE)
+
+        Commits immediately unless called inside transaction().
+        """
+        in_transaction = getattr(self._local, 'txn_conn', None) is not None
+        with self.connection() as conn:
+            try:
+                conn.execute(sql, params)
+                if not in_transaction:
+                    self._commit(conn)
+                return True
+            except Exception as e:
+                if not in_transaction:
+                    conn.rollback()
+                print(f"SQL Error: {e}")
+                return False
+
+    def executemany(self, sql: str, rows: Iterable[tuple]) -> int:
+        """Execute one statement for many parameter rows in a single transaction
+
+        If the batch fails it is rolled back and retried row by row, so one
+        bad row doesn't drop the rest. Returns the number of rows written.
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+
+        with self.transaction() as conn:
+            try:
+                if not conn.in_transaction:
+                    # Otherwise RELEASE of the outermost savepoint would commit
+                    conn.execute("BEGIN")
+                conn.execute("SAVEPOINT executemany")
+                conn.executemany(sql, rows)
+                conn.execute("RELEASE executemany")
+                return len(rows)
+            except Exception as e:
+                conn.execute("ROLLBACK TO executemany")
+                conn.execute("RELEASE executemany")
+                print(f"SQL Error: {e} - retrying {len(rows)} rows individually")
+
+            # A failed statement only undoes itself, not the rows before it
+            written = 0
+            failed = 0
+            for row in rows:
+                try:
+                    conn.execute(sql, row)
+                    written += 1
+                except Exception as e:
+                    failed += 1
+                    print(f"SQL Error: {e}")
+            print(f"⚠ {failed} of {len(rows)} rows failed")
+            return written
 
     # ==================== Customer Methods ====================
 
@@ -154,8 +419,11 @@ class StructuredStore:
 
     def count_customers(self) -> int:
         """Get total customer count"""
-        result = self.query("SELECT COUNT(*) as count FROM customers")
-        return result[0]['count'] if result else 0
+        return self._summary_count('customers')
+
+    def _summary_count(self, metric: str) -> int:
+        result = self.query("SELECT value FROM summary_counts WHERE metric = ?", (metric,))
+        return result[0]['value'] if result else 0
 
     def get_customers(self, limit: int = None, status: str = None) -> List[Dict]:
         """Get customer list with optional filters"""
@@ -170,81 +438,113 @@ class StructuredStore:
         return self.query(sql)
 
     def get_customer_details(self, customer_name: str) -> Optional[Dict]:
-        """Get detailed info for a specific customer"""
-        customers = self.query(
-            "SELECT * FROM customers WHERE name = ?",
-            (customer_name,)
-        )
-        if not customers:
+        """Get detailed info for a specific customer (single round-trip)"""
+        rows = self.query("""
+            SELECT c.*,
+                (SELECT json_group_array(json_object(
+                    'id', id, 'title', title, 'customer', customer, 'status', status,
+                    'priority', priority, 'assigned_to', assigned_to, 'start_date', start_date,
+                    'due_date', due_date, 'budget_hours', budget_hours, 'hours_spent', hours_spent,
+                    'percent_complete', percent_complete, 'description', description,
+                    'source_url', source_url, 'created_at', created_at, 'updated_at', updated_at))
+                 FROM projects WHERE customer = c.name) AS _projects,
+                (SELECT json_group_array(json_object(
+                    'id', id, 'title', title, 'customer', customer, 'status', status,
+                    'priority', priority, 'assigned_to', assigned_to, 'due_date', due_date,
+                    'time_spent', time_spent, 'description', description, 'source', source,
+                    'created_at', created_at, 'updated_at', updated_at))
+                 FROM tickets WHERE customer = c.name) AS _tickets,
+                (SELECT json_group_array(json_object(
+                    'id', id, 'title', title, 'file_path', file_path, 'customer', customer,
+                    'doc_type', doc_type, 'tags', tags, 'entities', entities,
+                    'indexed_at', indexed_at))
+                 FROM documents WHERE customer = c.name) AS _documents
+            FROM customers c
+            WHERE c.name = ?
+        """, (customer_name,))
+        if not rows:
             return None
 
-        customer = customers[0]
-
-        # Get related projects
-        projects = self.query(
-            "SELECT * FROM projects WHERE customer = ?",
-            (customer_name,)
-        )
-
-        # Get related tickets
-        tickets = self.query(
-            "SELECT * FROM tickets WHERE customer = ?",
-            (customer_name,)
-        )
-
-        # Get related documents
-        documents = self.query(
-            "SELECT * FROM documents WHERE customer = ?",
-            (customer_name,)
-        )
-
+        customer = rows[0]
         return {
-            'customer': customer,
-            'projects': projects,
-            'tickets': tickets,
-            'documents': documents
+            'projects': json.loads(customer.pop('_projects')),
+            'tickets': json.loads(customer.pop('_tickets')),
+            'documents': json.loads(customer.pop('_documents')),
+            'customer': customer
         }
 
     def update_customer_counts(self, customer_name: str):
         """Update aggregated counts for a customer"""
-        project_count = self.query(
-            "SELECT COUNT(*) as c FROM projects WHERE customer = ?",
-            (customer_name,)
-        )[0]['c']
-
-        ticket_count = self.query(
-            "SELECT COUNT(*) as c FROM tickets WHERE customer = ?",
-            (customer_name,)
-        )[0]['c']
-
-        doc_count = self.query(
-            "SELECT COUNT(*) as c FROM documents WHERE customer = ?",
-            (customer_name,)
-        )[0]['c']
-
         self.execute("""
             UPDATE customers
-            SET project_count = ?, ticket_count = ?, document_count = ?,
+            SET project_count = (SELECT COUNT(*) FROM projects WHERE customer = customers.name),
+                ticket_count = (SELECT COUNT(*) FROM tickets WHERE customer = customers.name),
+                document_count = (SELECT COUNT(*) FROM documents WHERE customer = customers.name),
                 updated_at = ?
             WHERE name = ?
-        """, (project_count, ticket_count, doc_count, datetime.now().isoformat(), customer_name))
+        """, (datetime.now().isoformat(), customer_name))
 
     # ==================== Project Methods ====================
 
+    PROJECT_UPSERT_SQL = """
+        INSERT INTO projects
+        (id, title, customer, status, priority, assigned_to,
+         start_date, due_date, budget_hours, hours_spent,
+         percent_complete, description, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            title = excluded.title,
+            customer = excluded.customer,
+            status = excluded.status,
+            updated_at = excluded.updated_at
+    """
+
+    TICKET_UPSERT_SQL = """
+        INSERT INTO tickets (id, title, customer, status, priority, assigned_to, due_date, description, source, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            title = excluded.title,
+            status = excluded.status,
+            updated_at = excluded.updated_at
+    """
+
     def add_project(self, project_data: Dict[str, Any]) -> bool:
         """Add or update a project"""
-        return self.execute("""
-            INSERT INTO projects
-            (id, title, customer, status, priority, assigned_to,
-             start_date, due_date, budget_hours, hours_spent,
-             percent_complete, description, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(id) DO UPDATE SET
-                title = excluded.title,
-                customer = excluded.customer,
-                status = excluded.status,
-                updated_at = excluded.updated_at
-        """, (
+        return self.execute(self.PROJECT_UPSERT_SQL, self._project_row(project_data))
+
+    def add_projects(self, projects: Iterable[Dict[str, Any]]) -> int:
+        """Add or update many projects in one transaction; returns rows written"""
+        return self.executemany(self.PROJECT_UPSERT_SQL, (self._project_row(p) for p in projects))
+
+    def add_tickets(self, tickets: Iterable[Dict[str, Any]]) -> int:
+        """Add or update many tickets in one transaction; returns rows written"""
+        now = datetime.now().isoformat()
+        return self.executemany(self.TICKET_UPSERT_SQL, (
+            (
+                t.get('id'),
+                t.get('title'),
+                t.get('customer'),
+                t.get('status'),
+                t.get('priority'),
+                t.get('assigned_to'),
+                t.get('due_date'),
+                t.get('description'),
+                t.get('source'),
+                now
+            )
+            for t in tickets
+        ))
+
+    def add_employees(self, names: Iterable[str], source: str = 'assignment') -> int:
+        """Insert employees that don't exist yet; returns rows submitted"""
+        return self.executemany("""
+            INSERT INTO employees (name, source) VALUES (?, ?)
+            ON CONFLICT(name) DO NOTHING
+        """, ((name, source) for name in names))
+
+    @staticmethod
+    def _project_row(project_data: Dict[str, Any]) -> tuple:
+        return (
             project_data.get('id'),
             project_data.get('title'),
             project_data.get('customer'),
@@ -258,34 +558,32 @@ class StructuredStore:
             project_data.get('percent_complete'),
             project_data.get('description'),
             datetime.now().isoformat()
-        ))
+        )
 
     def count_projects(self, status: str = None) -> int:
         """Get project count with optional status filter"""
         if status:
             result = self.query(
-                "SELECT COUNT(*) as count FROM projects WHERE status = ?",
+                "SELECT count FROM project_status_counts WHERE status = ?",
                 (status,)
             )
-        else:
-            result = self.query("SELECT COUNT(*) as count FROM projects")
-        return result[0]['count'] if result else 0
+            return result[0]['count'] if result else 0
+        return self._summary_count('projects')
 
     def get_project_stats(self) -> Dict[str, Any]:
         """Get project statistics"""
         return {
             'total_projects': self.count_projects(),
             'by_status': self.query("""
-                SELECT status, COUNT(*) as count
-                FROM projects
-                GROUP BY status
+                SELECT NULLIF(status, '') as status, count
+                FROM project_status_counts
+                WHERE count > 0
                 ORDER BY count DESC
             """),
             'by_customer': self.query("""
-                SELECT customer, COUNT(*) as count
-                FROM projects
-                WHERE customer IS NOT NULL
-                GROUP BY customer
+                SELECT customer, count
+                FROM project_customer_counts
+                WHERE count > 0 AND customer != ''
                 ORDER BY count DESC
                 LIMIT 10
             """)
@@ -380,17 +678,90 @@ class StructuredStore:
             datetime.now().isoformat()
         ))
 
+    # ==================== Full-Text Methods ====================
+
+    def index_note_text(self, note_id: str, title: str, file_path: str,
+                        content: str, tags: List[str] = None) -> bool:
+        """Add or replace a note in the full-text index
+
+        Wrap many calls in transaction() to commit them together.
+        """
+        if not self.fts_enabled:
+            return False
+        try:
+            with self.transaction() as conn:
+                conn.execute("DELETE FROM notes_fts WHERE note_id = ?", (note_id,))
+                conn.execute(
+                    "INSERT INTO notes_fts (note_id, file_path, title, tags, content) VALUES (?, ?, ?, ?, ?)",
+                    (note_id, file_path, title, ', '.join(tags or []), content)
+                )
+            return True
+        except Exception as e:
+            print(f"SQL Error: {e}")
+            return False
+
+    def remove_note_text(self, note_id: str) -> bool:
+        """Remove a note from the full-text index"""
+        if not self.fts_enabled:
+            return False
+        return self.execute("DELETE FROM notes_fts WHERE note_id = ?", (note_id,))
+
+    def clear_note_text(self) -> bool:
+        """Empty the full-text index (used by full rebuilds)"""
+        return self.fts_enabled and self.execute("DELETE FROM notes_fts")
+
+    def count_note_text(self) -> int:
+        """Number of notes in the full-text index"""
+        if not self.fts_enabled:
+            return 0
+        result = self.query("SELECT COUNT(*) as count FROM notes_fts")
+        return result[0]['count'] if result else 0
+
+    @staticmethod
+    def _fts_query(text: str) -> str:
+        """Turn free text into an FTS5 OR-query of quoted terms
+
+        Each whitespace-separated term is quoted so punctuation in things like
+        'U6-LR' or 'INC-1042' is matched as an adjacent-token phrase instead of
+        being parsed as FTS syntax.
+        """
+        terms = [t.strip('"?!.,;:()[]{}') for t in text.split()]
+        terms = [t.replace('"', '""') for t in terms if re.search(r'\w', t)]
+        return ' OR '.join(f'"{t}"' for t in terms)
+
+    def search_notes_text(self, query: str, limit: Optional[int] = 10) -> List[Dict]:
+        """BM25-ranked keyword search over vault notes
+
+        Args:
+            query: Search text
+            limit: Maximum hits, or None for every match
+
+        Returns:
+            List of {'note_id', 'title', 'file_path', 'tags', 'snippet', 'rank'}
+            best match first (lower rank is better)
+        """
+        if not self.fts_enabled:
+            return []
+        fts_query = self._fts_query(query)
+        if not fts_query:
+            return []
+        # Title and tag hits weigh more than body hits
+        return self.query("""
+            SELECT note_id, title, file_path, tags,
+                   snippet(notes_fts, 4, '', '', ' … ', 48) as snippet,
+                   bm25(notes_fts, 0, 0, 10.0, 5.0, 1.0) as rank
+            FROM notes_fts
+            WHERE notes_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        """, (fts_query, -1 if limit is None else limit))  # negative LIMIT = no limit
+
     # ==================== Analytics Methods ====================
 
     def get_summary_stats(self) -> Dict[str, Any]:
         """Get overall summary statistics"""
-        return {
-            'customers': self.count_customers(),
-            'projects': self.count_projects(),
-            'tickets': self.query("SELECT COUNT(*) as count FROM tickets")[0]['count'],
-            'documents': self.query("SELECT COUNT(*) as count FROM documents")[0]['count'],
-            'employees': self.query("SELECT COUNT(*) as count FROM employees")[0]['count'],
-        }
+        counts = {row['metric']: row['value'] for row in self.query("SELECT metric, value FROM summary_counts")}
+        return {table: counts.get(table, 0) for table in SUMMARY_TABLES}
 
     def search_customers(self, search_term: str) -> List[Dict]:
         """Search customers by name"""
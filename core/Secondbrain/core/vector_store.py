@@ -2,10 +2,17 @@
 Vector Store Manager - Simplified stub version
 Handles vector embeddings and semantic search using ChromaDB
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable
 from pathlib import Path
 
-from .config import CHROMA_DB_DIR
+from .config import CHROMA_DB_DIR, EMBEDDING_BATCH_SIZE
+from .chunker import chunk_markdown
+
+
+# Chunks fetched per requested note when grouping chunk hits back to notes
+CHUNK_OVERSAMPLE = 4
+# Chunks of a note kept as its content in search results
+MAX_CHUNKS_PER_NOTE = 3
 
 
 class VectorStore:
@@ -30,6 +37,12 @@ class VectorStore:
                 metadata={"description": "Second brain notes"}
             )
 
+            # Heading-aware chunks of each note, linked back via parent_note_id
+            self.chunk_collection = self.client.get_or_create_collection(
+                name="obsidian_chunks",
+                metadata={"description": "Second brain note chunks"}
+            )
+
             self.enabled = True
             print(f"✓ Vector store initialized: {self.persist_directory}")
 
@@ -39,6 +52,7 @@ class VectorStore:
             self.enabled = False
             self.client = None
             self.collection = None
+            self.chunk_collection = None
 
     def add_note(self, note_id: str, content: str, metadata: Dict[str, Any] = None):
         """Add a note to the vector store"""
@@ -46,29 +60,187 @@ class VectorStore:
             return
 
         try:
-            # Convert lists to strings for ChromaDB compatibility
-            clean_metadata = {}
-            if metadata:
-                for key, value in metadata.items():
-                    if isinstance(value, list):
-                        clean_metadata[key] = ', '.join(str(v) for v in value)
-                    else:
-                        clean_metadata[key] = value
-
             self.collection.add(
                 ids=[note_id],
                 documents=[content],
-                metadatas=[clean_metadata or {}]
+                metadatas=[self._clean_metadata(metadata)]
             )
         except Exception as e:
             print(f"⚠ Vector store add failed: {e}")
 
+    def upsert_note(self, note_id: str, content: str, metadata: Dict[str, Any] = None) -> bool:
+        """Insert or replace a note in the vector store
+
+        Returns True if the note was written.
+        """
+        if not self.enabled:
+            return False
+
+        try:
+            self.collection.upsert(
+                ids=[note_id],
+                documents=[content],
+                metadatas=[self._clean_metadata(metadata)]
+            )
+            return True
+        except Exception as e:
+            print(f"⚠ Vector store upsert failed: {e}")
+            return False
+
+    def add_notes(self, notes: Iterable[Dict[str, Any]],
+                  batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Add many notes, embedding each batch in a single collection call
+
+        Writes the whole-note collection only. semantic_search reads the chunk
+        index once it has been built, so ingestion should use upsert_note_chunks.
+
+        Args:
+            notes: Iterable of dicts with 'note_id', 'content' and optional 'metadata'
+            batch_size: Notes per write (defaults to EMBEDDING_BATCH_SIZE)
+
+        Returns:
+            {'written': [note_id, ...], 'failed': {note_id: error, ...}}
+        """
+        return self._write_notes('add', notes, batch_size)
+
+    def upsert_notes(self, notes: Iterable[Dict[str, Any]],
+                     batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Insert or replace many notes in batches - same contract as add_notes"""
+        return self._write_notes('upsert', notes, batch_size)
+
+    def upsert_note_chunks(self, notes: Iterable[Dict[str, Any]],
+                           batch_size: Optional[int] = None,
+                           chunk_size: Optional[int] = None,
+                           chunk_overlap: Optional[int] = None) -> Dict[str, Any]:
+        """Split notes into heading-aware chunks and (re)write them in batches
+
+        Any previous chunks of each note are replaced, so a note that shrinks
+        doesn't leave stale chunks behind.
+
+        Args:
+            notes: Iterable of dicts with 'note_id', 'content' and optional 'metadata'
+            batch_size: Chunks per write (defaults to EMBEDDING_BATCH_SIZE)
+            chunk_size: Chunk length in characters (defaults to CHUNK_SIZE)
+            chunk_overlap: Overlap between windows of a long section (defaults to CHUNK_OVERLAP)
+
+        Returns:
+            {'written': [note_id, ...], 'failed': {note_id: error, ...}} keyed by parent note
+        """
+        result = {'written': [], 'failed': {}}
+        if not self.enabled:
+            return result
+
+        chunks = []
+        parents = []
+        for note in notes:
+            note_id = note.get('note_id')
+            content = note.get('content')
+            if not note_id or not content:
+                result['failed'][note_id or '<missing id>'] = "note_id and content are required"
+                continue
+
+            parents.append(note_id)
+            metadata = self._clean_metadata(note.get('metadata'))
+            for chunk in chunk_markdown(content, chunk_size, chunk_overlap):
+                chunks.append({
+                    'note_id': f"{note_id}::chunk{chunk['index']:04d}",
+                    'content': chunk['text'],
+                    'metadata': {
+                        **metadata,
+                        'parent_note_id': note_id,
+                        'chunk_index': chunk['index'],
+                        'heading': chunk['heading']
+                    }
+                })
+
+        if not parents:
+            return result
+
+        try:
+            self.chunk_collection.delete(where={'parent_note_id': {'$in': parents}})
+        except Exception as e:
+            print(f"⚠ Vector store chunk cleanup failed: {e}")
+
+        chunk_result = self._write_notes('upsert', chunks, batch_size, self.chunk_collection)
+
+        for chunk_id, error in chunk_result['failed'].items():
+            parent = chunk_id.split('::chunk')[0]
+            result['failed'].setdefault(parent, error)
+        result['written'] = [p for p in parents if p not in result['failed']]
+        return result
+
+    def _write_notes(self, method: str, notes: Iterable[Dict[str, Any]],
+                     batch_size: Optional[int], collection=None) -> Dict[str, Any]:
+        result = {'written': [], 'failed': {}}
+        if not self.enabled:
+            return result
+
+        collection = collection or self.collection
+        batch_size = max(1, batch_size or EMBEDDING_BATCH_SIZE)
+        batch: Dict[str, Dict[str, Any]] = {}
+
+        for note in notes:
+            note_id = note.get('note_id')
+            content = note.get('content')
+            if not note_id or not content:
+                result['failed'][note_id or '<missing id>'] = "note_id and content are required"
+                continue
+
+            # Duplicate ids in one call are rejected by Chroma - last one wins
+            batch[note_id] = note
+            if len(batch) >= batch_size:
+                self._write_batch(collection, method, list(batch.values()), result)
+                batch = {}
+
+        if batch:
+            self._write_batch(collection, method, list(batch.values()), result)
+
+        return result
+
+    def _write_batch(self, collection, method: str, batch: List[Dict[str, Any]],
+                     result: Dict[str, Any]):
+        """Write one batch; on failure retry item by item to isolate bad documents"""
+        write = getattr(collection, method)
+
+        try:
+            write(
+                ids=[n['note_id'] for n in batch],
+                documents=[n['content'] for n in batch],
+                metadatas=[self._clean_metadata(n.get('metadata')) for n in batch]
+            )
+            result['written'].extend(n['note_id'] for n in batch)
+            return
+        except Exception as e:
+            if len(batch) == 1:
+                result['failed'][batch[0]['note_id']] = str(e)
+                return
+            print(f"⚠ Vector store batch {method} failed ({e}) - retrying {len(batch)} notes individually")
+
+        for note in batch:
+            try:
+                write(
+                    ids=[note['note_id']],
+                    documents=[note['content']],
+                    metadatas=[self._clean_metadata(note.get('metadata'))]
+                )
+                result['written'].append(note['note_id'])
+            except Exception as e:
+                result['failed'][note['note_id']] = str(e)
+
     def semantic_search(self, query: str, n_results: int = 5) -> List[Dict[str, Any]]:
-        """Perform semantic search"""
+        """Perform semantic search
+
+        Uses the chunk index when it has been built: the best matching chunks
+        are grouped back to their parent notes and only those chunks are
+        returned as the note content. Falls back to whole-note search otherwise.
+        """
         if not self.enabled:
             return []
 
         try:
+            if self.chunk_collection.count() > 0:
+                return self._chunk_search(query, n_results)
+
             results = self.collection.query(
                 query_texts=[query],
                 n_results=n_results
@@ -91,6 +263,45 @@ class VectorStore:
             print(f"⚠ Vector search failed: {e}")
             return []
 
+    def _chunk_search(self, query: str, n_results: int) -> List[Dict[str, Any]]:
+        """Query chunks and group hits by parent note, best note first"""
+        results = self.chunk_collection.query(
+            query_texts=[query],
+            n_results=n_results * CHUNK_OVERSAMPLE
+        )
+
+        grouped: Dict[str, Dict[str, Any]] = {}
+        if results['ids'] and results['ids'][0]:
+            for i, chunk_id in enumerate(results['ids'][0]):
+                metadata = dict(results['metadatas'][0][i]) if results['metadatas'] else {}
+                distance = results['distances'][0][i] if results.get('distances') else 0
+                parent_id = metadata.pop('parent_note_id', chunk_id)
+                chunk = {
+                    'chunk_index': metadata.pop('chunk_index', 0),
+                    'heading': metadata.pop('heading', ''),
+                    'content': results['documents'][0][i] if results['documents'] else '',
+                    'distance': distance
+                }
+
+                # Hits arrive in distance order, so the first chunk seen is the note's best
+                note = grouped.setdefault(parent_id, {
+                    'note_id': parent_id,
+                    'metadata': metadata,
+                    'distance': distance,
+                    'chunks': []
+                })
+                if len(note['chunks']) < MAX_CHUNKS_PER_NOTE:
+                    note['chunks'].append(chunk)
+
+        formatted = []
+        for note in list(grouped.values())[:n_results]:
+            # Present the kept chunks in document order
+            note['chunks'].sort(key=lambda c: c['chunk_index'])
+            note['content'] = '\n\n...\n\n'.join(c['content'] for c in note['chunks'])
+            formatted.append(note)
+
+        return formatted
+
     def update_note(self, note_id: str, content: str, metadata: Dict[str, Any] = None):
         """Update a note in the vector store"""
         if not self.enabled:
@@ -112,9 +323,41 @@ class VectorStore:
 
         try:
             self.collection.delete(ids=[note_id])
+            self.chunk_collection.delete(where={'parent_note_id': note_id})
         except Exception as e:
             print(f"⚠ Vector store delete failed: {e}")
 
+    def list_note_ids(self, batch_size: int = 1000) -> set:
+        """Ids of every note in the store, whole notes and chunk parents alike"""
+        note_ids = set()
+        if not self.enabled:
+            return note_ids
+
+        for collection, include in ((self.collection, []), (self.chunk_collection, ['metadatas'])):
+            offset = 0
+            while True:
+                page = collection.get(include=include, limit=batch_size, offset=offset)
+                if include:
+                    note_ids.update(m['parent_note_id'] for m in page['metadatas'] if m)
+                else:
+                    note_ids.update(page['ids'])
+                if len(page['ids']) < batch_size:
+                    break
+                offset += batch_size
+        return note_ids
+
+    @staticmethod
+    def _clean_metadata(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Convert lists to strings for ChromaDB compatibility"""
+        clean_metadata = {}
+        if metadata:
+            for key, value in metadata.items():
+                if isinstance(value, list):
+                    clean_metadata[key] = ', '.join(str(v) for v in value)
+                else:
+                    clean_metadata[key] = value
+        return clean_metadata
+
     def get_stats(self) -> Dict[str, Any]:
         """Get vector store statistics"""
         if not self.enabled:
@@ -125,6 +368,7 @@ class VectorStore:
             return {
                 "enabled": True,
                 "total_notes": count,
+                "total_chunks": self.chunk_collection.count(),
                 "collection": "obsidian_notes"
             }
         except Exception as e:
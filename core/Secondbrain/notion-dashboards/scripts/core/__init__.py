@@ -6,6 +6,7 @@ This package provides shared infrastructure:
 - Error handling
 - Logging
 - Retry logic
+- Change detection
 - Base sync class
 """
 
@@ -44,6 +45,8 @@ from core.retry import (
     RetryBudgetExhausted,
 )
 
+from core.change_detection import ChangeTracker, fingerprint_property
+
 from core.base_sync import BaseSyncClient
 
 __all__ = [
@@ -74,6 +77,9 @@ __all__ = [
     "retry_notion_api",
     "RetryBudget",
     "RetryBudgetExhausted",
+    # Change detection
+    "ChangeTracker",
+    "fingerprint_property",
     # Base class
     "BaseSyncClient",
 ]
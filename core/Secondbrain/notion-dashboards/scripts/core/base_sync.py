@@ -10,7 +10,8 @@ Provides common functionality:
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
 
 from core.config import Config, load_config
 from core.errors import (
@@ -21,12 +22,15 @@ from core.errors import (
 )
 from core.logging_config import get_logger
 from core.retry import retry_notion_api
+from core.change_detection import ChangeTracker
 
 # Import NotionWrapper - handle path flexibility
 try:
     from notion_client_wrapper import NotionWrapper
+    from resilience import AdaptiveRateLimiter, WriteScheduler
 except ImportError:
     from scripts.notion_client_wrapper import NotionWrapper
+    from scripts.resilience import AdaptiveRateLimiter, WriteScheduler
 
 
 class BaseSyncClient(ABC):
@@ -43,6 +47,10 @@ class BaseSyncClient(ABC):
     - primary_database: Property returning the main database name
     - sync(): Main sync operation
     
+    Subclasses may set heartbeat_properties to property names that change
+    on every run (e.g. "Last Seen"); updates touching only those are
+    written at most once per day.
+    
     Example:
         class CustomerSync(BaseSyncClient):
             @property
@@ -53,6 +61,8 @@ class BaseSyncClient(ABC):
                 # Implementation...
     """
     
+    heartbeat_properties: Tuple[str, ...] = ()
+    
     def __init__(
         self,
         config_path: str,
@@ -80,6 +90,18 @@ class BaseSyncClient(ABC):
         # Load configuration
         self.config = load_config(config_path)
         
+        # Shared write scheduler: one token bucket for every request this
+        # sync makes, and a small pool to keep the bucket busy
+        settings = self.config.settings
+        self.scheduler = WriteScheduler(
+            AdaptiveRateLimiter(
+                rate=settings.requests_per_second,
+                burst=max(1, int(settings.requests_per_second)),
+                name="notion"
+            ),
+            max_workers=settings.max_write_workers
+        )
+        
         # Initialize Notion client (None if dry-run)
         self._client: Optional[NotionWrapper] = None
         if not dry_run:
@@ -87,11 +109,20 @@ class BaseSyncClient(ABC):
         
         # Cache for page lookups
         self._page_cache: Dict[str, Dict[str, str]] = {}
+        
+        # Fingerprints of what was last written, to skip no-op updates
+        state_dir = settings.state_dir or Path(config_path).parent / "state"
+        self.change_tracker = ChangeTracker(
+            Path(state_dir) / f"{self.__class__.__name__}.json"
+        )
     
     def _init_client(self) -> None:
         """Initialize Notion client with token from config."""
         try:
-            self._client = NotionWrapper(token=self.config.notion_token)
+            self._client = NotionWrapper(
+                token=self.config.notion_token,
+                rate_limiter=self.scheduler.rate_limiter
+            )
             self.logger.debug("Notion client initialized")
         except Exception as e:
             raise ConfigurationError(
@@ -284,6 +315,127 @@ class BaseSyncClient(ABC):
         except Exception as e:
             raise map_notion_api_error(e)
     
+    def bulk_upsert(
+        self,
+        db_name: str,
+        rows: List[Tuple[str, Dict]]
+    ) -> List[Dict]:
+        """
+        Upsert many pages by title with one database scan.
+
+        Pages whose properties already match are skipped and updates only
+        send changed properties. Per-row API errors are reported in the
+        results rather than raised.
+
+        Args:
+            db_name: Target database name
+            rows: List of (title, properties) tuples
+
+        Returns:
+            List of {"title", "status", "action", ...} in row order
+        """
+        if self.dry_run:
+            self.logger.info(f"[DRY RUN] Would upsert {len(rows)} pages in {db_name}")
+            return [
+                {"title": title, "status": "dry_run", "action": "dry_run"}
+                for title, _ in rows
+            ]
+
+        db_id = self.get_db_id(db_name)
+        try:
+            index = self.client.load_title_index(db_id)
+        except Exception as e:
+            raise map_notion_api_error(e)
+
+        # Diff against the pages just fetched (so hand edits in Notion are
+        # repaired); heartbeat-only changes wait until the next day
+        results: List[Optional[Dict]] = [None] * len(rows)
+        pending = []
+        for i, (title, properties) in enumerate(rows):
+            if title in index:
+                properties = NotionWrapper.diff_properties(index[title], properties)
+                if not self.change_tracker.due(f"{db_name}:{title}", properties, self.heartbeat_properties):
+                    results[i] = {"title": title, "status": "success", "action": "unchanged", "page": index[title]}
+                    continue
+            pending.append((i, title, properties))
+
+        written = self.client.bulk_upsert(
+            db_id,
+            [(title, properties) for _, title, properties in pending],
+            max_workers=self.scheduler.max_workers
+        )
+        for (i, title, properties), result in zip(pending, written):
+            results[i] = result
+            if result["status"] == "success":
+                self.change_tracker.record(f"{db_name}:{title}", properties, verified=True)
+
+        for result in results:
+            if result["status"] == "success":
+                self._page_cache.setdefault(db_name, {})[result["title"]] = result["page"]["id"]
+        self.change_tracker.save()
+        return results
+    
+    def update_page_if_changed(
+        self,
+        page_id: str,
+        properties: Dict,
+        key: Optional[str] = None,
+        page: Optional[Dict] = None
+    ) -> Tuple[Dict, str]:
+        """
+        Update a page only if the properties differ from what it holds.
+        
+        With page (as returned by query_database), the diff is against its
+        live properties, so hand edits in Notion are repaired. Otherwise it
+        is against the last write's fingerprints, which expire daily.
+        Changes limited to heartbeat_properties are coalesced to one write
+        per day. Call save_state() when the run is done.
+        
+        Args:
+            page_id: Page to update
+            properties: Desired properties
+            key: Change-tracking key (defaults to page_id)
+            page: Current page object, if already fetched
+        
+        Returns:
+            Tuple of (page, action) where action is "updated" or "unchanged"
+        """
+        key = key or page_id
+        if page is not None:
+            changed = NotionWrapper.diff_properties(page, properties)
+            if not self.change_tracker.due(key, changed, self.heartbeat_properties):
+                changed = {}
+        else:
+            changed = self.change_tracker.changes(key, properties, self.heartbeat_properties)
+        if not changed:
+            return {"id": page_id}, "unchanged"
+        
+        updated = self.update_page(page_id, changed)
+        if not self.dry_run:
+            self.change_tracker.record(key, changed, verified=page is not None)
+        return updated, "updated"
+    
+    def save_state(self) -> None:
+        """Persist change-detection fingerprints (no-op in dry-run mode)."""
+        if not self.dry_run:
+            self.change_tracker.save()
+    
+    def run_concurrently(self, func, items: List[Any]) -> List[Tuple[Any, Optional[Exception]]]:
+        """
+        Run independent per-item operations on the write scheduler.
+        
+        Every Notion request still passes through the shared rate limiter,
+        so this only fills the idle time between requests.
+        
+        Args:
+            func: Callable taking one item
+            items: Items to process
+        
+        Returns:
+            (result, error) per item, in input order
+        """
+        return self.scheduler.map(func, items)
+    
     @retry_notion_api()
     def query_database(
         self,
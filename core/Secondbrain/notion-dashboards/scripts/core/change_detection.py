@@ -0,0 +1,197 @@
+"""
+Property-level change detection for Notion writes.
+
+Keeps a fingerprint of every property last written to each page in a local
+JSON state file, so syncs can skip no-op updates without reading the page
+back from Notion. "Heartbeat" properties (e.g. Last Seen) that change on
+every run are written at most once per day unless something material
+changed alongside them.
+
+Fingerprints only describe what this sync last wrote, so a page edited by
+hand in Notion looks unchanged. Callers that already hold the page diff
+against it and use the tracker only for heartbeat coalescing; otherwise
+fingerprints not confirmed by a full write within max_age_days expire and
+the whole payload is written again, repairing any drift.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from core.logging_config import get_logger
+
+# Import NotionWrapper - handle path flexibility
+try:
+    from notion_client_wrapper import NotionWrapper
+except ImportError:
+    from scripts.notion_client_wrapper import NotionWrapper
+
+logger = get_logger(__name__)
+
+STATE_VERSION = 1
+
+
+def fingerprint_property(prop: Dict) -> str:
+    """Short stable hash of a property's normalized value."""
+    value = NotionWrapper.normalize_property(prop)
+    raw = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class ChangeTracker:
+    """
+    Per-page property fingerprints persisted between sync runs.
+
+    Pages are identified by a caller-chosen key (page ID, "db:title",
+    alert UID...). Thread-safe, so it can be used from the write scheduler.
+
+    Example:
+        tracker = ChangeTracker(Path("state/DeviceIssuesSyncClient.json"))
+        to_write = tracker.changes(key, properties, heartbeat=("Last Seen",))
+        if to_write:
+            client.update_page(page_id, to_write)
+            tracker.record(key, to_write)
+        tracker.save()
+    """
+
+    def __init__(self, state_path: Path, max_age_days: int = 1):
+        self.state_path = Path(state_path)
+        self.max_age_days = max_age_days
+        self._pages: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        """Load fingerprints from disk (missing or corrupt file = empty state)."""
+        if not self.state_path.exists():
+            return
+        try:
+            with open(self.state_path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == STATE_VERSION:
+                self._pages = data.get("pages", {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable sync state {self.state_path}: {e}")
+
+    def save(self) -> None:
+        """Write fingerprints to disk atomically if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {
+                "version": STATE_VERSION,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+                "pages": self._pages,
+            }
+            self._dirty = False
+
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(self.state_path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def changes(
+        self,
+        key: str,
+        properties: Dict,
+        heartbeat: Iterable[str] = (),
+        today: Optional[str] = None
+    ) -> Dict:
+        """
+        Return the properties that need writing for a page.
+
+        Args:
+            key: Page identifier
+            properties: Desired Notion property payloads
+            heartbeat: Property names whose changes alone are coalesced
+            today: Date override (YYYY-MM-DD) for testing
+
+        Returns:
+            All properties for an unknown page or one whose fingerprints
+            have expired; otherwise the changed properties, or {} when
+            nothing material changed and the heartbeat was already
+            written today.
+        """
+        today = today or self._today()
+        with self._lock:
+            state = self._pages.get(key)
+        if state is None or self._expired(state, today):
+            return dict(properties)
+
+        stored = state.get("props", {})
+        changed = {
+            name: prop for name, prop in properties.items()
+            if stored.get(name) != fingerprint_property(prop)
+        }
+        return changed if self.due(key, changed, heartbeat, today) else {}
+
+    def due(
+        self,
+        key: str,
+        changed: Dict,
+        heartbeat: Iterable[str] = (),
+        today: Optional[str] = None
+    ) -> bool:
+        """
+        Whether a set of changed properties should be written now.
+
+        Use with a diff against the live page: changes limited to heartbeat
+        properties are held back if the page was already written today.
+        """
+        if not changed:
+            return False
+        heartbeat = set(heartbeat)
+        if any(name not in heartbeat for name in changed):
+            return True
+        with self._lock:
+            state = self._pages.get(key)
+        return state is None or state.get("written_on") != (today or self._today())
+
+    def _expired(self, state: Dict, today: str) -> bool:
+        verified_on = state.get("verified_on") or state.get("written_on")
+        if not verified_on:
+            return True
+        age = date.fromisoformat(today) - date.fromisoformat(verified_on)
+        return age.days > self.max_age_days
+
+    def record(self, key: str, written: Dict, today: Optional[str] = None, verified: bool = False) -> None:
+        """
+        Remember the properties just written to a page.
+
+        A write covering every tracked property (or verified=True, after a
+        diff against the live page) confirms the fingerprints and restarts
+        their expiry.
+        """
+        today = today or self._today()
+        fingerprints = {name: fingerprint_property(prop) for name, prop in written.items()}
+        with self._lock:
+            state = self._pages.setdefault(key, {"props": {}})
+            if verified or set(state["props"]) <= set(fingerprints):
+                state["verified_on"] = today
+            state["props"].update(fingerprints)
+            state["written_on"] = today
+            self._dirty = True
+
+    def forget(self, key: str) -> None:
+        """Drop a page's state (e.g. after it is archived or resolved)."""
+        with self._lock:
+            if self._pages.pop(key, None) is not None:
+                self._dirty = True
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._pages
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pages)
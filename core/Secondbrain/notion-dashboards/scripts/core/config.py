@@ -33,6 +33,9 @@ class SyncSettings:
     health_score_critical_threshold: int = 50
     batch_pause_seconds: float = 0.35
     max_retries: int = 3
+    requests_per_second: float = 3.0
+    max_write_workers: int = 4
+    state_dir: Optional[str] = None  # Change-detection state (default: <config dir>/state)
 
 
 @dataclass
@@ -147,6 +150,9 @@ class Config:
             health_score_critical_threshold=settings_data.get("health_score_critical_threshold", 50),
             batch_pause_seconds=settings_data.get("batch_pause_seconds", 0.35),
             max_retries=settings_data.get("max_retries", 3),
+            requests_per_second=settings_data.get("requests_per_second", 3.0),
+            max_write_workers=settings_data.get("max_write_workers", 4),
+            state_dir=settings_data.get("state_dir"),
         )
         
         # Maker/checker
@@ -31,7 +31,7 @@ import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 # Import from core modules
 from core import (
@@ -47,6 +47,7 @@ from services.health_score import (
     HealthScoreCalculator,
     HealthMetrics,
     HealthStatus,
+    HealthResult,
 )
 
 # Import NotionWrapper for static property builders
@@ -215,6 +216,9 @@ class CustomerStatusSync(BaseSyncClient):
         print(syncer.generate_report(results))
     """
     
+    # Health check date moves every day; alone it is written once per day
+    heartbeat_properties = ("Last Health Check",)
+    
     def __init__(
         self,
         config_path: str,
@@ -302,12 +306,12 @@ class CustomerStatusSync(BaseSyncClient):
         
         return properties, health_result
     
-    def sync_site(self, site_data: Dict) -> Dict:
+    def prepare_site(self, site_data: Dict) -> Tuple[Dict, HealthResult]:
         """
-        Sync a single site to Notion.
+        Fetch NinjaOne data and build the page properties for one site.
         
-        Creates new page or updates existing based on site name match.
-        Uses inherited upsert_page with retry logic.
+        Raises:
+            DataSourceError: If NinjaOne data cannot be fetched
         """
         site_name = site_data["name"]
         self.logger.info(f"Syncing site: {site_name}")
@@ -327,6 +331,18 @@ class CustomerStatusSync(BaseSyncClient):
                 f"Site {site_name} requires review: {', '.join(health_result.review_reasons)}"
             )
         
+        return properties, health_result
+    
+    def sync_site(self, site_data: Dict) -> Dict:
+        """
+        Sync a single site to Notion.
+        
+        Creates new page or updates existing based on site name match.
+        Uses inherited upsert_page with retry logic.
+        """
+        site_name = site_data["name"]
+        properties, health_result = self.prepare_site(site_data)
+        
         if self.dry_run:
             self.logger.info(f"[DRY RUN] Would sync: {site_name} (score: {health_result.score})")
             return {
@@ -386,6 +402,9 @@ class CustomerStatusSync(BaseSyncClient):
                 "Consider --dry-run first."
             )
         
+        if not self.dry_run:
+            return self.sync_bulk(sites)
+        
         # Sync each site
         for site in sites:
             try:
@@ -415,6 +434,65 @@ class CustomerStatusSync(BaseSyncClient):
         
         return results
     
+    def sync_bulk(self, sites: List[Dict]) -> List[Dict]:
+        """
+        Build every site's properties, then write them in one bulk upsert.
+        
+        The customer database is scanned once for existing pages and sites
+        whose properties haven't changed are not written at all.
+        """
+        results: Dict[str, Dict] = {}
+        rows = []
+        health = {}
+        
+        for site in sites:
+            try:
+                properties, health_result = self.prepare_site(site)
+                rows.append((site["name"], properties))
+                health[site["name"]] = health_result
+            except NotionSyncError as e:
+                self.logger.error(f"Failed to sync {site['name']}: {e}")
+                results[site["name"]] = {
+                    "site": site["name"],
+                    "status": "error",
+                    "error": str(e),
+                    "error_type": type(e).__name__,
+                }
+            except Exception as e:
+                self.logger.error(f"Unexpected error syncing {site['name']}: {e}")
+                results[site["name"]] = {
+                    "site": site["name"],
+                    "status": "error",
+                    "error": str(e),
+                }
+        
+        for result in self.bulk_upsert(self.primary_database, rows):
+            site_name = result["title"]
+            health_result = health[site_name]
+            if result["status"] == "error":
+                self.logger.error(f"Failed to sync {site_name}: {result['error']}")
+                results[site_name] = {
+                    "site": site_name,
+                    "status": "error",
+                    "error": result["error"],
+                    "health_score": health_result.score,
+                }
+                continue
+            
+            self.logger.info(
+                f"{result['action'].capitalize()} page for: {site_name} (score: {health_result.score})"
+            )
+            results[site_name] = {
+                "site": site_name,
+                "status": "success",
+                "action": result["action"],
+                "health_score": health_result.score,
+                "requires_review": health_result.requires_review,
+            }
+        
+        # Report in the original site order
+        return [results[site["name"]] for site in sites if site["name"] in results]
+    
     def generate_report(self, results: List[Dict]) -> str:
         """
         Generate sync summary report.
@@ -424,6 +502,7 @@ class CustomerStatusSync(BaseSyncClient):
         successful = [r for r in results if r["status"] == "success"]
         created = len([r for r in results if r.get("action") == "created"])
         updated = len([r for r in results if r.get("action") == "updated"])
+        unchanged = len([r for r in results if r.get("action") == "unchanged"])
         failed = [r for r in results if r["status"] == "error"]
         dry_run = [r for r in results if r["status"] == "dry_run"]
         review_needed = [r for r in results if r.get("requires_review")]
@@ -437,7 +516,7 @@ Customer Status Sync Report
 {'=' * 50}
 Timestamp: {datetime.now().isoformat()}
 Total Sites: {len(results)}
-Successful: {len(successful)} (Created: {created}, Updated: {updated})
+Successful: {len(successful)} (Created: {created}, Updated: {updated}, Unchanged: {unchanged})
 Failed: {len(failed)}
 Dry Run: {len(dry_run)}
 
@@ -315,12 +315,12 @@ class DailyHealthSync(BaseSyncClient):
                 f"Bulk operation: {len(sites)} sites. This is expected for daily sync."
             )
         
-        # Sync each site
-        for site in sites:
-            try:
-                result = self.sync_site_health(site)
+        # Sync sites concurrently - the shared rate limiter paces the writes
+        outcomes = self.run_concurrently(self.sync_site_health, sites)
+        for site, (result, e) in zip(sites, outcomes):
+            if e is None:
                 results.append(result)
-            except NotionSyncError as e:
+            elif isinstance(e, NotionSyncError):
                 self.logger.error(f"Failed to sync {site.name}: {e}")
                 results.append({
                     "site": site.name,
@@ -328,7 +328,7 @@ class DailyHealthSync(BaseSyncClient):
                     "error": str(e),
                     "error_type": type(e).__name__,
                 })
-            except Exception as e:
+            else:
                 self.logger.error(f"Unexpected error syncing {site.name}: {e}")
                 results.append({
                     "site": site.name,
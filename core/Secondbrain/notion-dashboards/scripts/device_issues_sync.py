@@ -263,8 +263,11 @@ class DeviceIssuesSyncClient(BaseSyncClient):
     - Creates/updates pages in Notion
     - Deduplicates by alert UID
     - Marks resolved issues when alerts clear
+    - Bumps "Last Seen" at most once per day per issue
     """
 
+    heartbeat_properties = ("Last Seen",)
+
     def __init__(self, config_path: str, dry_run: bool = False, verbose: bool = False):
         super().__init__(config_path, dry_run, verbose)
 
@@ -326,6 +329,7 @@ class DeviceIssuesSyncClient(BaseSyncClient):
                     if uid:
                         existing[uid] = {
                             "page_id": page["id"],
+                            "page": page,
                             "status": props.get("Status", {}).get("select", {}).get("name", "new")
                         }
         except Exception as e:
@@ -333,6 +337,18 @@ class DeviceIssuesSyncClient(BaseSyncClient):
 
         return existing
 
+    def _create_issue(self, db_id: str, properties: Dict, alert_uid: str) -> Dict:
+        """Create an issue page and record its properties for change detection."""
+        page = self._client.create_page(db_id, properties)
+        self.change_tracker.record(f"alert:{alert_uid}", properties)
+        return page
+
+    def _resolve_issue(self, page_id: str, alert_uid: str) -> Dict:
+        """Mark an issue resolved and stop tracking its alert."""
+        page = self.update_page(page_id, {"Status": NotionWrapper.prop_select("resolved")})
+        self.change_tracker.forget(f"alert:{alert_uid}")
+        return page
+
     def _build_properties(self, alert: Dict, device: Optional[Dict], org_name: str) -> Dict:
         """
         Build Notion page properties from alert data.
@@ -421,6 +437,9 @@ class DeviceIssuesSyncClient(BaseSyncClient):
         # Track which alerts we see (for marking resolved)
         seen_uids = set()
 
+        # Notion writes are collected and run on the shared write scheduler
+        writes = []  # (result, write callable)
+
         # Process each alert
         for alert in alerts:
             alert_uid = alert.get("uid", "")
@@ -443,67 +462,80 @@ class DeviceIssuesSyncClient(BaseSyncClient):
             issue_type, severity = classify_alert(alert)
             device_name = properties["Device Name"]["title"][0]["text"]["content"]
 
+            result = {
+                "device": device_name,
+                "issue_type": issue_type,
+                "severity": severity,
+            }
+
             # Check if already exists
             if alert_uid in existing_issues:
-                # Update last seen date only
+                # Update last seen date only (skipped if already bumped today)
+                result["action"] = "updated"
+                results.append(result)
                 if not self.dry_run:
-                    try:
-                        self._client.update_page(
-                            existing_issues[alert_uid]["page_id"],
-                            {"Last Seen": NotionWrapper.prop_date(datetime.now(timezone.utc).strftime("%Y-%m-%d"))}
-                        )
-                    except Exception as e:
-                        self.logger.warning(f"Failed to update {device_name}: {e}")
-
-                results.append({
-                    "device": device_name,
-                    "action": "updated",
-                    "issue_type": issue_type,
-                    "severity": severity,
-                })
+                    issue = existing_issues[alert_uid]
+                    writes.append((result, lambda issue=issue, uid=alert_uid: self.update_page_if_changed(
+                        issue["page_id"],
+                        {"Last Seen": NotionWrapper.prop_date(datetime.now(timezone.utc).strftime("%Y-%m-%d"))},
+                        key=f"alert:{uid}",
+                        page=issue["page"]
+                    )))
             else:
                 # Create new issue
+                result["action"] = "created"
+                results.append(result)
                 if self.dry_run:
                     self.logger.info(f"[DRY RUN] Would create: {device_name} - {issue_type} ({severity})")
                 else:
-                    try:
-                        self._client.create_page(db_id, properties)
-                        self.logger.info(f"Created issue: {device_name} - {issue_type}")
-                    except Exception as e:
-                        self.logger.error(f"Failed to create issue for {device_name}: {e}")
-                        continue
-
-                results.append({
-                    "device": device_name,
-                    "action": "created",
-                    "issue_type": issue_type,
-                    "severity": severity,
-                })
+                    writes.append((result, lambda properties=properties, uid=alert_uid: self._create_issue(db_id, properties, uid)))
 
         # Mark resolved issues (alerts no longer active)
         resolved_count = 0
         for uid, issue_data in existing_issues.items():
             if uid not in seen_uids and issue_data["status"] != "resolved":
                 if not self.dry_run:
-                    try:
-                        self._client.update_page(
-                            issue_data["page_id"],
-                            {"Status": NotionWrapper.prop_select("resolved")}
-                        )
-                        resolved_count += 1
-                    except Exception as e:
-                        self.logger.warning(f"Failed to mark resolved: {e}")
+                    page_id = issue_data["page_id"]
+                    writes.append((None, lambda page_id=page_id, uid=uid: self._resolve_issue(page_id, uid)))
                 else:
                     self.logger.info(f"[DRY RUN] Would mark as resolved: {uid}")
                     resolved_count += 1
 
+        outcomes = self.run_concurrently(lambda write: write(), [write for _, write in writes])
+        failed = set()
+        for (result, _), (outcome, e) in zip(writes, outcomes):
+            if result is None:
+                # Resolve write
+                if e:
+                    self.logger.warning(f"Failed to mark resolved: {e}")
+                else:
+                    resolved_count += 1
+            elif e is None:
+                if result["action"] == "created":
+                    self.logger.info(f"Created issue: {result['device']} - {result['issue_type']}")
+                elif outcome[1] == "unchanged":
+                    result["action"] = "unchanged"
+            elif result["action"] == "created":
+                self.logger.error(f"Failed to create issue for {result['device']}: {e}")
+                failed.add(id(result))
+            else:
+                self.logger.warning(f"Failed to update {result['device']}: {e}")
+
+        # Failed creates are not reported as synced
+        results = [r for r in results if id(r) not in failed]
+        self.save_state()
+
         if resolved_count:
             self.logger.info(f"Marked {resolved_count} issues as resolved")
 
         # Summary
         created = sum(1 for r in results if r["action"] == "created")
         updated = sum(1 for r in results if r["action"] == "updated")
-        self.logger.info(f"Sync complete: {created} created, {updated} updated, {resolved_count} resolved")
+        unchanged = sum(1 for r in results if r["action"] == "unchanged")
+        self.logger.info(
+            f"Sync complete: {created} created, {updated} updated, "
+            f"{unchanged} unchanged, {resolved_count} resolved"
+        )
 
         return results
 
@@ -22,7 +22,7 @@ import os
 import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 from notion_client import Client
 from notion_client.helpers import iterate_paginated_api
@@ -33,7 +33,8 @@ try:
     from structured_logging import setup_logging, get_logger, log_operation, log_audit_event
     from resilience import (
         retry_with_backoff, rate_limited, validate_site_name,
-        validate_database_id, sanitize_for_notion, batch_with_recovery
+        validate_database_id, sanitize_for_notion, batch_with_recovery,
+        AdaptiveRateLimiter, WriteScheduler
     )
     SECURITY_MODULES_AVAILABLE = True
 except ImportError:
@@ -46,17 +47,28 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Notion's documented average limit is 3 requests/second per integration
+NOTION_REQUESTS_PER_SECOND = 3.0
+
 
 class NotionWrapper:
     """Wrapper around official notion-client SDK with helper methods."""
     
-    def __init__(self, token: Optional[str] = None, config_path: Optional[str] = None):
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        config_path: Optional[str] = None,
+        rate_limiter: Optional[Any] = None
+    ):
         """
         Initialize Notion client.
         
         Args:
             token: Notion integration token (or set NOTION_TOKEN env var)
             config_path: Path to config file with database IDs
+            rate_limiter: Token bucket gating every API request; share one
+                between clients/threads using the same integration token.
+                Defaults to an AdaptiveRateLimiter at Notion's limit.
         """
         self.token = token or os.getenv("NOTION_TOKEN")
         if not self.token:
@@ -72,6 +84,17 @@ class NotionWrapper:
         self.config = {}
         if config_path:
             self.load_config(config_path)
+
+        if rate_limiter is None and SECURITY_MODULES_AVAILABLE:
+            rate_limiter = AdaptiveRateLimiter(
+                rate=NOTION_REQUESTS_PER_SECOND, burst=3, name="notion"
+            )
+        self.rate_limiter = rate_limiter
+
+        # Per-run caches: database schemas and title -> page maps.
+        # Both live as long as this wrapper instance (one sync run).
+        self._schema_cache: Dict[str, Dict] = {}
+        self._title_index: Dict[str, Dict[str, Dict]] = {}
     
     def load_config(self, config_path: str) -> None:
         """Load configuration with database IDs."""
@@ -83,27 +106,89 @@ class NotionWrapper:
     # Database Operations
     # =========================================================================
     
-    def get_database(self, database_id: str) -> Dict:
-        """Retrieve database schema and metadata."""
+    def get_database(self, database_id: str, use_cache: bool = True) -> Dict:
+        """Retrieve database schema and metadata (cached per instance)."""
         if SECURITY_MODULES_AVAILABLE:
             database_id = validate_database_id(database_id)
-        return self._retry_api_call(
+        if use_cache and database_id in self._schema_cache:
+            return self._schema_cache[database_id]
+
+        db = self._retry_api_call(
             lambda: self.client.databases.retrieve(database_id=database_id)
         )
+        self._schema_cache[database_id] = db
+        return db
+
+    def get_title_property(self, database_id: str) -> Optional[str]:
+        """Name of the database's title property (from the cached schema)."""
+        db = self.get_database(database_id)
+        for name, prop in db.get("properties", {}).items():
+            if prop.get("type") == "title":
+                return name
+        return None
+
+    def load_title_index(self, database_id: str, refresh: bool = False) -> Dict[str, Dict]:
+        """
+        Page through the whole database once and index pages by title.
+
+        Subsequent find_page_by_title/upsert_page/bulk_upsert calls against
+        this database are answered from the index instead of a filtered query.
+        Pages created through this wrapper are added to the index.
+
+        Args:
+            database_id: Database to index
+            refresh: Re-query even if an index is already loaded
+
+        Returns:
+            Dict of title -> page object
+        """
+        if not refresh and database_id in self._title_index:
+            return self._title_index[database_id]
+
+        index = {}
+        for page in self.query_database(database_id):
+            title = self.extract_title(page)
+            # Keep the first page on duplicate titles - matches filtered-query behaviour
+            if title and title not in index:
+                index[title] = page
+        self._title_index[database_id] = index
+        logger.info(f"Indexed {len(index)} pages by title in database {database_id[:8]}...")
+        return index
+
+    def clear_caches(self, database_id: Optional[str] = None) -> None:
+        """Drop cached schemas and title indexes (one database or all)."""
+        if database_id:
+            self._schema_cache.pop(database_id, None)
+            self._title_index.pop(database_id, None)
+        else:
+            self._schema_cache.clear()
+            self._title_index.clear()
 
     def _retry_api_call(self, func, max_retries: int = 3) -> Any:
-        """Execute API call with retry logic."""
+        """Execute API call with rate limiting and retry logic."""
         import time
         from notion_client.errors import APIResponseError
 
         last_error = None
         for attempt in range(max_retries):
+            if self.rate_limiter and not self.rate_limiter.wait_and_acquire(timeout=120.0):
+                raise TimeoutError("Timed out waiting for Notion rate limit")
             try:
-                return func()
+                result = func()
+                if hasattr(self.rate_limiter, "reward"):
+                    self.rate_limiter.reward()
+                return result
             except APIResponseError as e:
                 last_error = e
-                # Retry on rate limit (429) or server errors (5xx)
-                if e.status in (429, 500, 502, 503, 504):
+                if e.status == 429:
+                    # Honour Retry-After; an adaptive limiter pauses every worker
+                    retry_after = self._retry_after(e)
+                    if hasattr(self.rate_limiter, "penalize"):
+                        self.rate_limiter.penalize(retry_after)
+                    else:
+                        time.sleep(retry_after or min(2 ** attempt, 30))
+                    logger.warning(f"API error 429, retry {attempt+1}/{max_retries}")
+                elif e.status in (500, 502, 503, 504):
                     delay = min(2 ** attempt, 30)
                     logger.warning(f"API error {e.status}, retry {attempt+1}/{max_retries} in {delay}s")
                     time.sleep(delay)
@@ -117,6 +202,15 @@ class NotionWrapper:
 
         raise last_error
     
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """Seconds from a response's Retry-After header, if present."""
+        headers = getattr(error, "headers", None) or {}
+        try:
+            return float(headers.get("retry-after"))
+        except (TypeError, ValueError):
+            return None
+
     def query_database(
         self,
         database_id: str,
@@ -459,14 +553,11 @@ class NotionWrapper:
     
     def find_page_by_title(self, database_id: str, title: str) -> Optional[Dict]:
         """Find a page by its title property."""
-        # Get database to find title property name
-        db = self.get_database(database_id)
-        title_prop_name = None
-        for name, prop in db.get("properties", {}).items():
-            if prop.get("type") == "title":
-                title_prop_name = name
-                break
-        
+        # Answer from the title index when one has been loaded for this run
+        if database_id in self._title_index:
+            return self._title_index[database_id].get(title)
+
+        title_prop_name = self.get_title_property(database_id)
         if not title_prop_name:
             logger.warning("No title property found in database")
             return None
@@ -513,44 +604,206 @@ class NotionWrapper:
         existing = self.find_page_by_title(database_id, title)
         if existing:
             page = self.update_page(existing["id"], properties)
+            self._index_page(database_id, title, page)
             return page, "updated"
         
         page = self.create_page(database_id, properties)
+        self._index_page(database_id, title, page)
         return page, "created"
+
+    def bulk_upsert(
+        self,
+        database_id: str,
+        rows: List[Tuple[str, Dict]],
+        max_workers: int = 4
+    ) -> List[Dict]:
+        """
+        Upsert many pages by title, writing only what changed.
+
+        Loads the title index once, then for each row creates the page if
+        missing, skips it if every desired property already matches, or
+        updates only the properties that differ.
+
+        Args:
+            database_id: Target database
+            rows: List of (title, properties) tuples
+            max_workers: Concurrent writes (all share the rate limiter)
+
+        Returns:
+            List of {"title", "status", "action", "page"|"error"} in row order,
+            action being "created", "updated" or "unchanged"
+        """
+        index = self.load_title_index(database_id)
+
+        results: List[Optional[Dict]] = [None] * len(rows)
+        writes = []
+        seen = set()
+        for i, (title, properties) in enumerate(rows):
+            existing = index.get(title)
+            if existing is not None:
+                properties = self.diff_properties(existing, properties)
+                if not properties:
+                    results[i] = {"title": title, "status": "success", "action": "unchanged", "page": existing}
+                    continue
+            elif title in seen:
+                # Repeated new title - create once, later rows update it
+                writes.append((i, title, rows[i][1], True))
+                continue
+            seen.add(title)
+            writes.append((i, title, properties, False))
+
+        def write(job):
+            _, title, properties, _ = job
+            existing = index.get(title)
+            if existing is None:
+                page = self.create_page(database_id, properties)
+                action = "created"
+            else:
+                page = self.update_page(existing["id"], properties)
+                action = "updated"
+            self._index_page(database_id, title, page)
+            return page, action
+
+        # Repeats of a new title must wait for its create to land in the index
+        first = [job for job in writes if not job[3]]
+        repeats = [job for job in writes if job[3]]
+        for batch in (first, repeats):
+            for job, (outcome, error) in zip(batch, self._map_writes(write, batch, max_workers)):
+                i, title = job[0], job[1]
+                if error:
+                    logger.error(f"Failed to upsert '{title}': {error}")
+                    results[i] = {"title": title, "status": "error", "error": str(error)}
+                else:
+                    page, action = outcome
+                    results[i] = {"title": title, "status": "success", "action": action, "page": page}
+
+        return results
+
+    def _map_writes(self, func, items: List[Any], max_workers: int) -> List[Tuple[Any, Optional[Exception]]]:
+        """Run writes on a WriteScheduler sharing this client's rate limiter."""
+        if SECURITY_MODULES_AVAILABLE and self.rate_limiter is not None:
+            return WriteScheduler(self.rate_limiter, max_workers=max_workers).map(func, items)
+
+        outcomes = []
+        for item in items:
+            try:
+                outcomes.append((func(item), None))
+            except Exception as e:
+                outcomes.append((None, e))
+        return outcomes
+
+    def _index_page(self, database_id: str, title: str, page: Dict) -> None:
+        """Keep a loaded title index current after a write."""
+        if database_id in self._title_index and page.get("properties"):
+            self._title_index[database_id][title] = page
+
+    @classmethod
+    def diff_properties(cls, page: Dict, properties: Dict) -> Dict:
+        """
+        Return the subset of desired properties that differ from a page.
+
+        Both sides are reduced to plain values (see normalize_property), so
+        formatting differences such as text annotations or dashed IDs don't
+        count as changes. Properties missing from the page count as changed.
+        """
+        current = page.get("properties", {})
+        changed = {}
+        for name, desired in properties.items():
+            if name not in current:
+                changed[name] = desired
+            elif cls.normalize_property(current[name]) != cls.normalize_property(desired):
+                changed[name] = desired
+        return changed
+
+    @staticmethod
+    def normalize_property(prop: Dict) -> Any:
+        """
+        Reduce a property value or builder payload to a comparable value.
+
+        Accepts both page property objects (with "type") and the payloads
+        built by the prop_* helpers.
+        """
+        prop_type = prop.get("type")
+        if prop_type not in prop:
+            prop_type = next((k for k in prop if k not in ("id", "type")), None)
+        value = prop.get(prop_type)
+
+        if prop_type in ("title", "rich_text"):
+            return "".join(
+                t.get("plain_text") or t.get("text", {}).get("content", "")
+                for t in value or []
+            )
+        if prop_type in ("select", "status"):
+            return value.get("name") if value else None
+        if prop_type == "multi_select":
+            return sorted(o.get("name") for o in value or [])
+        if prop_type == "date":
+            if not value:
+                return None
+            return (value.get("start"), value.get("end"))
+        if prop_type in ("relation", "people"):
+            return sorted(r.get("id", "").replace("-", "") for r in value or [])
+        if prop_type == "files":
+            return [
+                f.get("external", {}).get("url") or f.get("file", {}).get("url")
+                for f in value or []
+            ]
+        if prop_type == "number" and value is not None:
+            return float(value)
+        return value
     
     def bulk_create_pages(
         self,
         database_id: str,
         pages_data: List[Dict],
-        batch_pause: float = 0.35
+        batch_pause: float = 0.35,
+        max_workers: int = 4
     ) -> List[Dict]:
         """
         Create multiple pages with rate limiting.
         
-        Notion rate limit is ~3 requests/second, so we pause between requests.
+        With a rate limiter, pages are created concurrently and the limiter
+        keeps requests at Notion's ~3 requests/second. Without one, pages
+        are created one at a time with batch_pause between requests.
         
         Args:
             database_id: Target database
             pages_data: List of property dicts for each page
-            batch_pause: Seconds to pause between requests
+            batch_pause: Seconds to pause between requests (no rate limiter only)
+            max_workers: Concurrent writes when a rate limiter is available
         
         Returns:
-            List of created page objects
+            List of {"status", "page"|"error"} in input order
         """
         import time
         
-        results = []
-        for i, properties in enumerate(pages_data):
-            try:
-                page = self.create_page(database_id, properties)
-                results.append({"status": "success", "page": page})
-            except Exception as e:
-                logger.error(f"Failed to create page {i}: {e}")
-                results.append({"status": "error", "error": str(e)})
+        if self.rate_limiter is None:
+            results = []
+            for i, properties in enumerate(pages_data):
+                try:
+                    page = self.create_page(database_id, properties)
+                    results.append({"status": "success", "page": page})
+                except Exception as e:
+                    logger.error(f"Failed to create page {i}: {e}")
+                    results.append({"status": "error", "error": str(e)})
+                
+                if i < len(pages_data) - 1:
+                    time.sleep(batch_pause)
             
-            if i < len(pages_data) - 1:
-                time.sleep(batch_pause)
+            return results
         
+        outcomes = self._map_writes(
+            lambda properties: self.create_page(database_id, properties),
+            pages_data,
+            max_workers
+        )
+        results = []
+        for i, (page, error) in enumerate(outcomes):
+            if error:
+                logger.error(f"Failed to create page {i}: {error}")
+                results.append({"status": "error", "error": str(error)})
+            else:
+                results.append({"status": "success", "page": page})
         return results
 
 
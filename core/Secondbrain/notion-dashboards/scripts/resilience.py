@@ -5,7 +5,8 @@ Resilience Patterns for OberaConnect Notion Dashboards
 Features:
 - Retry with exponential backoff
 - Circuit breaker pattern
-- Rate limiting
+- Rate limiting (with adaptive backoff on 429)
+- Concurrent write scheduling
 - Input validation and sanitization
 - Partial failure recovery
 
@@ -31,7 +32,7 @@ import time
 import logging
 from datetime import datetime, timedelta
 from functools import wraps
-from typing import Any, Callable, List, Optional, Type, TypeVar, Set
+from typing import Any, Callable, List, Optional, Tuple, Type, TypeVar, Set
 from dataclasses import dataclass, field
 import threading
 
@@ -374,6 +375,125 @@ def rate_limited(
     return decorator
 
 
+class AdaptiveRateLimiter(RateLimiter):
+    """
+    Token bucket that backs off when the server says it is overloaded.
+
+    On a 429 the rate is halved (down to min_rate) and all callers are
+    paused for the server's Retry-After; each success then adds `recovery`
+    requests/second back until the configured rate is reached again.
+    """
+
+    def __init__(
+        self,
+        rate: float = 3.0,
+        burst: int = 3,
+        min_rate: float = 0.5,
+        recovery: float = 0.1,
+        name: str = "default"
+    ):
+        super().__init__(rate=rate, burst=burst, name=name)
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.recovery = recovery
+        self._paused_until = 0.0  # time.monotonic() deadline
+
+    def acquire(self, tokens: int = 1) -> bool:
+        """Try to acquire tokens; always fails while paused after a 429."""
+        if time.monotonic() < self._paused_until:
+            return False
+        return super().acquire(tokens)
+
+    def wait_and_acquire(self, tokens: int = 1, timeout: float = 60.0) -> bool:
+        """Wait until tokens available (sleeping out any pause) or timeout."""
+        deadline = time.monotonic() + timeout
+
+        while True:
+            if self.acquire(tokens):
+                return True
+
+            now = time.monotonic()
+            if now >= deadline:
+                return False
+
+            wait = max(self._paused_until - now, 1.0 / self.rate)
+            time.sleep(min(wait, deadline - now))
+
+    def penalize(self, retry_after: Optional[float] = None) -> None:
+        """Record a rate-limit response: slow down and pause everyone."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            pause = retry_after if retry_after else 1.0 / self.rate
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            self._state.tokens = 0
+        logger.warning(
+            f"Rate limited ({self.name}): pausing {pause:.1f}s, rate now {self.rate:.2f}/s"
+        )
+
+    def reward(self) -> None:
+        """Record a successful request: creep back toward the configured rate."""
+        if self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.recovery)
+
+
+# =============================================================================
+# Concurrent Write Scheduling
+# =============================================================================
+
+class WriteScheduler:
+    """
+    Runs independent API writes on a small worker pool.
+
+    The pool only provides concurrency - the shared rate_limiter (handed to
+    the API client) gates every request, so throughput tracks the API
+    ceiling instead of a fixed pause between calls.
+
+    Usage:
+        scheduler = WriteScheduler(AdaptiveRateLimiter(rate=3.0), max_workers=4)
+        client = NotionWrapper(rate_limiter=scheduler.rate_limiter)
+        outcomes = scheduler.map(lambda props: client.create_page(db_id, props), rows)
+    """
+
+    def __init__(
+        self,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_workers: int = 4
+    ):
+        self.rate_limiter = rate_limiter
+        self.max_workers = max(1, max_workers)
+
+    def map(
+        self,
+        func: Callable[[Any], T],
+        items: List[Any]
+    ) -> List[Tuple[Optional[T], Optional[Exception]]]:
+        """
+        Apply func to every item concurrently.
+
+        Returns:
+            (result, error) per item, in input order - exactly one is None
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        items = list(items)
+        workers = min(self.max_workers, len(items))
+        if workers <= 1:
+            return [self._run(func, item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="notion-write") as pool:
+            futures = [pool.submit(self._run, func, item) for item in items]
+            return [f.result() for f in futures]
+
+    @staticmethod
+    def _run(func: Callable[[Any], T], item: Any) -> Tuple[Optional[T], Optional[Exception]]:
+        try:
+            return func(item), None
+        except Exception as e:
+            return None, e
+
+
 # =============================================================================
 # Input Validation
 # =============================================================================
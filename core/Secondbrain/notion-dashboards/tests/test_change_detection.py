@@ -0,0 +1,215 @@
+"""
+Unit tests for property-diff change detection.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from core.base_sync import BaseSyncClient
+from core.change_detection import ChangeTracker, fingerprint_property
+from notion_client_wrapper import NotionWrapper
+
+
+def issue_props(status: str = "new", last_seen: str = "2025-01-01") -> dict:
+    return {
+        "Status": NotionWrapper.prop_select(status),
+        "Last Seen": NotionWrapper.prop_date(last_seen),
+    }
+
+
+class TestFingerprint:
+    """Tests for property fingerprints."""
+
+    def test_equivalent_payloads_match(self):
+        """Builder payloads and page values with the same value should match."""
+        page_value = {"id": "x", "type": "select", "select": {"id": "1", "name": "new", "color": "red"}}
+        assert fingerprint_property(page_value) == fingerprint_property(NotionWrapper.prop_select("new"))
+
+    def test_different_values_differ(self):
+        """Different values should produce different fingerprints."""
+        assert fingerprint_property(NotionWrapper.prop_number(1)) != fingerprint_property(NotionWrapper.prop_number(2))
+
+
+class TestChangeTracker:
+    """Tests for ChangeTracker."""
+
+    @pytest.fixture
+    def tracker(self, tmp_path):
+        return ChangeTracker(tmp_path / "state.json")
+
+    def test_unknown_page_writes_everything(self, tracker):
+        """A page with no state should get the full payload."""
+        props = issue_props()
+        assert tracker.changes("a", props) == props
+
+    def test_unchanged_page_skipped(self, tracker):
+        """Identical properties should produce no write."""
+        tracker.record("a", issue_props(), today="2025-01-01")
+        assert tracker.changes("a", issue_props(), today="2025-01-01") == {}
+
+    def test_only_changed_properties_returned(self, tracker):
+        """Material changes should return just the changed properties."""
+        tracker.record("a", issue_props(), today="2025-01-01")
+        changes = tracker.changes("a", issue_props(status="triaged"), today="2025-01-01")
+        assert list(changes) == ["Status"]
+
+    def test_heartbeat_coalesced_within_day(self, tracker):
+        """Heartbeat-only changes should wait for the next day."""
+        heartbeat = ("Last Seen",)
+        tracker.record("a", issue_props(last_seen="2025-01-01T08:00"), today="2025-01-01")
+
+        bumped = issue_props(last_seen="2025-01-01T09:00")
+        assert tracker.changes("a", bumped, heartbeat, today="2025-01-01") == {}
+        assert list(tracker.changes("a", bumped, heartbeat, today="2025-01-02")) == ["Last Seen"]
+
+    def test_heartbeat_rides_along_with_material_change(self, tracker):
+        """A material change should also carry the heartbeat."""
+        heartbeat = ("Last Seen",)
+        tracker.record("a", issue_props(), today="2025-01-01")
+        changes = tracker.changes(
+            "a", issue_props(status="triaged", last_seen="2025-01-01T09:00"), heartbeat, today="2025-01-01"
+        )
+        assert set(changes) == {"Status", "Last Seen"}
+
+    def test_state_persists(self, tmp_path):
+        """Fingerprints should survive a save/load round trip."""
+        tracker = ChangeTracker(tmp_path / "state.json")
+        tracker.record("a", issue_props(), today="2025-01-01")
+        tracker.save()
+
+        reloaded = ChangeTracker(tmp_path / "state.json")
+        assert "a" in reloaded
+        assert reloaded.changes("a", issue_props(), today="2025-01-01") == {}
+
+    def test_corrupt_state_ignored(self, tmp_path):
+        """An unreadable state file should behave like no state."""
+        path = tmp_path / "state.json"
+        path.write_text("{not json")
+        assert len(ChangeTracker(path)) == 0
+
+    def test_fingerprints_expire(self, tracker):
+        """Fingerprints not confirmed by a full write should expire."""
+        tracker.record("a", issue_props(), today="2025-01-01")
+        tracker.record("a", {"Last Seen": NotionWrapper.prop_date("2025-01-02")}, today="2025-01-02")
+
+        assert tracker.changes("a", issue_props(last_seen="2025-01-02"), today="2025-01-02") == {}
+        assert set(tracker.changes("a", issue_props(last_seen="2025-01-02"), today="2025-01-03")) == {
+            "Status", "Last Seen"
+        }
+
+    def test_due_coalesces_heartbeat(self, tracker):
+        """Live-page diffs should only hold back heartbeat-only changes."""
+        heartbeat = ("Last Seen",)
+        tracker.record("a", issue_props(), today="2025-01-01")
+        last_seen = {"Last Seen": NotionWrapper.prop_date("2025-01-01T09:00")}
+
+        assert not tracker.due("a", {}, heartbeat, today="2025-01-01")
+        assert not tracker.due("a", last_seen, heartbeat, today="2025-01-01")
+        assert tracker.due("a", last_seen, heartbeat, today="2025-01-02")
+        assert tracker.due("a", {"Status": NotionWrapper.prop_select("new")}, heartbeat, today="2025-01-01")
+
+    def test_forget(self, tracker):
+        """Forgotten pages should be treated as unknown."""
+        tracker.record("a", issue_props())
+        tracker.forget("a")
+        assert tracker.changes("a", issue_props()) == issue_props()
+
+
+class DemoSync(BaseSyncClient):
+    """Minimal concrete sync for exercising BaseSyncClient."""
+
+    heartbeat_properties = ("Last Seen",)
+
+    @property
+    def primary_database(self) -> str:
+        return "devices"
+
+    def sync(self, **kwargs):
+        return []
+
+
+class TestUpdatePageIfChanged:
+    """Tests for BaseSyncClient.update_page_if_changed."""
+
+    @pytest.fixture
+    def syncer(self, config_file):
+        syncer = DemoSync(str(config_file), dry_run=True)
+        syncer.dry_run = False
+        syncer._client = MagicMock()
+        syncer._client.update_page.side_effect = lambda page_id, props: {"id": page_id}
+        return syncer
+
+    def test_skips_repeat_updates(self, syncer):
+        """Second identical update should not call the API."""
+        _, first = syncer.update_page_if_changed("p1", issue_props())
+        _, second = syncer.update_page_if_changed("p1", issue_props())
+
+        assert (first, second) == ("updated", "unchanged")
+        assert syncer._client.update_page.call_count == 1
+
+    def test_state_saved_next_to_config(self, syncer, config_file):
+        """Fingerprints should be persisted under the config directory."""
+        syncer.update_page_if_changed("p1", issue_props())
+        syncer.save_state()
+        assert (Path(config_file).parent / "state" / "DemoSync.json").exists()
+
+    def test_live_page_repairs_hand_edits(self, syncer):
+        """A page edited in Notion should be rewritten even if fingerprints match."""
+        syncer.update_page_if_changed("p1", issue_props())
+        edited = {"id": "p1", "properties": {
+            "Status": {"type": "select", "select": {"name": "triaged"}},
+            "Last Seen": {"type": "date", "date": {"start": "2025-01-01"}},
+        }}
+
+        _, action = syncer.update_page_if_changed("p1", issue_props(), page=edited)
+
+        assert action == "updated"
+        assert list(syncer._client.update_page.call_args.args[1]) == ["Status"]
+
+
+class TestBulkUpsertChangeDetection:
+    """Tests for BaseSyncClient.bulk_upsert."""
+
+    @pytest.fixture
+    def syncer(self, config_file):
+        syncer = DemoSync(str(config_file), dry_run=True)
+        syncer.dry_run = False
+        syncer._client = MagicMock()
+        syncer._client.bulk_upsert.side_effect = lambda db_id, rows, max_workers: [
+            {"title": title, "status": "success", "action": "updated", "page": {"id": title}}
+            for title, _ in rows
+        ]
+        return syncer
+
+    def test_diffs_against_fetched_pages(self, syncer):
+        """Rows are compared with the indexed pages, not only the last write."""
+        page = {"id": "site-a", "properties": {
+            "Status": {"type": "select", "select": {"name": "new"}},
+            "Last Seen": {"type": "date", "date": {"start": "2025-01-01"}},
+        }}
+        syncer._client.load_title_index.return_value = {"site-a": page}
+        syncer.change_tracker.record("devices:site-a", issue_props(status="triaged"))
+
+        results = syncer.bulk_upsert("devices", [("site-a", issue_props(status="triaged"))])
+
+        rows = syncer._client.bulk_upsert.call_args.args[1]
+        assert rows == [("site-a", {"Status": NotionWrapper.prop_select("triaged")})]
+        assert results[0]["action"] == "updated"
+
+    def test_unchanged_page_not_written(self, syncer):
+        """Rows matching the fetched page should not be sent."""
+        page = {"id": "site-a", "properties": {
+            "Status": {"type": "select", "select": {"name": "new"}},
+            "Last Seen": {"type": "date", "date": {"start": "2025-01-01"}},
+        }}
+        syncer._client.load_title_index.return_value = {"site-a": page}
+
+        results = syncer.bulk_upsert("devices", [("site-a", issue_props())])
+
+        assert results[0]["action"] == "unchanged"
+        assert syncer._client.bulk_upsert.call_args.args[1] == []
@@ -0,0 +1,162 @@
+"""
+Unit tests for NotionWrapper schema caching, title index and bulk upsert.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from notion_client_wrapper import NotionWrapper
+from resilience import AdaptiveRateLimiter
+
+
+DB_ID = "0123456789abcdef0123456789abcdef"
+
+
+def make_page(page_id: str, title: str, score: float = 80, state: str = "Alabama") -> dict:
+    """Page object shaped like a Notion API response."""
+    return {
+        "id": page_id,
+        "properties": {
+            "Site Name": {
+                "id": "title",
+                "type": "title",
+                "title": [{"type": "text", "text": {"content": title}, "plain_text": title}],
+            },
+            "Health Score": {"id": "a", "type": "number", "number": score},
+            "State": {"id": "b", "type": "select", "select": {"id": "x", "name": state, "color": "red"}},
+        },
+    }
+
+
+@pytest.fixture
+def wrapper():
+    """NotionWrapper with the SDK client replaced by a mock."""
+    w = NotionWrapper(
+        token="secret_test_token_12345",
+        rate_limiter=AdaptiveRateLimiter(rate=100.0, burst=100)
+    )
+    w.client = MagicMock()
+    w.client.databases.retrieve.return_value = {
+        "properties": {"Site Name": {"type": "title"}, "Health Score": {"type": "number"}}
+    }
+    w.client.request.return_value = {
+        "results": [make_page("p1", "Acme"), make_page("p2", "Globex", score=60)],
+        "has_more": False,
+    }
+    w.client.pages.create.side_effect = lambda parent, properties: {"id": "new", "properties": properties}
+    w.client.pages.update.side_effect = lambda page_id, properties: {"id": page_id, "properties": properties}
+    return w
+
+
+def props(title: str, score: float, state: str = "Alabama") -> dict:
+    return {
+        "Site Name": NotionWrapper.prop_title(title),
+        "Health Score": NotionWrapper.prop_number(score),
+        "State": NotionWrapper.prop_select(state),
+    }
+
+
+class TestSchemaCache:
+    """Tests for cached database schema lookups."""
+
+    def test_schema_fetched_once(self, wrapper):
+        """Repeated lookups should reuse the cached schema."""
+        wrapper.get_database(DB_ID)
+        wrapper.get_title_property(DB_ID)
+        assert wrapper.client.databases.retrieve.call_count == 1
+
+    def test_find_page_uses_cached_schema(self, wrapper):
+        """Title lookups without an index should not re-fetch the schema."""
+        wrapper.find_page_by_title(DB_ID, "Acme")
+        wrapper.find_page_by_title(DB_ID, "Globex")
+        assert wrapper.client.databases.retrieve.call_count == 1
+        assert wrapper.client.request.call_count == 2
+
+
+class TestTitleIndex:
+    """Tests for the per-run title index."""
+
+    def test_index_answers_lookups(self, wrapper):
+        """After loading the index, lookups should not hit the API."""
+        index = wrapper.load_title_index(DB_ID)
+        assert set(index) == {"Acme", "Globex"}
+
+        assert wrapper.find_page_by_title(DB_ID, "Acme")["id"] == "p1"
+        assert wrapper.find_page_by_title(DB_ID, "Missing") is None
+        assert wrapper.client.request.call_count == 1
+
+    def test_created_pages_added_to_index(self, wrapper):
+        """Pages created by upsert should be found on the next lookup."""
+        wrapper.load_title_index(DB_ID)
+        page, action = wrapper.upsert_page(DB_ID, "Initech", props("Initech", 90))
+        assert action == "created"
+        assert wrapper.find_page_by_title(DB_ID, "Initech")["id"] == "new"
+
+
+class TestDiffProperties:
+    """Tests for property change detection."""
+
+    def test_identical_values_not_changed(self):
+        """Builder payloads should match equivalent page values."""
+        page = make_page("p1", "Acme", score=80)
+        assert NotionWrapper.diff_properties(page, props("Acme", 80.0)) == {}
+
+    def test_changed_value_returned(self):
+        """Only properties with different values should be returned."""
+        page = make_page("p1", "Acme", score=80)
+        changed = NotionWrapper.diff_properties(page, props("Acme", 75))
+        assert list(changed) == ["Health Score"]
+
+    def test_missing_property_is_changed(self):
+        """Properties absent from the page should be written."""
+        page = make_page("p1", "Acme")
+        desired = {"Open Tickets": NotionWrapper.prop_number(0)}
+        assert NotionWrapper.diff_properties(page, desired) == desired
+
+    def test_multi_select_order_ignored(self):
+        """Multi-select comparison should ignore option order."""
+        page = {"properties": {"Stack": {"type": "multi_select", "multi_select": [
+            {"name": "Azure"}, {"name": "Ubiquiti"}
+        ]}}}
+        desired = {"Stack": NotionWrapper.prop_multi_select(["Ubiquiti", "Azure"])}
+        assert NotionWrapper.diff_properties(page, desired) == {}
+
+
+class TestBulkUpsert:
+    """Tests for bulk_upsert."""
+
+    def test_creates_updates_and_skips(self, wrapper):
+        """Should create new, update changed and skip unchanged pages."""
+        results = wrapper.bulk_upsert(DB_ID, [
+            ("Acme", props("Acme", 80)),
+            ("Globex", props("Globex", 65)),
+            ("Initech", props("Initech", 90)),
+        ])
+
+        assert [r["action"] for r in results] == ["unchanged", "updated", "created"]
+        assert wrapper.client.request.call_count == 1
+        assert wrapper.client.pages.create.call_count == 1
+
+        # Updates send only the changed properties
+        update_kwargs = wrapper.client.pages.update.call_args.kwargs
+        assert update_kwargs["page_id"] == "p2"
+        assert list(update_kwargs["properties"]) == ["Health Score"]
+
+    def test_errors_reported_per_row(self, wrapper):
+        """A failing write should not stop the remaining rows."""
+        wrapper._retry_api_call = lambda func, max_retries=3: func()
+        wrapper.client.pages.create.side_effect = RuntimeError("boom")
+
+        results = wrapper.bulk_upsert(DB_ID, [
+            ("New Site", props("New Site", 50)),
+            ("Globex", props("Globex", 65)),
+        ])
+
+        assert results[0]["status"] == "error"
+        assert "boom" in results[0]["error"]
+        assert results[1]["action"] == "updated"
@@ -0,0 +1,139 @@
+"""
+Unit tests for the adaptive rate limiter and concurrent write scheduler.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import httpx
+
+# Add scripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from notion_client.errors import APIResponseError
+from notion_client_wrapper import NotionWrapper
+from resilience import AdaptiveRateLimiter, WriteScheduler
+
+
+def rate_limit_error(retry_after: str = "0.05") -> APIResponseError:
+    """429 error as raised by notion-client."""
+    return APIResponseError(
+        code="rate_limited",
+        status=429,
+        message="Rate limited",
+        headers=httpx.Headers({"retry-after": retry_after}),
+        raw_body_text="",
+    )
+
+
+class TestAdaptiveRateLimiter:
+    """Tests for AdaptiveRateLimiter."""
+
+    def test_burst_then_limited(self):
+        """Should allow a burst, then refuse until tokens refill."""
+        limiter = AdaptiveRateLimiter(rate=1.0, burst=2)
+        assert limiter.acquire()
+        assert limiter.acquire()
+        assert not limiter.acquire()
+
+    def test_penalize_halves_rate_and_pauses(self):
+        """A 429 should slow the limiter and block acquisition for Retry-After."""
+        limiter = AdaptiveRateLimiter(rate=4.0, burst=4)
+        limiter.penalize(retry_after=0.2)
+
+        assert limiter.rate == 2.0
+        assert not limiter.acquire()
+
+        start = time.monotonic()
+        assert limiter.wait_and_acquire(timeout=2.0)
+        assert time.monotonic() - start >= 0.15
+
+    def test_rate_floor(self):
+        """Rate should never drop below min_rate."""
+        limiter = AdaptiveRateLimiter(rate=2.0, min_rate=0.5)
+        for _ in range(5):
+            limiter.penalize(retry_after=0.001)
+        assert limiter.rate == 0.5
+
+    def test_reward_recovers_to_max(self):
+        """Successes should restore the configured rate, not exceed it."""
+        limiter = AdaptiveRateLimiter(rate=3.0, recovery=1.0)
+        limiter.penalize(retry_after=0.001)
+        for _ in range(5):
+            limiter.reward()
+        assert limiter.rate == 3.0
+
+
+class TestWriteScheduler:
+    """Tests for WriteScheduler."""
+
+    def test_results_in_input_order(self):
+        """Results should line up with inputs regardless of completion order."""
+        scheduler = WriteScheduler(max_workers=4)
+
+        def slow_double(x):
+            time.sleep(0.01 * (5 - x))
+            return x * 2
+
+        outcomes = scheduler.map(slow_double, [1, 2, 3, 4])
+        assert [result for result, _ in outcomes] == [2, 4, 6, 8]
+
+    def test_errors_captured_per_item(self):
+        """A failing item should not affect the others."""
+        scheduler = WriteScheduler(max_workers=2)
+
+        def maybe_fail(x):
+            if x == 2:
+                raise ValueError("bad item")
+            return x
+
+        outcomes = scheduler.map(maybe_fail, [1, 2, 3])
+        assert outcomes[0] == (1, None)
+        assert outcomes[1][0] is None
+        assert isinstance(outcomes[1][1], ValueError)
+        assert outcomes[2] == (3, None)
+
+    def test_runs_concurrently(self):
+        """Items should be processed by more than one worker."""
+        scheduler = WriteScheduler(max_workers=4)
+        threads = set()
+
+        def record(_):
+            threads.add(threading.get_ident())
+            time.sleep(0.02)
+
+        scheduler.map(record, range(8))
+        assert len(threads) > 1
+
+
+class TestNotionRateLimitHandling:
+    """Tests for 429 handling in NotionWrapper."""
+
+    def test_retries_after_rate_limit(self):
+        """A 429 should penalize the shared limiter and retry."""
+        limiter = AdaptiveRateLimiter(rate=10.0, burst=10)
+        wrapper = NotionWrapper(token="secret_test_token_12345", rate_limiter=limiter)
+        wrapper.client = MagicMock()
+        wrapper.client.pages.update.side_effect = [rate_limit_error(), {"id": "p1"}]
+
+        assert wrapper.update_page("p1", {}) == {"id": "p1"}
+        assert wrapper.client.pages.update.call_count == 2
+        assert limiter.rate < 10.0
+
+    def test_bulk_create_uses_scheduler(self):
+        """bulk_create_pages should create every page and keep input order."""
+        wrapper = NotionWrapper(
+            token="secret_test_token_12345",
+            rate_limiter=AdaptiveRateLimiter(rate=100.0, burst=100)
+        )
+        wrapper.client = MagicMock()
+        wrapper.client.pages.create.side_effect = lambda parent, properties: {"id": properties["n"]}
+
+        results = wrapper.bulk_create_pages(
+            "0123456789abcdef0123456789abcdef",
+            [{"n": i} for i in range(6)]
+        )
+        assert [r["page"]["id"] for r in results] == list(range(6))
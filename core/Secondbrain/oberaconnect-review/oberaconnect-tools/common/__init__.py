@@ -54,6 +54,21 @@ from .cache import (
     invalidate_pattern
 )
 
+from .http_cache import (
+    ResponseCache,
+    payload_digest
+)
+
+from .delta import (
+    EntityDelta,
+    DeltaTracker
+)
+
+from .ratelimit import (
+    TokenBucket,
+    get_host_limiter
+)
+
 __all__ = [
     # Maker/Checker
     'RiskLevel',
@@ -94,5 +109,13 @@ __all__ = [
     'Cache',
     'get_cache',
     'cached',
-    'invalidate_pattern'
+    'invalidate_pattern',
+    # HTTP cache / deltas
+    'ResponseCache',
+    'payload_digest',
+    'EntityDelta',
+    'DeltaTracker',
+    # Rate limiting
+    'TokenBucket',
+    'get_host_limiter'
 ]
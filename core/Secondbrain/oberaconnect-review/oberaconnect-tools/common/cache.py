@@ -19,10 +19,15 @@ Usage:
     def get_sites():
         return api.fetch_sites()
 
+    # Single-flight: concurrent misses for the same key share one call
+    sites = cache.get_or_compute("sites", api.fetch_sites, ttl=300)
+
 Environment Variables:
     REDIS_URL           - Redis connection URL (default: None, uses in-memory)
     CACHE_DEFAULT_TTL   - Default TTL in seconds (default: 300)
     CACHE_ENABLED       - Enable/disable caching (default: true)
+    CACHE_MAX_ENTRIES   - In-memory LRU entry limit (default: 1000)
+    CACHE_MAX_BYTES     - In-memory LRU size limit in bytes (default: unlimited)
 """
 
 import hashlib
@@ -31,9 +36,10 @@ import logging
 import os
 import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass
 from functools import wraps
-from threading import Lock
+from threading import Event, Lock
 from typing import Any, Callable, Dict, Optional, TypeVar, Union
 
 logger = logging.getLogger(__name__)
@@ -46,6 +52,7 @@ class CacheEntry:
     """Cache entry with value and expiration."""
     value: Any
     expires_at: float
+    size: int = 0
 
     def is_expired(self) -> bool:
         return time.time() > self.expires_at
@@ -79,57 +86,110 @@ class CacheBackend(ABC):
         """Check if key exists."""
         pass
 
+    def stats(self) -> Dict[str, Any]:
+        """Backend statistics (hits, misses, size...)."""
+        return {}
+
 
 class InMemoryCache(CacheBackend):
     """
-    Thread-safe in-memory cache with TTL support.
+    Thread-safe in-memory LRU cache with TTL support.
 
     Used as fallback when Redis is not available.
     Not suitable for multi-process deployments.
+
+    Reads move entries to the most-recently-used end, so hot keys such as
+    the fleet summary survive eviction. Limits can be set on entry count
+    and, optionally, on approximate size in bytes (JSON-encoded length).
+    Expired entries are dropped lazily on access and swept periodically
+    during writes.
     """
 
-    def __init__(self, max_size: int = 1000):
-        self._cache: Dict[str, CacheEntry] = {}
+    def __init__(
+        self,
+        max_size: int = 1000,
+        max_bytes: Optional[int] = None,
+        sweep_interval: float = 60.0
+    ):
+        self._cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
         self._lock = Lock()
         self._max_size = max_size
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._sweep_interval = sweep_interval
+        self._next_sweep = time.time() + sweep_interval
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @staticmethod
+    def _estimate_size(value: Any) -> int:
+        try:
+            return len(json.dumps(value, default=str))
+        except (TypeError, ValueError):
+            return len(repr(value))
+
+    def _remove(self, key: str) -> CacheEntry:
+        entry = self._cache.pop(key)
+        self._bytes -= entry.size
+        return entry
 
     def get(self, key: str) -> Optional[Any]:
         with self._lock:
             entry = self._cache.get(key)
             if entry is None:
+                self._misses += 1
                 return None
             if entry.is_expired():
-                del self._cache[key]
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
                 return None
+            self._cache.move_to_end(key)
+            self._hits += 1
             return entry.value
 
     def set(self, key: str, value: Any, ttl: int) -> bool:
-        with self._lock:
-            # Evict expired entries if cache is full
-            if len(self._cache) >= self._max_size:
-                self._evict_expired()
+        size = self._estimate_size(value) if self._max_bytes else 0
+        if self._max_bytes and size > self._max_bytes:
+            logger.debug(f"Not caching {key}: {size} bytes exceeds cache limit")
+            return False
 
-            # Still full? Evict oldest
-            if len(self._cache) >= self._max_size:
-                oldest_key = next(iter(self._cache))
-                del self._cache[oldest_key]
+        with self._lock:
+            now = time.time()
+            if now >= self._next_sweep:
+                self._evict_expired(now)
 
+            if key in self._cache:
+                self._remove(key)
             self._cache[key] = CacheEntry(
                 value=value,
-                expires_at=time.time() + ttl
+                expires_at=now + ttl,
+                size=size
             )
+            self._bytes += size
+
+            # Evict least recently used until within limits
+            while len(self._cache) > self._max_size or (
+                self._max_bytes and self._bytes > self._max_bytes
+            ):
+                self._remove(next(iter(self._cache)))
+                self._evictions += 1
             return True
 
     def delete(self, key: str) -> bool:
         with self._lock:
             if key in self._cache:
-                del self._cache[key]
+                self._remove(key)
                 return True
             return False
 
     def clear(self) -> bool:
         with self._lock:
             self._cache.clear()
+            self._bytes = 0
             return True
 
     def exists(self, key: str) -> bool:
@@ -138,16 +198,34 @@ class InMemoryCache(CacheBackend):
             if entry is None:
                 return False
             if entry.is_expired():
-                del self._cache[key]
+                self._remove(key)
+                self._expirations += 1
                 return False
             return True
 
-    def _evict_expired(self):
-        """Remove expired entries."""
-        now = time.time()
+    def _evict_expired(self, now: Optional[float] = None):
+        """Remove expired entries (caller holds the lock)."""
+        now = now or time.time()
         expired = [k for k, v in self._cache.items() if v.expires_at < now]
         for key in expired:
-            del self._cache[key]
+            self._remove(key)
+        self._expirations += len(expired)
+        self._next_sweep = now + self._sweep_interval
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._cache),
+                'max_entries': self._max_size,
+                'bytes': self._bytes if self._max_bytes else None,
+                'max_bytes': self._max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else 0.0,
+                'evictions': self._evictions,
+                'expirations': self._expirations
+            }
 
 
 class RedisCache(CacheBackend):
@@ -169,9 +247,19 @@ class RedisCache(CacheBackend):
         except Exception as e:
             raise ConnectionError(f"Failed to connect to Redis: {e}")
 
+        # Counters are shared by the threaded server's request threads
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
     def get(self, key: str) -> Optional[Any]:
         try:
             data = self._redis.get(key)
+            with self._lock:
+                if data is None:
+                    self._misses += 1
+                else:
+                    self._hits += 1
             if data is None:
                 return None
             return json.loads(data)
@@ -210,6 +298,17 @@ class RedisCache(CacheBackend):
             logger.warning(f"Redis EXISTS error: {e}")
             return False
 
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counts for this process (server-wide stats live in Redis INFO)."""
+        with self._lock:
+            hits, misses = self._hits, self._misses
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0
+        }
+
 
 class Cache:
     """
@@ -222,12 +321,19 @@ class Cache:
         self,
         redis_url: Optional[str] = None,
         default_ttl: int = 300,
-        enabled: bool = True
+        enabled: bool = True,
+        max_size: int = 1000,
+        max_bytes: Optional[int] = None
     ):
         self.default_ttl = default_ttl
         self.enabled = enabled
         self._backend: Optional[CacheBackend] = None
 
+        # Single-flight bookkeeping for get_or_compute
+        self._inflight: Dict[str, "_Flight"] = {}
+        self._inflight_lock = Lock()
+        self._coalesced = 0
+
         if not enabled:
             logger.info("Caching disabled")
             return
@@ -243,7 +349,7 @@ class Cache:
                 logger.warning(f"Redis unavailable, falling back to in-memory: {e}")
 
         # Fall back to in-memory
-        self._backend = InMemoryCache()
+        self._backend = InMemoryCache(max_size=max_size, max_bytes=max_bytes)
         logger.info("Using in-memory cache backend")
 
     def get(self, key: str, default: T = None) -> Optional[T]:
@@ -284,13 +390,64 @@ class Cache:
         ttl: Optional[int] = None
     ) -> T:
         """Get from cache or compute and store."""
+        return self.get_or_compute(key, factory, ttl)
+
+    def get_or_compute(
+        self,
+        key: str,
+        factory: Callable[[], T],
+        ttl: Optional[int] = None
+    ) -> T:
+        """
+        Get from cache or compute and store, coalescing concurrent misses.
+
+        If several threads miss on the same key at once, only the first
+        calls factory(); the rest wait for and share its result (or its
+        exception). Coalescing is per process.
+        """
         value = self.get(key)
         if value is not None:
             return value
 
-        value = factory()
-        self.set(key, value, ttl)
-        return value
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                # A previous leader may have stored the value since our miss
+                value = self.get(key)
+                if value is not None:
+                    return value
+                flight = self._inflight[key] = _Flight()
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = factory()
+            self.set(key, flight.value, ttl)
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics for monitoring (/metrics)."""
+        data = {
+            'backend': self.backend_type,
+            'coalesced_misses': self._coalesced
+        }
+        if self.enabled and self._backend:
+            data.update(self._backend.stats())
+        return data
 
     @property
     def backend_type(self) -> str:
@@ -300,6 +457,15 @@ class Cache:
         return "redis" if isinstance(self._backend, RedisCache) else "memory"
 
 
+class _Flight:
+    """An in-progress get_or_compute call that other callers can wait on."""
+
+    def __init__(self):
+        self.done = Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
 # Global cache instance
 _cache: Optional[Cache] = None
 
@@ -311,7 +477,9 @@ def get_cache() -> Cache:
         _cache = Cache(
             redis_url=os.getenv('REDIS_URL'),
             default_ttl=int(os.getenv('CACHE_DEFAULT_TTL', '300')),
-            enabled=os.getenv('CACHE_ENABLED', 'true').lower() != 'false'
+            enabled=os.getenv('CACHE_ENABLED', 'true').lower() != 'false',
+            max_size=int(os.getenv('CACHE_MAX_ENTRIES', '1000')),
+            max_bytes=int(os.getenv('CACHE_MAX_BYTES', '0')) or None
         )
     return _cache
 
@@ -352,17 +520,8 @@ def cached(
                 key_hash = hashlib.md5(key_data.encode()).hexdigest()[:12]
                 key = f"{key_prefix}:{func.__name__}:{key_hash}" if key_prefix else f"{func.__name__}:{key_hash}"
 
-            # Try cache
-            cached_value = cache.get(key)
-            if cached_value is not None:
-                logger.debug(f"Cache hit: {key}")
-                return cached_value
-
-            # Compute and cache
-            logger.debug(f"Cache miss: {key}")
-            result = func(*args, **kwargs)
-            cache.set(key, result, ttl)
-            return result
+            # Concurrent misses for the same key share one call
+            return cache.get_or_compute(key, lambda: func(*args, **kwargs), ttl)
 
         return wrapper
     return decorator
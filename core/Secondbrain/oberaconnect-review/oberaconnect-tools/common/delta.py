@@ -0,0 +1,141 @@
+"""
+OberaConnect Entity Deltas
+
+Tracks per-entity fingerprints between fetches so consumers can process
+only the sites, devices or alerts that were added, changed or removed.
+
+Usage:
+    from oberaconnect_tools.common.delta import DeltaTracker
+
+    tracker = DeltaTracker()
+    delta = tracker.update('sites', sites, key=lambda s: s.id)
+    for site_id in delta.added + delta.changed:
+        ...
+"""
+
+import logging
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .http_cache import payload_digest
+
+logger = logging.getLogger(__name__)
+
+
+def _default_fingerprint(item: Any) -> str:
+    return payload_digest(item.to_dict() if hasattr(item, 'to_dict') else item)
+
+
+@dataclass
+class EntityDelta:
+    """IDs added, changed and removed between two fetches."""
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.changed or self.removed)
+
+    def merge(self, later: 'EntityDelta') -> 'EntityDelta':
+        """
+        Combine with a later delta into one delta spanning both.
+
+        Added-then-removed cancels out; removed-then-added becomes changed.
+        """
+        state: Dict[str, str] = {}
+        for kind in ('added', 'changed', 'removed'):
+            for entity_id in getattr(self, kind):
+                state[entity_id] = kind
+
+        for kind in ('added', 'changed', 'removed'):
+            for entity_id in getattr(later, kind):
+                before = state.get(entity_id)
+                if before == 'added' and kind == 'removed':
+                    del state[entity_id]
+                elif before == 'added':
+                    continue
+                elif before == 'removed' and kind == 'added':
+                    state[entity_id] = 'changed'
+                else:
+                    state[entity_id] = kind
+
+        merged = EntityDelta()
+        for entity_id, kind in state.items():
+            getattr(merged, kind).append(entity_id)
+        return merged
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'added': list(self.added),
+            'changed': list(self.changed),
+            'removed': list(self.removed)
+        }
+
+
+class DeltaTracker:
+    """
+    Remembers a fingerprint per entity, per collection name.
+
+    Each update() compares the new items against the previous update for
+    the same collection.
+    """
+
+    def __init__(self):
+        self._fingerprints: Dict[str, Dict[str, str]] = {}
+        self._lock = Lock()
+
+    def update(
+        self,
+        name: str,
+        items: Iterable[Any],
+        key: Callable[[Any], str],
+        fingerprint: Optional[Callable[[Any], str]] = None
+    ) -> EntityDelta:
+        """
+        Record the current items for a collection and return what changed.
+
+        Args:
+            name: Collection name ('sites', 'alerts', ...)
+            items: Current entities
+            key: Returns an entity's ID
+            fingerprint: Returns a hash of an entity's content
+                (default: digest of to_dict())
+        """
+        fingerprint = fingerprint or _default_fingerprint
+        current = {str(key(item)): fingerprint(item) for item in items}
+
+        with self._lock:
+            previous = self._fingerprints.get(name, {})
+            self._fingerprints[name] = current
+
+        delta = EntityDelta()
+        for entity_id, digest in current.items():
+            before = previous.get(entity_id)
+            if before is None:
+                delta.added.append(entity_id)
+            elif before != digest:
+                delta.changed.append(entity_id)
+        delta.removed = [entity_id for entity_id in previous if entity_id not in current]
+
+        if not delta.is_empty:
+            logger.debug(
+                f"{name}: {len(delta.added)} added, {len(delta.changed)} changed, "
+                f"{len(delta.removed)} removed"
+            )
+        return delta
+
+    def reset(self, name: Optional[str] = None):
+        """Forget fingerprints so the next update reports everything as added."""
+        with self._lock:
+            if name is None:
+                self._fingerprints.clear()
+            else:
+                self._fingerprints.pop(name, None)
+
+
+__all__ = [
+    'EntityDelta',
+    'DeltaTracker'
+]
@@ -0,0 +1,152 @@
+"""
+OberaConnect HTTP Response Cache
+
+Conditional-request cache for the API clients. GET responses are stored
+with their validators; the next request for the same URL sends
+If-None-Match / If-Modified-Since, and a 304 reuses the stored payload
+without re-downloading it.
+
+APIs that send no validators are handled by hashing the payload: an
+identical body is reported as unchanged and the previously decoded payload
+is returned.
+
+Usage:
+    from oberaconnect_tools.common.http_cache import ResponseCache
+
+    cache = ResponseCache()
+    key = cache.key(url, params)
+    response = session.get(url, params=params, headers=cache.conditional_headers(key))
+    payload = cache.resolve(key, response)
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def payload_digest(payload: Any) -> str:
+    """Stable hash of a JSON-compatible payload."""
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    """Decoded payload plus the validators it was served with."""
+    payload: Any
+    digest: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = 0.0
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU of GET responses keyed by URL and query parameters.
+
+    Payloads are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = Lock()
+        self._max_entries = max_entries
+
+        self._not_modified = 0
+        self._unchanged = 0
+        self._changed = 0
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        if not params:
+            return url
+        query = '&'.join(f"{k}={params[k]}" for k in sorted(params))
+        return f"{url}?{query}"
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        """Validator headers for a request, empty if nothing is cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def resolve(self, key: str, response) -> Any:
+        """
+        Return the payload for a response, updating the cache.
+
+        A 304 returns the cached payload; a 200 whose body hashes the same
+        as the cached one also returns the cached payload.
+        """
+        with self._lock:
+            previous = self._entries.get(key)
+
+        if response.status_code == 304 and previous is not None:
+            with self._lock:
+                self._not_modified += 1
+                previous.fetched_at = time.time()
+                self._entries.move_to_end(key)
+            return previous.payload
+
+        payload = response.json()
+        digest = payload_digest(payload)
+        unchanged = previous is not None and previous.digest == digest
+        if unchanged:
+            payload = previous.payload
+
+        entry = CachedResponse(
+            payload=payload,
+            digest=digest,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            fetched_at=time.time()
+        )
+        with self._lock:
+            if unchanged:
+                self._unchanged += 1
+            else:
+                self._changed += 1
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one entry, or everything."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self._not_modified + self._unchanged + self._changed
+            return {
+                'entries': len(self._entries),
+                'max_entries': self._max_entries,
+                'not_modified': self._not_modified,
+                'unchanged': self._unchanged,
+                'changed': self._changed,
+                'reuse_rate': round((self._not_modified + self._unchanged) / total, 4) if total else 0.0
+            }
+
+
+__all__ = [
+    'CachedResponse',
+    'ResponseCache',
+    'payload_digest'
+]
@@ -0,0 +1,112 @@
+"""
+OberaConnect Rate Limiting
+
+Thread-safe token buckets shared per API host, so concurrent fetches
+(thread pool fan-out, multiple client instances) stay under the vendor's
+request limits.
+
+Usage:
+    from oberaconnect_tools.common.ratelimit import get_host_limiter
+
+    limiter = get_host_limiter("https://api.ui.com/v1", rate=10)
+    limiter.acquire()          # blocks until a request slot is free
+    response = session.get(url)
+"""
+
+import logging
+import time
+from threading import Lock
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+
+    Allows bursts of up to `burst` requests, refilling at `rate` tokens
+    per second. A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available."""
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a token is available.
+
+        Returns False if timeout (seconds) passes first.
+        """
+        if self.rate <= 0:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None:
+                if now + wait > deadline:
+                    return False
+            time.sleep(wait)
+
+
+# Shared limiters keyed by host
+_host_limiters: Dict[str, TokenBucket] = {}
+_host_limiters_lock = Lock()
+
+
+def get_host_limiter(url: str, rate: float, burst: Optional[int] = None) -> TokenBucket:
+    """
+    Get the shared limiter for a URL's host, creating it on first use.
+
+    The first caller's rate/burst win; later callers share that bucket.
+    """
+    host = urlparse(url).netloc or url
+    with _host_limiters_lock:
+        limiter = _host_limiters.get(host)
+        if limiter is None:
+            limiter = TokenBucket(rate, burst)
+            _host_limiters[host] = limiter
+            logger.debug(f"Rate limiter for {host}: {rate}/s")
+        return limiter
+
+
+def retry_after_seconds(response, attempt: int) -> float:
+    """Seconds to wait after a 429 (Retry-After header or exponential backoff)."""
+    try:
+        return max(0.0, float(response.headers.get('Retry-After')))
+    except (TypeError, ValueError):
+        return float(2 ** attempt)
+
+
+__all__ = [
+    'TokenBucket',
+    'get_host_limiter',
+    'retry_after_seconds'
+]
@@ -5,5 +5,6 @@ REST API for n8n workflow integration.
 """
 
 from .webhook_api import create_app, run_server
+from .snapshot import FleetSnapshot, SnapshotService
 
-__all__ = ['create_app', 'run_server']
+__all__ = ['create_app', 'run_server', 'FleetSnapshot', 'SnapshotService']
@@ -0,0 +1,338 @@
+"""
+Fleet Snapshot Service
+
+Background prefetch of UniFi and NinjaOne data for the webhook API.
+
+A daemon thread refreshes sites, alerts and devices on a schedule and
+swaps in an immutable FleetSnapshot. Request handlers read the current
+snapshot reference and never call the upstream APIs, so endpoint latency
+no longer depends on UniFi/NinjaOne response times and scrapes of
+/metrics no longer generate API traffic.
+
+Each refresh also records which sites, alerts and devices were added,
+changed or removed. Derived views (analyzer, summary, correlator) are
+only rebuilt when their inputs changed, and consumers can ask for the
+changes since a given snapshot generation.
+
+Environment Variables:
+    DATA_REFRESH_INTERVAL - Refresh interval in seconds (default: 300)
+"""
+
+import os
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_SECONDS = 300.0
+
+# Refreshes whose deltas are kept for changes_since()
+DELTA_HISTORY = 32
+
+ENTITY_KINDS = ('sites', 'alerts', 'devices')
+
+
+@dataclass(frozen=True)
+class FleetSnapshot:
+    """
+    Point-in-time view of the fleet.
+
+    Never mutated after construction; a refresh builds a new snapshot.
+    The analyzer, summary and correlator are derived once per snapshot.
+    """
+    sites: Tuple[Any, ...] = ()
+    alerts: Tuple[Any, ...] = ()
+    devices: Tuple[Any, ...] = ()
+    analyzer: Any = None
+    summary: Any = None
+    correlator: Any = None
+    fetched_at: float = 0.0
+    refresh_duration: float = 0.0
+    errors: Dict[str, str] = field(default_factory=dict)
+    sites_by_id: Dict[str, Any] = field(default_factory=dict)
+    generation: int = 0
+    deltas: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def age_seconds(self) -> float:
+        if not self.fetched_at:
+            return 0.0
+        return max(0.0, time.time() - self.fetched_at)
+
+    @property
+    def fetched_at_iso(self) -> Optional[str]:
+        if not self.fetched_at:
+            return None
+        return datetime.fromtimestamp(self.fetched_at, timezone.utc).isoformat()
+
+    def get_site(self, site_id: str):
+        return self.sites_by_id.get(site_id)
+
+    def get_alerts(self, severity: Optional[str] = None, org_id: Optional[str] = None) -> List[Any]:
+        """Filter alerts the same way NinjaOneClient.get_alerts does server-side."""
+        alerts = self.alerts
+        if severity:
+            alerts = [a for a in alerts if a.severity == severity]
+        if org_id:
+            alerts = [a for a in alerts if a.org_id == org_id]
+        return list(alerts)
+
+    def get_devices(self, org_id: Optional[str] = None) -> List[Any]:
+        if org_id:
+            return [d for d in self.devices if d.org_id == org_id]
+        return list(self.devices)
+
+    def lookup(self, kind: str) -> Dict[str, Any]:
+        """Map of entity ID -> entity for 'sites', 'alerts' or 'devices'."""
+        if kind == 'sites':
+            return self.sites_by_id
+        return {str(item.id): item for item in getattr(self, kind)}
+
+    def meta(self) -> Dict[str, Any]:
+        """Freshness fields added to every snapshot-backed response."""
+        meta = {
+            'snapshot_age_seconds': round(self.age_seconds, 2),
+            'snapshot_at': self.fetched_at_iso,
+            'snapshot_generation': self.generation
+        }
+        if self.errors:
+            meta['snapshot_errors'] = dict(self.errors)
+        return meta
+
+
+class SnapshotService:
+    """
+    Periodically rebuilds a FleetSnapshot from the API clients.
+
+    Readers call get() and receive the current snapshot without blocking
+    on a refresh. If one source fails, its data from the previous snapshot
+    is carried forward and the error is reported in snapshot.errors.
+
+    Example:
+        service = SnapshotService(unifi_client, ninjaone_client)
+        service.start()
+        snapshot = service.get()
+        result = snapshot.analyzer.analyze("sites with offline devices")
+    """
+
+    def __init__(
+        self,
+        unifi_client=None,
+        ninjaone_client=None,
+        refresh_interval: Optional[float] = None,
+        build_correlator: bool = True
+    ):
+        self.unifi_client = unifi_client
+        self.ninjaone_client = ninjaone_client
+        if refresh_interval is None:
+            refresh_interval = float(os.getenv('DATA_REFRESH_INTERVAL', DEFAULT_REFRESH_SECONDS))
+        self.refresh_interval = refresh_interval
+        self.build_correlator = build_correlator
+        # Shared by every Correlator built, so overrides survive refreshes
+        self.correlation_overrides: Dict[str, str] = {}
+        if build_correlator:
+            from ninjaone import Correlator
+            self.correlation_overrides = Correlator.load_overrides()
+
+        from common.delta import DeltaTracker
+
+        self._snapshot: Optional[FleetSnapshot] = None
+        self._tracker = DeltaTracker()
+        self._history: deque = deque(maxlen=DELTA_HISTORY)
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.refresh_count = 0
+        self.failed_refreshes = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> 'SnapshotService':
+        """Load the first snapshot and start the background refresher."""
+        if self.running:
+            return self
+        if self._snapshot is None:
+            self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='fleet-snapshot', daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Snapshot refresher started (every {self.refresh_interval:g}s)")
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the background refresher."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Snapshot refresh failed: {e}")
+
+    def get(self) -> FleetSnapshot:
+        """
+        Return the current snapshot.
+
+        Only the very first call (before start() or any refresh) fetches
+        synchronously; after that this is a plain reference read.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._refresh_lock:
+                snapshot = self._snapshot
+            if snapshot is None:
+                snapshot = self.refresh()
+        return snapshot
+
+    def refresh(self) -> FleetSnapshot:
+        """Fetch all sources, build a new snapshot and swap it in."""
+        with self._refresh_lock:
+            started = time.time()
+            previous = self._snapshot or FleetSnapshot()
+            errors: Dict[str, str] = {}
+
+            sites = self._fetch('unifi_sites', errors, previous.sites, self._fetch_sites)
+            alerts = self._fetch('ninjaone_alerts', errors, previous.alerts, self._fetch_alerts)
+            devices = self._fetch('ninjaone_devices', errors, previous.devices, self._fetch_devices)
+
+            deltas = {
+                kind: self._tracker.update(kind, items, key=lambda item: item.id)
+                for kind, items in zip(ENTITY_KINDS, (sites, alerts, devices))
+            }
+            first = self._snapshot is None
+            sites_changed = first or not deltas['sites'].is_empty
+            any_changed = first or any(not d.is_empty for d in deltas.values())
+
+            snapshot = FleetSnapshot(
+                sites=sites,
+                alerts=alerts,
+                devices=devices,
+                analyzer=self._build_analyzer(sites) if sites_changed else previous.analyzer,
+                summary=self._build_summary(sites) if sites_changed else previous.summary,
+                correlator=(
+                    self._build_correlator(sites, alerts, devices)
+                    if any_changed else previous.correlator
+                ),
+                fetched_at=time.time(),
+                refresh_duration=time.time() - started,
+                errors=errors,
+                sites_by_id={s.id: s for s in sites},
+                generation=previous.generation + 1,
+                deltas=deltas
+            )
+
+            self._snapshot = snapshot
+            self._history.append((snapshot.generation, deltas))
+            self.refresh_count += 1
+            if errors:
+                self.failed_refreshes += 1
+                logger.warning(f"Snapshot refreshed with errors: {errors}")
+            else:
+                logger.debug(
+                    f"Snapshot refreshed: {len(sites)} sites, {len(alerts)} alerts, "
+                    f"{len(devices)} devices in {snapshot.refresh_duration:.2f}s"
+                )
+            return snapshot
+
+    def changes_since(self, generation: int) -> Optional[Dict[str, Any]]:
+        """
+        Merged deltas for every refresh after `generation`.
+
+        Returns None if that generation is older than the kept history;
+        the caller should then resync from the full snapshot.
+        """
+        history = list(self._history)
+        current = history[-1][0] if history else 0
+        if generation == current:
+            return {}
+        if generation > current or generation < history[0][0] - 1:
+            return None
+
+        merged: Dict[str, Any] = {}
+        for gen, deltas in history:
+            if gen <= generation:
+                continue
+            for kind, delta in deltas.items():
+                merged[kind] = merged[kind].merge(delta) if kind in merged else delta
+        return merged
+
+    @staticmethod
+    def _fetch(name: str, errors: Dict[str, str], fallback: tuple, fetcher) -> tuple:
+        try:
+            return tuple(fetcher())
+        except Exception as e:
+            errors[name] = str(e)
+            return fallback
+
+    def _fetch_sites(self) -> List[Any]:
+        if not self.unifi_client:
+            return []
+        return self.unifi_client.get_sites()
+
+    def _fetch_alerts(self) -> List[Any]:
+        if not self.ninjaone_client or not hasattr(self.ninjaone_client, 'get_alerts'):
+            return []
+        return self.ninjaone_client.get_alerts()
+
+    def _fetch_devices(self) -> List[Any]:
+        if not self.ninjaone_client or not hasattr(self.ninjaone_client, 'get_devices'):
+            return []
+        return self.ninjaone_client.get_devices()
+
+    def _build_analyzer(self, sites: tuple):
+        if not self.unifi_client:
+            return None
+        from unifi import UniFiAnalyzer
+        return UniFiAnalyzer(list(sites))
+
+    def _build_summary(self, sites: tuple):
+        if not self.unifi_client:
+            return None
+        from unifi import FleetSummary
+        return FleetSummary.from_sites(list(sites))
+
+    def _build_correlator(self, sites: tuple, alerts: tuple, devices: tuple):
+        if not self.build_correlator:
+            return None
+        from ninjaone import Correlator
+        return Correlator(
+            unifi_sites=list(sites),
+            ninjaone_alerts=list(alerts),
+            ninjaone_devices=list(devices),
+            overrides=self.correlation_overrides
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Refresher statistics for /metrics."""
+        snapshot = self._snapshot
+        return {
+            'running': self.running,
+            'refresh_interval_seconds': self.refresh_interval,
+            'refresh_count': self.refresh_count,
+            'generation': snapshot.generation if snapshot else 0,
+            'failed_refreshes': self.failed_refreshes,
+            'age_seconds': round(snapshot.age_seconds, 2) if snapshot else None,
+            'last_refresh_duration_seconds': round(snapshot.refresh_duration, 3) if snapshot else None,
+            'errors': dict(snapshot.errors) if snapshot else {}
+        }
+
+
+__all__ = [
+    'FleetSnapshot',
+    'SnapshotService'
+]
@@ -8,6 +8,10 @@ Provides endpoints for:
 - NinjaOne alert access
 - Cross-platform correlation
 - Health checks (Kubernetes-compatible /health and /ready)
+
+Fleet data (sites, alerts, devices, summary, correlation) is served from a
+prefetched snapshot refreshed in the background; see n8n/snapshot.py.
+Snapshot-backed responses include snapshot_age_seconds and snapshot_at.
 """
 
 import os
@@ -19,6 +23,8 @@ from datetime import datetime, timezone
 
 from flask import Flask, request, jsonify
 
+from .snapshot import SnapshotService
+
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +53,8 @@ def _format_uptime(seconds: float) -> str:
 def create_app(
     unifi_client=None,
     ninjaone_client=None,
-    correlator=None
+    correlator=None,
+    snapshot_service: Optional[SnapshotService] = None
 ) -> Flask:
     """
     Create Flask application with all endpoints.
@@ -55,7 +62,10 @@ def create_app(
     Args:
         unifi_client: UniFi API client instance
         ninjaone_client: NinjaOne API client instance
-        correlator: Cross-platform correlator instance
+        correlator: Cross-platform correlator instance (defaults to one
+            rebuilt with every snapshot)
+        snapshot_service: Prefetching snapshot service; one is created and
+            started for the given clients if not provided
     """
     app = Flask(__name__)
     app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', 'dev-key-change-me')
@@ -64,17 +74,19 @@ def create_app(
     app.unifi_client = unifi_client
     app.ninjaone_client = ninjaone_client
     app.correlator = correlator
-    
-    # Lazy imports to avoid circular dependencies
-    _unifi_analyzer = None
-    
-    def get_unifi_analyzer():
-        nonlocal _unifi_analyzer
-        if _unifi_analyzer is None and app.unifi_client:
-            from unifi import UniFiAnalyzer
-            sites = app.unifi_client.get_sites()
-            _unifi_analyzer = UniFiAnalyzer(sites)
-        return _unifi_analyzer
+
+    if snapshot_service is None:
+        snapshot_service = SnapshotService(unifi_client, ninjaone_client)
+        if unifi_client or ninjaone_client:
+            snapshot_service.start()
+    app.snapshot_service = snapshot_service
+
+    def get_correlator(snapshot):
+        return app.correlator or snapshot.correlator
+
+    def with_snapshot(payload: Dict[str, Any], snapshot) -> Dict[str, Any]:
+        payload.update(snapshot.meta())
+        return payload
     
     # ========== Health Endpoints ==========
 
@@ -160,8 +172,14 @@ def create_app(
         Returns key operational metrics in JSON format.
         For Prometheus, consider using prometheus_flask_exporter.
         """
+        from common.cache import get_cache
+        from common.http_cache import ResponseCache
+
         uptime_seconds = time.time() - _start_time
 
+        # Site/device/alert counts come from the snapshot, never the live APIs
+        snapshot = app.snapshot_service.get()
+
         metrics_data = {
             'timestamp': datetime.now(timezone.utc).isoformat(),
             'version': _version,
@@ -170,34 +188,65 @@ def create_app(
                 'unifi_configured': app.unifi_client is not None,
                 'ninjaone_configured': app.ninjaone_client is not None,
                 'correlator_configured': app.correlator is not None
-            }
+            },
+            'snapshot': app.snapshot_service.stats(),
+            'cache': get_cache().stats()
         }
 
-        # Add site/device counts if available
         if app.unifi_client:
-            try:
-                sites = app.unifi_client.get_sites()
-                metrics_data['unifi'] = {
-                    'site_count': len(sites),
-                    'total_devices': sum(s.device_count for s in sites),
-                    'offline_devices': sum(s.offline_device_count for s in sites)
-                }
-            except Exception:
-                metrics_data['unifi'] = {'error': 'Failed to fetch metrics'}
+            sites = snapshot.sites
+            metrics_data['unifi'] = {
+                'site_count': len(sites),
+                'total_devices': sum(s.total_devices for s in sites),
+                'offline_devices': sum(s.offline_devices for s in sites)
+            }
+            response_cache = getattr(app.unifi_client, 'response_cache', None)
+            if isinstance(response_cache, ResponseCache):
+                metrics_data['unifi']['http_cache'] = response_cache.stats()
 
         if app.ninjaone_client:
-            try:
-                if hasattr(app.ninjaone_client, 'get_alerts'):
-                    alerts = app.ninjaone_client.get_alerts()
-                    critical = [a for a in alerts if a.severity == 'CRITICAL']
-                    metrics_data['ninjaone'] = {
-                        'total_alerts': len(alerts),
-                        'critical_alerts': len(critical)
-                    }
-            except Exception:
-                metrics_data['ninjaone'] = {'error': 'Failed to fetch metrics'}
-
-        return jsonify(metrics_data)
+            metrics_data['ninjaone'] = {
+                'total_alerts': len(snapshot.alerts),
+                'critical_alerts': len(snapshot.get_alerts(severity='CRITICAL'))
+            }
+            response_cache = getattr(app.ninjaone_client, 'response_cache', None)
+            if isinstance(response_cache, ResponseCache):
+                metrics_data['ninjaone']['http_cache'] = response_cache.stats()
+
+        return jsonify(with_snapshot(metrics_data, snapshot))
+
+    @app.route('/api/changes', methods=['GET'])
+    def snapshot_changes():
+        """
+        Sites, alerts and devices changed since a snapshot generation.
+
+        Query params:
+            since: Generation from a previous response's snapshot_generation
+                   (default: the refresh before the current one)
+
+        Added and changed entities are returned in full, removed ones by ID.
+        If `since` is older than the kept history, `full` is true and the
+        caller should resync from the list endpoints.
+        """
+        snapshot = app.snapshot_service.get()
+        try:
+            since = int(request.args.get('since', snapshot.generation - 1))
+        except ValueError:
+            return jsonify({'error': 'since must be an integer'}), 400
+
+        changes = app.snapshot_service.changes_since(since)
+        if changes is None:
+            return jsonify(with_snapshot({'since': since, 'full': True, 'changes': None}, snapshot))
+
+        payload = {}
+        for kind, delta in changes.items():
+            entities = snapshot.lookup(kind)
+            payload[kind] = {
+                'added': [entities[i].to_dict() for i in delta.added if i in entities],
+                'changed': [entities[i].to_dict() for i in delta.changed if i in entities],
+                'removed': list(delta.removed)
+            }
+        return jsonify(with_snapshot({'since': since, 'full': False, 'changes': payload}, snapshot))
 
     # ========== UniFi Endpoints ==========
     
@@ -212,8 +261,8 @@ def create_app(
         Returns:
             Query result with matching sites
         """
-        analyzer = get_unifi_analyzer()
-        if not analyzer:
+        snapshot = app.snapshot_service.get()
+        if not snapshot.analyzer:
             return jsonify({'error': 'UniFi client not configured'}), 503
         
         data = request.get_json() or {}
@@ -223,8 +272,8 @@ def create_app(
             return jsonify({'error': 'Missing query parameter'}), 400
         
         try:
-            result = analyzer.analyze(query)
-            return jsonify(result.to_dict())
+            result = snapshot.analyzer.analyze(query)
+            return jsonify(with_snapshot(result.to_dict(), snapshot))
         except Exception as e:
             logger.error(f"Query error: {e}")
             return jsonify({'error': str(e)}), 500
@@ -236,11 +285,11 @@ def create_app(
             return jsonify({'error': 'UniFi client not configured'}), 503
         
         try:
-            sites = app.unifi_client.get_sites()
-            return jsonify({
-                'count': len(sites),
-                'sites': [s.to_dict() for s in sites]
-            })
+            snapshot = app.snapshot_service.get()
+            return jsonify(with_snapshot({
+                'count': len(snapshot.sites),
+                'sites': [s.to_dict() for s in snapshot.sites]
+            }, snapshot))
         except Exception as e:
             logger.error(f"Sites error: {e}")
             return jsonify({'error': str(e)}), 500
@@ -252,10 +301,11 @@ def create_app(
             return jsonify({'error': 'UniFi client not configured'}), 503
         
         try:
-            site = app.unifi_client.get_site(site_id)
+            snapshot = app.snapshot_service.get()
+            site = snapshot.get_site(site_id)
             if not site:
                 return jsonify({'error': 'Site not found'}), 404
-            return jsonify(site.to_dict())
+            return jsonify(with_snapshot(site.to_dict(), snapshot))
         except Exception as e:
             logger.error(f"Site error: {e}")
             return jsonify({'error': str(e)}), 500
@@ -267,8 +317,8 @@ def create_app(
             return jsonify({'error': 'UniFi client not configured'}), 503
         
         try:
-            summary = app.unifi_client.get_fleet_summary()
-            return jsonify(summary.to_dict())
+            snapshot = app.snapshot_service.get()
+            return jsonify(with_snapshot(snapshot.summary.to_dict(), snapshot))
         except Exception as e:
             logger.error(f"Summary error: {e}")
             return jsonify({'error': str(e)}), 500
@@ -276,13 +326,13 @@ def create_app(
     @app.route('/api/unifi/offline', methods=['GET'])
     def unifi_offline():
         """Get sites with offline devices."""
-        analyzer = get_unifi_analyzer()
-        if not analyzer:
+        snapshot = app.snapshot_service.get()
+        if not snapshot.analyzer:
             return jsonify({'error': 'UniFi client not configured'}), 503
         
         try:
-            result = analyzer.analyze("sites with offline devices")
-            return jsonify(result.to_dict())
+            result = snapshot.analyzer.analyze("sites with offline devices")
+            return jsonify(with_snapshot(result.to_dict(), snapshot))
         except Exception as e:
             logger.error(f"Offline error: {e}")
             return jsonify({'error': str(e)}), 500
@@ -348,11 +398,12 @@ def create_app(
         org_id = request.args.get('org_id')
         
         try:
-            alerts = app.ninjaone_client.get_alerts(severity=severity, org_id=org_id)
-            return jsonify({
+            snapshot = app.snapshot_service.get()
+            alerts = snapshot.get_alerts(severity=severity, org_id=org_id)
+            return jsonify(with_snapshot({
                 'count': len(alerts),
                 'alerts': [a.to_dict() for a in alerts]
-            })
+            }, snapshot))
         except Exception as e:
             logger.error(f"Alerts error: {e}")
             return jsonify({'error': str(e)}), 500
@@ -364,11 +415,12 @@ def create_app(
             return jsonify({'error': 'NinjaOne client not configured'}), 503
         
         try:
-            alerts = app.ninjaone_client.get_critical_alerts()
-            return jsonify({
+            snapshot = app.snapshot_service.get()
+            alerts = snapshot.get_alerts(severity='CRITICAL')
+            return jsonify(with_snapshot({
                 'count': len(alerts),
                 'alerts': [a.to_dict() for a in alerts]
-            })
+            }, snapshot))
         except Exception as e:
             logger.error(f"Critical alerts error: {e}")
             return jsonify({'error': str(e)}), 500
@@ -382,11 +434,12 @@ def create_app(
         org_id = request.args.get('org_id')
         
         try:
-            devices = app.ninjaone_client.get_devices(org_id=org_id)
-            return jsonify({
+            snapshot = app.snapshot_service.get()
+            devices = snapshot.get_devices(org_id=org_id)
+            return jsonify(with_snapshot({
                 'count': len(devices),
                 'devices': [d.to_dict() for d in devices]
-            })
+            }, snapshot))
         except Exception as e:
             logger.error(f"Devices error: {e}")
             return jsonify({'error': str(e)}), 500
@@ -547,7 +600,9 @@ def create_app(
         Request body:
             {"customer": "Setco Industries"}
         """
-        if not app.correlator:
+        snapshot = app.snapshot_service.get()
+        correlator = get_correlator(snapshot)
+        if not correlator:
             return jsonify({'error': 'Correlator not configured'}), 503
         
         data = request.get_json() or {}
@@ -557,8 +612,8 @@ def create_app(
             return jsonify({'error': 'Missing customer parameter'}), 400
         
         try:
-            incident = app.correlator.get_incident_context(customer)
-            return jsonify(incident.to_dict())
+            incident = correlator.get_incident_context(customer)
+            return jsonify(with_snapshot(incident.to_dict(), snapshot))
         except Exception as e:
             logger.error(f"Correlation error: {e}")
             return jsonify({'error': str(e)}), 500
@@ -566,15 +621,17 @@ def create_app(
     @app.route('/api/correlate/issues', methods=['GET'])
     def correlate_issues():
         """Get all correlated issues."""
-        if not app.correlator:
+        snapshot = app.snapshot_service.get()
+        correlator = get_correlator(snapshot)
+        if not correlator:
             return jsonify({'error': 'Correlator not configured'}), 503
         
         try:
-            incidents = app.correlator.find_correlated_issues()
-            return jsonify({
+            incidents = correlator.find_correlated_issues()
+            return jsonify(with_snapshot({
                 'count': len(incidents),
                 'incidents': [i.to_dict() for i in incidents]
-            })
+            }, snapshot))
         except Exception as e:
             logger.error(f"Issues error: {e}")
             return jsonify({'error': str(e)}), 500
@@ -582,16 +639,69 @@ def create_app(
     @app.route('/api/correlate/morning-check', methods=['GET'])
     def morning_check():
         """Get morning check report."""
-        if not app.correlator:
+        snapshot = app.snapshot_service.get()
+        correlator = get_correlator(snapshot)
+        if not correlator:
             return jsonify({'error': 'Correlator not configured'}), 503
         
         try:
-            report = app.correlator.get_morning_check_report()
-            return jsonify(report)
+            report = correlator.get_morning_check_report()
+            return jsonify(with_snapshot(report, snapshot))
         except Exception as e:
             logger.error(f"Morning check error: {e}")
             return jsonify({'error': str(e)}), 500
-    
+
+    @app.route('/api/correlate/stats', methods=['GET'])
+    def correlate_stats():
+        """Get correlation index size and match timings."""
+        snapshot = app.snapshot_service.get()
+        correlator = get_correlator(snapshot)
+        if not correlator:
+            return jsonify({'error': 'Correlator not configured'}), 503
+
+        return jsonify(with_snapshot(correlator.stats(), snapshot))
+
+    @app.route('/api/correlate/overrides', methods=['GET', 'POST', 'DELETE'])
+    def correlate_overrides():
+        """
+        Manage manual customer → NinjaOne org mappings.
+
+        Overrides apply to every later snapshot; they are kept across
+        restarts only if CORRELATION_OVERRIDES_FILE is set ("persisted").
+
+        POST body:
+            {"customer": "Setco", "org": "Setco Industries Inc"}
+        DELETE body:
+            {"customer": "Setco"}
+        """
+        snapshot = app.snapshot_service.get()
+        correlator = get_correlator(snapshot)
+        if not correlator:
+            return jsonify({'error': 'Correlator not configured'}), 503
+
+        persisted = bool(correlator.overrides_file)
+        if request.method == 'GET':
+            return jsonify({'overrides': correlator.overrides, 'persisted': persisted})
+
+        data = request.get_json() or {}
+        customer = data.get('customer', '')
+        if not customer:
+            return jsonify({'error': 'Missing customer parameter'}), 400
+
+        try:
+            if request.method == 'DELETE':
+                removed = correlator.remove_override(customer)
+                return jsonify({'removed': removed, 'overrides': correlator.overrides, 'persisted': persisted})
+
+            org = data.get('org', '')
+            if not org:
+                return jsonify({'error': 'Missing org parameter'}), 400
+            correlator.set_override(customer, org)
+            return jsonify({'overrides': correlator.overrides, 'persisted': persisted})
+        except OSError as e:
+            logger.error(f"Override save error: {e}")
+            return jsonify({'error': str(e)}), 500
+
     return app
 
 
@@ -605,9 +715,8 @@ def run_server(host: str = '0.0.0.0', port: int = 5000, debug: bool = False):
         debug: Enable debug mode
     """
     # Import clients
-    from unifi import get_client as get_unifi_client, DemoUniFiClient
-    from ninjaone import get_client as get_ninjaone_client, DemoNinjaOneClient
-    from ninjaone import Correlator
+    from unifi import get_client as get_unifi_client
+    from ninjaone import get_client as get_ninjaone_client
     
     # Check for demo mode
     demo_mode = os.getenv('OBERACONNECT_DEMO', 'false').lower() == 'true'
@@ -616,34 +725,21 @@ def run_server(host: str = '0.0.0.0', port: int = 5000, debug: bool = False):
     unifi = get_unifi_client(demo=demo_mode)
     ninjaone = get_ninjaone_client(demo=demo_mode)
 
-    # Initialize data (with graceful fallback on errors)
-    try:
-        unifi_sites = unifi.get_sites()
-        logger.info(f"Loaded {len(unifi_sites)} UniFi sites")
-    except Exception as e:
-        logger.warning(f"Failed to load UniFi sites: {e}")
-        unifi_sites = []
-
-    try:
-        ninjaone_alerts = ninjaone.get_alerts() if hasattr(ninjaone, 'get_alerts') else []
-        ninjaone_devices = ninjaone.get_devices() if hasattr(ninjaone, 'get_devices') else []
-        logger.info(f"Loaded {len(ninjaone_alerts)} NinjaOne alerts, {len(ninjaone_devices)} devices")
-    except Exception as e:
-        logger.warning(f"Failed to load NinjaOne data: {e}")
-        ninjaone_alerts = []
-        ninjaone_devices = []
-    
-    correlator = Correlator(
-        unifi_sites=unifi_sites,
-        ninjaone_alerts=ninjaone_alerts,
-        ninjaone_devices=ninjaone_devices
+    # Prefetch fleet data; the correlator is rebuilt with every snapshot
+    snapshot_service = SnapshotService(unifi, ninjaone).start()
+    snapshot = snapshot_service.get()
+    logger.info(
+        f"Loaded {len(snapshot.sites)} UniFi sites, {len(snapshot.alerts)} NinjaOne alerts, "
+        f"{len(snapshot.devices)} devices"
     )
+    for source, error in snapshot.errors.items():
+        logger.warning(f"Failed to load {source}: {error}")
     
     # Create and run app
     app = create_app(
         unifi_client=unifi,
         ninjaone_client=ninjaone,
-        correlator=correlator
+        snapshot_service=snapshot_service
     )
     
     logger.info(f"Starting webhook API on {host}:{port}")
@@ -2,17 +2,25 @@
 NinjaOne RMM API Client
 
 Client for NinjaOne API integration.
+
+List endpoints are paginated with pageSize/after cursors and exposed as
+generators; all requests share a pooled session and a per-host rate limit.
 """
 
 import os
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Iterator, Optional, Union
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 import requests
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from common.http_cache import ResponseCache
+from common.ratelimit import get_host_limiter, retry_after_seconds
+
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +41,8 @@ class NinjaOneConfig:
     base_url: str = "https://us2.ninjarmm.com"
     timeout: int = 30
     verify_ssl: bool = True
+    rate_limit: float = 10.0  # Requests per second, shared per host (0 = unlimited)
+    page_size: int = 500
 
     @classmethod
     def from_env(cls) -> 'NinjaOneConfig':
@@ -42,10 +52,28 @@ class NinjaOneConfig:
             base_url=os.getenv('NINJAONE_BASE_URL', 'https://api.ninjarmm.com'),
             timeout=int(os.getenv('NINJAONE_TIMEOUT', '30')),
             # Default to True; only disable for local dev with self-signed certs
-            verify_ssl=os.getenv('NINJAONE_VERIFY_SSL', 'true').lower() != 'false'
+            verify_ssl=os.getenv('NINJAONE_VERIFY_SSL', 'true').lower() != 'false',
+            rate_limit=float(os.getenv('NINJAONE_RATE_LIMIT', '10'))
         )
 
 
+def _parse_time(value: Union[str, int, float, None]) -> Optional[datetime]:
+    """
+    Parse a NinjaOne timestamp.
+    
+    The API returns epoch seconds (possibly fractional); ISO 8601 strings
+    are accepted too.
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    try:
+        return datetime.fromtimestamp(float(value), tz=timezone.utc)
+    except ValueError:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
 @dataclass
 class NinjaOneAlert:
     """Represents a NinjaOne alert."""
@@ -131,14 +159,25 @@ class NinjaOneClient:
 
     # Buffer time before expiration to refresh token (5 minutes)
     TOKEN_REFRESH_BUFFER = timedelta(minutes=5)
+    MAX_RATE_LIMIT_RETRIES = 3
 
     def __init__(self, config: Optional[NinjaOneConfig] = None):
         self.config = config or NinjaOneConfig.from_env()
         self.session = requests.Session()
         self.session.verify = self.config.verify_ssl
+        self.session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+        self._limiter = None
+        self.response_cache = ResponseCache()
         self._access_token: Optional[str] = None
         self._token_expires: Optional[datetime] = None
 
+    @property
+    def limiter(self):
+        """Rate limiter shared by all clients of this NinjaOne host."""
+        if self._limiter is None:
+            self._limiter = get_host_limiter(self.config.base_url, self.config.rate_limit)
+        return self._limiter
+    
     def _is_token_expired(self) -> bool:
         """Check if token needs refresh (expired or expiring soon)."""
         if not self._access_token or not self._token_expires:
@@ -184,7 +223,14 @@ class NinjaOneClient:
                                        requests.exceptions.Timeout))
     )
     def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
-        """Make authenticated API request with retry logic."""
+        """
+        Make authenticated API request with retry logic.
+        
+        GET requests send cached validators and reuse the cached payload
+        on 304 or an identical body. 429 responses are retried after the
+        Retry-After delay (or exponential backoff), up to
+        MAX_RATE_LIMIT_RETRIES times.
+        """
         # Proactively refresh token if expired or expiring soon
         if self._is_token_expired():
             self._authenticate()
@@ -193,21 +239,13 @@ class NinjaOneClient:
             'Authorization': f'Bearer {self._access_token}',
             'Accept': 'application/json'
         }
+        cache_key = None
+        if method == 'GET':
+            cache_key = self.response_cache.key(f"{self.config.base_url}{endpoint}", kwargs.get('params'))
+            headers.update(self.response_cache.conditional_headers(cache_key))
 
-        response = self.session.request(
-            method=method,
-            url=f"{self.config.base_url}{endpoint}",
-            headers=headers,
-            timeout=self.config.timeout,
-            **kwargs
-        )
-
-        if response.status_code == 401:
-            # Token rejected (possibly invalidated server-side), force re-authenticate
-            logger.warning("Token rejected, re-authenticating...")
-            self._access_token = None  # Force refresh
-            self._authenticate()
-            headers['Authorization'] = f'Bearer {self._access_token}'
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            self.limiter.acquire()
             response = self.session.request(
                 method=method,
                 url=f"{self.config.base_url}{endpoint}",
@@ -216,8 +254,28 @@ class NinjaOneClient:
                 **kwargs
             )
 
+            if response.status_code == 401:
+                # Token rejected (possibly invalidated server-side), force re-authenticate
+                logger.warning("Token rejected, re-authenticating...")
+                self._access_token = None  # Force refresh
+                self._authenticate()
+                headers['Authorization'] = f'Bearer {self._access_token}'
+                self.limiter.acquire()
+                response = self.session.request(
+                    method=method,
+                    url=f"{self.config.base_url}{endpoint}",
+                    headers=headers,
+                    timeout=self.config.timeout,
+                    **kwargs
+                )
+
+            if response.status_code != 429 or attempt == self.MAX_RATE_LIMIT_RETRIES:
+                break
+            retry_after = retry_after_seconds(response, attempt)
+            logger.warning(f"Rate limited by NinjaOne API, retrying in {retry_after:.1f}s")
+            time.sleep(retry_after)
+
         if response.status_code == 429:
-            # Rate limited - let tenacity handle retry
             raise NinjaOneAPIError("Rate limited", status_code=429)
 
         if response.status_code >= 400:
@@ -226,34 +284,66 @@ class NinjaOneClient:
                 status_code=response.status_code
             )
 
+        if cache_key:
+            return self.response_cache.resolve(cache_key, response)
         return response.json()
     
-    def get_alerts(
-        self, 
-        severity: Optional[str] = None,
-        org_id: Optional[str] = None
-    ) -> List[NinjaOneAlert]:
+    def _paginate(
+        self,
+        endpoint: str,
+        key: str,
+        params: Dict[str, Any] = None,
+        page_size: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Get alerts from NinjaOne.
+        Yield items from a list endpoint, following `after` cursors.
+        
+        NinjaOne pages by the ID of the last item seen. Stops on a short
+        page, or if the API ignores the cursor and repeats a page.
         
         Args:
-            severity: Filter by severity (CRITICAL, MAJOR, MODERATE, MINOR)
-            org_id: Filter by organization ID
+            endpoint: API path
+            key: Wrapper key if the response is an object, not a list
+            params: Query parameters
+            page_size: Items per page (defaults to config.page_size)
         """
+        params = dict(params or {})
+        page_size = page_size or self.config.page_size
+        params['pageSize'] = page_size
+        last_id = None
+        
+        while True:
+            data = self._request('GET', endpoint, params=params)
+            # NinjaOne API returns list directly, not wrapped in {key: [...]}
+            items = data if isinstance(data, list) else data.get(key, [])
+            if not items:
+                return
+            
+            page_last_id = items[-1].get('id')
+            if page_last_id is not None and page_last_id == last_id:
+                return
+            yield from items
+            
+            if len(items) < page_size or page_last_id is None:
+                return
+            last_id = page_last_id
+            params['after'] = last_id
+    
+    def iter_alerts(
+        self,
+        severity: Optional[str] = None,
+        org_id: Optional[str] = None
+    ) -> Iterator[NinjaOneAlert]:
+        """Stream alerts page by page (see get_alerts for filters)."""
         params = {}
         if severity:
             params['severity'] = severity
         if org_id:
             params['organizationId'] = org_id
         
-        data = self._request('GET', '/v2/alerts', params=params)
-        
-        alerts = []
-        # NinjaOne API returns list directly, not wrapped in {'alerts': [...]}
-        items = data if isinstance(data, list) else data.get('alerts', [])
-        for item in items:
+        for item in self._paginate('/v2/alerts', 'alerts', params):
             try:
-                alert = NinjaOneAlert(
+                yield NinjaOneAlert(
                     id=str(item.get('id', '')),
                     severity=item.get('severity', 'UNKNOWN'),
                     message=item.get('message', ''),
@@ -261,50 +351,55 @@ class NinjaOneClient:
                     device_name=item.get('deviceName', ''),
                     org_id=str(item.get('organizationId', '')),
                     org_name=item.get('organizationName', ''),
-                    created_at=datetime.fromisoformat(item['createTime'].replace('Z', '+00:00')) 
-                               if item.get('createTime') else None,
+                    created_at=_parse_time(item.get('createTime')),
                     acknowledged=item.get('acknowledged', False)
                 )
-                alerts.append(alert)
             except Exception as e:
                 logger.warning(f"Failed to parse alert: {e}")
+    
+    def get_alerts(
+        self, 
+        severity: Optional[str] = None,
+        org_id: Optional[str] = None
+    ) -> List[NinjaOneAlert]:
+        """
+        Get alerts from NinjaOne.
         
-        return alerts
+        Args:
+            severity: Filter by severity (CRITICAL, MAJOR, MODERATE, MINOR)
+            org_id: Filter by organization ID
+        """
+        return list(self.iter_alerts(severity=severity, org_id=org_id))
     
-    def get_devices(self, org_id: Optional[str] = None) -> List[NinjaOneDevice]:
-        """Get managed devices."""
+    def iter_devices(self, org_id: Optional[str] = None) -> Iterator[NinjaOneDevice]:
+        """Stream managed devices page by page."""
         params = {}
         if org_id:
             params['organizationId'] = org_id
         
-        data = self._request('GET', '/v2/devices', params=params)
-        
-        devices = []
-        # NinjaOne API returns list directly, not wrapped in {'devices': [...]}
-        items = data if isinstance(data, list) else data.get('devices', [])
-        for item in items:
+        for item in self._paginate('/v2/devices', 'devices', params):
             try:
-                device = NinjaOneDevice(
+                yield NinjaOneDevice(
                     id=str(item.get('id', '')),
                     name=item.get('systemName', item.get('dnsName', 'Unknown')),
                     org_id=str(item.get('organizationId', '')),
                     org_name=item.get('organizationName', ''),
                     status=item.get('nodeStatus', 'UNKNOWN'),
                     os=item.get('os', {}).get('name', 'Unknown'),
+                    last_contact=_parse_time(item.get('lastContact')),
                     ip_address=item.get('ipAddress')
                 )
-                devices.append(device)
             except Exception as e:
                 logger.warning(f"Failed to parse device: {e}")
-        
-        return devices
+    
+    def get_devices(self, org_id: Optional[str] = None) -> List[NinjaOneDevice]:
+        """Get managed devices."""
+        return list(self.iter_devices(org_id=org_id))
     
     def get_organizations(self) -> List[NinjaOneOrg]:
         """Get all organizations (customers)."""
-        data = self._request('GET', '/v2/organizations')
-        
         orgs = []
-        for item in data if isinstance(data, list) else data.get('organizations', []):
+        for item in self._paginate('/v2/organizations', 'organizations'):
             try:
                 org = NinjaOneOrg(
                     id=str(item.get('id', '')),
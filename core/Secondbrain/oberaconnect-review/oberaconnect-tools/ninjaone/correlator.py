@@ -7,12 +7,20 @@ Example use cases:
 - AP goes offline → Check for related endpoint alerts
 - Multiple devices offline at same customer → Likely network issue
 - Endpoint alerts spike → Check network health
+
+Customer → NinjaOne org matching goes through an OrgMatchIndex built once
+per data load, plus an optional persisted table of manual overrides
+(CORRELATION_OVERRIDES_FILE).
 """
 
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from threading import Lock
+import json
 import logging
+import os
+import time
 
 from unifi.models import UniFiSite, FleetSummary
 from .client import NinjaOneAlert, NinjaOneDevice
@@ -46,6 +54,8 @@ class CorrelatedIncident:
     # Correlation metadata
     correlation_type: str = "unknown"  # network_outage, endpoint_issue, combined
     confidence: float = 0.0  # 0-1 confidence score
+    match_type: str = "none"  # override, exact, substring, first_word, none
+    match_ms: float = 0.0  # Time spent matching the customer to an org
     created_at: datetime = field(default_factory=datetime.now)
     
     def to_dict(self) -> Dict[str, Any]:
@@ -62,32 +72,152 @@ class CorrelatedIncident:
             'offlineEndpoints': self.offline_endpoints,
             'correlationType': self.correlation_type,
             'confidence': round(self.confidence, 2),
+            'matchType': self.match_type,
+            'matchMs': round(self.match_ms, 3),
             'createdAt': self.created_at.isoformat()
         }
 
 
+@dataclass
+class OrgMatch:
+    """Best NinjaOne org for a customer name."""
+    org_key: Optional[str]
+    confidence: float
+    match_type: str
+    elapsed_ms: float = 0.0
+
+
+class OrgMatchIndex:
+    """
+    Precomputed lookup of normalized NinjaOne org names.
+
+    Gives the same answer as scoring every org with
+    Correlator._match_customer (exact 1.0 → substring 0.8 → first word 0.6,
+    earliest org wins ties) without scanning all orgs:
+
+    - exact: alias map of normalized name → orgs
+    - substring: character-trigram inverted index for "name in org", and a
+      lookup of the name's own substrings for "org in name"
+    - first word: map of first token → orgs
+    """
+
+    def __init__(self, org_keys: List[str], normalize):
+        self._normalize = normalize
+        self._rank: Dict[str, int] = {}
+        self._aliases: Dict[str, List[str]] = {}
+        self._trigrams: Dict[str, set] = {}
+        self._by_first_word: Dict[str, List[str]] = {}
+        self._short: List[str] = []
+
+        for rank, key in enumerate(org_keys):
+            self._rank[key] = rank
+            match_key = normalize(key)
+            self._aliases.setdefault(match_key, []).append(key)
+            for trigram in self._trigrams_of(match_key):
+                self._trigrams.setdefault(trigram, set()).add(match_key)
+            words = match_key.split()
+            if words:
+                self._by_first_word.setdefault(words[0], []).append(key)
+
+        self._alias_lengths = sorted({len(k) for k in self._aliases})
+
+    def __len__(self) -> int:
+        return len(self._rank)
+
+    @staticmethod
+    def _trigrams_of(text: str) -> set:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def _first(self, keys) -> Optional[str]:
+        return min(keys, key=self._rank.__getitem__, default=None)
+
+    def _containing(self, name: str) -> List[str]:
+        """Match keys that contain name."""
+        if len(name) < 3:
+            return [k for k in self._aliases if name in k]
+        postings = []
+        for trigram in self._trigrams_of(name):
+            posting = self._trigrams.get(trigram)
+            if not posting:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set.intersection(*postings)
+        return [k for k in candidates if name in k]
+
+    def _contained_in(self, name: str) -> List[str]:
+        """Match keys that are substrings of name."""
+        found = []
+        for length in self._alias_lengths:
+            if length > len(name):
+                break
+            for start in range(len(name) - length + 1):
+                part = name[start:start + length]
+                if part in self._aliases:
+                    found.append(part)
+        return found
+
+    def match(self, name: str) -> OrgMatch:
+        """Find the best org for an (already normalized) customer name."""
+        name = self._normalize(name)
+
+        exact = self._aliases.get(name)
+        if exact:
+            return OrgMatch(self._first(exact), 1.0, 'exact')
+
+        substring = set()
+        for match_key in self._containing(name) + self._contained_in(name):
+            substring.update(self._aliases[match_key])
+        if substring:
+            return OrgMatch(self._first(substring), 0.8, 'substring')
+
+        words = name.split()
+        if words and words[0] in self._by_first_word:
+            return OrgMatch(self._by_first_word[words[0]][0], 0.6, 'first_word')
+
+        return OrgMatch(None, 0.0, 'none')
+
+
 class Correlator:
     """
     Correlates events across UniFi and NinjaOne platforms.
     
     Uses customer name matching to link UniFi sites with NinjaOne orgs.
+    Manual overrides (customer name → NinjaOne org name) take precedence
+    over name matching and are persisted to overrides_file if set.
+    
+    Pass overrides (e.g. from load_overrides()) to share one table between
+    correlators: changes made through any of them are seen by all.
     """
     
     def __init__(
         self,
         unifi_sites: List[UniFiSite] = None,
         ninjaone_alerts: List[NinjaOneAlert] = None,
-        ninjaone_devices: List[NinjaOneDevice] = None
+        ninjaone_devices: List[NinjaOneDevice] = None,
+        overrides_file: Optional[str] = None,
+        overrides: Optional[Dict[str, str]] = None
     ):
         self._unifi_sites = unifi_sites or []
         self._ninjaone_alerts = ninjaone_alerts or []
         self._ninjaone_devices = ninjaone_devices or []
         
+        self.overrides_file = overrides_file or os.getenv('CORRELATION_OVERRIDES_FILE')
+        self._overrides: Dict[str, str] = (
+            overrides if overrides is not None else self.load_overrides(self.overrides_file)
+        )
+        
+        self._stats_lock = Lock()
+        self._match_count = 0
+        self._match_ms_total = 0.0
+        
         # Build lookup indexes
         self._build_indexes()
     
     def _build_indexes(self):
         """Build lookup indexes for efficient correlation."""
+        started = time.perf_counter()
+
         # UniFi sites by normalized name
         self._unifi_by_name: Dict[str, UniFiSite] = {}
         for site in self._unifi_sites:
@@ -109,8 +239,97 @@ class Correlator:
             if key not in self._devices_by_org:
                 self._devices_by_org[key] = []
             self._devices_by_org[key].append(device)
+        
+        # Org match index: alert orgs first, then device-only orgs
+        org_keys = list(self._alerts_by_org)
+        org_keys += [k for k in self._devices_by_org if k not in self._alerts_by_org]
+        self._org_index = OrgMatchIndex(org_keys, self._normalize_name)
+        
+        self.index_build_ms = (time.perf_counter() - started) * 1000
+    
+    # ========== Manual Overrides ==========
+    
+    @classmethod
+    def load_overrides(cls, overrides_file: Optional[str] = None) -> Dict[str, str]:
+        """Read an overrides file (default CORRELATION_OVERRIDES_FILE); {} if unset or unreadable."""
+        overrides_file = overrides_file or os.getenv('CORRELATION_OVERRIDES_FILE')
+        if not overrides_file or not os.path.exists(overrides_file):
+            return {}
+        try:
+            with open(overrides_file, 'r') as f:
+                data = json.load(f)
+            return {cls._normalize_name(k): v for k, v in data.items()}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable correlation overrides {overrides_file}: {e}")
+            return {}
+    
+    def _save_overrides(self):
+        if not self.overrides_file:
+            return
+        directory = os.path.dirname(self.overrides_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.overrides_file + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self._overrides, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.overrides_file)
     
-    def _normalize_name(self, name: str) -> str:
+    @property
+    def overrides(self) -> Dict[str, str]:
+        """Manual customer → NinjaOne org mappings (normalized customer keys)."""
+        return dict(self._overrides)
+    
+    def set_override(self, customer_name: str, org_name: str):
+        """Always match customer_name to the NinjaOne org named org_name."""
+        self._overrides[self._normalize_name(customer_name)] = org_name
+        self._save_overrides()
+    
+    def remove_override(self, customer_name: str) -> bool:
+        """Drop a manual mapping. Returns True if one existed."""
+        removed = self._overrides.pop(self._normalize_name(customer_name), None)
+        if removed is not None:
+            self._save_overrides()
+        return removed is not None
+    
+    # ========== Matching ==========
+    
+    def match_org(self, customer_name: str) -> OrgMatch:
+        """
+        Find the NinjaOne org for a customer, with confidence and timing.
+        
+        Overrides win; otherwise the org index gives the same result as
+        scoring every org with _match_customer.
+        """
+        started = time.perf_counter()
+        norm_name = self._normalize_name(customer_name)
+        
+        override = self._overrides.get(norm_name)
+        if override is not None:
+            result = OrgMatch(self._normalize_name(override), 1.0, 'override')
+        else:
+            result = self._org_index.match(norm_name)
+        
+        result.elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._stats_lock:
+            self._match_count += 1
+            self._match_ms_total += result.elapsed_ms
+        return result
+    
+    def stats(self) -> Dict[str, Any]:
+        """Index size and matching timings for benchmarking."""
+        with self._stats_lock:
+            count, total_ms = self._match_count, self._match_ms_total
+        return {
+            'sites': len(self._unifi_sites),
+            'orgs': len(self._org_index),
+            'overrides': len(self._overrides),
+            'indexBuildMs': round(self.index_build_ms, 3),
+            'matches': count,
+            'avgMatchMs': round(total_ms / count, 4) if count else 0.0
+        }
+    
+    @staticmethod
+    def _normalize_name(name: str) -> str:
         """Normalize customer name for matching."""
         if not name:
             return ""
@@ -162,22 +381,9 @@ class Correlator:
         unifi_site = self._unifi_by_name.get(norm_name)
         
         # Find best matching NinjaOne org
-        best_match_key = None
-        best_confidence = 0.0
-        
-        for key in self._alerts_by_org.keys():
-            confidence = self._match_customer(norm_name, key)
-            if confidence > best_confidence:
-                best_confidence = confidence
-                best_match_key = key
-        
-        # Also check devices
-        for key in self._devices_by_org.keys():
-            if key not in self._alerts_by_org:
-                confidence = self._match_customer(norm_name, key)
-                if confidence > best_confidence:
-                    best_confidence = confidence
-                    best_match_key = key
+        match = self.match_org(customer_name)
+        best_match_key = match.org_key
+        best_confidence = match.confidence
         
         # Get NinjaOne data
         alerts = self._alerts_by_org.get(best_match_key, []) if best_match_key else []
@@ -201,7 +407,9 @@ class Correlator:
             endpoint_alerts=alerts,
             offline_endpoints=offline_endpoints,
             correlation_type=correlation_type,
-            confidence=best_confidence if best_match_key else (1.0 if unifi_site else 0.0)
+            confidence=best_confidence if best_match_key else (1.0 if unifi_site else 0.0),
+            match_type=match.match_type,
+            match_ms=match.elapsed_ms
         )
     
     def _analyze_incident(
@@ -347,5 +555,7 @@ class Correlator:
 
 __all__ = [
     'CorrelatedIncident',
+    'OrgMatch',
+    'OrgMatchIndex',
     'Correlator'
 ]
@@ -280,3 +280,68 @@ class TestEdgeCases:
 
         # Should fall back to filter with no matches or return something reasonable
         assert result.success is True
+
+
+class TestSiteIndex:
+    """Tests for the indexed query path."""
+
+    def test_top_ties_match_full_sort(self, sample_sites):
+        """Indexed top/bottom N should equal a stable full sort."""
+        from unifi.analyzer import UniFiAnalyzer
+
+        analyzer = UniFiAnalyzer(sample_sites)
+
+        for field in ('total_devices', 'offline_devices', 'gateway_count', 'isp'):
+            for n in (1, 2, 3, 10):
+                assert analyzer.top(n, field) == analyzer.sort(field, reverse=True)[:n]
+                assert analyzer.bottom(n, field) == analyzer.sort(field)[:n]
+
+    def test_comparison_uses_sorted_index(self, sample_sites):
+        """Range filters should match a linear scan."""
+        from unifi.analyzer import UniFiAnalyzer
+
+        analyzer = UniFiAnalyzer(sample_sites)
+
+        for op, expected in (('>', 2), ('>=', 3), ('<', 1), ('<=', 2), ('==', 1)):
+            compare = analyzer._make_comparison('total_clients', op, 80)
+            positions = analyzer._index.compare('total_clients', op, 80)
+            assert analyzer._index.select(sorted(positions)) == analyzer.filter(compare)
+            assert len(positions) == expected
+
+    def test_combined_filters(self, sample_sites):
+        """Multiple criteria should intersect and keep site order."""
+        from unifi.analyzer import UniFiAnalyzer
+
+        analyzer = UniFiAnalyzer(sample_sites)
+        result = analyzer.analyze("verizon sites with offline devices")
+
+        assert [s['id'] for s in result.data] == ['site-004']
+
+    def test_find_by_name(self, sample_sites):
+        """Exact name lookup should be case-insensitive."""
+        from unifi.analyzer import UniFiAnalyzer
+
+        analyzer = UniFiAnalyzer(sample_sites)
+
+        assert analyzer.find_by_name('hoods discount').id == 'site-002'
+        assert analyzer.find_by_name('Hoods') is None
+
+    def test_parse_is_cached(self):
+        """Parsing the same query twice should return the cached result."""
+        from unifi.analyzer import UniFiAnalyzer, QueryIntent
+
+        first = UniFiAnalyzer.parse("top 3 sites by clients")
+        assert UniFiAnalyzer.parse("top 3 sites by clients") is first
+        assert first.intent == QueryIntent.TOP
+        assert (first.field, first.limit) == ('total_clients', 3)
+
+    def test_reassigning_sites_rebuilds_index(self, sample_sites):
+        """Assigning new sites should replace the indexes."""
+        from unifi.analyzer import UniFiAnalyzer
+
+        analyzer = UniFiAnalyzer(sample_sites)
+        analyzer.top(1, 'total_clients')
+        analyzer.sites = sample_sites[:2]
+
+        assert analyzer.top(1, 'total_clients')[0].id == 'site-001'
+        assert analyzer.sum('total_clients') == 230
@@ -0,0 +1,196 @@
+"""
+Tests for paginated and concurrent API fetching.
+
+Tests:
+- UniFi nextToken pagination and 429 retries
+- Concurrent per-site device fan-out
+- NinjaOne after-cursor pagination and timestamp parsing
+- Token bucket rate limiting
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+
+def make_response(payload, status_code=200, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    response.headers = headers or {}
+    response.text = ''
+    return response
+
+
+def site_item(site_id, name=None):
+    return {'hostId': site_id, 'meta': {'desc': name or site_id}}
+
+
+@pytest.fixture
+def unifi_client():
+    from unifi.api_client import UniFiClient, UniFiAPIConfig
+    return UniFiClient(UniFiAPIConfig(api_key='test-key', rate_limit=0, page_size=2))
+
+
+@pytest.fixture
+def ninjaone_client(ninjaone_config):
+    from ninjaone.client import NinjaOneClient
+    ninjaone_config.rate_limit = 0
+    ninjaone_config.page_size = 2
+    client = NinjaOneClient(ninjaone_config)
+    client._access_token = 'test-token'
+    client._token_expires = datetime.now() + timedelta(hours=1)
+    return client
+
+
+class TestUniFiPagination:
+    """Tests for UniFiClient cursor pagination."""
+
+    def test_follows_next_token(self, unifi_client):
+        """Pages should be requested until nextToken is absent."""
+        unifi_client.session.request = Mock(side_effect=[
+            make_response({'data': [site_item('a'), site_item('b')], 'nextToken': 't1'}),
+            make_response({'data': [site_item('c')]}),
+        ])
+
+        sites = unifi_client.get_sites()
+
+        assert [s.id for s in sites] == ['a', 'b', 'c']
+        second_params = unifi_client.session.request.call_args_list[1].kwargs['params']
+        assert second_params == {'pageSize': 2, 'nextToken': 't1'}
+
+    def test_repeated_token_stops(self, unifi_client):
+        """A repeated cursor should not loop forever."""
+        unifi_client.session.request = Mock(side_effect=[
+            make_response({'data': [site_item('a')], 'nextToken': 't1'}),
+            make_response({'data': [site_item('b')], 'nextToken': 't1'}),
+        ])
+
+        assert len(unifi_client.get_sites()) == 2
+        assert unifi_client.session.request.call_count == 2
+
+    def test_retries_rate_limited_request(self, unifi_client):
+        """429 responses should be retried after Retry-After."""
+        unifi_client.session.request = Mock(side_effect=[
+            make_response({}, status_code=429, headers={'Retry-After': '0'}),
+            make_response({'data': [site_item('a')]}),
+        ])
+
+        assert [s.id for s in unifi_client.get_sites()] == ['a']
+
+
+class TestUniFiFanOut:
+    """Tests for concurrent device fetching."""
+
+    def test_fleet_with_devices(self, unifi_client):
+        """Every site should get its own device list."""
+        def request(method, url, params=None, **kwargs):
+            if url.endswith('/sites'):
+                return make_response({'data': [site_item('a'), site_item('b'), site_item('c')]})
+            site_id = url.split('/')[-2]
+            if site_id == 'c':
+                return make_response({}, status_code=500)
+            return make_response({'data': [{'mac': f'{site_id}-mac', 'status': 'online'}]})
+
+        unifi_client.session.request = Mock(side_effect=request)
+
+        sites = unifi_client.get_fleet_with_devices(max_workers=3)
+
+        devices = {s.id: [d.mac for d in s.devices] for s in sites}
+        assert devices == {'a': ['a-mac'], 'b': ['b-mac'], 'c': []}
+
+    def test_failed_sites_omitted(self, unifi_client):
+        """Sites that fail should be left out of the result map."""
+        unifi_client.session.request = Mock(return_value=make_response({}, status_code=503))
+
+        assert unifi_client.get_devices_for_sites(['x', 'y']) == {}
+
+
+class TestNinjaOnePagination:
+    """Tests for NinjaOneClient cursor pagination."""
+
+    def test_follows_after_cursor(self, ninjaone_client):
+        """Full pages should be followed by a request after the last ID."""
+        ninjaone_client.session.request = Mock(side_effect=[
+            make_response([{'id': 1, 'severity': 'CRITICAL'}, {'id': 2, 'severity': 'MAJOR'}]),
+            make_response([{'id': 3, 'severity': 'MINOR'}]),
+        ])
+
+        alerts = ninjaone_client.get_alerts()
+
+        assert [a.id for a in alerts] == ['1', '2', '3']
+        second_params = ninjaone_client.session.request.call_args_list[1].kwargs['params']
+        assert second_params == {'pageSize': 2, 'after': 2}
+
+    def test_retries_rate_limited_page(self, ninjaone_client):
+        """A 429 mid-listing should be retried after Retry-After, not abort the listing."""
+        ninjaone_client.session.request = Mock(side_effect=[
+            make_response([{'id': 1}, {'id': 2}]),
+            make_response([], status_code=429, headers={'Retry-After': '0'}),
+            make_response([{'id': 3}]),
+        ])
+
+        assert [a.id for a in ninjaone_client.get_alerts()] == ['1', '2', '3']
+
+    def test_persistent_rate_limit_raises(self, ninjaone_client):
+        """Repeated 429s should give up after MAX_RATE_LIMIT_RETRIES."""
+        from ninjaone.client import NinjaOneAPIError
+
+        ninjaone_client.session.request = Mock(
+            return_value=make_response([], status_code=429, headers={'Retry-After': '0'})
+        )
+
+        with pytest.raises(NinjaOneAPIError) as exc:
+            ninjaone_client.get_alerts()
+        assert exc.value.status_code == 429
+        assert ninjaone_client.session.request.call_count == ninjaone_client.MAX_RATE_LIMIT_RETRIES + 1
+
+    def test_ignored_cursor_stops(self, ninjaone_client):
+        """An endpoint that ignores `after` should not be fetched twice."""
+        page = [{'id': 1}, {'id': 2}]
+        ninjaone_client.session.request = Mock(return_value=make_response(page))
+
+        assert len(ninjaone_client.get_devices()) == 2
+        assert ninjaone_client.session.request.call_count == 2
+
+    def test_parses_epoch_and_iso_times(self, ninjaone_client):
+        """createTime and lastContact may be epoch seconds or ISO strings."""
+        ninjaone_client.session.request = Mock(side_effect=[
+            make_response([{'id': 1, 'createTime': 1700000000.5}]),
+            make_response([{'id': 7, 'lastContact': '2024-01-01T00:00:00Z'}]),
+        ])
+
+        alert = ninjaone_client.get_alerts()[0]
+        device = ninjaone_client.get_devices()[0]
+
+        assert alert.created_at.timestamp() == 1700000000.5
+        assert device.last_contact.year == 2024
+
+
+class TestTokenBucket:
+    """Tests for the shared rate limiter."""
+
+    def test_burst_then_refuse(self):
+        """Only `burst` tokens should be available at once."""
+        from common.ratelimit import TokenBucket
+
+        bucket = TokenBucket(rate=1, burst=2)
+        assert bucket.try_acquire()
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+        assert not bucket.acquire(timeout=0.01)
+
+    def test_zero_rate_unlimited(self):
+        """A rate of 0 should never block."""
+        from common.ratelimit import TokenBucket
+
+        bucket = TokenBucket(rate=0)
+        assert all(bucket.try_acquire() for _ in range(100))
+
+    def test_limiter_shared_per_host(self):
+        """Clients for the same host should share one bucket."""
+        from common.ratelimit import get_host_limiter
+
+        first = get_host_limiter('https://limiter-test.example.com/v1', rate=5)
+        second = get_host_limiter('https://limiter-test.example.com/ea', rate=50)
+        assert first is second
@@ -0,0 +1,149 @@
+"""
+Tests for the OberaConnect caching layer.
+
+Tests:
+- LRU eviction and recency
+- Byte-size limits
+- TTL expiry (lazy and periodic)
+- Single-flight get_or_compute
+"""
+
+import threading
+import time
+
+import pytest
+
+
+class TestInMemoryCache:
+    """Tests for InMemoryCache."""
+
+    def test_lru_keeps_recently_read_keys(self):
+        """Reading a key should protect it from eviction."""
+        from common.cache import InMemoryCache
+
+        cache = InMemoryCache(max_size=2)
+        cache.set('summary', 1, ttl=60)
+        cache.set('a', 2, ttl=60)
+        cache.get('summary')
+        cache.set('b', 3, ttl=60)
+
+        assert cache.get('summary') == 1
+        assert cache.get('a') is None
+        assert cache.stats()['evictions'] == 1
+
+    def test_overwrite_does_not_evict(self):
+        """Replacing an existing key should not count against the limit."""
+        from common.cache import InMemoryCache
+
+        cache = InMemoryCache(max_size=2)
+        cache.set('a', 1, ttl=60)
+        cache.set('b', 2, ttl=60)
+        cache.set('a', 3, ttl=60)
+
+        assert cache.get('a') == 3
+        assert cache.get('b') == 2
+
+    def test_byte_limit(self):
+        """Entries should be evicted to stay under max_bytes."""
+        from common.cache import InMemoryCache
+
+        cache = InMemoryCache(max_size=100, max_bytes=25)
+        cache.set('a', 'x' * 10, ttl=60)   # 12 bytes as JSON
+        cache.set('b', 'y' * 10, ttl=60)
+        cache.set('c', 'z' * 10, ttl=60)
+
+        stats = cache.stats()
+        assert cache.get('a') is None
+        assert stats['bytes'] <= 25
+        assert not cache.set('huge', 'x' * 100, ttl=60)
+
+    def test_lazy_expiry(self):
+        """Expired entries should read as misses."""
+        from common.cache import InMemoryCache
+
+        cache = InMemoryCache()
+        cache.set('a', 1, ttl=-1)
+
+        assert cache.get('a') is None
+        assert cache.stats()['expirations'] == 1
+
+    def test_periodic_sweep(self):
+        """Writes should sweep expired entries once the interval passes."""
+        from common.cache import InMemoryCache
+
+        cache = InMemoryCache(sweep_interval=0)
+        cache.set('old', 1, ttl=-1)
+        cache.set('new', 2, ttl=60)
+
+        assert cache.stats()['entries'] == 1
+
+    def test_hit_miss_stats(self):
+        """Stats should count hits and misses."""
+        from common.cache import InMemoryCache
+
+        cache = InMemoryCache()
+        cache.set('a', 1, ttl=60)
+        cache.get('a')
+        cache.get('missing')
+
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0.5)
+
+
+class TestGetOrCompute:
+    """Tests for single-flight Cache.get_or_compute."""
+
+    @pytest.fixture
+    def cache(self, monkeypatch):
+        from common.cache import Cache
+        monkeypatch.delenv('REDIS_URL', raising=False)
+        return Cache(default_ttl=60)
+
+    def test_concurrent_misses_coalesced(self, cache):
+        """Simultaneous misses should call the factory once."""
+        calls = []
+        start = threading.Event()
+
+        def fetch_sites():
+            calls.append(1)
+            time.sleep(0.05)
+            return ['site-001']
+
+        results = []
+
+        def worker():
+            start.wait()
+            results.append(cache.get_or_compute('sites', fetch_sites))
+
+        threads = [threading.Thread(target=worker) for _ in range(10)]
+        for t in threads:
+            t.start()
+        start.set()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert results == [['site-001']] * 10
+        assert cache.stats()['coalesced_misses'] == 9
+
+    def test_late_miss_reuses_stored_value(self, cache, monkeypatch):
+        """A miss racing a finished leader should not call the factory again."""
+        cache.set('sites', ['site-001'])
+        real_get = cache.get
+        lookups = iter([None])
+        monkeypatch.setattr(cache, 'get', lambda key: next(lookups, real_get(key)))
+
+        def fetch_sites():
+            raise AssertionError("factory called for a cached key")
+
+        assert cache.get_or_compute('sites', fetch_sites) == ['site-001']
+
+    def test_errors_shared_and_not_cached(self, cache):
+        """A failing factory should raise for every waiter and cache nothing."""
+        def fail():
+            raise RuntimeError("API down")
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_compute('sites', fail)
+        assert cache.get('sites') is None
+        assert cache.get_or_compute('sites', lambda: [1]) == [1]
@@ -0,0 +1,154 @@
+"""
+Tests for conditional requests and entity deltas.
+
+Tests:
+- ETag / Last-Modified validators and 304 reuse
+- Payload-hash fallback for APIs without validators
+- Per-entity added/changed/removed deltas and merging
+- Client integration
+"""
+
+from unittest.mock import Mock
+
+
+def make_response(payload, status_code=200, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    response.headers = headers or {}
+    response.text = ''
+    return response
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    def test_sends_validators(self):
+        """Stored ETag and Last-Modified should become conditional headers."""
+        from common.http_cache import ResponseCache
+
+        cache = ResponseCache()
+        key = cache.key('https://api/sites', {'pageSize': 100})
+        assert cache.conditional_headers(key) == {}
+
+        cache.resolve(key, make_response({'data': []}, headers={
+            'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'
+        }))
+
+        assert cache.conditional_headers(key) == {
+            'If-None-Match': '"v1"',
+            'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'
+        }
+
+    def test_not_modified_reuses_payload(self):
+        """A 304 should return the cached payload without decoding."""
+        from common.http_cache import ResponseCache
+
+        cache = ResponseCache()
+        payload = cache.resolve('k', make_response({'data': [1]}, headers={'ETag': '"v1"'}))
+        not_modified = make_response(None, status_code=304)
+
+        assert cache.resolve('k', not_modified) is payload
+        not_modified.json.assert_not_called()
+        assert cache.stats()['not_modified'] == 1
+
+    def test_hash_fallback(self):
+        """Identical bodies without validators should count as unchanged."""
+        from common.http_cache import ResponseCache
+
+        cache = ResponseCache()
+        first = cache.resolve('k', make_response({'data': [1, 2]}))
+        second = cache.resolve('k', make_response({'data': [1, 2]}))
+        cache.resolve('k', make_response({'data': [3]}))
+
+        assert second is first
+        stats = cache.stats()
+        assert (stats['unchanged'], stats['changed']) == (1, 2)
+
+    def test_evicts_oldest(self):
+        """Entries beyond max_entries should be dropped LRU-first."""
+        from common.http_cache import ResponseCache
+
+        cache = ResponseCache(max_entries=2)
+        for key in ('a', 'b', 'c'):
+            cache.resolve(key, make_response({}, headers={'ETag': key}))
+
+        assert cache.conditional_headers('a') == {}
+        assert cache.conditional_headers('c') == {'If-None-Match': 'c'}
+
+
+class TestDeltaTracker:
+    """Tests for DeltaTracker and EntityDelta."""
+
+    def test_added_changed_removed(self, sample_sites):
+        """Updates should report per-entity changes."""
+        import copy
+
+        from common.delta import DeltaTracker
+
+        tracker = DeltaTracker()
+        first = tracker.update('sites', sample_sites, key=lambda s: s.id)
+        assert first.added == [s.id for s in sample_sites]
+
+        updated = copy.deepcopy(sample_sites[1:])
+        updated[0].offline_devices += 1
+        delta = tracker.update('sites', updated, key=lambda s: s.id)
+
+        assert delta.added == []
+        assert delta.changed == [updated[0].id]
+        assert delta.removed == [sample_sites[0].id]
+
+    def test_unchanged_is_empty(self, sample_sites):
+        """Re-submitting the same entities should yield an empty delta."""
+        from common.delta import DeltaTracker
+
+        tracker = DeltaTracker()
+        tracker.update('sites', sample_sites, key=lambda s: s.id)
+        assert tracker.update('sites', sample_sites, key=lambda s: s.id).is_empty
+
+    def test_merge(self):
+        """Merged deltas should collapse intermediate states."""
+        from common.delta import EntityDelta
+
+        first = EntityDelta(added=['a'], changed=['b'], removed=['c'])
+        later = EntityDelta(added=['c'], changed=['a', 'd'], removed=['b', 'e'])
+        merged = first.merge(later)
+
+        assert sorted(merged.added) == ['a']
+        assert sorted(merged.changed) == ['c', 'd']
+        assert sorted(merged.removed) == ['b', 'e']
+        assert EntityDelta(added=['x']).merge(EntityDelta(removed=['x'])).is_empty
+
+
+class TestClientConditionalRequests:
+    """Tests for conditional GETs in the API clients."""
+
+    def test_unifi_sends_if_none_match(self):
+        """The second fetch of a URL should carry the stored ETag."""
+        from unifi.api_client import UniFiAPIConfig, UniFiClient
+
+        client = UniFiClient(UniFiAPIConfig(api_key='test-key', rate_limit=0))
+        body = {'data': [{'hostId': 'a', 'meta': {'desc': 'A'}}]}
+        client.session.request = Mock(side_effect=[
+            make_response(body, headers={'ETag': '"e1"'}),
+            make_response(None, status_code=304),
+        ])
+
+        first = client.get_sites()
+        second = client.get_sites()
+
+        headers = client.session.request.call_args_list[1].kwargs['headers']
+        assert headers == {'If-None-Match': '"e1"'}
+        assert [s.id for s in second] == [s.id for s in first] == ['a']
+
+    def test_fleet_summary_uses_given_sites(self, sample_sites):
+        """get_fleet_summary should not refetch sites it is handed."""
+        from unifi.api_client import UniFiAPIConfig, UniFiClient
+
+        client = UniFiClient(UniFiAPIConfig(api_key='test-key', rate_limit=0))
+        client.session.request = Mock()
+
+        summary = client.get_fleet_summary(sites=sample_sites)
+
+        assert summary.total_sites == len(sample_sites)
+        client.session.request.assert_not_called()
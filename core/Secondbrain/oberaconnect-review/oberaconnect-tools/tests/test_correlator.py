@@ -0,0 +1,162 @@
+"""
+Tests for Cross-Platform Correlator.
+
+Tests:
+- Indexed org matching (exact, substring, first word)
+- Equivalence with scoring every org
+- Manual overrides and persistence
+- Match confidence and timing
+"""
+
+import json
+import pytest
+
+
+def make_alert(org_name, severity='MAJOR', alert_id='1'):
+    from ninjaone.client import NinjaOneAlert
+    return NinjaOneAlert(
+        id=alert_id,
+        severity=severity,
+        message='Test alert',
+        device_id='dev-1',
+        device_name='PC-01',
+        org_id=f'org-{org_name}',
+        org_name=org_name,
+        created_at=None
+    )
+
+
+def make_device(org_name, status='ONLINE'):
+    from ninjaone.client import NinjaOneDevice
+    return NinjaOneDevice(
+        id=f'dev-{org_name}',
+        name='PC-01',
+        org_id=f'org-{org_name}',
+        org_name=org_name,
+        status=status,
+        os='Windows 11'
+    )
+
+
+@pytest.fixture
+def correlator(sample_sites):
+    from ninjaone.correlator import Correlator
+    return Correlator(
+        unifi_sites=sample_sites,
+        ninjaone_alerts=[
+            make_alert('Setco Industries Inc', severity='CRITICAL'),
+            make_alert('Hoods Discount LLC'),
+            make_alert('Gulf Coast Dental'),
+        ],
+        ninjaone_devices=[
+            make_device('Kinder Academy', status='OFFLINE'),
+        ]
+    )
+
+
+def brute_force_match(correlator, customer):
+    """Original O(orgs) scoring loop."""
+    norm = correlator._normalize_name(customer)
+    best_key, best = None, 0.0
+    keys = list(correlator._alerts_by_org)
+    keys += [k for k in correlator._devices_by_org if k not in correlator._alerts_by_org]
+    for key in keys:
+        confidence = correlator._match_customer(norm, key)
+        if confidence > best:
+            best_key, best = key, confidence
+    return best_key, best
+
+
+class TestOrgMatching:
+    """Tests for indexed customer → org matching."""
+
+    def test_exact_match(self, correlator):
+        """Suffix-normalized names should match exactly."""
+        match = correlator.match_org('Setco Industries')
+        assert (match.org_key, match.confidence, match.match_type) == ('setco industries', 1.0, 'exact')
+
+    def test_substring_match(self, correlator):
+        """A name contained in an org name should score 0.8."""
+        match = correlator.match_org('Hoods')
+        assert (match.org_key, match.confidence, match.match_type) == ('hoods discount', 0.8, 'substring')
+
+    def test_first_word_match(self, correlator):
+        """Shared first word should score 0.6."""
+        match = correlator.match_org('Gulf Shores Office')
+        assert (match.org_key, match.confidence, match.match_type) == ('gulf coast dental', 0.6, 'first_word')
+
+    def test_device_only_org(self, correlator):
+        """Orgs known only from devices should still match."""
+        incident = correlator.get_incident_context('Kinder Academy')
+        assert incident.offline_endpoints == 1
+        assert incident.match_type == 'exact'
+
+    def test_no_match(self, correlator):
+        """Unrelated names should not match."""
+        match = correlator.match_org('Initech')
+        assert (match.org_key, match.confidence) == (None, 0.0)
+
+    def test_matches_brute_force(self):
+        """Index results should equal scoring every org."""
+        from ninjaone.correlator import Correlator
+
+        names = [
+            'Acme Corp', 'Acme Widgets', 'Widgets Acme', 'Setco', 'Set', 'Hoods Discount',
+            'Hood', 'Bay Church', 'Mobile Bay Church HQ', 'Co', '', 'A B', 'Daphne Main'
+        ]
+        correlator = Correlator(
+            ninjaone_alerts=[make_alert(n, alert_id=str(i)) for i, n in enumerate(names[:8])],
+            ninjaone_devices=[make_device(n) for n in names[5:]]
+        )
+
+        for customer in names + ['acme', 'Mobile', 'widgets', 'hoods discount store', 'xyz', 'b']:
+            match = correlator.match_org(customer)
+            assert (match.org_key, match.confidence) == brute_force_match(correlator, customer), customer
+
+
+class TestOverrides:
+    """Tests for manual correlation overrides."""
+
+    def test_override_wins(self, correlator):
+        """An override should replace name matching."""
+        correlator.set_override('Gulf Shores Office', 'Hoods Discount LLC')
+        incident = correlator.get_incident_context('Gulf Shores Office')
+
+        assert incident.match_type == 'override'
+        assert incident.confidence == 1.0
+        assert incident.endpoint_alerts[0].org_name == 'Hoods Discount LLC'
+
+    def test_overrides_persist(self, sample_sites, tmp_path):
+        """Overrides should be saved and loaded from the overrides file."""
+        from ninjaone.correlator import Correlator
+
+        path = tmp_path / 'overrides.json'
+        first = Correlator(unifi_sites=sample_sites, overrides_file=str(path))
+        first.set_override('Setco', 'Setco Industries Inc')
+
+        assert json.loads(path.read_text()) == {'setco': 'Setco Industries Inc'}
+        second = Correlator(unifi_sites=sample_sites, overrides_file=str(path))
+        assert second.overrides == {'setco': 'Setco Industries Inc'}
+
+        assert second.remove_override('Setco')
+        assert json.loads(path.read_text()) == {}
+
+
+class TestMatchStats:
+    """Tests for confidence and timing reporting."""
+
+    def test_incident_reports_match(self, correlator):
+        """Incidents should include match type and timing."""
+        data = correlator.get_incident_context('Setco Industries').to_dict()
+        assert data['matchType'] == 'exact'
+        assert data['matchMs'] >= 0
+
+    def test_stats(self, correlator):
+        """Stats should count lookups and orgs."""
+        correlator.match_org('Setco')
+        correlator.match_org('Hoods')
+        stats = correlator.stats()
+
+        assert stats['orgs'] == 4
+        assert stats['matches'] == 2
+        assert stats['indexBuildMs'] >= 0
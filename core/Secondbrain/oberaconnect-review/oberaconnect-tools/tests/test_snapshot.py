@@ -0,0 +1,201 @@
+"""
+Tests for the fleet snapshot service and snapshot-backed webhook endpoints.
+
+Tests:
+- Snapshot refresh and atomic swap
+- Per-source fallback on refresh errors
+- Endpoints served without calling upstream APIs
+- Snapshot age reporting
+- Per-refresh deltas and derived-view reuse
+"""
+
+import pytest
+from unittest.mock import Mock
+
+
+@pytest.fixture
+def unifi_client(sample_sites):
+    """Mock UniFi client returning the sample sites."""
+    client = Mock()
+    client.get_sites.return_value = sample_sites
+    return client
+
+
+@pytest.fixture
+def ninjaone_client():
+    """Demo NinjaOne client wrapped so calls can be counted."""
+    from ninjaone.client import DemoNinjaOneClient
+    return Mock(wraps=DemoNinjaOneClient())
+
+
+@pytest.fixture
+def snapshot_service(unifi_client, ninjaone_client):
+    from n8n.snapshot import SnapshotService
+    return SnapshotService(unifi_client, ninjaone_client, refresh_interval=3600)
+
+
+@pytest.fixture
+def client(unifi_client, ninjaone_client, snapshot_service):
+    from n8n.webhook_api import create_app
+    app = create_app(
+        unifi_client=unifi_client,
+        ninjaone_client=ninjaone_client,
+        snapshot_service=snapshot_service
+    )
+    return app.test_client()
+
+
+class TestSnapshotService:
+    """Tests for SnapshotService."""
+
+    def test_refresh_builds_snapshot(self, snapshot_service, sample_sites):
+        """Refresh should capture sites and derived views."""
+        snapshot = snapshot_service.refresh()
+
+        assert len(snapshot.sites) == len(sample_sites)
+        assert snapshot.summary.total_sites == len(sample_sites)
+        assert snapshot.get_site('site-002').name == 'Hoods Discount'
+        assert snapshot.analyzer is not None
+        assert snapshot.errors == {}
+
+    def test_refresh_swaps_new_snapshot(self, snapshot_service, unifi_client, sample_sites):
+        """Readers holding the old snapshot should not see new data."""
+        old = snapshot_service.refresh()
+        unifi_client.get_sites.return_value = sample_sites[:1]
+        new = snapshot_service.refresh()
+
+        assert snapshot_service.get() is new
+        assert len(old.sites) == len(sample_sites)
+        assert len(new.sites) == 1
+
+    def test_failed_source_keeps_previous_data(self, snapshot_service, unifi_client):
+        """A failing source should carry forward its last good data."""
+        first = snapshot_service.refresh()
+        unifi_client.get_sites.side_effect = RuntimeError("API down")
+        second = snapshot_service.refresh()
+
+        assert second.sites == first.sites
+        assert 'unifi_sites' in second.errors
+        assert second.alerts
+        assert snapshot_service.failed_refreshes == 1
+
+    def test_start_and_stop(self, snapshot_service):
+        """start() should load a snapshot before returning."""
+        snapshot_service.start()
+        try:
+            assert snapshot_service.running
+            assert snapshot_service.refresh_count == 1
+        finally:
+            snapshot_service.stop()
+        assert not snapshot_service.running
+
+
+class TestSnapshotEndpoints:
+    """Tests for webhook endpoints served from the snapshot."""
+
+    def test_endpoints_do_not_call_upstream(self, client, unifi_client, ninjaone_client):
+        """Repeated requests should reuse one fetch per source."""
+        for _ in range(3):
+            client.get('/metrics')
+            client.get('/api/unifi/sites')
+            client.get('/api/unifi/summary')
+            client.get('/api/ninjaone/alerts')
+            client.post('/api/unifi/query', json={'query': 'sites with offline devices'})
+
+        assert unifi_client.get_sites.call_count == 1
+        assert ninjaone_client.get_alerts.call_count == 1
+
+    def test_responses_report_snapshot_age(self, client):
+        """Snapshot-backed responses should include freshness fields."""
+        for response in (
+            client.get('/metrics'),
+            client.get('/api/unifi/summary'),
+            client.get('/api/unifi/sites/site-001'),
+            client.get('/api/ninjaone/alerts/critical'),
+        ):
+            data = response.get_json()
+            assert response.status_code == 200
+            assert data['snapshot_age_seconds'] >= 0
+            assert data['snapshot_at']
+
+    def test_metrics_counts(self, client, sample_sites):
+        """Metrics should be computed from snapshot data."""
+        data = client.get('/metrics').get_json()
+
+        assert data['unifi']['site_count'] == len(sample_sites)
+        assert data['unifi']['offline_devices'] == sum(s.offline_devices for s in sample_sites)
+        assert data['snapshot']['refresh_count'] == 1
+
+    def test_alert_filters(self, client):
+        """Severity filters should apply to snapshot alerts."""
+        data = client.get('/api/ninjaone/alerts?severity=CRITICAL').get_json()
+        assert all(a['severity'] == 'CRITICAL' for a in data['alerts'])
+
+    def test_unknown_site(self, client):
+        """Unknown site IDs should return 404."""
+        assert client.get('/api/unifi/sites/missing').status_code == 404
+
+
+class TestSnapshotDeltas:
+    """Tests for per-refresh deltas and derived-view reuse."""
+
+    def test_unchanged_refresh_reuses_views(self, snapshot_service):
+        """Derived views should be reused when nothing changed."""
+        first = snapshot_service.refresh()
+        second = snapshot_service.refresh()
+
+        assert second.generation == first.generation + 1
+        assert all(delta.is_empty for delta in second.deltas.values())
+        assert second.analyzer is first.analyzer
+        assert second.correlator is first.correlator
+
+    def test_changed_sites_rebuild_analyzer(self, snapshot_service, unifi_client, sample_sites):
+        """Site changes should rebuild the analyzer and summary."""
+        first = snapshot_service.refresh()
+        unifi_client.get_sites.return_value = sample_sites[1:]
+        second = snapshot_service.refresh()
+
+        assert second.deltas['sites'].removed == [sample_sites[0].id]
+        assert second.analyzer is not first.analyzer
+        assert second.summary.total_sites == len(sample_sites) - 1
+
+    def test_changes_since(self, snapshot_service, unifi_client, sample_sites):
+        """changes_since should merge deltas across refreshes."""
+        unifi_client.get_sites.return_value = sample_sites[:2]
+        base = snapshot_service.refresh().generation
+        unifi_client.get_sites.return_value = sample_sites[:3]
+        snapshot_service.refresh()
+        unifi_client.get_sites.return_value = sample_sites[1:3]
+        snapshot_service.refresh()
+
+        changes = snapshot_service.changes_since(base)
+        assert changes['sites'].added == [sample_sites[2].id]
+        assert changes['sites'].removed == [sample_sites[0].id]
+        assert snapshot_service.changes_since(base + 2) == {}
+        assert snapshot_service.changes_since(base + 5) is None
+
+    def test_changes_endpoint(self, client, snapshot_service, unifi_client, sample_sites):
+        """The changes endpoint should return full added entities and removed IDs."""
+        generation = client.get('/api/unifi/summary').get_json()['snapshot_generation']
+        unifi_client.get_sites.return_value = sample_sites[1:]
+        snapshot_service.refresh()
+
+        data = client.get(f'/api/changes?since={generation}').get_json()
+
+        assert data['full'] is False
+        assert data['changes']['sites']['removed'] == [sample_sites[0].id]
+        assert data['changes']['alerts'] == {'added': [], 'changed': [], 'removed': []}
+        assert client.get('/api/changes?since=x').status_code == 400
+
+    def test_overrides_survive_correlator_rebuild(self, client, snapshot_service, unifi_client, sample_sites):
+        """Overrides set through the API should apply to correlators built later."""
+        first = snapshot_service.refresh()
+        response = client.post('/api/correlate/overrides', json={'customer': 'Setco', 'org': 'Setco Industries Inc'})
+        assert response.status_code == 200
+
+        unifi_client.get_sites.return_value = sample_sites[1:]
+        second = snapshot_service.refresh()
+
+        assert second.correlator is not first.correlator
+        assert second.correlator.overrides == {'setco': 'Setco Industries Inc'}
+        assert client.get('/api/correlate/overrides').get_json()['overrides'] == {'setco': 'Setco Industries Inc'}
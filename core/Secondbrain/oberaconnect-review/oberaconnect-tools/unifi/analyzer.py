@@ -9,12 +9,19 @@ Supports queries like:
 - "top 5 sites by device count"
 - "group sites by ISP"
 - "summary"
+
+Queries are parsed once into a ParsedQuery (cached per query string) and
+executed against a SiteIndex built once per site list, so repeated n8n
+queries against a large fleet avoid regex work and full scans.
 """
 
 import re
+import heapq
 import logging
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Callable, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field as dataclass_field
 from enum import Enum, auto
 
 from .models import UniFiSite, FleetSummary
@@ -57,6 +64,185 @@ class QueryResult:
         }
 
 
+@dataclass(frozen=True)
+class SiteFilter:
+    """Filter criteria extracted from a query (all must match)."""
+    offline: Optional[bool] = None                     # True: has offline, False: none offline
+    comparison: Optional[Tuple[str, str, int]] = None  # (field, op, value)
+    isp: Optional[str] = None                          # Canonical ISP name
+    health: Tuple[str, ...] = ()                       # Allowed health statuses
+
+
+@dataclass(frozen=True)
+class ParsedQuery:
+    """Site-independent interpretation of a natural language query."""
+    intent: QueryIntent
+    field: str = 'total_devices'
+    limit: int = 5
+    term: str = ''
+    group_by: str = 'isp'
+    aggregate: str = 'total'
+    filters: SiteFilter = dataclass_field(default_factory=SiteFilter)
+
+
+class SiteIndex:
+    """
+    Lookup structures over one immutable list of sites.
+
+    Hash indexes (name, ISP, customer, health status) are built up front;
+    per-field sorted indexes, groups and totals are built on first use.
+    Rebuild (by assigning UniFiAnalyzer.sites) whenever the sites change.
+    """
+
+    NUMERIC_FIELDS = frozenset({
+        'total_clients', 'total_devices', 'offline_devices', 'health_score',
+        'ap_count', 'switch_count', 'gateway_count'
+    })
+
+    SEARCH_CACHE_SIZE = 256
+
+    def __init__(
+        self,
+        sites: List[UniFiSite],
+        isp_names: List[str] = (),
+        customers: List[str] = ()
+    ):
+        self.sites = sites
+        self.names = [s.name.lower() for s in sites]
+
+        self.by_name: Dict[str, List[int]] = {}
+        self.by_health: Dict[str, List[int]] = {}
+        for pos, site in enumerate(sites):
+            self.by_name.setdefault(self.names[pos], []).append(pos)
+            self.by_health.setdefault(site.health_status, []).append(pos)
+
+        isps = [s.isp.lower() for s in sites]
+        self.by_isp: Dict[str, List[int]] = {
+            isp: [pos for pos, value in enumerate(isps) if isp.lower() in value]
+            for isp in set(isp_names)
+        }
+        self.by_customer: Dict[str, List[int]] = {
+            customer: [pos for pos, name in enumerate(self.names) if customer in name]
+            for customer in customers
+        }
+
+        self._sorted: Dict[str, Optional[Tuple[List[Any], List[int]]]] = {}
+        self._totals: Dict[str, Any] = {}
+        self._groups: Dict[str, Dict[str, List[UniFiSite]]] = {}
+        self._search_cache: Dict[str, List[int]] = {}
+        self._summary: Optional[FleetSummary] = None
+
+    def __len__(self) -> int:
+        return len(self.sites)
+
+    def select(self, positions) -> List[UniFiSite]:
+        return [self.sites[pos] for pos in positions]
+
+    # ----- Sorted indexes -----
+
+    def sorted_index(self, field: str) -> Optional[Tuple[List[Any], List[int]]]:
+        """(values, positions) sorted by (value, position) for numeric fields."""
+        if field not in self.NUMERIC_FIELDS:
+            return None
+        if field not in self._sorted:
+            order = sorted((getattr(site, field, 0), pos) for pos, site in enumerate(self.sites))
+            self._sorted[field] = ([v for v, _ in order], [pos for _, pos in order])
+        return self._sorted[field]
+
+    def compare(self, field: str, op: str, value: int) -> Optional[List[int]]:
+        """Positions where field <op> value, via bisect; None if not indexed."""
+        index = self.sorted_index(field)
+        if index is None:
+            return None
+        values, positions = index
+        if op == '>':
+            return positions[bisect_right(values, value):]
+        if op == '>=':
+            return positions[bisect_left(values, value):]
+        if op == '<':
+            return positions[:bisect_left(values, value)]
+        if op == '<=':
+            return positions[:bisect_right(values, value)]
+        if op == '==':
+            return positions[bisect_left(values, value):bisect_right(values, value)]
+        return list(range(len(self.sites)))
+
+    def top(self, n: int, field: str) -> List[UniFiSite]:
+        """
+        Highest n sites by field, ties in original order.
+
+        Same result as sorted(sites, key=field, reverse=True)[:n].
+        """
+        if n <= 0:
+            return []
+        index = self.sorted_index(field)
+        if index is None:
+            return heapq.nlargest(n, self.sites, key=lambda s: getattr(s, field, 0))
+
+        values, positions = index
+        result: List[int] = []
+        end = len(values)
+        while end > 0 and len(result) < n:
+            start = bisect_left(values, values[end - 1], 0, end)
+            result.extend(positions[start:end])
+            end = start
+        return self.select(result[:n])
+
+    def bottom(self, n: int, field: str) -> List[UniFiSite]:
+        """Lowest n sites by field, ties in original order."""
+        if n <= 0:
+            return []
+        index = self.sorted_index(field)
+        if index is None:
+            return heapq.nsmallest(n, self.sites, key=lambda s: getattr(s, field, 0))
+        return self.select(index[1][:n])
+
+    # ----- Name lookups -----
+
+    def find_name(self, name: str) -> Optional[UniFiSite]:
+        positions = self.by_name.get(name.lower())
+        return self.sites[positions[0]] if positions else None
+
+    def search(self, term: str) -> List[int]:
+        """Positions of sites whose name contains term (lowercase)."""
+        cached = self._search_cache.get(term)
+        if cached is not None:
+            return cached
+
+        # A known customer inside the term narrows the candidates
+        candidates = range(len(self.names))
+        for customer, positions in self.by_customer.items():
+            if customer in term:
+                candidates = positions
+                break
+        result = [pos for pos in candidates if term in self.names[pos]]
+
+        if len(self._search_cache) >= self.SEARCH_CACHE_SIZE:
+            self._search_cache.clear()
+        self._search_cache[term] = result
+        return result
+
+    # ----- Aggregates -----
+
+    def total(self, field: str) -> Any:
+        if field not in self._totals:
+            self._totals[field] = sum(getattr(s, field, 0) for s in self.sites)
+        return self._totals[field]
+
+    def group_by(self, field: str) -> Dict[str, List[UniFiSite]]:
+        if field not in self._groups:
+            groups: Dict[str, List[UniFiSite]] = {}
+            for site in self.sites:
+                groups.setdefault(str(getattr(site, field, 'Unknown')), []).append(site)
+            self._groups[field] = groups
+        return self._groups[field]
+
+    def summary(self) -> FleetSummary:
+        if self._summary is None:
+            self._summary = FleetSummary.from_sites(self.sites)
+        return self._summary
+
+
 class UniFiAnalyzer:
     """
     Natural Language Query Engine for UniFi Fleet Data.
@@ -158,31 +344,62 @@ class UniFiAnalyzer:
         'setco', 'hoods', 'kinder', 'celebration', 
         'gulf shores', 'mobile bay', 'fairhope', 'daphne'
     ]
+
+    # Precompiled query patterns
+    DETAIL_PATTERN = re.compile(
+        r'status\s+of\s+\w+|details?\s+(for|of)\s+\w+|show\s+\w+\s+site'
+        r'|how\s+is\s+\w+|what.+about\s+\w+'
+    )
+    DETAIL_NAME_PATTERNS = [
+        re.compile(r'status\s+of\s+(.+?)(?:\?|$)', re.IGNORECASE),
+        re.compile(r'details?\s+(?:for|of)\s+(.+?)(?:\?|$)', re.IGNORECASE),
+        re.compile(r'how\s+is\s+(.+?)(?:\?|$)', re.IGNORECASE),
+        re.compile(r'what.+about\s+(.+?)(?:\?|$)', re.IGNORECASE)
+    ]
+    # Word boundaries avoid matching 'sum' inside 'summary'
+    AGGREGATE_PATTERN = re.compile(
+        r'\btotal\b|\bsum\b|\baverage\b|\bavg\b|\bmean\b|across all|all sites'
+    )
+    TOP_BOTTOM_PATTERN = re.compile(r'\b(top|bottom|highest|lowest|best|worst)\s*\d*\b')
+    TOP_BOTTOM_LIMIT_PATTERN = re.compile(r'\b(top|bottom|highest|lowest|best|worst)\s*(\d+)?')
+    COMPARISON_PATTERNS = [
+        (re.compile(rf'{re.escape(phrase)}\s*(\d+)\s*(\w+)'), op)
+        for phrase, op in COMPARISONS.items()
+    ]
+    OR_MORE_PATTERN = re.compile(r'(\d+)\s+or\s+more\s+(\w+)')
+
+    SUMMARY_KEYWORDS = ['summary', 'overview', 'stats', 'statistics', 'fleet']
+    SEARCH_KEYWORDS = ['find', 'search', 'where is', 'show me', 'locate']
     
     def __init__(self, sites: List[UniFiSite] = None):
         """
         Initialize analyzer with site data.
-        
+
         Args:
             sites: List of UniFiSite objects to analyze
         """
-        self._sites = sites or []
-    
+        self.sites = sites or []
+
     @property
     def sites(self) -> List[UniFiSite]:
         return self._sites
-    
+
     @sites.setter
     def sites(self, value: List[UniFiSite]):
         self._sites = value
-    
+        self._index = SiteIndex(
+            value,
+            isp_names=list(self.KNOWN_ISPS.values()),
+            customers=self.KNOWN_CUSTOMERS
+        )
+
     def analyze(self, query: str) -> QueryResult:
         """
         Process a natural language query.
-        
+
         Args:
             query: Natural language query string
-            
+
         Returns:
             QueryResult with processed data
         """
@@ -193,98 +410,183 @@ class UniFiAnalyzer:
                 data=None,
                 message="No site data loaded"
             )
-        
-        query_lower = query.lower().strip()
-        
-        # Detect intent and process
-        # Check DETAIL first (before SUMMARY, since "status of X" contains "status")
-        if self._is_detail_query(query_lower):
-            return self._handle_detail(query_lower)
 
-        if self._is_aggregate_query(query_lower):
-            return self._handle_aggregate(query_lower)
+        query_lower = query.lower().strip()
+        parsed = self.parse(query_lower)
+
+        handler = {
+            QueryIntent.FIND: self._handle_detail,
+            QueryIntent.AGGREGATE: self._handle_aggregate,
+            QueryIntent.SUMMARY: self._handle_summary,
+            QueryIntent.TOP: self._handle_top_bottom,
+            QueryIntent.BOTTOM: self._handle_top_bottom,
+            QueryIntent.GROUP: self._handle_group,
+            QueryIntent.COUNT: self._handle_count,
+            QueryIntent.SEARCH: self._handle_search,
+            QueryIntent.FILTER: self._handle_filter,
+        }.get(parsed.intent)
+
+        if handler is None:
+            return self._unknown_result(query_lower)
+        return handler(parsed)
+
+    # ========== Query Parsing ==========
+
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def parse(cls, query: str) -> ParsedQuery:
+        """
+        Interpret a lowercased query without looking at site data.
 
-        if self._is_summary_query(query_lower):
-            return self._handle_summary()
+        Cached per query string, so repeated n8n queries skip the regex work.
+        """
+        # Check DETAIL first (before SUMMARY, since "status of X" contains "status")
+        if cls._is_detail_query(query):
+            for pattern in cls.DETAIL_NAME_PATTERNS:
+                match = pattern.search(query)
+                if match:
+                    return ParsedQuery(QueryIntent.FIND, term=match.group(1).strip())
+            return ParsedQuery(QueryIntent.SEARCH, term=cls._search_term(query))
+
+        if cls._is_aggregate_query(query):
+            is_average = 'average' in query or 'avg' in query or 'mean' in query
+            return ParsedQuery(
+                QueryIntent.AGGREGATE,
+                field=cls._detect_field(query),
+                aggregate='average' if is_average else 'total'
+            )
 
-        if self._is_top_bottom_query(query_lower):
-            return self._handle_top_bottom(query_lower)
+        if cls._is_summary_query(query):
+            return ParsedQuery(QueryIntent.SUMMARY)
+
+        if cls._is_top_bottom_query(query):
+            match = cls.TOP_BOTTOM_LIMIT_PATTERN.search(query)
+            if not match:
+                return ParsedQuery(QueryIntent.UNKNOWN)
+            is_top = match.group(1) in ('top', 'highest', 'best')
+            return ParsedQuery(
+                QueryIntent.TOP if is_top else QueryIntent.BOTTOM,
+                field=cls._detect_field(query),
+                limit=int(match.group(2)) if match.group(2) else 5
+            )
 
-        if self._is_group_query(query_lower):
-            return self._handle_group(query_lower)
+        if cls._is_group_query(query):
+            if 'status' in query or 'health' in query:
+                return ParsedQuery(QueryIntent.GROUP, group_by='health_status')
+            return ParsedQuery(QueryIntent.GROUP, group_by='isp')
 
-        if self._is_count_query(query_lower):
-            return self._handle_count(query_lower)
+        if cls._is_count_query(query):
+            return ParsedQuery(QueryIntent.COUNT, filters=cls._parse_filters(query))
 
-        if self._is_search_query(query_lower):
-            return self._handle_search(query_lower)
+        if cls._is_search_query(query):
+            return ParsedQuery(QueryIntent.SEARCH, term=cls._search_term(query))
 
         # Default: try to interpret as filter
-        return self._handle_filter(query_lower)
-    
-    def _is_detail_query(self, query: str) -> bool:
+        return ParsedQuery(QueryIntent.FILTER, filters=cls._parse_filters(query))
+
+    @classmethod
+    def _is_detail_query(cls, query: str) -> bool:
         """Check if query is asking for specific site details."""
         # "status of X", "details for X", "show X site"
-        patterns = [
-            r'status\s+of\s+\w+',
-            r'details?\s+(for|of)\s+\w+',
-            r'show\s+\w+\s+site',
-            r'how\s+is\s+\w+',
-            r'what.+about\s+\w+'
-        ]
-        return any(re.search(p, query) for p in patterns)
-
-    def _is_aggregate_query(self, query: str) -> bool:
+        return bool(cls.DETAIL_PATTERN.search(query))
+
+    @classmethod
+    def _is_aggregate_query(cls, query: str) -> bool:
         """Check if query is asking for aggregation (sum, avg, total)."""
-        # Use word boundaries to avoid matching 'sum' inside 'summary'
-        patterns = [r'\btotal\b', r'\bsum\b', r'\baverage\b', r'\bavg\b', r'\bmean\b', r'across all', r'all sites']
-        return any(re.search(p, query) for p in patterns)
+        return bool(cls.AGGREGATE_PATTERN.search(query))
 
-    def _is_summary_query(self, query: str) -> bool:
+    @classmethod
+    def _is_summary_query(cls, query: str) -> bool:
         """Check if query is asking for summary."""
-        keywords = ['summary', 'overview', 'stats', 'statistics', 'fleet']
-        # Removed 'status' - now handled by _is_detail_query
-        return any(kw in query for kw in keywords)
-    
-    def _is_top_bottom_query(self, query: str) -> bool:
+        # 'status' is handled by _is_detail_query
+        return any(kw in query for kw in cls.SUMMARY_KEYWORDS)
+
+    @classmethod
+    def _is_top_bottom_query(cls, query: str) -> bool:
         """Check if query is asking for top/bottom N."""
-        return bool(re.search(r'\b(top|bottom|highest|lowest|best|worst)\s*\d*\b', query))
-    
-    def _is_group_query(self, query: str) -> bool:
+        return bool(cls.TOP_BOTTOM_PATTERN.search(query))
+
+    @staticmethod
+    def _is_group_query(query: str) -> bool:
         """Check if query is asking for grouping."""
         return 'group' in query or 'by isp' in query or 'per isp' in query
-    
-    def _is_count_query(self, query: str) -> bool:
+
+    @staticmethod
+    def _is_count_query(query: str) -> bool:
         """Check if query is asking for count."""
         return query.startswith('how many') or query.startswith('count')
-    
-    def _is_search_query(self, query: str) -> bool:
+
+    @classmethod
+    def _is_search_query(cls, query: str) -> bool:
         """Check if query is searching for specific site."""
-        keywords = ['find', 'search', 'where is', 'show me', 'locate']
-        return any(kw in query for kw in keywords)
-    
-    def _handle_detail(self, query: str) -> QueryResult:
-        """Handle site detail queries like 'status of Celebration Church'."""
-        # Extract site name from query
-        patterns = [
-            r'status\s+of\s+(.+?)(?:\?|$)',
-            r'details?\s+(?:for|of)\s+(.+?)(?:\?|$)',
-            r'how\s+is\s+(.+?)(?:\?|$)',
-            r'what.+about\s+(.+?)(?:\?|$)'
-        ]
-
-        site_name = None
-        for pattern in patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
-            if match:
-                site_name = match.group(1).strip()
+        return any(kw in query for kw in cls.SEARCH_KEYWORDS)
+
+    @classmethod
+    def _search_term(cls, query: str) -> str:
+        """Strip search keywords, leaving the name fragment."""
+        for kw in cls.SEARCH_KEYWORDS:
+            query = query.replace(kw, '')
+        return query.strip().lower()
+
+    @classmethod
+    def _parse_filters(cls, query: str) -> SiteFilter:
+        """Extract filter criteria from query."""
+        offline = None
+        if 'offline' in query or 'down' in query:
+            offline = not ('no offline' in query or 'without offline' in query)
+
+        isp = None
+        for isp_key, isp_name in cls.KNOWN_ISPS.items():
+            if isp_key in query:
+                isp = isp_name
                 break
 
-        if not site_name:
-            return self._handle_search(query)
+        if 'healthy' in query:
+            health = ('healthy',)
+        elif 'critical' in query:
+            health = ('critical',)
+        elif 'warning' in query or 'degraded' in query:
+            health = ('warning', 'degraded')
+        else:
+            health = ()
+
+        return SiteFilter(
+            offline=offline,
+            comparison=cls._parse_comparison(query),
+            isp=isp,
+            health=health
+        )
+
+    @classmethod
+    def _parse_comparison(cls, query: str) -> Optional[Tuple[str, str, int]]:
+        """
+        Extract a numeric comparison from query.
+
+        Handles patterns like "more than 100 clients", "at least 5 devices"
+        """
+        # Pattern: [comparison] [number] [field]
+        for pattern, op in cls.COMPARISON_PATTERNS:
+            match = pattern.search(query)
+            if match:
+                field = cls._map_field(match.group(2))
+                if field:
+                    return field, op, int(match.group(1))
+
+        # Alternative pattern: [number] or more [field]
+        match = cls.OR_MORE_PATTERN.search(query)
+        if match:
+            field = cls._map_field(match.group(2))
+            if field:
+                return field, '>=', int(match.group(1))
+
+        return None
 
-        # Find matching site
-        matches = [s for s in self._sites if site_name.lower() in s.name.lower()]
+    # ========== Query Handlers ==========
+
+    def _handle_detail(self, parsed: ParsedQuery) -> QueryResult:
+        """Handle site detail queries like 'status of Celebration Church'."""
+        site_name = parsed.term
+        matches = self._index.search(site_name.lower())
 
         if not matches:
             return QueryResult(
@@ -295,7 +597,7 @@ class UniFiAnalyzer:
                 site_count=0
             )
 
-        site = matches[0]  # Return first match
+        site = self._sites[matches[0]]  # Return first match
         return QueryResult(
             success=True,
             intent=QueryIntent.FIND,
@@ -304,18 +606,14 @@ class UniFiAnalyzer:
             site_count=1
         )
 
-    def _handle_aggregate(self, query: str) -> QueryResult:
+    def _handle_aggregate(self, parsed: ParsedQuery) -> QueryResult:
         """Handle aggregation queries like 'total clients across all sites'."""
-        field = self._detect_field(query)
+        field = parsed.field
+        agg_type = parsed.aggregate
 
-        # Determine aggregation type
-        if 'average' in query or 'avg' in query or 'mean' in query:
-            values = [getattr(s, field, 0) for s in self._sites]
-            result = sum(values) / len(values) if values else 0
-            agg_type = 'average'
-        else:  # Default to sum/total
-            result = sum(getattr(s, field, 0) for s in self._sites)
-            agg_type = 'total'
+        result = self._index.total(field)
+        if agg_type == 'average':
+            result = result / len(self._sites)
 
         return QueryResult(
             success=True,
@@ -325,9 +623,9 @@ class UniFiAnalyzer:
             site_count=len(self._sites)
         )
 
-    def _handle_summary(self) -> QueryResult:
+    def _handle_summary(self, parsed: ParsedQuery = None) -> QueryResult:
         """Generate fleet summary."""
-        summary = FleetSummary.from_sites(self._sites)
+        summary = self._index.summary()
 
         return QueryResult(
             success=True,
@@ -336,53 +634,34 @@ class UniFiAnalyzer:
             message=f"Fleet summary: {summary.total_sites} sites, {summary.total_devices} devices, {summary.fleet_health_score}% healthy",
             site_count=summary.total_sites
         )
-    
-    def _handle_top_bottom(self, query: str) -> QueryResult:
+
+    def _handle_top_bottom(self, parsed: ParsedQuery) -> QueryResult:
         """Handle top/bottom N queries."""
-        # Extract N
-        match = re.search(r'\b(top|bottom|highest|lowest|best|worst)\s*(\d+)?', query)
-        if not match:
-            return self._unknown_result(query)
-        
-        direction = match.group(1)
-        n = int(match.group(2)) if match.group(2) else 5
-        
-        is_top = direction in ('top', 'highest', 'best')
-        
-        # Detect field to sort by
-        field = self._detect_field(query)
-        
-        # Sort and slice
-        sorted_sites = sorted(
-            self._sites,
-            key=lambda s: getattr(s, field, 0),
-            reverse=is_top
-        )[:n]
-        
+        is_top = parsed.intent == QueryIntent.TOP
+        n = parsed.limit
+        field = parsed.field
+
+        if is_top:
+            selected = self._index.top(n, field)
+        else:
+            selected = self._index.bottom(n, field)
+
         return QueryResult(
             success=True,
-            intent=QueryIntent.TOP if is_top else QueryIntent.BOTTOM,
-            data=[s.to_dict() for s in sorted_sites],
+            intent=parsed.intent,
+            data=[s.to_dict() for s in selected],
             message=f"{'Top' if is_top else 'Bottom'} {n} sites by {field}",
-            site_count=len(sorted_sites)
+            site_count=len(selected)
         )
-    
-    def _handle_group(self, query: str) -> QueryResult:
+
+    def _handle_group(self, parsed: ParsedQuery) -> QueryResult:
         """Handle grouping queries."""
-        # Determine grouping field
-        if 'isp' in query or 'provider' in query:
-            groups = self._group_by('isp')
-            field = 'ISP'
-        elif 'status' in query or 'health' in query:
-            groups = self._group_by('health_status')
-            field = 'Health Status'
-        else:
-            groups = self._group_by('isp')  # Default
-            field = 'ISP'
-        
+        groups = self._index.group_by(parsed.group_by)
+        field = 'Health Status' if parsed.group_by == 'health_status' else 'ISP'
+
         # Format output
         formatted = {k: len(v) for k, v in groups.items()}
-        
+
         return QueryResult(
             success=True,
             intent=QueryIntent.GROUP,
@@ -394,12 +673,11 @@ class UniFiAnalyzer:
             message=f"Sites grouped by {field}: {len(groups)} groups",
             site_count=len(self._sites)
         )
-    
-    def _handle_count(self, query: str) -> QueryResult:
+
+    def _handle_count(self, parsed: ParsedQuery) -> QueryResult:
         """Handle count queries."""
-        # Apply any filters first
-        filtered = self._apply_filters(query, self._sites)
-        
+        filtered = self._apply_filters(parsed.filters)
+
         return QueryResult(
             success=True,
             intent=QueryIntent.COUNT,
@@ -407,21 +685,12 @@ class UniFiAnalyzer:
             message=f"Found {len(filtered)} matching sites",
             site_count=len(filtered)
         )
-    
-    def _handle_search(self, query: str) -> QueryResult:
+
+    def _handle_search(self, parsed: ParsedQuery) -> QueryResult:
         """Handle search queries."""
-        # Extract search term
-        for kw in ['find', 'search', 'where is', 'show me', 'locate']:
-            query = query.replace(kw, '')
-        
-        search_term = query.strip().lower()
-        
-        # Search by name
-        matches = [
-            s for s in self._sites
-            if search_term in s.name.lower()
-        ]
-        
+        search_term = parsed.term
+        matches = self._index.select(self._index.search(search_term))
+
         if not matches:
             return QueryResult(
                 success=True,
@@ -430,7 +699,7 @@ class UniFiAnalyzer:
                 message=f"No sites found matching '{search_term}'",
                 site_count=0
             )
-        
+
         return QueryResult(
             success=True,
             intent=QueryIntent.SEARCH,
@@ -438,11 +707,11 @@ class UniFiAnalyzer:
             message=f"Found {len(matches)} site(s) matching '{search_term}'",
             site_count=len(matches)
         )
-    
-    def _handle_filter(self, query: str) -> QueryResult:
+
+    def _handle_filter(self, parsed: ParsedQuery) -> QueryResult:
         """Handle filter queries."""
-        filtered = self._apply_filters(query, self._sites)
-        
+        filtered = self._apply_filters(parsed.filters)
+
         return QueryResult(
             success=True,
             intent=QueryIntent.FILTER,
@@ -450,72 +719,47 @@ class UniFiAnalyzer:
             message=f"Found {len(filtered)} sites matching criteria",
             site_count=len(filtered)
         )
-    
-    def _apply_filters(self, query: str, sites: List[UniFiSite]) -> List[UniFiSite]:
-        """Apply detected filters to site list."""
-        results = sites.copy()
-        
-        # Check for offline filter
-        if 'offline' in query or 'down' in query:
-            if 'no offline' in query or 'without offline' in query:
-                results = [s for s in results if s.offline_devices == 0]
-            else:
-                results = [s for s in results if s.offline_devices > 0]
-        
-        # Check for numeric comparisons
-        predicate = self._build_predicate(query)
-        if predicate:
-            results = [s for s in results if predicate(s)]
-        
-        # Check for ISP filter
-        for isp_key, isp_name in self.KNOWN_ISPS.items():
-            if isp_key in query:
-                results = [s for s in results if isp_name.lower() in s.isp.lower()]
-                break
-        
-        # Check for health status
-        if 'healthy' in query:
-            results = [s for s in results if s.health_status == 'healthy']
-        elif 'critical' in query:
-            results = [s for s in results if s.health_status == 'critical']
-        elif 'warning' in query or 'degraded' in query:
-            results = [s for s in results if s.health_status in ('warning', 'degraded')]
-        
-        return results
-    
-    def _build_predicate(self, query: str) -> Optional[Callable[[UniFiSite], bool]]:
+
+    def _apply_filters(self, filters: SiteFilter) -> List[UniFiSite]:
         """
-        Build a filter predicate from query.
-        
-        Handles patterns like "more than 100 clients", "at least 5 devices"
+        Apply filter criteria using the site indexes.
+
+        Each criterion yields a set of positions; the intersection is
+        returned in original site order.
         """
-        # Pattern: [comparison] [number] [field]
-        for comp_phrase, op in self.COMPARISONS.items():
-            pattern = rf'{re.escape(comp_phrase)}\s*(\d+)\s*(\w+)'
-            match = re.search(pattern, query)
-            if match:
-                value = int(match.group(1))
-                field_word = match.group(2).lower()
-                field = self._map_field(field_word)
-                
-                if field:
-                    return self._make_comparison(field, op, value)
-        
-        # Alternative pattern: [number] or more [field]
-        match = re.search(r'(\d+)\s+or\s+more\s+(\w+)', query)
-        if match:
-            value = int(match.group(1))
-            field_word = match.group(2).lower()
-            field = self._map_field(field_word)
-            if field:
-                return self._make_comparison(field, '>=', value)
-        
-        return None
-    
+        index = self._index
+        matched: Optional[set] = None
+
+        def narrow(positions):
+            nonlocal matched
+            positions = set(positions)
+            matched = positions if matched is None else matched & positions
+
+        if filters.offline is not None:
+            narrow(index.compare('offline_devices', '>' if filters.offline else '==', 0))
+
+        if filters.comparison:
+            field, op, value = filters.comparison
+            positions = index.compare(field, op, value)
+            if positions is None:
+                compare = self._make_comparison(field, op, value)
+                positions = [pos for pos, site in enumerate(self._sites) if compare(site)]
+            narrow(positions)
+
+        if filters.isp:
+            narrow(index.by_isp.get(filters.isp, ()))
+
+        if filters.health:
+            narrow(pos for status in filters.health for pos in index.by_health.get(status, ()))
+
+        if matched is None:
+            return self._sites.copy()
+        return index.select(sorted(matched))
+
     def _make_comparison(
-        self, 
-        field: str, 
-        op: str, 
+        self,
+        field: str,
+        op: str,
         value: int
     ) -> Callable[[UniFiSite], bool]:
         """Create a comparison function."""
@@ -532,40 +776,34 @@ class UniFiAnalyzer:
             elif op == '==':
                 return site_value == value
             return True
-        
+
         return compare
-    
-    def _detect_field(self, query: str) -> str:
+
+    @classmethod
+    def _detect_field(cls, query: str) -> str:
         """Detect which field the query is referring to."""
         query_lower = query.lower()
-        
+
         # Check each mapping
-        for word, field in self.FIELD_MAPPINGS.items():
+        for word, field in cls.FIELD_MAPPINGS.items():
             if word in query_lower:
                 return field
-        
+
         # Defaults
         if 'offline' in query_lower or 'down' in query_lower:
             return 'offline_devices'
-        
+
         return 'total_devices'  # Default
-    
-    def _map_field(self, word: str) -> Optional[str]:
+
+    @classmethod
+    def _map_field(cls, word: str) -> Optional[str]:
         """Map a word to a field name."""
-        return self.FIELD_MAPPINGS.get(word.lower())
-    
+        return cls.FIELD_MAPPINGS.get(word.lower())
+
     def _group_by(self, field: str) -> Dict[str, List[UniFiSite]]:
         """Group sites by a field."""
-        groups: Dict[str, List[UniFiSite]] = {}
-        
-        for site in self._sites:
-            key = str(getattr(site, field, 'Unknown'))
-            if key not in groups:
-                groups[key] = []
-            groups[key].append(site)
-        
-        return groups
-    
+        return self._index.group_by(field)
+
     def _unknown_result(self, query: str) -> QueryResult:
         """Return result for unrecognized query."""
         return QueryResult(
@@ -574,13 +812,13 @@ class UniFiAnalyzer:
             data=None,
             message=f"Could not understand query: {query}"
         )
-    
+
     # Convenience methods
-    
+
     def filter(self, predicate: Callable[[UniFiSite], bool]) -> List[UniFiSite]:
         """Filter sites by predicate function."""
         return [s for s in self._sites if predicate(s)]
-    
+
     def sort(self, field: str, reverse: bool = False) -> List[UniFiSite]:
         """Sort sites by field."""
         return sorted(
@@ -588,50 +826,49 @@ class UniFiAnalyzer:
             key=lambda s: getattr(s, field, 0),
             reverse=reverse
         )
-    
+
     def top(self, n: int, field: str) -> List[UniFiSite]:
         """Get top N sites by field."""
-        return self.sort(field, reverse=True)[:n]
-    
+        return self._index.top(n, field)
+
     def bottom(self, n: int, field: str) -> List[UniFiSite]:
         """Get bottom N sites by field."""
-        return self.sort(field, reverse=False)[:n]
-    
+        return self._index.bottom(n, field)
+
     def sum(self, field: str) -> int:
         """Sum a field across all sites."""
-        return sum(getattr(s, field, 0) for s in self._sites)
-    
+        return self._index.total(field)
+
     def avg(self, field: str) -> float:
         """Average a field across all sites."""
         if not self._sites:
             return 0.0
         return self.sum(field) / len(self._sites)
-    
+
     def count(self, predicate: Callable[[UniFiSite], bool] = None) -> int:
         """Count sites, optionally with filter."""
         if predicate:
             return len(self.filter(predicate))
         return len(self._sites)
-    
+
     def find_by_name(self, name: str) -> Optional[UniFiSite]:
         """Find site by exact name match."""
-        for site in self._sites:
-            if site.name.lower() == name.lower():
-                return site
-        return None
-    
+        return self._index.find_name(name)
+
     def search(self, term: str) -> List[UniFiSite]:
         """Search sites by partial name match."""
-        term_lower = term.lower()
-        return [s for s in self._sites if term_lower in s.name.lower()]
-    
+        return self._index.select(self._index.search(term.lower()))
+
     def summary(self) -> FleetSummary:
         """Get fleet summary."""
-        return FleetSummary.from_sites(self._sites)
+        return self._index.summary()
 
 
 __all__ = [
     'QueryIntent',
     'QueryResult',
+    'ParsedQuery',
+    'SiteFilter',
+    'SiteIndex',
     'UniFiAnalyzer'
 ]
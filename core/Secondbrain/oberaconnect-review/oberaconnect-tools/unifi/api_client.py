@@ -2,16 +2,26 @@
 UniFi Site Manager API Client
 
 Handles authentication and API calls to unifi.ui.com Site Manager.
+
+List endpoints are read page by page (nextToken cursors) through
+generators, and per-site device fetches fan out over a bounded thread pool
+sharing one pooled session and a per-host rate limit.
 """
 
 import os
 import json
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from common.http_cache import ResponseCache
+from common.ratelimit import get_host_limiter, retry_after_seconds
 
 from .models import UniFiSite, UniFiDevice, FleetSummary
 
@@ -35,6 +45,9 @@ class UniFiAPIConfig:
     base_url: str = "https://api.ui.com/v1"
     timeout: int = 30
     verify_ssl: bool = True
+    rate_limit: float = 10.0  # Requests per second, shared per host (0 = unlimited)
+    max_workers: int = 8      # Concurrent per-site fetches
+    page_size: int = 100
 
     @classmethod
     def from_env(cls) -> 'UniFiAPIConfig':
@@ -44,7 +57,9 @@ class UniFiAPIConfig:
             base_url=os.getenv('UNIFI_API_BASE_URL', 'https://api.ui.com/v1'),
             timeout=int(os.getenv('UNIFI_API_TIMEOUT', '30')),
             # Default to True; only disable for local dev with self-signed certs
-            verify_ssl=os.getenv('UNIFI_VERIFY_SSL', 'true').lower() != 'false'
+            verify_ssl=os.getenv('UNIFI_VERIFY_SSL', 'true').lower() != 'false',
+            rate_limit=float(os.getenv('UNIFI_RATE_LIMIT', '10')),
+            max_workers=int(os.getenv('UNIFI_MAX_WORKERS', '8'))
         )
 
 
@@ -55,6 +70,9 @@ class UniFiClient:
     Provides methods for querying and managing UniFi sites.
     """
     
+    # Retries for 429 responses (honoring Retry-After)
+    MAX_RATE_LIMIT_RETRIES = 3
+    
     def __init__(self, config: Optional[UniFiAPIConfig] = None):
         """
         Initialize the client.
@@ -64,10 +82,18 @@ class UniFiClient:
         """
         self.config = config or UniFiAPIConfig.from_env()
         self.session = requests.Session()
+        self.limiter = get_host_limiter(self.config.base_url, self.config.rate_limit)
+        self.response_cache = ResponseCache()
         self._setup_session()
     
     def _setup_session(self):
-        """Configure the requests session with authentication."""
+        """Configure the requests session with authentication and pooling."""
+        # One keep-alive connection per worker thread
+        pool_size = max(10, self.config.max_workers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         if self.config.api_key:
             self.session.headers.update({
                 'X-API-KEY': self.config.api_key,
@@ -85,6 +111,9 @@ class UniFiClient:
         """
         Make an API request.
         
+        GET requests are conditional: cached ETag/Last-Modified validators
+        are sent, and a 304 or an identical body returns the cached payload.
+        
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint path
@@ -98,18 +127,28 @@ class UniFiClient:
             UniFiAPIError: On API errors
         """
         url = f"{self.config.base_url}{endpoint}"
+        cache_key = self.response_cache.key(url, params) if method == 'GET' else None
+        headers = self.response_cache.conditional_headers(cache_key) if cache_key else None
         
         logger.debug(f"API request: {method} {url}")
         
         try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                params=params,
-                json=data,
-                timeout=self.config.timeout,
-                verify=self.config.verify_ssl
-            )
+            for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+                self.limiter.acquire()
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    params=params,
+                    json=data,
+                    headers=headers,
+                    timeout=self.config.timeout,
+                    verify=self.config.verify_ssl
+                )
+                if response.status_code != 429 or attempt == self.MAX_RATE_LIMIT_RETRIES:
+                    break
+                retry_after = retry_after_seconds(response, attempt)
+                logger.warning(f"Rate limited by UniFi API, retrying in {retry_after:.1f}s")
+                time.sleep(retry_after)
             
             if response.status_code >= 400:
                 logger.error(f"API error: {response.status_code} - {response.text}")
@@ -119,6 +158,8 @@ class UniFiClient:
                     response=response.text
                 )
             
+            if cache_key:
+                return self.response_cache.resolve(cache_key, response)
             return response.json()
             
         except requests.exceptions.Timeout:
@@ -128,6 +169,37 @@ class UniFiClient:
         except json.JSONDecodeError:
             raise UniFiAPIError("Invalid JSON response")
     
+    def _paginate(
+        self,
+        endpoint: str,
+        params: Dict = None,
+        page_size: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield items from a list endpoint, following nextToken cursors.
+        
+        Only one page is held in memory at a time.
+        """
+        params = dict(params or {})
+        params.setdefault('pageSize', page_size or self.config.page_size)
+        
+        while True:
+            response = self._request('GET', endpoint, params=params)
+            yield from response.get('data', [])
+            
+            next_token = response.get('nextToken')
+            if not next_token or next_token == params.get('nextToken'):
+                return
+            params['nextToken'] = next_token
+    
+    def iter_sites(self) -> Iterator[UniFiSite]:
+        """Stream all sites from Site Manager, page by page."""
+        for item in self._paginate('/sites'):
+            try:
+                yield UniFiSite.from_api_response(item)
+            except Exception as e:
+                logger.warning(f"Failed to parse site: {e}")
+    
     def get_sites(self) -> List[UniFiSite]:
         """
         Get all sites from Site Manager.
@@ -135,17 +207,7 @@ class UniFiClient:
         Returns:
             List of UniFiSite objects
         """
-        response = self._request('GET', '/sites')
-        
-        sites = []
-        for item in response.get('data', []):
-            try:
-                site = UniFiSite.from_api_response(item)
-                sites.append(site)
-            except Exception as e:
-                logger.warning(f"Failed to parse site: {e}")
-                continue
-        
+        sites = list(self.iter_sites())
         logger.info(f"Loaded {len(sites)} sites from API")
         return sites
     
@@ -176,37 +238,101 @@ class UniFiClient:
         Returns:
             List of UniFiDevice objects
         """
-        response = self._request('GET', f'/ea/hosts/{site_id}/devices')
-        
-        devices = []
-        for item in response.get('data', []):
+        return list(self.iter_site_devices(site_id))
+    
+    def iter_site_devices(self, site_id: str) -> Iterator[UniFiDevice]:
+        """Stream devices for a site, page by page."""
+        for item in self._paginate(f'/ea/hosts/{site_id}/devices'):
             try:
-                device = UniFiDevice(
-                    mac=item.get('mac', ''),
-                    name=item.get('name', item.get('model', 'Unknown')),
-                    type=item.get('type', 'unknown'),
-                    model=item.get('model', 'Unknown'),
-                    status=item.get('status', 'unknown'),
-                    ip=item.get('ip'),
-                    firmware=item.get('version'),
-                    uptime=item.get('uptime', 0),
-                    clients=item.get('numSta', 0)
-                )
-                devices.append(device)
+                yield self._parse_device(item)
             except Exception as e:
                 logger.warning(f"Failed to parse device: {e}")
-                continue
+    
+    @staticmethod
+    def _parse_device(item: Dict[str, Any]) -> UniFiDevice:
+        return UniFiDevice(
+            mac=item.get('mac', ''),
+            name=item.get('name', item.get('model', 'Unknown')),
+            type=item.get('type', 'unknown'),
+            model=item.get('model', 'Unknown'),
+            status=item.get('status', 'unknown'),
+            ip=item.get('ip'),
+            firmware=item.get('version'),
+            uptime=item.get('uptime', 0),
+            clients=item.get('numSta', 0)
+        )
+    
+    def get_devices_for_sites(
+        self,
+        site_ids: Iterable[str],
+        max_workers: Optional[int] = None
+    ) -> Dict[str, List[UniFiDevice]]:
+        """
+        Fetch devices for many sites concurrently.
         
-        return devices
+        Requests run on a bounded thread pool sharing the pooled session
+        and the per-host rate limit. Sites whose fetch fails are logged
+        and omitted from the result.
+        
+        Args:
+            site_ids: Site/host IDs
+            max_workers: Pool size (defaults to config.max_workers)
+            
+        Returns:
+            Dict of site ID -> devices
+        """
+        site_ids = list(site_ids)
+        workers = max(1, min(max_workers or self.config.max_workers, len(site_ids) or 1))
+        results: Dict[str, List[UniFiDevice]] = {}
+        
+        def fetch(site_id: str):
+            try:
+                return site_id, self.get_site_devices(site_id), None
+            except UniFiAPIError as e:
+                return site_id, None, e
+        
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='unifi-fetch') as pool:
+            for site_id, devices, error in pool.map(fetch, site_ids):
+                if error is not None:
+                    logger.warning(f"Failed to fetch devices for site {site_id}: {error}")
+                    continue
+                results[site_id] = devices
+        
+        logger.info(
+            f"Fetched devices for {len(results)}/{len(site_ids)} sites "
+            f"in {time.monotonic() - started:.1f}s ({workers} workers)"
+        )
+        return results
     
-    def get_fleet_summary(self) -> FleetSummary:
+    def get_fleet_with_devices(self, max_workers: Optional[int] = None) -> List[UniFiSite]:
+        """
+        Get all sites with their device lists populated.
+        
+        Args:
+            max_workers: Concurrent device fetches (defaults to config.max_workers)
+            
+        Returns:
+            List of UniFiSite objects with .devices filled in
+        """
+        sites = self.get_sites()
+        devices_by_site = self.get_devices_for_sites([s.id for s in sites], max_workers)
+        for site in sites:
+            site.devices = devices_by_site.get(site.id, [])
+        return sites
+    
+    def get_fleet_summary(self, sites: Optional[List[UniFiSite]] = None) -> FleetSummary:
         """
         Get summary statistics for the entire fleet.
         
+        Args:
+            sites: Already-fetched sites; fetched if not given
+        
         Returns:
             FleetSummary object
         """
-        sites = self.get_sites()
+        if sites is None:
+            sites = self.get_sites()
         return FleetSummary.from_sites(sites)
     
     def test_connection(self) -> bool:
@@ -383,8 +509,11 @@ class DemoUniFiClient:
                 return site
         return None
     
-    def get_fleet_summary(self) -> FleetSummary:
-        return FleetSummary.from_sites(self._sites)
+    def get_fleet_with_devices(self, max_workers: Optional[int] = None) -> List[UniFiSite]:
+        return self.get_sites()
+    
+    def get_fleet_summary(self, sites: Optional[List[UniFiSite]] = None) -> FleetSummary:
+        return FleetSummary.from_sites(self._sites if sites is None else sites)
     
     def test_connection(self) -> bool:
         return True
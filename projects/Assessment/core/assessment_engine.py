@@ -21,6 +21,8 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
+from .catalog import AssessmentCatalog
+
 
 class AssessmentType(Enum):
     SECURITY = "security"
@@ -137,6 +139,15 @@ class AssessmentEngine:
         self._pattern_cache: Dict[str, Any] = {}
         self._benchmark_cache: Dict[str, Any] = {}
 
+        # Index over assessment files; built once from disk if new
+        self.catalog = AssessmentCatalog(self.data_dir / "catalog.db")
+        if not self.catalog.count() and any(self.assessments_dir.glob("*.json")):
+            self.catalog.rebuild(self.assessments_dir)
+
+    def rebuild_catalog(self) -> int:
+        """Re-index all assessment files (e.g. after copying files in by hand)"""
+        return self.catalog.rebuild(self.assessments_dir)
+
     def generate_assessment_id(self, customer_id: str, assessment_type: str) -> str:
         """Generate unique assessment ID"""
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
@@ -236,8 +247,10 @@ class AssessmentEngine:
 
         # Save assessment
         filepath = self.assessments_dir / f"{assessment.id}.json"
+        data = assessment.to_dict()
         with open(filepath, 'w') as f:
-            json.dump(assessment.to_dict(), f, indent=2)
+            json.dump(data, f, indent=2)
+        self.catalog.upsert(data, filepath)
 
         # Update pattern database (Data Moat)
         self._update_patterns(assessment)
@@ -264,53 +277,24 @@ class AssessmentEngine:
     ) -> Optional[AssessmentResult]:
         """Get the most recent assessment for a customer/type combination"""
 
-        assessments = []
-        for filepath in self.assessments_dir.glob("*.json"):
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-
-            if (data['customer_id'] == customer_id and
-                data['assessment_type'] == assessment_type.value):
-                assessments.append((data['timestamp'], filepath))
+        while True:
+            assessment_id = self.catalog.latest_id(customer_id, assessment_type.value)
+            if assessment_id is None:
+                return None
 
-        if not assessments:
-            return None
-
-        # Sort by timestamp, get most recent
-        assessments.sort(key=lambda x: x[0], reverse=True)
-        latest_path = assessments[0][1]
-
-        with open(latest_path, 'r') as f:
-            data = json.load(f)
+            assessment = self.load_assessment(assessment_id)
+            if assessment:
+                return assessment
 
-        data['assessment_type'] = AssessmentType(data['assessment_type'])
-        data['findings'] = [Finding.from_dict(f) for f in data['findings']]
-        return AssessmentResult(**data)
+            # File was deleted behind the catalog's back
+            self.catalog.remove(assessment_id)
 
     def get_customer_history(self, customer_id: str) -> List[Dict]:
         """
         FEEDBACK LOOP: Comparative Analysis
         Get assessment history for a customer showing score progression
         """
-        history = []
-
-        for filepath in self.assessments_dir.glob("*.json"):
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-
-            if data['customer_id'] == customer_id:
-                history.append({
-                    'id': data['id'],
-                    'type': data['assessment_type'],
-                    'timestamp': data['timestamp'],
-                    'overall_score': data['overall_score'],
-                    'finding_count': len(data['findings']),
-                    'trend': data.get('trend'),
-                    'score_delta': data.get('score_delta')
-                })
-
-        history.sort(key=lambda x: x['timestamp'])
-        return history
+        return self.catalog.history(customer_id)
 
     def _update_patterns(self, assessment: AssessmentResult) -> None:
         """
@@ -576,10 +560,10 @@ class AssessmentEngine:
     ) -> Dict[str, Any]:
         """
         FEEDBACK LOOP: Benchmark Comparison
-        Compare assessment against aggregated benchmarks
-        """
-        insights = self.get_pattern_insights()
+        Compare assessment against peers in the catalog
 
+        compare_by: 'industry' or 'assessment_type'
+        """
         comparison = {
             'assessment_score': assessment.overall_score,
             'comparison_type': compare_by,
@@ -588,13 +572,21 @@ class AssessmentEngine:
             'recommendations': []
         }
 
-        if compare_by == 'industry' and assessment.industry:
-            benchmarks = insights.get('industry_benchmarks', {})
-            if assessment.industry in benchmarks:
-                avg = benchmarks[assessment.industry]['avg_score']
-                comparison['benchmark_average'] = avg
-                comparison['above_average'] = assessment.overall_score > avg
-                comparison['delta'] = assessment.overall_score - avg
+        if compare_by == 'industry':
+            peer_value = assessment.industry
+        elif compare_by == 'assessment_type':
+            peer_value = assessment.assessment_type.value
+        else:
+            peer_value = None
+
+        benchmark = self.catalog.benchmark(compare_by, peer_value, assessment.overall_score) if peer_value else None
+        if benchmark:
+            avg = benchmark['avg_score']
+            comparison['benchmark_average'] = avg
+            comparison['sample_size'] = benchmark['sample_size']
+            comparison['percentile'] = benchmark['percentile']
+            comparison['above_average'] = assessment.overall_score > avg
+            comparison['delta'] = assessment.overall_score - avg
 
         return comparison
 
@@ -0,0 +1,171 @@
+"""
+OberaConnect Assessment Catalog
+SQLite index over saved assessment files
+
+The engine writes each assessment to its own JSON file. The catalog keeps
+one row per assessment (customer, type, date, score, industry, ...) so
+history, latest-assessment and benchmark lookups are indexed queries
+instead of opening every file on disk.
+
+Rebuild from existing files:
+    python catalog.py rebuild [data_dir]
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+
+class AssessmentCatalog:
+    """
+    Index of assessments keyed by customer, type, date and score
+
+    Rows are upserted by AssessmentEngine.save_assessment; rebuild()
+    re-creates the index from the JSON files.
+    """
+
+    # compare_by -> catalog column for benchmark queries
+    BENCHMARK_COLUMNS = {
+        'industry': 'industry',
+        'assessment_type': 'assessment_type'
+    }
+
+    def __init__(self, db_path: Path):
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS assessments (
+                    id TEXT PRIMARY KEY,
+                    customer_id TEXT NOT NULL,
+                    customer_name TEXT,
+                    assessment_type TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    overall_score REAL NOT NULL,
+                    finding_count INTEGER NOT NULL,
+                    trend TEXT,
+                    score_delta REAL,
+                    industry TEXT,
+                    employee_count INTEGER,
+                    path TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_assessments_customer
+                    ON assessments(customer_id, timestamp);
+                CREATE INDEX IF NOT EXISTS idx_assessments_customer_type
+                    ON assessments(customer_id, assessment_type, timestamp);
+                CREATE INDEX IF NOT EXISTS idx_assessments_industry
+                    ON assessments(industry, overall_score);
+                CREATE INDEX IF NOT EXISTS idx_assessments_type
+                    ON assessments(assessment_type, overall_score);
+            """)
+
+    def upsert(self, data: Dict[str, Any], path: Path) -> None:
+        """Index one assessment (as written by AssessmentResult.to_dict)"""
+        with self._lock, self._conn:
+            self._upsert(data, path)
+
+    def _upsert(self, data: Dict[str, Any], path: Path) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO assessments (id, customer_id, customer_name, assessment_type, "
+            "timestamp, overall_score, finding_count, trend, score_delta, industry, employee_count, path) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (data['id'], data['customer_id'], data.get('customer_name'), data['assessment_type'],
+             data['timestamp'], data['overall_score'], len(data.get('findings', [])),
+             data.get('trend'), data.get('score_delta'), data.get('industry'),
+             data.get('employee_count'), str(path))
+        )
+
+    def remove(self, assessment_id: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM assessments WHERE id = ?", (assessment_id,))
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM assessments").fetchone()[0]
+
+    def rebuild(self, assessments_dir: Path) -> int:
+        """Re-index every assessment file; returns the number indexed"""
+        indexed = 0
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM assessments")
+            for filepath in Path(assessments_dir).glob("*.json"):
+                try:
+                    with open(filepath, 'r') as f:
+                        data = json.load(f)
+                    self._upsert(data, filepath)
+                    indexed += 1
+                except (OSError, ValueError, KeyError, TypeError):
+                    continue  # Not an assessment file
+        return indexed
+
+    def latest_id(self, customer_id: str, assessment_type: str) -> Optional[str]:
+        """ID of the most recent assessment for a customer/type combination"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM assessments WHERE customer_id = ? AND assessment_type = ? "
+                "ORDER BY timestamp DESC LIMIT 1",
+                (customer_id, assessment_type)
+            ).fetchone()
+        return row['id'] if row else None
+
+    def history(self, customer_id: str) -> List[Dict[str, Any]]:
+        """Score progression for a customer, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, assessment_type, timestamp, overall_score, finding_count, trend, score_delta "
+                "FROM assessments WHERE customer_id = ? ORDER BY timestamp",
+                (customer_id,)
+            ).fetchall()
+
+        return [{
+            'id': row['id'],
+            'type': row['assessment_type'],
+            'timestamp': row['timestamp'],
+            'overall_score': row['overall_score'],
+            'finding_count': row['finding_count'],
+            'trend': row['trend'],
+            'score_delta': row['score_delta']
+        } for row in rows]
+
+    def benchmark(self, compare_by: str, value: Any, score: float) -> Optional[Dict[str, Any]]:
+        """
+        Score statistics for the peer group where compare_by == value
+
+        Returns sample size, average and the share of assessments scoring
+        below score, or None if the group is empty.
+        """
+        column = self.BENCHMARK_COLUMNS[compare_by]
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT COUNT(*) AS n, AVG(overall_score) AS avg, "
+                f"SUM(CASE WHEN overall_score < ? THEN 1 ELSE 0 END) AS below "
+                f"FROM assessments WHERE {column} = ?",
+                (score, value)
+            ).fetchone()
+
+        if not row['n']:
+            return None
+        return {
+            'sample_size': row['n'],
+            'avg_score': row['avg'],
+            'percentile': int(row['below'] / row['n'] * 100)
+        }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "rebuild":
+        print("Usage: python catalog.py rebuild [data_dir]")
+        sys.exit(1)
+
+    data_dir = Path(sys.argv[2]) if len(sys.argv) > 2 else Path(__file__).parent.parent / "data"
+    catalog = AssessmentCatalog(data_dir / "catalog.db")
+    print(f"Indexed {catalog.rebuild(data_dir / 'assessments')} assessments into {catalog.db_path}")
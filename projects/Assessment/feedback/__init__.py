@@ -5,3 +5,4 @@ from .feedback_loops import (
     PatternLearningLoop,
     BenchmarkLoop
 )
+from .store import FeedbackStore, QuantileSketch
@@ -15,6 +15,8 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
 
+from .store import FeedbackStore
+
 
 @dataclass
 class FeedbackEvent:
@@ -39,15 +41,44 @@ class ScoreTrackingLoop:
     - Build customer health dashboards
     """
 
-    def __init__(self, data_dir: Path):
+    TREND_WINDOW = 6  # Scores needed for the recent/older moving averages
+
+    def __init__(self, data_dir: Path, store: FeedbackStore = None):
         self.data_dir = data_dir
-        self.tracking_file = data_dir / "score_tracking.json"
-        self._ensure_file()
+        self.tracking_file = data_dir / "score_tracking.json"  # Legacy, imported into the store
+        self.store = store or FeedbackStore(data_dir / "feedback.db")
+        self._import_legacy()
 
-    def _ensure_file(self):
-        if not self.tracking_file.exists():
-            with open(self.tracking_file, 'w') as f:
-                json.dump({'customers': {}, 'alerts': [], 'trends': {}}, f)
+    def _import_legacy(self):
+        """Move score history from score_tracking.json into an empty store"""
+        if not self.tracking_file.exists() or self.store.count('scores'):
+            return
+        try:
+            with open(self.tracking_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+
+        for customer_id, by_type in data.get('customers', {}).items():
+            if not isinstance(by_type, dict):
+                continue
+            for assessment_type, scores in by_type.items():
+                if not isinstance(scores, list):
+                    continue
+                for entry in scores:
+                    if isinstance(entry, dict) and 'score' in entry:
+                        self._append_score(customer_id, assessment_type, entry)
+        for alert in data.get('alerts', []):
+            if isinstance(alert, dict) and 'customer_id' in alert:
+                self.store.append('score_alerts', alert['customer_id'], alert, timestamp=alert.get('timestamp'))
+
+    def _series_key(self, customer_id: str, assessment_type: str) -> str:
+        return f"{customer_id}/{assessment_type}"
+
+    def _append_score(self, customer_id: str, assessment_type: str, entry: Dict) -> Dict[str, Any]:
+        key = self._series_key(customer_id, assessment_type)
+        self.store.append('scores', key, entry, timestamp=entry.get('timestamp'))
+        return self.store.observe('scores', key, entry['score'], timestamp=entry.get('timestamp'))
 
     def record_score(
         self,
@@ -58,37 +89,23 @@ class ScoreTrackingLoop:
     ) -> Dict[str, Any]:
         """Record a new score and return trend analysis"""
 
-        with open(self.tracking_file, 'r') as f:
-            data = json.load(f)
-
-        # Initialize customer tracking if new
-        if customer_id not in data['customers']:
-            data['customers'][customer_id] = {}
-
-        if assessment_type not in data['customers'][customer_id]:
-            data['customers'][customer_id][assessment_type] = []
-
         # Add new score
         entry = {
             'score': score,
             'assessment_id': assessment_id,
             'timestamp': datetime.now().isoformat()
         }
-        data['customers'][customer_id][assessment_type].append(entry)
+        stats = self._append_score(customer_id, assessment_type, entry)
 
-        # Calculate trend
-        scores = data['customers'][customer_id][assessment_type]
-        trend_analysis = self._analyze_trend(scores)
+        # Calculate trend from the recent window plus running aggregates
+        key = self._series_key(customer_id, assessment_type)
+        scores = self.store.recent('scores', key, limit=self.TREND_WINDOW)
+        trend_analysis = self._analyze_trend(scores, stats)
 
         # Check for alerts
         alerts = self._check_alerts(customer_id, assessment_type, scores, trend_analysis)
-        data['alerts'].extend(alerts)
-
-        # Update trends
-        data['trends'][f"{customer_id}_{assessment_type}"] = trend_analysis
-
-        with open(self.tracking_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        for alert in alerts:
+            self.store.append('score_alerts', customer_id, alert, timestamp=alert['timestamp'])
 
         return {
             'current_score': score,
@@ -96,14 +113,19 @@ class ScoreTrackingLoop:
             'alerts': alerts
         }
 
-    def _analyze_trend(self, scores: List[Dict]) -> Dict[str, Any]:
-        """Analyze score trend over time"""
+    def _analyze_trend(self, scores: List[Dict], stats: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Analyze score trend over time
 
-        if len(scores) < 2:
+        scores holds only the latest TREND_WINDOW entries; all-time figures
+        come from the store's running aggregates in stats.
+        """
+
+        if stats['count'] < 2:
             return {
                 'direction': 'insufficient_data',
                 'change': 0,
-                'assessment_count': len(scores)
+                'assessment_count': stats['count']
             }
 
         recent = scores[-1]['score']
@@ -133,10 +155,10 @@ class ScoreTrackingLoop:
             'direction': direction,
             'change': change,
             'trend_strength': trend_strength,
-            'assessment_count': len(scores),
-            'all_time_high': max(s['score'] for s in scores),
-            'all_time_low': min(s['score'] for s in scores),
-            'average': sum(s['score'] for s in scores) / len(scores)
+            'assessment_count': stats['count'],
+            'all_time_high': stats['max'],
+            'all_time_low': stats['min'],
+            'average': stats['mean']
         }
 
     def _check_alerts(
@@ -197,10 +219,8 @@ class ScoreTrackingLoop:
     def get_customer_dashboard(self, customer_id: str) -> Dict[str, Any]:
         """Get dashboard data for a customer"""
 
-        with open(self.tracking_file, 'r') as f:
-            data = json.load(f)
-
-        customer_data = data['customers'].get(customer_id, {})
+        prefix = self._series_key(customer_id, '')
+        series = self.store.aggregates('scores', prefix=prefix)
 
         dashboard = {
             'customer_id': customer_id,
@@ -212,20 +232,20 @@ class ScoreTrackingLoop:
         total_score = 0
         count = 0
 
-        for assessment_type, scores in customer_data.items():
-            if scores:
-                latest = scores[-1]
-                trend = data['trends'].get(f"{customer_id}_{assessment_type}", {})
+        for key, stats in series.items():
+            assessment_type = key[len(prefix):]
+            scores = self.store.recent('scores', key, limit=self.TREND_WINDOW)
+            trend = self._analyze_trend(scores, stats)
 
-                dashboard['assessments'][assessment_type] = {
-                    'current_score': latest['score'],
-                    'last_assessed': latest['timestamp'],
-                    'trend': trend.get('direction', 'unknown'),
-                    'history_count': len(scores)
-                }
+            dashboard['assessments'][assessment_type] = {
+                'current_score': stats['last'],
+                'last_assessed': stats['updated_at'],
+                'trend': trend.get('direction', 'unknown'),
+                'history_count': stats['count']
+            }
 
-                total_score += latest['score']
-                count += 1
+            total_score += stats['last']
+            count += 1
 
         if count > 0:
             avg_score = total_score / count
@@ -238,8 +258,8 @@ class ScoreTrackingLoop:
 
         # Get active alerts
         dashboard['active_alerts'] = [
-            a for a in data['alerts']
-            if a['customer_id'] == customer_id and a.get('action_required', False)
+            a for a in self.store.iter_events('score_alerts', key=customer_id)
+            if a.get('action_required', False)
         ]
 
         return dashboard
@@ -744,22 +764,43 @@ class BenchmarkLoop:
     - Best-in-class performers
     """
 
-    def __init__(self, data_dir: Path):
+    def __init__(self, data_dir: Path, store: FeedbackStore = None):
         self.data_dir = data_dir
-        self.benchmark_file = data_dir / "benchmarks.json"
-        self._ensure_file()
+        self.benchmark_file = data_dir / "benchmarks.json"  # Legacy, imported into the store
+        self.store = store or FeedbackStore(data_dir / "feedback.db")
+        self._import_legacy()
 
-    def _ensure_file(self):
-        if not self.benchmark_file.exists():
-            with open(self.benchmark_file, 'w') as f:
-                json.dump({
-                    'global': {'scores': [], 'percentiles': {}},
-                    'by_industry': {},
-                    'by_size': {},
-                    'by_assessment_type': {},
-                    'best_in_class': {},
-                    'last_updated': None
-                }, f)
+    def _import_legacy(self):
+        """Move score lists from benchmarks.json into an empty store"""
+        if not self.benchmark_file.exists() or self.store.aggregate('benchmarks', 'global'):
+            return
+        try:
+            with open(self.benchmark_file, 'r') as f:
+                benchmarks = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+
+        groups = {'global': benchmarks.get('global')}
+        for section, prefix in (('by_assessment_type', 'type'), ('by_industry', 'industry'), ('by_size', 'size')):
+            for name, group in benchmarks.get(section, {}).items():
+                groups[f"{prefix}:{name}"] = group
+        for group, data in groups.items():
+            if isinstance(data, dict):
+                for score in data.get('scores', []):
+                    self.store.observe('benchmarks', group, score)
+
+        for key, entries in benchmarks.get('best_in_class', {}).items():
+            for entry in entries:
+                self.store.append('best_in_class', key, entry, timestamp=entry.get('timestamp'))
+
+    def _groups(self, assessment_type: str, industry: str = None, employee_count: int = None) -> Dict[str, str]:
+        """Comparison name -> benchmark group for an assessment"""
+        groups = {'global': 'global', 'assessment_type': f"type:{assessment_type}"}
+        if industry:
+            groups['industry'] = f"industry:{industry}"
+        if employee_count:
+            groups['company_size'] = f"size:{self._get_size_bucket(employee_count)}"
+        return groups
 
     def update_benchmarks(
         self,
@@ -768,51 +809,24 @@ class BenchmarkLoop:
         industry: str = None,
         employee_count: int = None
     ) -> None:
-        """Update benchmark data with new assessment"""
-
-        with open(self.benchmark_file, 'r') as f:
-            benchmarks = json.load(f)
-
-        # Update global benchmarks
-        benchmarks['global']['scores'].append(score)
-        self._recalculate_percentiles(benchmarks['global'])
-
-        # Update by assessment type
-        if assessment_type not in benchmarks['by_assessment_type']:
-            benchmarks['by_assessment_type'][assessment_type] = {'scores': [], 'percentiles': {}}
-        benchmarks['by_assessment_type'][assessment_type]['scores'].append(score)
-        self._recalculate_percentiles(benchmarks['by_assessment_type'][assessment_type])
+        """
+        Update benchmark data with new assessment
 
-        # Update by industry
-        if industry:
-            if industry not in benchmarks['by_industry']:
-                benchmarks['by_industry'][industry] = {'scores': [], 'percentiles': {}}
-            benchmarks['by_industry'][industry]['scores'].append(score)
-            self._recalculate_percentiles(benchmarks['by_industry'][industry])
+        Each peer group's aggregates and percentile sketch are updated in
+        place, so the cost doesn't grow with the number of assessments.
+        """
 
-        # Update by size
-        if employee_count:
-            size_bucket = self._get_size_bucket(employee_count)
-            if size_bucket not in benchmarks['by_size']:
-                benchmarks['by_size'][size_bucket] = {'scores': [], 'percentiles': {}}
-            benchmarks['by_size'][size_bucket]['scores'].append(score)
-            self._recalculate_percentiles(benchmarks['by_size'][size_bucket])
+        for group in self._groups(assessment_type, industry, employee_count).values():
+            self.store.observe('benchmarks', group, score)
 
         # Track best in class
         if score >= 90:
             key = f"{assessment_type}_{industry or 'general'}"
-            if key not in benchmarks['best_in_class']:
-                benchmarks['best_in_class'][key] = []
-            benchmarks['best_in_class'][key].append({
+            self.store.append('best_in_class', key, {
                 'score': score,
                 'timestamp': datetime.now().isoformat()
             })
 
-        benchmarks['last_updated'] = datetime.now().isoformat()
-
-        with open(self.benchmark_file, 'w') as f:
-            json.dump(benchmarks, f, indent=2)
-
     def _get_size_bucket(self, employee_count: int) -> str:
         if employee_count < 10:
             return 'micro'
@@ -825,21 +839,20 @@ class BenchmarkLoop:
         else:
             return 'enterprise'
 
-    def _recalculate_percentiles(self, data: Dict) -> None:
-        """Recalculate percentile thresholds"""
-        scores = sorted(data['scores'])
-        n = len(scores)
-
-        if n == 0:
-            return
+    def get_percentiles(self, group: str) -> Dict[str, Any]:
+        """Percentile thresholds for a benchmark group, from its sketch"""
+        stats = self.store.aggregate('benchmarks', group)
+        if not stats:
+            return {}
 
-        data['percentiles'] = {
-            '25th': scores[int(n * 0.25)] if n >= 4 else scores[0],
-            '50th': scores[int(n * 0.5)] if n >= 2 else scores[0],
-            '75th': scores[int(n * 0.75)] if n >= 4 else scores[-1],
-            '90th': scores[int(n * 0.9)] if n >= 10 else scores[-1],
-            'mean': sum(scores) / n,
-            'count': n
+        sketch = stats['sketch']
+        return {
+            '25th': sketch.quantile(0.25),
+            '50th': sketch.quantile(0.5),
+            '75th': sketch.quantile(0.75),
+            '90th': sketch.quantile(0.9),
+            'mean': stats['mean'],
+            'count': stats['count']
         }
 
     def get_benchmark_comparison(
@@ -851,70 +864,32 @@ class BenchmarkLoop:
     ) -> Dict[str, Any]:
         """Get benchmark comparison for a score"""
 
-        with open(self.benchmark_file, 'r') as f:
-            benchmarks = json.load(f)
-
         comparison = {
             'score': score,
             'comparisons': {}
         }
 
-        # Global comparison
-        global_data = benchmarks['global']
-        if global_data['scores']:
-            comparison['comparisons']['global'] = {
-                'percentile': self._calculate_percentile(score, global_data['scores']),
-                'vs_mean': score - global_data['percentiles'].get('mean', 0),
-                'sample_size': len(global_data['scores'])
-            }
-
-        # Assessment type comparison
-        if assessment_type in benchmarks['by_assessment_type']:
-            type_data = benchmarks['by_assessment_type'][assessment_type]
-            if type_data['scores']:
-                comparison['comparisons']['assessment_type'] = {
-                    'percentile': self._calculate_percentile(score, type_data['scores']),
-                    'vs_mean': score - type_data['percentiles'].get('mean', 0),
-                    'sample_size': len(type_data['scores'])
-                }
-
-        # Industry comparison
-        if industry and industry in benchmarks['by_industry']:
-            ind_data = benchmarks['by_industry'][industry]
-            if ind_data['scores']:
-                comparison['comparisons']['industry'] = {
-                    'industry': industry,
-                    'percentile': self._calculate_percentile(score, ind_data['scores']),
-                    'vs_mean': score - ind_data['percentiles'].get('mean', 0),
-                    'sample_size': len(ind_data['scores'])
-                }
+        for name, group in self._groups(assessment_type, industry, employee_count).items():
+            stats = self.store.aggregate('benchmarks', group)
+            if not stats:
+                continue
 
-        # Size comparison
-        if employee_count:
-            size_bucket = self._get_size_bucket(employee_count)
-            if size_bucket in benchmarks['by_size']:
-                size_data = benchmarks['by_size'][size_bucket]
-                if size_data['scores']:
-                    comparison['comparisons']['company_size'] = {
-                        'size_category': size_bucket,
-                        'percentile': self._calculate_percentile(score, size_data['scores']),
-                        'vs_mean': score - size_data['percentiles'].get('mean', 0),
-                        'sample_size': len(size_data['scores'])
-                    }
+            entry = {
+                'percentile': int(stats['sketch'].rank(score) * 100),
+                'vs_mean': score - stats['mean'],
+                'sample_size': stats['count']
+            }
+            if name == 'industry':
+                entry = {'industry': industry, **entry}
+            elif name == 'company_size':
+                entry = {'size_category': group.split(':', 1)[1], **entry}
+            comparison['comparisons'][name] = entry
 
         # Generate insights
         comparison['insights'] = self._generate_benchmark_insights(comparison)
 
         return comparison
 
-    def _calculate_percentile(self, score: float, scores: List[float]) -> int:
-        """Calculate percentile ranking"""
-        if not scores:
-            return 50
-
-        below = sum(1 for s in scores if s < score)
-        return int((below / len(scores)) * 100)
-
     def _generate_benchmark_insights(self, comparison: Dict) -> List[str]:
         """Generate human-readable insights from comparison"""
 
@@ -951,10 +926,12 @@ class FeedbackLoopOrchestrator:
         self.data_dir = Path(data_dir) if data_dir else Path(__file__).parent.parent / "data"
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
-        self.score_loop = ScoreTrackingLoop(self.data_dir)
+        self.store = FeedbackStore(self.data_dir / "feedback.db")
+
+        self.score_loop = ScoreTrackingLoop(self.data_dir, self.store)
         self.remediation_loop = RemediationLoop(self.data_dir)
         self.pattern_loop = PatternLearningLoop(self.data_dir)
-        self.benchmark_loop = BenchmarkLoop(self.data_dir)
+        self.benchmark_loop = BenchmarkLoop(self.data_dir, self.store)
 
     def process_assessment(
         self,
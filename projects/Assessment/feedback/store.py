@@ -0,0 +1,277 @@
+"""
+OberaConnect Feedback Store
+Append-only event log with incrementally maintained aggregates
+
+Feedback loops append events instead of rewriting a JSON file, so
+recording stays cheap however much history builds up, and no history is
+trimmed. Numeric observations update per-group aggregates (count, mean,
+min, max, last values) and a quantile sketch in the same transaction, so
+percentiles never need a pass over past data.
+"""
+
+import json
+import math
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator
+
+
+class QuantileSketch:
+    """
+    Streaming quantile sketch with bounded relative error
+
+    Values are counted in logarithmic buckets (as in DDSketch), so any
+    quantile is within relative_accuracy of the true value and memory
+    grows with the value range, not the number of values. Values below
+    min_value (including zero) share one bucket.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-6):
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _index(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, index: int) -> float:
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def add(self, value: float):
+        if value < self.min_value:
+            self.zero_count += 1
+        else:
+            index = self._index(value)
+            self.bins[index] = self.bins.get(index, 0) + 1
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate value at quantile q (0-1)"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                return self._value(index)
+        return self._value(max(self.bins))
+
+    def rank(self, value: float) -> float:
+        """Approximate fraction of values strictly below value"""
+        if self.count == 0:
+            return 0.0
+        if value < self.min_value:
+            return 0.0
+        boundary = self._index(value)
+        below = self.zero_count + sum(n for index, n in self.bins.items() if index < boundary)
+        return below / self.count
+
+    def to_dict(self) -> Dict:
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'min_value': self.min_value,
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'bins': {str(index): n for index, n in self.bins.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'QuantileSketch':
+        sketch = cls(data['relative_accuracy'], data['min_value'])
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        sketch.bins = {int(index): n for index, n in data['bins'].items()}
+        return sketch
+
+
+class FeedbackStore:
+    """
+    SQLite-backed storage for feedback loops
+
+    - events: append-only log of JSON payloads, indexed by (stream, key)
+    - aggregates: per (stream, group) running count/sum/min/max, the last
+      two values and a QuantileSketch, updated by observe()
+    """
+
+    def __init__(self, db_path: Path):
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    stream TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    payload TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_events_stream_key ON events(stream, key, id);
+                CREATE INDEX IF NOT EXISTS idx_events_stream ON events(stream, id);
+
+                CREATE TABLE IF NOT EXISTS aggregates (
+                    stream TEXT NOT NULL,
+                    grp TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    total REAL NOT NULL,
+                    min REAL NOT NULL,
+                    max REAL NOT NULL,
+                    last REAL NOT NULL,
+                    previous REAL,
+                    updated_at TEXT NOT NULL,
+                    sketch TEXT NOT NULL,
+                    PRIMARY KEY (stream, grp)
+                );
+            """)
+
+    def append(
+        self,
+        stream: str,
+        key: str,
+        payload: Dict[str, Any],
+        timestamp: str = None
+    ) -> int:
+        """Append an event; returns its sequence number"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO events (stream, key, timestamp, payload) VALUES (?, ?, ?, ?)",
+                (stream, key, timestamp or datetime.now().isoformat(), json.dumps(payload, default=str))
+            )
+            return cursor.lastrowid
+
+    def observe(
+        self,
+        stream: str,
+        group: str,
+        value: float,
+        timestamp: str = None
+    ) -> Dict[str, Any]:
+        """Fold a value into a group's aggregates; returns the updated aggregate"""
+        timestamp = timestamp or datetime.now().isoformat()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT * FROM aggregates WHERE stream = ? AND grp = ?", (stream, group)
+            ).fetchone()
+
+            if row is None:
+                sketch = QuantileSketch()
+                sketch.add(value)
+                values = (1, value, value, value, value, None)
+            else:
+                sketch = QuantileSketch.from_dict(json.loads(row['sketch']))
+                sketch.add(value)
+                values = (row['count'] + 1, row['total'] + value, min(row['min'], value),
+                          max(row['max'], value), value, row['last'])
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO aggregates "
+                "(stream, grp, count, total, min, max, last, previous, updated_at, sketch) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (stream, group, *values, timestamp, json.dumps(sketch.to_dict()))
+            )
+
+        count, total, low, high, last, previous = values
+        return self._aggregate_dict(group, count, total, low, high, last, previous, timestamp, sketch)
+
+    def aggregate(self, stream: str, group: str) -> Optional[Dict[str, Any]]:
+        """Current aggregate for a group, or None if nothing was observed"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM aggregates WHERE stream = ? AND grp = ?", (stream, group)
+            ).fetchone()
+        return self._row_to_aggregate(row) if row else None
+
+    def aggregates(self, stream: str, prefix: str = '') -> Dict[str, Dict[str, Any]]:
+        """All aggregates in a stream whose group starts with prefix"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM aggregates WHERE stream = ? AND grp >= ? AND grp < ?",
+                (stream, prefix, prefix + '\uffff')
+            ).fetchall()
+        return {row['grp']: self._row_to_aggregate(row) for row in rows}
+
+    def recent(self, stream: str, key: str = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """Latest events, oldest first"""
+        query = "SELECT payload FROM events WHERE stream = ?"
+        params: list = [stream]
+        if key is not None:
+            query += " AND key = ?"
+            params.append(key)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [json.loads(row['payload']) for row in reversed(rows)]
+
+    def iter_events(
+        self,
+        stream: str,
+        key: str = None,
+        prefix: str = None,
+        batch_size: int = 500
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream events in order, matching an exact key or a key prefix"""
+        query = "SELECT id, payload FROM events WHERE stream = ? AND id > ?"
+        params: list = [stream]
+        if key is not None:
+            query += " AND key = ?"
+            params.append(key)
+        elif prefix:
+            query += " AND key >= ? AND key < ?"
+            params += [prefix, prefix + '\uffff']
+        query += " ORDER BY id LIMIT ?"
+
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(query, [params[0], last_id, *params[1:], batch_size]).fetchall()
+            for row in rows:
+                yield json.loads(row['payload'])
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1]['id']
+
+    def count(self, stream: str, key: str = None) -> int:
+        with self._lock:
+            if key is None:
+                row = self._conn.execute("SELECT COUNT(*) FROM events WHERE stream = ?", (stream,)).fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT COUNT(*) FROM events WHERE stream = ? AND key = ?", (stream, key)
+                ).fetchone()
+        return row[0]
+
+    def _row_to_aggregate(self, row: sqlite3.Row) -> Dict[str, Any]:
+        sketch = QuantileSketch.from_dict(json.loads(row['sketch']))
+        return self._aggregate_dict(row['grp'], row['count'], row['total'], row['min'], row['max'],
+                                    row['last'], row['previous'], row['updated_at'], sketch)
+
+    @staticmethod
+    def _aggregate_dict(group, count, total, low, high, last, previous, updated_at, sketch) -> Dict[str, Any]:
+        return {
+            'group': group,
+            'count': count,
+            'mean': total / count,
+            'min': low,
+            'max': high,
+            'last': last,
+            'previous': previous,
+            'updated_at': updated_at,
+            'sketch': sketch
+        }
@@ -8,3 +8,4 @@ from .scan_analytics import (
     ScanOutcome,
     ErrorCategory
 )
+from .store import FeedbackStore, QuantileSketch
@@ -23,6 +23,8 @@ from dataclasses import dataclass, field, asdict
 from enum import Enum
 from collections import defaultdict
 
+from .store import FeedbackStore
+
 
 class ScanOutcome(Enum):
     SUCCESS = "success"
@@ -77,19 +79,17 @@ class ScanPerformanceLoop:
     - Recommend scan type based on target
     """
 
-    def __init__(self, data_dir: Path):
+    def __init__(self, data_dir: Path, store: FeedbackStore = None):
         self.data_dir = data_dir
-        self.metrics_file = data_dir / "scan_metrics.json"
+        self.metrics_file = data_dir / "scan_metrics.json"  # Legacy, imported into the store
         self.benchmarks_file = data_dir / "scan_benchmarks.json"
         self._ensure_files()
+        self.store = store or FeedbackStore(data_dir / "feedback.db")
+        self._import_legacy_metrics()
 
     def _ensure_files(self):
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
-        if not self.metrics_file.exists():
-            with open(self.metrics_file, 'w') as f:
-                json.dump({'scans': [], 'total_count': 0}, f)
-
         if not self.benchmarks_file.exists():
             with open(self.benchmarks_file, 'w') as f:
                 json.dump({
@@ -103,22 +103,33 @@ class ScanPerformanceLoop:
                     'last_updated': None
                 }, f)
 
+    def _import_legacy_metrics(self):
+        """Move scans from scan_metrics.json into an empty store"""
+        if not self.metrics_file.exists() or self.store.count('scans'):
+            return
+        try:
+            with open(self.metrics_file, 'r') as f:
+                scans = json.load(f).get('scans', [])
+        except (OSError, json.JSONDecodeError):
+            return
+        for scan in scans:
+            self._append_scan(scan)
+
+    def _append_scan(self, scan: Dict):
+        # Full history is kept; per-network aggregates make lookups O(1)
+        self.store.append('scans', scan['target'], scan, timestamp=scan.get('completed_at'))
+        if scan['outcome'] == ScanOutcome.SUCCESS.value:
+            network = self._network_prefix(scan['target'])
+            self.store.observe('scan_duration', network, scan['duration_seconds'])
+            self.store.observe('scan_hosts', network, scan['hosts_discovered'])
+
+    def _network_prefix(self, target: str) -> str:
+        return target.rsplit('.', 1)[0] if '.' in target else target
+
     def record_scan(self, metrics: ScanMetrics) -> Dict[str, Any]:
         """Record scan metrics and update benchmarks"""
 
-        with open(self.metrics_file, 'r') as f:
-            data = json.load(f)
-
-        # Add scan record
-        data['scans'].append(metrics.to_dict())
-        data['total_count'] += 1
-
-        # Keep last 1000 scans for analysis
-        if len(data['scans']) > 1000:
-            data['scans'] = data['scans'][-1000:]
-
-        with open(self.metrics_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        self._append_scan(metrics.to_dict())
 
         # Update benchmarks
         insights = self._update_benchmarks(metrics)
@@ -269,27 +280,21 @@ class ScanPerformanceLoop:
         Analyzes patterns to suggest optimal scan parameters
         """
 
-        with open(self.metrics_file, 'r') as f:
-            data = json.load(f)
-
         suggestions = []
 
-        # Find similar scans
-        network_prefix = target.rsplit('.', 1)[0] if '.' in target else target
-        similar_scans = [
-            s for s in data['scans']
-            if s['target'].startswith(network_prefix) and s['outcome'] == 'success'
-        ]
+        # Successful scans of the same network, from running aggregates
+        network_prefix = self._network_prefix(target)
+        durations = self.store.aggregate('scan_duration', network_prefix)
+        hosts = self.store.aggregate('scan_hosts', network_prefix)
 
-        if similar_scans:
-            # Analyze successful scans of this network
-            avg_duration = statistics.mean([s['duration_seconds'] for s in similar_scans])
-            avg_hosts = statistics.mean([s['hosts_discovered'] for s in similar_scans])
+        if durations and hosts:
+            avg_duration = durations['mean']
+            avg_hosts = hosts['mean']
 
             suggestions.append({
                 'type': 'historical_insight',
                 'message': f"Previous scans of {network_prefix}.x found ~{int(avg_hosts)} hosts in ~{int(avg_duration/60)} minutes",
-                'confidence': 'high' if len(similar_scans) > 3 else 'medium'
+                'confidence': 'high' if durations['count'] > 3 else 'medium'
             })
 
         # Scan type recommendations
@@ -1099,20 +1104,14 @@ class ScanAnalyticsOrchestrator:
     def _get_performance_summary(self) -> Dict[str, Any]:
         """Get performance summary from metrics"""
 
-        metrics_file = self.data_dir / "scan_metrics.json"
-        if not metrics_file.exists():
-            return {'message': 'No performance data yet'}
+        store = self.performance_loop.store
+        recent = store.recent('scans', limit=50)  # Last 50 scans
 
-        with open(metrics_file, 'r') as f:
-            data = json.load(f)
-
-        if not data['scans']:
+        if not recent:
             return {'message': 'No scans recorded'}
 
-        recent = data['scans'][-50:]  # Last 50 scans
-
         return {
-            'total_scans': data['total_count'],
+            'total_scans': store.count('scans'),
             'recent_scans': len(recent),
             'avg_duration_minutes': statistics.mean([s['duration_seconds']/60 for s in recent]),
             'success_rate': sum(1 for s in recent if s['outcome'] == 'success') / len(recent),
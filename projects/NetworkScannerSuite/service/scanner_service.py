@@ -9,14 +9,17 @@ import json
 import subprocess
 import os
 import re
+import sqlite3
+import threading
+import xml.etree.ElementTree as ET
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Iterator, List, Optional
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
@@ -24,10 +27,37 @@ from pydantic import BaseModel, Field
 SERVICE_DIR = Path(__file__).parent
 SCANS_DIR = SERVICE_DIR / "scans"
 SCANS_DIR.mkdir(exist_ok=True)
+JOBS_DB = Path(os.environ.get("SCANNER_JOBS_DB", SCANS_DIR / "jobs.db"))
+RESUME_ON_START = os.environ.get("SCANNER_RESUME_ON_START", "false").lower() in ("1", "true", "yes")
+
+# Pipelined scan engine: live hosts from discovery are handed to per-host
+# workers as soon as nmap reports them, up to SCAN_PARALLELISM at a time
+SCAN_PARALLELISM = int(os.environ.get("SCANNER_PARALLELISM", "16"))
+DISCOVERY_HOST_TIMEOUT = os.environ.get("SCANNER_DISCOVERY_HOST_TIMEOUT", "30s")
+
+# Per-host phases for each scan type: (phase name, file prefix, nmap args, host timeout).
+# Phases after the port scan only probe the ports it found open. OS detection
+# therefore sees no closed port, so it must not use --osscan-limit (which
+# skips every host without both an open and a closed port).
+HOST_PHASES = {
+    "quick": [],
+    "standard": [
+        ("Port Scan", "02_ports", ["-F"], "5m"),
+        ("Service Detection", "03_services", ["-sV"], "10m"),
+    ],
+    "intense": [
+        ("Port Scan", "02_ports", ["-p-", "-T4"], "15m"),
+        ("Service Detection", "03_services", ["-sV", "-sC"], "20m"),
+        ("OS Detection", "04_os", ["-O"], "5m"),
+    ],
+}
 
 # Store active scans and websocket connections
 active_scans = {}
 websocket_connections: List[WebSocket] = []
+event_subscribers: Dict[str, List[asyncio.Queue]] = {}  # scan_id -> SSE client queues
+resumed_tasks = set()  # Keeps resumed scan tasks referenced until they finish
+EVENT_QUEUE_SIZE = 1000
 
 
 # Pydantic Models
@@ -36,11 +66,12 @@ class ScanConfig(BaseModel):
     scan_type: str = Field(default="standard", description="Scan type: quick, standard, or intense")
     name: Optional[str] = Field(default=None, description="Custom name for this scan")
     exclusions: List[str] = Field(default=[], description="IPs to exclude from scan")
+    max_parallel: int = Field(default=SCAN_PARALLELISM, ge=1, le=256, description="Hosts scanned concurrently")
 
 
 class ScanStatus(BaseModel):
     scan_id: str
-    status: str  # pending, running, completed, failed, cancelled
+    status: str  # pending, running, completed, failed, cancelled, interrupted
     target: str
     scan_type: str
     started_at: Optional[str]
@@ -64,13 +95,24 @@ async def lifespan(app: FastAPI):
     # Startup
     print(f"Obera Network Scanner Service starting...")
     print(f"Scans directory: {SCANS_DIR}")
+    imported = job_store.import_summaries(SCANS_DIR)
+    if imported:
+        print(f"Imported {imported} scans into job store")
+    interrupted = job_store.mark_interrupted()
+    if interrupted:
+        print(f"{len(interrupted)} scans were interrupted by a restart")
+        if RESUME_ON_START:
+            for scan_id in interrupted:
+                resume_job(scan_id)
+                print(f"Resuming {scan_id}")
     yield
     # Shutdown
     print("Shutting down scanner service...")
-    # Cancel any active scans
-    for scan_id in list(active_scans.keys()):
-        if active_scans[scan_id].get("process"):
-            active_scans[scan_id]["process"].terminate()
+    # Stop active scans; hosts in flight stay incomplete so the scan can be resumed
+    for scan_info in active_scans.values():
+        if scan_info["status"] == "running":
+            scan_info["cancelled"] = scan_info["interrupted"] = True
+        terminate_processes(scan_info)
 
 
 # Create FastAPI app
@@ -93,7 +135,12 @@ app.add_middleware(
 
 # WebSocket manager for real-time updates
 async def broadcast_update(message: dict):
-    """Send update to all connected websocket clients"""
+    """Send update to all connected websocket clients and the scan's SSE subscribers"""
+    for queue in event_subscribers.get(message.get("scan_id"), ()):
+        if queue.full():
+            queue.get_nowait()  # Slow client: drop its oldest event rather than block the scan
+        queue.put_nowait(message)
+
     for connection in websocket_connections:
         try:
             await connection.send_json(message)
@@ -101,92 +148,567 @@ async def broadcast_update(message: dict):
             pass
 
 
-# Scan execution
-async def run_scan(scan_id: str, config: ScanConfig):
-    """Execute network scan in background"""
-    scan_info = active_scans[scan_id]
-    output_dir = Path(scan_info["output_dir"])
-    output_dir.mkdir(parents=True, exist_ok=True)
+# nmap XML parsing
+class NmapXMLStream:
+    """
+    Incremental parser for nmap XML output
+
+    feed() accepts output as it arrives and returns the hosts completed so
+    far. Each <host> element is dropped from the tree once read, so memory
+    stays flat however many hosts the scan covers.
+    """
+
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._root = None
+
+    def feed(self, data: bytes) -> List[dict]:
+        self._parser.feed(data)
+        hosts = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = elem
+            elif elem.tag == "host":
+                record = host_record(elem)
+                if record:
+                    hosts.append(record)
+                self._root.remove(elem)
+        return hosts
+
+
+def host_record(elem: ET.Element) -> Optional[dict]:
+    """Convert an nmap <host> element to a host record (None for hosts that are down)"""
+    status = elem.find("status")
+    if status is not None and status.get("state") != "up":
+        return None
+
+    record = {"ip": None, "hostname": None, "mac": None, "vendor": None, "ports": [], "os": None}
+    for address in elem.iter("address"):
+        if address.get("addrtype") in ("ipv4", "ipv6") and not record["ip"]:
+            record["ip"] = address.get("addr")
+        elif address.get("addrtype") == "mac":
+            record["mac"] = address.get("addr")
+            record["vendor"] = address.get("vendor")
+    if not record["ip"]:
+        return None
+
+    hostname = elem.find("hostnames/hostname")
+    if hostname is not None:
+        record["hostname"] = hostname.get("name")
+
+    for port in elem.iter("port"):
+        state = port.find("state")
+        if state is None or state.get("state") != "open":
+            continue
+        service = port.find("service")
+        record["ports"].append({
+            "port": int(port.get("portid")),
+            "protocol": port.get("protocol"),
+            "service": service.get("name", "") if service is not None else "",
+            "product": service.get("product") if service is not None else None,
+            "version": service.get("version") if service is not None else None
+        })
 
-    # Build nmap commands for each phase
-    phases = []
-
-    if config.scan_type == "quick":
-        phases = [
-            ("Host Discovery", f"nmap -sn {config.target} -oA {output_dir}/01_discovery"),
-        ]
-    elif config.scan_type == "standard":
-        phases = [
-            ("Host Discovery", f"nmap -sn {config.target} -oA {output_dir}/01_discovery"),
-            ("Port Scan", f"nmap -F {config.target} -oA {output_dir}/02_ports"),
-            ("Service Detection", f"nmap -sV {config.target} -oA {output_dir}/03_services"),
-        ]
-    else:  # intense
-        phases = [
-            ("Host Discovery", f"nmap -sn {config.target} -oA {output_dir}/01_discovery"),
-            ("Port Scan", f"nmap -p- -T4 {config.target} -oA {output_dir}/02_ports"),
-            ("Service Detection", f"nmap -sV -sC {config.target} -oA {output_dir}/03_services"),
-            ("OS Detection", f"nmap -O {config.target} -oA {output_dir}/04_os"),
-        ]
-
-    total_phases = len(phases)
-    hosts_found = 0
+    osmatch = elem.find("os/osmatch")
+    if osmatch is not None:
+        record["os"] = osmatch.get("name")
+        record["os_accuracy"] = int(osmatch.get("accuracy", 0))
 
-    try:
-        for i, (phase_name, cmd) in enumerate(phases):
-            # Update status
-            scan_info["current_phase"] = phase_name
-            scan_info["progress"] = int((i / total_phases) * 100)
+    return record
 
-            await broadcast_update({
-                "type": "scan_progress",
-                "scan_id": scan_id,
-                "phase": phase_name,
-                "progress": scan_info["progress"],
-                "message": f"Running {phase_name}..."
-            })
 
-            # Run nmap command
-            process = await asyncio.create_subprocess_shell(
-                cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+def iter_xml_hosts(xml_file: Path, chunk_size: int = 65536) -> Iterator[dict]:
+    """Stream host records from an nmap XML file"""
+    stream = NmapXMLStream()
+    with open(xml_file, "rb") as f:
+        try:
+            while chunk := f.read(chunk_size):
+                yield from stream.feed(chunk)
+        except ET.ParseError:
+            pass  # Truncated by a cancelled or killed nmap: keep the hosts read so far
+
+
+class HostTable:
+    """
+    Host records merged across phases, keyed by IP
+
+    Later phases add detail to what earlier ones found (e.g. service
+    versions for ports from the port scan) without duplicating ports.
+    """
+
+    def __init__(self):
+        self._hosts: Dict[str, dict] = {}
+        self._ports: Dict[str, Dict[tuple, dict]] = {}
+
+    def __len__(self) -> int:
+        return len(self._hosts)
+
+    def __contains__(self, ip: str) -> bool:
+        return ip in self._hosts
+
+    def merge(self, record: dict) -> dict:
+        """Merge a host record in; returns the merged host"""
+        ip = record["ip"]
+        host = self._hosts.get(ip)
+        if host is None:
+            host = {"ip": ip, "hostname": None, "mac": None, "vendor": None, "ports": [], "os": None}
+            self._hosts[ip] = host
+            self._ports[ip] = {}
+
+        for key in ("hostname", "mac", "vendor"):
+            if record.get(key):
+                host[key] = record[key]
+        if record.get("os") and record.get("os_accuracy", 0) >= host.get("os_accuracy", 0):
+            host["os"] = record["os"]
+            host["os_accuracy"] = record.get("os_accuracy", 0)
+
+        ports = self._ports[ip]
+        for port in record["ports"]:
+            key = (port["protocol"], port["port"])
+            existing = ports.get(key)
+            if existing is None:
+                existing = dict(port)
+                ports[key] = existing
+                host["ports"].append(existing)
+            else:
+                existing.update({k: v for k, v in port.items() if v})
+        return host
+
+    def to_results(self) -> dict:
+        hosts = list(self._hosts.values())
+        for host in hosts:
+            host["ports"].sort(key=lambda p: (p["protocol"], p["port"]))
+        return {
+            "hosts": hosts,
+            "services": [
+                {"ip": host["ip"], **port}
+                for host in hosts for port in host["ports"] if port.get("service")
+            ],
+            "os_matches": [
+                {"ip": host["ip"], "os": host["os"], "accuracy": host.get("os_accuracy")}
+                for host in hosts if host["os"]
+            ]
+        }
+
+
+# Persistent job store
+class ScanJobStore:
+    """
+    SQLite store for scan jobs and their host results
+
+    Each discovered host is written with a completion marker that is set
+    once all of its phases have finished, so an interrupted scan can be
+    resumed from the hosts that are still incomplete. Job listings are
+    served from the indexed jobs table instead of reading every
+    SUMMARY.json.
+    """
+
+    JOB_FIELDS = ("status", "started_at", "completed_at", "hosts_found", "progress",
+                  "current_phase", "error", "discovery_done")
+
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    scan_id TEXT PRIMARY KEY,
+                    target TEXT NOT NULL,
+                    scan_type TEXT NOT NULL,
+                    config TEXT NOT NULL,
+                    output_dir TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    started_at TEXT,
+                    completed_at TEXT,
+                    hosts_found INTEGER DEFAULT 0,
+                    progress INTEGER DEFAULT 0,
+                    current_phase TEXT,
+                    error TEXT,
+                    discovery_done INTEGER DEFAULT 0
+                );
+                CREATE INDEX IF NOT EXISTS idx_jobs_started ON jobs(started_at);
+                CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, started_at);
+                CREATE INDEX IF NOT EXISTS idx_jobs_target ON jobs(target, started_at);
+
+                CREATE TABLE IF NOT EXISTS hosts (
+                    scan_id TEXT NOT NULL,
+                    ip TEXT NOT NULL,
+                    record TEXT NOT NULL,
+                    completed INTEGER DEFAULT 0,
+                    updated_at TEXT,
+                    PRIMARY KEY (scan_id, ip)
+                );
+                CREATE INDEX IF NOT EXISTS idx_hosts_pending ON hosts(scan_id, completed);
+            """)
+
+    def create_job(self, scan_info: dict, config: ScanConfig):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (scan_id, target, scan_type, config, output_dir, status, "
+                "started_at, completed_at, hosts_found, progress, current_phase) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (scan_info["scan_id"], config.target, config.scan_type, json.dumps(config.model_dump()),
+                 scan_info["output_dir"], scan_info["status"], scan_info["started_at"],
+                 scan_info["completed_at"], scan_info["hosts_found"], scan_info["progress"],
+                 scan_info["current_phase"])
+            )
+
+    def update_job(self, scan_id: str, **fields):
+        unknown = set(fields) - set(self.JOB_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown job fields: {', '.join(sorted(unknown))}")
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE scan_id = ?", (*fields.values(), scan_id)
             )
-            scan_info["process"] = process
 
-            stdout, stderr = await process.communicate()
-            output = stdout.decode()
+    def get_job(self, scan_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE scan_id = ?", (scan_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list_jobs(self, status: Optional[str] = None, target: Optional[str] = None,
+                  limit: int = 100, offset: int = 0) -> List[dict]:
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if target:
+            clauses.append("target = ?")
+            params.append(target)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM jobs {where} ORDER BY started_at DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def save_host(self, scan_id: str, host: dict, completed: bool = False):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO hosts (scan_id, ip, record, completed, updated_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(scan_id, ip) DO UPDATE SET record = excluded.record, "
+                "completed = MAX(completed, excluded.completed), updated_at = excluded.updated_at",
+                (scan_id, host["ip"], json.dumps(host), int(completed), datetime.now().isoformat())
+            )
+
+    def mark_host_complete(self, scan_id: str, ip: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE hosts SET completed = 1, updated_at = ? WHERE scan_id = ? AND ip = ?",
+                (datetime.now().isoformat(), scan_id, ip)
+            )
+
+    def load_hosts(self, scan_id: str) -> tuple:
+        """Return (HostTable of everything found, IPs whose phases are incomplete)"""
+        table, pending = HostTable(), []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ip, record, completed FROM hosts WHERE scan_id = ?", (scan_id,)
+            ).fetchall()
+        for row in rows:
+            table.merge(json.loads(row["record"]))
+            if not row["completed"]:
+                pending.append(row["ip"])
+        return table, pending
+
+    def mark_interrupted(self) -> List[str]:
+        """Flag jobs left running by a previous process; returns their IDs"""
+        with self._lock, self._conn:
+            rows = self._conn.execute("SELECT scan_id FROM jobs WHERE status = 'running'").fetchall()
+            self._conn.execute("UPDATE jobs SET status = 'interrupted' WHERE status = 'running'")
+        return [row["scan_id"] for row in rows]
+
+    def import_summaries(self, scans_dir: Path) -> int:
+        """Add completed scans that only exist as SUMMARY.json files"""
+        with self._lock:
+            known = {row[0] for row in self._conn.execute("SELECT scan_id FROM jobs")}
+        imported = 0
+        for summary_file in scans_dir.glob("*/SUMMARY.json"):
+            if summary_file.parent.name in known:
+                continue
+            try:
+                with open(summary_file) as f:
+                    summary = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            config = {"target": summary.get("target", "unknown"),
+                      "scan_type": summary.get("scan_type", "unknown")}
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO jobs (scan_id, target, scan_type, config, output_dir, status, "
+                    "started_at, completed_at, hosts_found, progress, current_phase, discovery_done) "
+                    "VALUES (?, ?, ?, ?, ?, 'completed', ?, ?, ?, 100, 'Complete', 1)",
+                    (summary_file.parent.name, config["target"], config["scan_type"], json.dumps(config),
+                     str(summary_file.parent), summary.get("started_at"), summary.get("completed_at"),
+                     summary.get("hosts_found", 0))
+                )
+            imported += 1
+        return imported
+
+
+job_store = ScanJobStore(JOBS_DB)
 
-            # Send output to websockets
-            await broadcast_update({
-                "type": "scan_output",
-                "scan_id": scan_id,
-                "phase": phase_name,
-                "output": output
-            })
 
-            # Count hosts from discovery phase
-            if "discovery" in cmd:
-                hosts_found = output.count("Host is up")
-                scan_info["hosts_found"] = hosts_found
+# Scan execution
+def terminate_processes(scan_info: dict):
+    """Terminate every nmap process a scan has running"""
+    for process in list(scan_info.get("processes", ())):
+        if process.returncode is None:
+            process.terminate()
+
+
+def timeout_seconds(value: str) -> float:
+    """Convert an nmap time spec (30s, 5m, 1h) to seconds"""
+    units = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    match = re.fullmatch(r"(\d+)(ms|s|m|h)?", value)
+    if not match:
+        raise ValueError(f"Invalid timeout: {value}")
+    return int(match.group(1)) * units[match.group(2) or "s"]
+
+
+async def stream_nmap(
+    scan_info: dict,
+    args: List[str],
+    target: str,
+    xml_file: Path,
+    timeout: Optional[float] = None
+):
+    """
+    Run nmap with XML on stdout and yield host records as nmap emits them
+
+    The XML is also saved to xml_file. The process is tracked in
+    scan_info so the scan can be cancelled, and killed if it outlives
+    timeout.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout if timeout else None
+    process = await asyncio.create_subprocess_exec(
+        "nmap", *args, "-oX", "-", target,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    scan_info["processes"].add(process)
+    stream = NmapXMLStream()
+    try:
+        with open(xml_file, "wb") as out:
+            while True:
+                remaining = None if deadline is None else deadline - loop.time()
+                chunk = await asyncio.wait_for(process.stdout.read(65536), timeout=remaining)
+                if not chunk:
+                    break
+                out.write(chunk)
+                try:
+                    for record in stream.feed(chunk):
+                        yield record
+                except ET.ParseError:
+                    pass  # Killed mid-document; keep saving output, stop parsing
+        await process.wait()
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        scan_info["processes"].discard(process)
+
+
+def discover_hosts(scan_info: dict, config: ScanConfig, output_dir: Path):
+    """Host discovery as an async stream of live host records"""
+    args = ["-sn", "--host-timeout", DISCOVERY_HOST_TIMEOUT,
+            "-oN", str(output_dir / "01_discovery.nmap"),
+            "-oG", str(output_dir / "01_discovery.gnmap")]
+    if config.exclusions:
+        args += ["--exclude", ",".join(config.exclusions)]
+
+    return stream_nmap(scan_info, args, config.target, output_dir / "01_discovery.xml")
+
+
+async def scan_host(scan_info: dict, ip: str, phases: list, output_dir: Path, on_update=None) -> List[str]:
+    """
+    Run the per-host phases for one live host; returns its open TCP ports
+
+    Each merged host record is passed to on_update as a phase reports it.
+    """
+    host_dir = output_dir / "hosts" / ip
+    host_dir.mkdir(parents=True, exist_ok=True)
+    open_ports = None
+
+    for phase_name, prefix, phase_args, host_timeout in phases:
+        if scan_info.get("cancelled"):
+            break
+        if open_ports is not None and not open_ports:
+            break  # Nothing open: service and OS probes have nothing to work with
+
+        # Discovery already proved the host is up, so skip nmap's own ping (-Pn)
+        args = ["-Pn", *phase_args, "--host-timeout", host_timeout,
+                "-oN", str(host_dir / f"{prefix}.nmap"),
+                "-oG", str(host_dir / f"{prefix}.gnmap")]
+        if open_ports:
+            args += ["-p", ",".join(open_ports)]
+
+        # nmap enforces --host-timeout; the outer timeout only catches hangs
+        phase_ports = []
+        async for record in stream_nmap(
+            scan_info, args, ip, host_dir / f"{prefix}.xml",
+            timeout=timeout_seconds(host_timeout) + 60
+        ):
+            phase_ports += [str(p["port"]) for p in record["ports"] if p["protocol"] == "tcp"]
+            if on_update:
+                await on_update(phase_name, record)
+
+        if open_ports is None:
+            open_ports = list(dict.fromkeys(phase_ports))
+
+    return open_ports or []
+
+
+async def run_scan(scan_id: str, config: ScanConfig, pending: Optional[List[str]] = None):
+    """
+    Execute network scan in background
+
+    Discovery streams live hosts into a queue; max_parallel workers pull
+    hosts off it and run the port/service/OS phases against that host
+    only, so later phases never probe dead address space and start
+    before discovery has finished.
+
+    When resuming, scan_info["hosts"] already holds the hosts found
+    earlier and pending lists those whose phases did not finish.
+    Discovery is skipped if it had completed, and otherwise only adds
+    hosts that are not already known.
+    """
+    scan_info = active_scans[scan_id]
+    output_dir = Path(scan_info["output_dir"])
+    output_dir.mkdir(parents=True, exist_ok=True)
 
-            # Check if cancelled
-            if scan_info.get("cancelled"):
-                scan_info["status"] = "cancelled"
+    phases = HOST_PHASES.get(config.scan_type, HOST_PHASES["intense"])
+    hosts: HostTable = scan_info["hosts"]
+    queue: asyncio.Queue = asyncio.Queue()
+    pending = pending or []
+    discovery_done = scan_info.get("discovery_done", False)
+    progress = {"found": len(hosts), "done": len(hosts) - len(pending), "discovering": not discovery_done}
+
+    async def report(message: str):
+        found, done = progress["found"], progress["done"]
+        if not phases:
+            percent = 0 if progress["discovering"] else 100
+        else:
+            # Discovery can keep adding hosts, so hold back until it finishes
+            percent = int(95 * done / found) if found else 0
+            if progress["discovering"]:
+                percent = min(percent, 50)
+        scan_info["progress"] = percent
+        job_store.update_job(scan_id, progress=percent, hosts_found=found,
+                             current_phase=scan_info["current_phase"])
+        await broadcast_update({
+            "type": "scan_progress",
+            "scan_id": scan_id,
+            "phase": scan_info["current_phase"],
+            "progress": percent,
+            "hosts_found": found,
+            "hosts_done": done,
+            "message": message
+        })
+
+    async def host_update(phase_name: str, record: dict):
+        host = hosts.merge(record)
+        job_store.save_host(scan_id, host, completed=not phases)
+        await broadcast_update({
+            "type": "host_update",
+            "scan_id": scan_id,
+            "phase": phase_name,
+            "host": host
+        })
+
+    async def worker():
+        while True:
+            ip = await queue.get()
+            try:
+                if ip is None:
+                    return
+                open_ports = await scan_host(scan_info, ip, phases, output_dir, on_update=host_update)
+                if scan_info.get("cancelled"):
+                    continue
+                job_store.mark_host_complete(scan_id, ip)
+                progress["done"] += 1
                 await broadcast_update({
-                    "type": "scan_cancelled",
-                    "scan_id": scan_id
+                    "type": "scan_output",
+                    "scan_id": scan_id,
+                    "phase": scan_info["current_phase"],
+                    "output": f"{ip}: {len(open_ports)} open ports {', '.join(open_ports)}".rstrip()
                 })
-                return
+                await report(f"Finished {ip} ({progress['done']}/{progress['found']})")
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(config.max_parallel if phases else 0)]
+
+    try:
+        for ip in pending:
+            if phases:
+                queue.put_nowait(ip)
+
+        if not discovery_done:
+            scan_info["current_phase"] = "Host Discovery" if not phases else "Host Discovery + " + phases[0][0]
+            await report("Running Host Discovery...")
+
+            discovery = discover_hosts(scan_info, config, output_dir)
+            try:
+                async for record in discovery:
+                    ip = record["ip"]
+                    if ip in hosts:
+                        continue
+                    await host_update("Host Discovery", record)
+                    progress["found"] += 1
+                    scan_info["hosts_found"] = progress["found"]
+                    if phases:
+                        queue.put_nowait(ip)
+                    if scan_info.get("cancelled"):
+                        break
+            finally:
+                await discovery.aclose()
+
+            if not scan_info.get("cancelled"):
+                scan_info["discovery_done"] = True
+                job_store.update_job(scan_id, discovery_done=1)
+
+        progress["discovering"] = False
+        if phases:
+            scan_info["current_phase"] = " / ".join(name for name, *_ in phases)
+            await report(f"Discovery complete: {progress['found']} hosts up")
+        for _ in workers:
+            queue.put_nowait(None)
+        await asyncio.gather(*workers)
+
+        hosts_found = progress["found"]
+
+        # Check if cancelled
+        if scan_info.get("cancelled"):
+            scan_info["status"] = "interrupted" if scan_info.get("interrupted") else "cancelled"
+            job_store.update_job(scan_id, status=scan_info["status"])
+            await broadcast_update({
+                "type": "scan_cancelled",
+                "scan_id": scan_id
+            })
+            return
 
         # Scan completed
         scan_info["status"] = "completed"
         scan_info["completed_at"] = datetime.now().isoformat()
         scan_info["progress"] = 100
         scan_info["current_phase"] = "Complete"
+        job_store.update_job(scan_id, status="completed", completed_at=scan_info["completed_at"],
+                             progress=100, current_phase="Complete", hosts_found=hosts_found)
 
-        # Parse results
-        results = parse_scan_results(output_dir)
+        # Results were merged as hosts reported in
+        results = hosts.to_results()
 
         # Save summary
         summary_file = output_dir / "SUMMARY.json"
@@ -209,8 +731,12 @@ async def run_scan(scan_id: str, config: ScanConfig):
         })
 
     except Exception as e:
+        for task in workers:
+            task.cancel()
+        terminate_processes(scan_info)
         scan_info["status"] = "failed"
         scan_info["error"] = str(e)
+        job_store.update_job(scan_id, status="failed", error=str(e))
         await broadcast_update({
             "type": "scan_failed",
             "scan_id": scan_id,
@@ -219,41 +745,12 @@ async def run_scan(scan_id: str, config: ScanConfig):
 
 
 def parse_scan_results(output_dir: Path) -> dict:
-    """Parse nmap output files into structured results"""
-    results = {
-        "hosts": [],
-        "services": [],
-        "os_matches": []
-    }
-
-    # Parse gnmap files for quick host extraction
-    for gnmap_file in output_dir.glob("*.gnmap"):
-        with open(gnmap_file) as f:
-            for line in f:
-                if "Status: Up" in line:
-                    ip_match = re.search(r'Host: (\d+\.\d+\.\d+\.\d+)', line)
-                    if ip_match:
-                        ip = ip_match.group(1)
-                        if ip not in [h["ip"] for h in results["hosts"]]:
-                            results["hosts"].append({"ip": ip, "ports": [], "os": None})
-
-                # Parse ports
-                if "Ports:" in line:
-                    ip_match = re.search(r'Host: (\d+\.\d+\.\d+\.\d+)', line)
-                    if ip_match:
-                        ip = ip_match.group(1)
-                        ports_section = line.split("Ports:")[1]
-                        port_matches = re.findall(r'(\d+)/open/tcp//([^/]*)', ports_section)
-                        for port, service in port_matches:
-                            for host in results["hosts"]:
-                                if host["ip"] == ip:
-                                    host["ports"].append({
-                                        "port": int(port),
-                                        "protocol": "tcp",
-                                        "service": service.strip()
-                                    })
-
-    return results
+    """Parse nmap XML output files (including per-host phases under hosts/) into structured results"""
+    hosts = HostTable()
+    for xml_file in sorted(output_dir.rglob("*.xml")):
+        for record in iter_xml_hosts(xml_file):
+            hosts.merge(record)
+    return hosts.to_results()
 
 
 # API Routes
@@ -295,62 +792,82 @@ async def start_scan(config: ScanConfig, background_tasks: BackgroundTasks):
     scan_name = config.name or config.target.replace("/", "_").replace(".", "-")
     scan_id = f"{scan_name}_{timestamp}"
 
-    # Create output directory
-    output_dir = SCANS_DIR / scan_id
-
     # Initialize scan info
-    scan_info = {
+    scan_info = new_scan_info(scan_id, config, SCANS_DIR / scan_id, datetime.now().isoformat())
+    active_scans[scan_id] = scan_info
+    job_store.create_job(scan_info, config)
+
+    # Start scan in background
+    background_tasks.add_task(run_scan, scan_id, config)
+
+    return ScanStatus(**{k: v for k, v in scan_info.items() if k not in ["processes", "hosts"]})
+
+
+def new_scan_info(scan_id: str, config: ScanConfig, output_dir: Path, started_at: str) -> dict:
+    """Runtime state for a scan that is about to run"""
+    return {
         "scan_id": scan_id,
         "status": "running",
         "target": config.target,
         "scan_type": config.scan_type,
-        "started_at": datetime.now().isoformat(),
+        "started_at": started_at,
         "completed_at": None,
         "hosts_found": 0,
         "progress": 0,
         "current_phase": "Initializing",
         "output_dir": str(output_dir),
-        "process": None,
+        "processes": set(),
+        "hosts": HostTable(),
+        "discovery_done": False,
         "cancelled": False
     }
+
+
+def resume_job(scan_id: str) -> asyncio.Task:
+    """Restart an unfinished scan from the hosts it had not completed"""
+    job = job_store.get_job(scan_id)
+    config = ScanConfig(**json.loads(job["config"]))
+    scan_info = new_scan_info(scan_id, config, Path(job["output_dir"]), job["started_at"])
+    scan_info["hosts"], pending = job_store.load_hosts(scan_id)
+    scan_info["hosts_found"] = len(scan_info["hosts"])
+    scan_info["discovery_done"] = bool(job["discovery_done"])
     active_scans[scan_id] = scan_info
+    job_store.update_job(scan_id, status="running", error=None, completed_at=None)
 
-    # Start scan in background
-    background_tasks.add_task(run_scan, scan_id, config)
+    task = asyncio.create_task(run_scan(scan_id, config, pending))
+    resumed_tasks.add(task)
+    task.add_done_callback(resumed_tasks.discard)
+    return task
 
-    return ScanStatus(**{k: v for k, v in scan_info.items() if k != "process"})
 
+@app.post("/api/scans/{scan_id}/resume", response_model=ScanStatus)
+async def resume_scan(scan_id: str):
+    """Resume an interrupted, cancelled or failed scan"""
+    job = job_store.get_job(scan_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Scan not found")
+    if scan_id in active_scans and active_scans[scan_id]["status"] == "running":
+        raise HTTPException(status_code=400, detail="Scan is already running")
+    if job["status"] not in ("interrupted", "cancelled", "failed"):
+        raise HTTPException(status_code=400, detail=f"Scan is {job['status']} and cannot be resumed")
 
-@app.get("/api/scans", response_model=List[ScanStatus])
-async def list_scans():
-    """List all scans (active and completed)"""
-    scans = []
+    resume_job(scan_id)
+    info = active_scans[scan_id]
+    return ScanStatus(**{k: v for k, v in info.items() if k not in ["processes", "hosts"]})
 
-    # Active scans
-    for scan_id, info in active_scans.items():
-        scans.append(ScanStatus(**{k: v for k, v in info.items() if k not in ["process", "cancelled"]}))
 
-    # Completed scans from disk
-    for scan_dir in SCANS_DIR.iterdir():
-        if scan_dir.is_dir() and scan_dir.name not in active_scans:
-            summary_file = scan_dir / "SUMMARY.json"
-            if summary_file.exists():
-                with open(summary_file) as f:
-                    summary = json.load(f)
-                    scans.append(ScanStatus(
-                        scan_id=summary.get("scan_id", scan_dir.name),
-                        status="completed",
-                        target=summary.get("target", "unknown"),
-                        scan_type=summary.get("scan_type", "unknown"),
-                        started_at=summary.get("started_at"),
-                        completed_at=summary.get("completed_at"),
-                        hosts_found=summary.get("hosts_found", 0),
-                        progress=100,
-                        current_phase="Complete",
-                        output_dir=str(scan_dir)
-                    ))
-
-    return sorted(scans, key=lambda x: x.started_at or "", reverse=True)
+@app.get("/api/scans", response_model=List[ScanStatus])
+async def list_scans(status: Optional[str] = None, target: Optional[str] = None,
+                     limit: int = 100, offset: int = 0):
+    """List scan history, newest first, optionally filtered by status or target"""
+    scans = []
+    for job in job_store.list_jobs(status=status, target=target, limit=limit, offset=offset):
+        # Running scans report live progress from memory
+        info = active_scans.get(job["scan_id"])
+        if info and info["status"] == "running":
+            job = {**job, **{k: v for k, v in info.items() if k in ScanStatus.model_fields}}
+        scans.append(ScanStatus(**{k: v for k, v in job.items() if k in ScanStatus.model_fields}))
+    return scans
 
 
 @app.get("/api/scans/{scan_id}")
@@ -360,8 +877,8 @@ async def get_scan(scan_id: str):
     if scan_id in active_scans:
         info = active_scans[scan_id]
         return {
-            "status": ScanStatus(**{k: v for k, v in info.items() if k not in ["process", "cancelled"]}),
-            "results": None if info["status"] == "running" else parse_scan_results(Path(info["output_dir"]))
+            "status": ScanStatus(**{k: v for k, v in info.items() if k not in ["processes", "hosts", "cancelled"]}),
+            "results": info["hosts"].to_results()
         }
 
     # Check completed scans
@@ -372,6 +889,15 @@ async def get_scan(scan_id: str):
             with open(summary_file) as f:
                 return json.load(f)
 
+    # Unfinished scans: whatever the job store has so far
+    job = job_store.get_job(scan_id)
+    if job:
+        hosts, _ = job_store.load_hosts(scan_id)
+        return {
+            "status": ScanStatus(**{k: v for k, v in job.items() if k in ScanStatus.model_fields}),
+            "results": hosts.to_results()
+        }
+
     raise HTTPException(status_code=404, detail="Scan not found")
 
 
@@ -387,8 +913,7 @@ async def cancel_scan(scan_id: str):
 
     # Cancel the scan
     scan_info["cancelled"] = True
-    if scan_info.get("process"):
-        scan_info["process"].terminate()
+    terminate_processes(scan_info)
 
     return {"message": "Scan cancelled", "scan_id": scan_id}
 
@@ -400,25 +925,72 @@ async def list_scan_files(scan_id: str):
     if not scan_dir.exists():
         raise HTTPException(status_code=404, detail="Scan not found")
 
+    # Per-host phase output lives under hosts/<ip>/, so list files recursively
     files = []
-    for f in scan_dir.iterdir():
+    for f in sorted(scan_dir.rglob("*")):
+        if not f.is_file():
+            continue
+        stat = f.stat()
         files.append({
-            "name": f.name,
-            "size": f.stat().st_size,
-            "modified": datetime.fromtimestamp(f.stat().st_mtime).isoformat()
+            "name": f.relative_to(scan_dir).as_posix(),
+            "size": stat.st_size,
+            "modified": datetime.fromtimestamp(stat.st_mtime).isoformat()
         })
 
     return files
 
 
-@app.get("/api/scans/{scan_id}/files/{filename}")
+@app.get("/api/scans/{scan_id}/files/{filename:path}")
 async def download_scan_file(scan_id: str, filename: str):
-    """Download a specific scan output file"""
-    file_path = SCANS_DIR / scan_id / filename
-    if not file_path.exists():
+    """Download a specific scan output file (path relative to the scan directory)"""
+    scan_dir = (SCANS_DIR / scan_id).resolve()
+    file_path = (scan_dir / filename).resolve()
+    if not file_path.is_relative_to(scan_dir) or not file_path.is_file():
         raise HTTPException(status_code=404, detail="File not found")
 
-    return FileResponse(file_path, filename=filename)
+    return FileResponse(file_path, filename=file_path.name)
+
+
+@app.get("/api/scans/{scan_id}/events")
+async def scan_events(scan_id: str):
+    """Server-sent events stream of host-level progress for one scan"""
+    if scan_id not in active_scans:
+        raise HTTPException(status_code=404, detail="Scan not found")
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+    event_subscribers.setdefault(scan_id, []).append(queue)
+
+    async def stream():
+        try:
+            # Replay hosts found so far so late subscribers start complete
+            info = active_scans[scan_id]
+            for host in info["hosts"].to_results()["hosts"]:
+                yield f"event: host_update\ndata: {json.dumps({'scan_id': scan_id, 'host': host})}\n\n"
+            if info["status"] != "running":
+                yield f"event: scan_{info['status']}\ndata: {json.dumps({'scan_id': scan_id})}\n\n"
+                return
+
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {message['type']}\ndata: {json.dumps(message, default=str)}\n\n"
+                if message["type"] in ("scan_completed", "scan_failed", "scan_cancelled"):
+                    return
+        finally:
+            subscribers = event_subscribers.get(scan_id, [])
+            if queue in subscribers:
+                subscribers.remove(queue)
+            if not subscribers:
+                event_subscribers.pop(scan_id, None)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 # WebSocket for real-time updates